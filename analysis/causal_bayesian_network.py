@@ -48,6 +48,11 @@ from dataclasses import dataclass, field
 from itertools import product
 from typing import Dict, Iterable, List, Mapping, Tuple
 
+from analysis.cbn_inference import Calibration, Factor, JunctionTree
+
+# Number of evidence/intervention combinations kept calibrated per network.
+_CALIBRATION_CACHE_SIZE = 16
+
 
 @dataclass
 class CausalBayesianNetwork:
@@ -101,7 +106,7 @@ class CausalBayesianNetwork:
         var: str,
         evidence: Mapping[str, bool] | None = None,
     ) -> float:
-        """Return ``P(var=True | evidence)`` using enumeration."""
+        """Return ``P(var=True | evidence)`` using junction-tree inference."""
 
         return self._query(var, evidence=evidence or {}, interventions={})
 
@@ -125,56 +130,61 @@ class CausalBayesianNetwork:
         evidence: Mapping[str, bool],
         interventions: Mapping[str, bool],
     ) -> float:
-        vars_order = self._topological()
-        dist: Dict[bool, float] = {}
-        for value in (False, True):
-            extended = dict(evidence)
-            extended[var] = value
-            dist[value] = self._enumerate_all(vars_order, extended, interventions)
-        total = dist[False] + dist[True]
-        return dist[True] / total if total else 0.0
-
-    def _enumerate_all(
-        self,
-        vars_order: List[str],
-        evidence: Dict[str, bool],
-        interventions: Mapping[str, bool],
-    ) -> float:
-        if not vars_order:
-            return 1.0
-        Y = vars_order[0]
-        rest = vars_order[1:]
-        if Y in evidence:
-            prob = self._probability(Y, evidence[Y], evidence, interventions)
-            return prob * self._enumerate_all(rest, evidence, interventions)
-        else:
-            total = 0.0
-            evidence[Y] = True
-            prob_true = self._probability(Y, True, evidence, interventions)
-            total += prob_true * self._enumerate_all(rest, evidence, interventions)
-            evidence[Y] = False
-            prob_false = self._probability(Y, False, evidence, interventions)
-            total += prob_false * self._enumerate_all(rest, evidence, interventions)
-            del evidence[Y]
-            return total
-
-    def _probability(
+        return self._calibration(evidence, interventions).probability_true(var)
+
+    def _calibration(
         self,
-        var: str,
-        value: bool,
         evidence: Mapping[str, bool],
         interventions: Mapping[str, bool],
-    ) -> float:
+    ) -> Calibration:
+        """Return calibrated clique potentials for the current parameters.
+
+        The junction tree is rebuilt only when nodes or edges change and the
+        most recent calibrations are cached per parameters, evidence and
+        interventions, so the UI can ask for many marginals in a row.
+        Networks are edited in place by the UI, hence the keys are derived
+        from the current contents rather than tracked on mutation.
+        """
+
+        cache = self.__dict__.setdefault("_inference_cache", {})
+        structure = tuple((n, tuple(self.parents.get(n, []))) for n in self.nodes)
+        if cache.get("structure") != structure:
+            self._topological()
+            cache.clear()
+            cache["structure"] = structure
+            cache["tree"] = JunctionTree(dict(structure))
+            cache["calibrations"] = {}
+        calibrations: Dict[tuple, Calibration] = cache["calibrations"]
+        key = (
+            tuple(self._parameter_key(n) for n in self.nodes),
+            tuple(sorted(evidence.items())),
+            tuple(sorted(interventions.items())),
+        )
+        result = calibrations.pop(key, None)
+        if result is None:
+            factors = {n: self._factor(n, interventions) for n in self.nodes}
+            result = cache["tree"].calibrate(factors, evidence)
+            if len(calibrations) >= _CALIBRATION_CACHE_SIZE:
+                calibrations.pop(next(iter(calibrations)))
+        calibrations[key] = result
+        return result
+
+    def _parameter_key(self, var: str) -> object:
+        cpd = self.cpds.get(var)
+        if isinstance(cpd, Mapping):
+            return tuple(sorted(cpd.items()))
+        return cpd
+
+    def _factor(self, var: str, interventions: Mapping[str, bool]) -> Factor:
+        """Return ``P(var | parents)``, or an indicator when ``var`` is forced."""
+
         if var in interventions:
-            return 1.0 if value == interventions[var] else 0.0
+            return Factor((var,), [0.0, 1.0] if interventions[var] else [1.0, 0.0])
         parents = self.parents.get(var, [])
         if not parents:
             p_true = float(self.cpds[var])
-        else:
-            key = tuple(evidence[p] for p in parents)
-            default = 1.0 / (2 ** len(parents))
-            p_true = float(self.cpds[var].get(key, default))
-        return p_true if value else 1.0 - p_true
+            return Factor((var,), [1.0 - p_true, p_true])
+        return Factor.conditional(var, parents, dict(self._cpd_rows_only(var)))
 
     # ------------------------------------------------------------------
     def _topological(self) -> List[str]:
@@ -207,13 +217,13 @@ class CausalBayesianNetwork:
 
             P(X=True) = \sum_{pa} P(X=True \mid pa) P(pa)
 
-        by delegating the computation of each term to the enumeration based
-        :meth:`joint_probability` helper.  While potentially more expensive
-        than simple propagation, it produces correct results even when parent
-        nodes are themselves dependent.
+        evaluated for all nodes at once from a single calibration of the
+        junction tree, so it stays exact when parent nodes are themselves
+        dependent.
         """
 
-        return {node: self.joint_probability({node: True}) for node in self.nodes}
+        calibration = self._calibration({}, {})
+        return {node: calibration.probability_true(node) for node in self.nodes}
 
     # ------------------------------------------------------------------
     def _cpd_rows_only(self, var: str) -> List[Tuple[Tuple[bool, ...], float]]:
@@ -255,10 +265,10 @@ class CausalBayesianNetwork:
             combo, prob = rows[0]
             return [(combo, prob, 1.0, prob)]
 
+        parent_joint = self._calibration({}, {}).joint(parents)
         result: List[Tuple[Tuple[bool, ...], float, float, float]] = []
         for combo, p_true in rows:
-            assignment = {p: v for p, v in zip(parents, combo)}
-            combo_prob = self.joint_probability(assignment)
+            combo_prob = parent_joint.value(dict(zip(parents, combo)))
             joint_prob = combo_prob * p_true
             result.append((combo, p_true, combo_prob, joint_prob))
         return result
@@ -269,12 +279,11 @@ class CausalBayesianNetwork:
 
         The computation mirrors the classic factorisation of a Bayesian
         network, ``\prod_i P(X_i \mid Parents(X_i))``, while summing out all
-        unspecified variables.  It forms the basis for deriving marginal and
-        conditional probabilities used throughout the UI.
+        unspecified variables.  The result is the probability mass left in
+        the junction tree after entering ``assignment`` as evidence.
         """
 
-        order = self._topological()
-        return self._enumerate_all(order, dict(assignment), {})
+        return self._calibration(assignment, {}).mass
 
 
 @dataclass
@@ -0,0 +1,358 @@
+# Author: Miguel Marina <karel.capek.robotics@gmail.com>
+# SPDX-License-Identifier: GPL-3.0-or-later
+#
+# Copyright (C) 2025 Capek System Safety & Robotic Solutions
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+"""Junction-tree inference for binary causal Bayesian networks.
+
+:class:`Factor` stores a table over binary variables as a flat NumPy array
+indexed by the bits of an assignment (bit ``i`` holds ``variables[i]``), so
+products, marginals and evidence work on whole tables at once.  Without
+NumPy the table is a list and the same operations loop over its entries.
+:class:`JunctionTree` triangulates the moral graph of a network with a
+min-fill elimination ordering, joins the resulting cliques by a maximum
+weight spanning tree and calibrates clique potentials with a two-pass Hugin
+propagation.  A :class:`Calibration` then answers every marginal, and the
+joint of any family, without further propagation.
+
+The tree only depends on the graph structure, so it is built once and
+reused for any parameters, evidence and ``do()`` interventions: an
+intervened variable's conditional table is replaced by an indicator on its
+forced value, which fits the clique that held the original family.
+"""
+
+from __future__ import annotations
+
+from typing import Dict, Iterable, List, Mapping, Optional, Sequence, Set, Tuple
+
+try:  # optional dependency
+    import numpy as np
+except Exception:  # pragma: no cover - NumPy may not be installed
+    np = None
+
+
+class Factor:
+    """Table of non-negative values over binary ``variables``."""
+
+    __slots__ = ("variables", "values")
+
+    def __init__(self, variables: Sequence[str], values: Optional[Sequence[float]] = None) -> None:
+        self.variables: Tuple[str, ...] = tuple(variables)
+        size = 1 << len(self.variables)
+        if np is None:
+            self.values = [1.0] * size if values is None else list(values)
+        else:
+            self.values = np.ones(size) if values is None else np.array(values, dtype=float)
+        if len(self.values) != size:
+            raise ValueError("factor table size does not match its variables")
+
+    @classmethod
+    def conditional(
+        cls, var: str, parents: Sequence[str], p_true: Mapping[Tuple[bool, ...], float]
+    ) -> "Factor":
+        """Return ``P(var | parents)`` given ``P(var=True)`` per parent combo."""
+        variables = (var, *parents)
+        values = [0.0] * (1 << len(variables))
+        for idx in range(len(values)):
+            combo = tuple(bool(idx >> (i + 1) & 1) for i in range(len(parents)))
+            p = p_true[combo]
+            values[idx] = p if idx & 1 else 1.0 - p
+        return cls(variables, values)
+
+    def _positions(self, variables: Sequence[str]) -> List[int]:
+        index = {v: i for i, v in enumerate(self.variables)}
+        return [index[v] for v in variables]
+
+    def _tensor(self):
+        """Return the table as an array with one axis per variable.
+
+        Bit 0 is the least significant, so axes run from the last variable
+        to the first.
+        """
+        return self.values.reshape((2,) * len(self.variables))
+
+    def _aligned(self, variables: Sequence[str]):
+        """Return the table broadcastable over the axes of *variables*."""
+        axes = variables[::-1]
+        own = self.variables[::-1]
+        tensor = self._tensor().transpose([own.index(v) for v in axes if v in self.variables])
+        return tensor.reshape([2 if v in self.variables else 1 for v in axes])
+
+    def multiply(self, other: "Factor") -> "Factor":
+        """Return the product of both factors.
+
+        The result lists ``self.variables`` first so multiplying by a factor
+        over a subset of them keeps the variable order unchanged.
+        """
+        variables = self.variables + tuple(
+            v for v in other.variables if v not in self.variables
+        )
+        if not isinstance(self.values, list):
+            product = self._aligned(variables) * other._aligned(variables)
+            return Factor(variables, product.reshape(-1))
+        mask = (1 << len(self.variables)) - 1
+        positions = [variables.index(v) for v in other.variables]
+        values = [0.0] * (1 << len(variables))
+        mine = self.values
+        theirs = other.values
+        for idx in range(len(values)):
+            a = mine[idx & mask]
+            if not a:
+                continue
+            j = 0
+            for bit, pos in enumerate(positions):
+                j |= (idx >> pos & 1) << bit
+            values[idx] = a * theirs[j]
+        return Factor(variables, values)
+
+    def marginal(self, keep: Iterable[str]) -> "Factor":
+        """Sum out every variable not in *keep*; kept variables follow *keep*."""
+        keep = tuple(keep)
+        positions = self._positions(keep)
+        if not isinstance(self.values, list):
+            n = len(self.variables)
+            summed = self._tensor().sum(
+                axis=tuple(n - 1 - i for i, v in enumerate(self.variables) if v not in keep)
+            )
+            # Remaining axes keep their order: last kept variable first.
+            remaining = [v for v in self.variables[::-1] if v in keep]
+            table = np.asarray(summed).transpose([remaining.index(v) for v in keep[::-1]])
+            return Factor(keep, table.reshape(-1))
+        values = [0.0] * (1 << len(keep))
+        for idx, value in enumerate(self.values):
+            if not value:
+                continue
+            j = 0
+            for bit, pos in enumerate(positions):
+                j |= (idx >> pos & 1) << bit
+            values[j] += value
+        return Factor(keep, values)
+
+    def observe(self, var: str, value: bool) -> None:
+        """Zero every entry inconsistent with ``var == value`` in place."""
+        pos = self.variables.index(var)
+        want = 1 if value else 0
+        if not isinstance(self.values, list):
+            axis = len(self.variables) - 1 - pos
+            self._tensor()[(slice(None),) * axis + (1 - want,)] = 0.0
+            return
+        values = self.values
+        for idx in range(len(values)):
+            if (idx >> pos & 1) != want:
+                values[idx] = 0.0
+
+    def divide(self, other: "Factor") -> "Factor":
+        """Divide entrywise by a factor over the same variables (``0/0 = 0``)."""
+        if other.variables != self.variables:
+            other = other.marginal(self.variables)
+        if not isinstance(self.values, list):
+            quotient = np.divide(
+                self.values, other.values, out=np.zeros_like(self.values), where=other.values != 0
+            )
+            return Factor(self.variables, quotient)
+        return Factor(
+            self.variables,
+            [a / b if b else 0.0 for a, b in zip(self.values, other.values)],
+        )
+
+    def total(self) -> float:
+        if isinstance(self.values, list):
+            return sum(self.values)
+        return float(self.values.sum())
+
+    def value(self, assignment: Mapping[str, bool]) -> float:
+        idx = 0
+        for bit, var in enumerate(self.variables):
+            if assignment[var]:
+                idx |= 1 << bit
+        return float(self.values[idx])
+
+
+def min_fill_order(adjacency: Mapping[str, Set[str]]) -> List[str]:
+    """Return an elimination ordering chosen greedily by fewest fill-in edges.
+
+    Ties are broken by the smaller neighbourhood and then by name so the
+    ordering is deterministic.
+    """
+    graph = {v: set(n) for v, n in adjacency.items()}
+    order: List[str] = []
+    while graph:
+        best = None
+        best_key = None
+        for v, neighbours in graph.items():
+            nb = sorted(neighbours)
+            fill = 0
+            for i, a in enumerate(nb):
+                adj = graph[a]
+                for b in nb[i + 1 :]:
+                    if b not in adj:
+                        fill += 1
+            key = (fill, len(nb), v)
+            if best_key is None or key < best_key:
+                best, best_key = v, key
+        neighbours = graph.pop(best)
+        for a in neighbours:
+            graph[a].discard(best)
+            graph[a] |= neighbours - {a}
+        order.append(best)
+    return order
+
+
+class JunctionTree:
+    """Clique tree for the network described by ``families``.
+
+    ``families`` maps each variable to its parents.  Every family is
+    assigned to the smallest clique containing it.
+    """
+
+    def __init__(self, families: Mapping[str, Sequence[str]]) -> None:
+        self.families = {v: tuple(p) for v, p in families.items()}
+        adjacency: Dict[str, Set[str]] = {v: set() for v in self.families}
+        for var, parents in self.families.items():
+            family = (var, *parents)
+            for a in family:
+                adjacency.setdefault(a, set())
+                for b in family:
+                    if a != b:
+                        adjacency[a].add(b)
+        self.order = min_fill_order(adjacency)
+
+        cliques: List[Tuple[str, ...]] = []
+        graph = {v: set(n) for v, n in adjacency.items()}
+        for v in self.order:
+            neighbours = graph.pop(v)
+            clique = frozenset(neighbours | {v})
+            if not any(clique <= set(c) for c in cliques):
+                cliques.append(tuple(sorted(clique)))
+            for a in neighbours:
+                graph[a].discard(v)
+                graph[a] |= neighbours - {a}
+        # Drop cliques contained in a later, larger one.
+        sets = [set(c) for c in cliques]
+        self.cliques: List[Tuple[str, ...]] = [
+            c
+            for i, c in enumerate(cliques)
+            if not any(i != j and sets[i] < sets[j] for j in range(len(sets)))
+        ]
+
+        self.neighbours: List[List[int]] = [[] for _ in self.cliques]
+        self._join_cliques()
+
+        # Breadth-first traversal from clique 0: ``schedule`` holds
+        # ``(child, parent, separator)`` in the order messages flow outwards.
+        self.schedule: List[Tuple[int, int, Tuple[str, ...]]] = []
+        if self.cliques:
+            seen = {0}
+            queue = [0]
+            for node in queue:
+                for nb in self.neighbours[node]:
+                    if nb not in seen:
+                        seen.add(nb)
+                        queue.append(nb)
+                        sep = tuple(
+                            v for v in self.cliques[nb] if v in self.cliques[node]
+                        )
+                        self.schedule.append((nb, node, sep))
+
+        self.assignment: Dict[str, int] = {}
+        for var, parents in self.families.items():
+            family = {var, *parents}
+            self.assignment[var] = min(
+                (i for i, c in enumerate(self.cliques) if family <= set(c)),
+                key=lambda i: len(self.cliques[i]),
+            )
+        self.home: Dict[str, int] = {}
+        for i, clique in enumerate(self.cliques):
+            for v in clique:
+                if v not in self.home or len(clique) < len(self.cliques[self.home[v]]):
+                    self.home[v] = i
+
+    def _join_cliques(self) -> None:
+        """Link cliques by a maximum spanning tree on separator size."""
+        edges = []
+        for i in range(len(self.cliques)):
+            a = set(self.cliques[i])
+            for j in range(i + 1, len(self.cliques)):
+                edges.append((len(a.intersection(self.cliques[j])), i, j))
+        edges.sort(key=lambda e: (-e[0], e[1], e[2]))
+        root = list(range(len(self.cliques)))
+
+        def find(i: int) -> int:
+            while root[i] != i:
+                root[i] = root[root[i]]
+                i = root[i]
+            return i
+
+        for _weight, i, j in edges:
+            ri, rj = find(i), find(j)
+            if ri != rj:
+                root[ri] = rj
+                self.neighbours[i].append(j)
+                self.neighbours[j].append(i)
+
+    def calibrate(
+        self,
+        factors: Mapping[str, Factor],
+        evidence: Mapping[str, bool] | None = None,
+    ) -> "Calibration":
+        """Propagate ``factors`` (one per variable) and *evidence*."""
+        potentials = [Factor(c) for c in self.cliques]
+        for var, factor in factors.items():
+            i = self.assignment[var]
+            potentials[i] = potentials[i].multiply(factor)
+        for var, value in (evidence or {}).items():
+            home = self.home.get(var)
+            if home is not None:
+                potentials[home].observe(var, value)
+        separators: Dict[int, Factor] = {}
+        for child, parent, sep in reversed(self.schedule):
+            message = potentials[child].marginal(sep)
+            separators[child] = message
+            potentials[parent] = potentials[parent].multiply(message)
+        for child, parent, sep in self.schedule:
+            message = potentials[parent].marginal(sep)
+            potentials[child] = potentials[child].multiply(
+                message.divide(separators[child])
+            )
+            separators[child] = message
+        return Calibration(self, potentials)
+
+
+class Calibration:
+    """Calibrated clique potentials of a :class:`JunctionTree`."""
+
+    def __init__(self, tree: JunctionTree, potentials: List[Factor]) -> None:
+        self.tree = tree
+        self.potentials = potentials
+        self.mass = potentials[0].total() if potentials else 1.0
+        self._marginals: Dict[str, float] = {}
+
+    def probability_true(self, var: str) -> float:
+        """Return ``P(var=True | evidence)`` or ``0.0`` for impossible evidence."""
+        cached = self._marginals.get(var)
+        if cached is None:
+            table = self.potentials[self.tree.home[var]].marginal((var,)).values
+            total = table[0] + table[1]
+            cached = self._marginals[var] = table[1] / total if total else 0.0
+        return cached
+
+    def joint(self, variables: Sequence[str]) -> Factor:
+        """Return the unnormalised joint of *variables*, which share a clique."""
+        wanted = set(variables)
+        for i in sorted(range(len(self.potentials)), key=lambda i: len(self.tree.cliques[i])):
+            if wanted <= set(self.tree.cliques[i]):
+                return self.potentials[i].marginal(variables)
+        raise KeyError(f"no clique contains {sorted(wanted)}")
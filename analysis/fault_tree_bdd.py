@@ -0,0 +1,427 @@
+# Author: Miguel Marina <karel.capek.robotics@gmail.com>
+# SPDX-License-Identifier: GPL-3.0-or-later
+#
+# Copyright (C) 2025 Capek System Safety & Robotic Solutions
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+"""Binary decision diagram engine for exact fault tree analysis.
+
+A top event is compiled into a reduced ordered binary decision diagram
+(ROBDD) whose variables are the basic events of the tree.  Clones share the
+variable of their original so repeated events are handled exactly.  From the
+single diagram :class:`FaultTreeBDD` derives
+
+* the exact top event probability,
+* minimal cut sets (Rauzy's algorithm) with optional order and probability
+  cut-offs and
+* Birnbaum and Fussell-Vesely importance measures.
+
+All diagram operations run on explicit stacks so trees with thousands of
+basic events do not hit Python's recursion limit.
+"""
+
+from __future__ import annotations
+
+from typing import Dict, List, Mapping, Sequence
+
+ZERO = 0
+ONE = 1
+
+_AND = "AND"
+_OR = "OR"
+
+ORDERING_HEURISTICS = ("dfs", "bfs", "frequency")
+
+
+def _run(gen):
+    """Drive a generator based recursive procedure without recursion."""
+    stack = [gen]
+    value = None
+    while stack:
+        try:
+            sub = stack[-1].send(value)
+        except StopIteration as stop:
+            stack.pop()
+            value = stop.value
+            continue
+        stack.append(sub)
+        value = None
+    return value
+
+
+def _resolve(node):
+    """Return the node whose logic ``node`` represents (clones map to originals)."""
+    original = getattr(node, "original", None)
+    if not getattr(node, "is_primary_instance", True) and original is not None:
+        return original
+    return node
+
+
+def _is_leaf(node) -> bool:
+    return node.node_type.upper() == "BASIC EVENT" or not node.children
+
+
+def _gate(node) -> str:
+    return _OR if (node.gate_type or _AND).upper() == _OR else _AND
+
+
+def order_variables(top_event, heuristic: str = "dfs") -> List[int]:
+    """Return basic event ids of ``top_event`` in BDD variable order.
+
+    ``dfs`` follows the depth-first, left-to-right occurrence of events which
+    keeps events of the same subtree adjacent.  ``bfs`` orders events by their
+    depth below the top event and ``frequency`` places events referenced by
+    many gates first, breaking ties by depth-first position.
+    """
+    if heuristic not in ORDERING_HEURISTICS:
+        raise ValueError(f"Unknown variable ordering heuristic: {heuristic}")
+    dfs_order: Dict[int, int] = {}
+    depth: Dict[int, int] = {}
+    counts: Dict[int, int] = {}
+    expanded: set[int] = set()
+    stack = [(top_event, 0)]
+    while stack:
+        node, level = stack.pop()
+        node = _resolve(node)
+        uid = node.unique_id
+        if _is_leaf(node):
+            counts[uid] = counts.get(uid, 0) + 1
+            dfs_order.setdefault(uid, len(dfs_order))
+            depth[uid] = min(depth.get(uid, level), level)
+            continue
+        if uid in expanded:
+            continue
+        expanded.add(uid)
+        for child in reversed(node.children):
+            stack.append((child, level + 1))
+    keys = list(dfs_order)
+    if heuristic == "bfs":
+        keys.sort(key=lambda k: (depth[k], dfs_order[k]))
+    elif heuristic == "frequency":
+        keys.sort(key=lambda k: (-counts[k], dfs_order[k]))
+    return keys
+
+
+class FaultTreeBDD:
+    """Shared ROBDD compiled from a fault tree top event.
+
+    Parameters
+    ----------
+    top_event:
+        Root ``FaultTreeNode`` to compile.
+    ordering:
+        Name of a heuristic from :data:`ORDERING_HEURISTICS` or an explicit
+        sequence of basic event ids.
+    """
+
+    def __init__(self, top_event, ordering: str | Sequence[int] = "dfs") -> None:
+        self.top_event = top_event
+        if isinstance(ordering, str):
+            order = order_variables(top_event, ordering)
+        else:
+            order = list(ordering)
+        self.variables: List[int] = order
+        self._level: Dict[int, int] = {key: idx for idx, key in enumerate(order)}
+        self.events: Dict[int, object] = {}
+        # Node storage: index -> (level, low, high); 0 and 1 are terminals.
+        terminal = len(order)
+        self._nodes: List[tuple[int, int, int]] = [
+            (terminal, ZERO, ZERO),
+            (terminal, ONE, ONE),
+        ]
+        self._unique: Dict[tuple[int, int, int], int] = {}
+        self._apply_cache: Dict[tuple[str, int, int], int] = {}
+        self._mcs_root: int | None = None
+        self.root = self._compile(top_event)
+
+    # ------------------------------------------------------------------
+    # Core diagram operations
+    def _mk(self, level: int, low: int, high: int) -> int:
+        if low == high:
+            return low
+        key = (level, low, high)
+        idx = self._unique.get(key)
+        if idx is None:
+            idx = len(self._nodes)
+            self._nodes.append(key)
+            self._unique[key] = idx
+        return idx
+
+    def _var(self, key: int) -> int:
+        level = self._level.get(key)
+        if level is None:
+            level = len(self.variables)
+            self.variables.append(key)
+            self._level[key] = level
+            self._reset_terminals()
+        return self._mk(level, ZERO, ONE)
+
+    def _reset_terminals(self) -> None:
+        terminal = len(self.variables)
+        self._nodes[ZERO] = (terminal, ZERO, ZERO)
+        self._nodes[ONE] = (terminal, ONE, ONE)
+
+    def _apply(self, op: str, a: int, b: int):
+        if op == _AND:
+            if a == ZERO or b == ZERO:
+                return ZERO
+            if a == ONE:
+                return b
+            if b == ONE or a == b:
+                return a
+        else:
+            if a == ONE or b == ONE:
+                return ONE
+            if a == ZERO:
+                return b
+            if b == ZERO or a == b:
+                return a
+        key = (op, a, b) if a < b else (op, b, a)
+        cached = self._apply_cache.get(key)
+        if cached is not None:
+            return cached
+        la, a0, a1 = self._nodes[a]
+        lb, b0, b1 = self._nodes[b]
+        level = min(la, lb)
+        if la != level:
+            a0 = a1 = a
+        if lb != level:
+            b0 = b1 = b
+        low = yield self._apply(op, a0, b0)
+        high = yield self._apply(op, a1, b1)
+        result = self._mk(level, low, high)
+        self._apply_cache[key] = result
+        return result
+
+    def _combine(self, op: str, a: int, b: int) -> int:
+        return _run(self._apply(op, a, b))
+
+    def _reduce(self, op: str, operands: List[int]) -> int:
+        """Combine ``operands`` pairwise so wide gates stay near ``n log n``."""
+        if not operands:
+            return ONE if op == _AND else ZERO
+        while len(operands) > 1:
+            paired = [
+                self._combine(op, operands[i], operands[i + 1])
+                for i in range(0, len(operands) - 1, 2)
+            ]
+            if len(operands) % 2:
+                paired.append(operands[-1])
+            operands = paired
+        return operands[0]
+
+    def _compile(self, top_event) -> int:
+        compiled: Dict[int, int] = {}
+        on_path: set[int] = set()
+        stack = [(top_event, False)]
+        while stack:
+            node, expanded = stack.pop()
+            node = _resolve(node)
+            uid = node.unique_id
+            if expanded:
+                on_path.discard(uid)
+                # Cycles back to an ancestor contribute nothing.
+                operands = [
+                    compiled[c.unique_id]
+                    for c in map(_resolve, node.children)
+                    if c.unique_id in compiled
+                ]
+                compiled[uid] = self._reduce(_gate(node), operands)
+                continue
+            if uid in compiled or uid in on_path:
+                continue
+            if _is_leaf(node):
+                self.events.setdefault(uid, node)
+                compiled[uid] = self._var(uid)
+                continue
+            on_path.add(uid)
+            stack.append((node, True))
+            for child in reversed(node.children):
+                stack.append((child, False))
+        return compiled[_resolve(top_event).unique_id]
+
+    # ------------------------------------------------------------------
+    # Queries
+    def __len__(self) -> int:
+        return len(self._reachable(self.root))
+
+    def _reachable(self, root: int) -> List[int]:
+        seen = {root}
+        stack = [root]
+        while stack:
+            idx = stack.pop()
+            if idx <= ONE:
+                continue
+            _, low, high = self._nodes[idx]
+            for child in (low, high):
+                if child not in seen:
+                    seen.add(child)
+                    stack.append(child)
+        # Children are always created before their parents.
+        return sorted(seen)
+
+    def event_probabilities(self) -> Dict[int, float]:
+        """Return the failure probability of every basic event by id."""
+        probs = {}
+        for key in self.variables:
+            node = self.events.get(key)
+            try:
+                probs[key] = float(getattr(node, "failure_prob", 0.0) or 0.0)
+            except (TypeError, ValueError):
+                probs[key] = 0.0
+        return probs
+
+    def _node_probabilities(self, root: int, probs: Mapping[int, float]):
+        values = {ZERO: 0.0, ONE: 1.0}
+        for idx in self._reachable(root):
+            if idx <= ONE:
+                continue
+            level, low, high = self._nodes[idx]
+            p = probs[self.variables[level]]
+            values[idx] = p * values[high] + (1 - p) * values[low]
+        return values
+
+    def probability(self, probabilities: Mapping[int, float] | None = None):
+        """Return the exact top event probability.
+
+        ``probabilities`` overrides basic event probabilities by id.  Values
+        may be floats or NumPy arrays for vectorised evaluation.
+        """
+        probs = self.event_probabilities()
+        if probabilities:
+            probs.update(probabilities)
+        return self._node_probabilities(self.root, probs)[self.root]
+
+    def birnbaum_importance(
+        self, probabilities: Mapping[int, float] | None = None
+    ) -> Dict[int, float]:
+        """Return ``P(top | e) - P(top | not e)`` for every basic event ``e``."""
+        probs = self.event_probabilities()
+        if probabilities:
+            probs.update(probabilities)
+        values = self._node_probabilities(self.root, probs)
+        reach = {self.root: 1.0}
+        importance = {key: 0.0 for key in self.variables}
+        for idx in reversed(self._reachable(self.root)):
+            if idx <= ONE:
+                continue
+            level, low, high = self._nodes[idx]
+            r = reach.get(idx, 0.0)
+            key = self.variables[level]
+            p = probs[key]
+            importance[key] += r * (values[high] - values[low])
+            reach[high] = reach.get(high, 0.0) + r * p
+            reach[low] = reach.get(low, 0.0) + r * (1 - p)
+        return importance
+
+    def fussell_vesely_importance(
+        self, probabilities: Mapping[int, float] | None = None
+    ) -> Dict[int, float]:
+        """Return ``(P(top) - P(top | not e)) / P(top)`` for every event ``e``."""
+        probs = self.event_probabilities()
+        if probabilities:
+            probs.update(probabilities)
+        top = self.probability(probs)
+        birnbaum = self.birnbaum_importance(probs)
+        if not top:
+            return {key: 0.0 for key in birnbaum}
+        return {key: probs[key] * b / top for key, b in birnbaum.items()}
+
+    # ------------------------------------------------------------------
+    # Minimal cut sets
+    def _without(self, p: int, q: int):
+        if p == ZERO or q == ONE:
+            return ZERO
+        if q == ZERO or p == ONE:
+            return p
+        key = ("WITHOUT", p, q)
+        cached = self._apply_cache.get(key)
+        if cached is not None:
+            return cached
+        lp, p0, p1 = self._nodes[p]
+        lq, q0, q1 = self._nodes[q]
+        if lp < lq:
+            low = yield self._without(p0, q)
+            high = yield self._without(p1, q)
+            result = self._mk(lp, low, high)
+        elif lp > lq:
+            result = yield self._without(p, q0)
+        else:
+            low = yield self._without(p0, q0)
+            partial = yield self._without(p1, q0)
+            high = yield self._without(partial, q1)
+            result = self._mk(lp, low, high)
+        self._apply_cache[key] = result
+        return result
+
+    def _minimal(self, f: int):
+        if f <= ONE:
+            return f
+        key = ("MCS", f, f)
+        cached = self._apply_cache.get(key)
+        if cached is not None:
+            return cached
+        level, f0, f1 = self._nodes[f]
+        low = yield self._minimal(f0)
+        high = yield self._minimal(f1)
+        high = yield self._without(high, low)
+        result = self._mk(level, low, high)
+        self._apply_cache[key] = result
+        return result
+
+    def _mcs(self) -> int:
+        if self._mcs_root is None:
+            self._mcs_root = _run(self._minimal(self.root))
+        return self._mcs_root
+
+    def minimal_cut_sets(
+        self,
+        max_order: int | None = None,
+        cutoff: float | None = None,
+    ) -> List[set[int]]:
+        """Return minimal cut sets as sets of basic event ids.
+
+        ``max_order`` discards cut sets with more events and ``cutoff``
+        discards cut sets whose probability (product of event probabilities)
+        falls below the given value.  Both are applied while enumerating so
+        truncated results never materialise the full cut set family.
+        """
+        root = self._mcs()
+        probs = self.event_probabilities() if cutoff is not None else None
+        results: List[set[int]] = []
+        stack = [(root, (), 1.0)]
+        while stack:
+            idx, events, prob = stack.pop()
+            if idx == ZERO:
+                continue
+            if idx == ONE:
+                results.append(set(events))
+                continue
+            level, low, high = self._nodes[idx]
+            stack.append((low, events, prob))
+            if max_order is not None and len(events) >= max_order:
+                continue
+            key = self.variables[level]
+            high_prob = prob * probs[key] if probs is not None else prob
+            if probs is not None and high_prob < cutoff:
+                continue
+            stack.append((high, events + (key,), high_prob))
+        results.sort(key=lambda cs: (len(cs), sorted(cs)))
+        return results
+
+
+def compile_fault_tree(top_event, ordering: str | Sequence[int] = "dfs") -> FaultTreeBDD:
+    """Convenience wrapper returning a :class:`FaultTreeBDD` for ``top_event``."""
+    return FaultTreeBDD(top_event, ordering)
@@ -0,0 +1,179 @@
+# Author: Miguel Marina <karel.capek.robotics@gmail.com>
+# SPDX-License-Identifier: GPL-3.0-or-later
+#
+# Copyright (C) 2025 Capek System Safety & Robotic Solutions
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+"""Memoised probability evaluation for fault trees.
+
+Fault trees frequently share gates between branches (page gates, clones and
+subtrees referenced from several top events).  Evaluating such trees by plain
+recursion visits a shared subtree once per path which grows exponentially with
+the nesting depth.  :class:`FaultTreeProbabilityEngine` evaluates every
+``FaultTreeNode`` at most once per calculation and keeps the results keyed by
+``unique_id`` so a later calculation only recomputes the ancestors of nodes
+whose inputs changed.
+"""
+
+from __future__ import annotations
+
+from typing import Dict, Hashable, Iterable
+
+
+class FaultTreeProbabilityEngine:
+    """Evaluate and cache top event probabilities of fault trees.
+
+    The engine combines child probabilities exactly like the historical
+    recursive calculation: AND gates multiply their inputs, every other gate
+    uses ``1 - ∏(1 - p)`` and leaves (basic events or nodes without
+    children) use their ``failure_prob``.  Each evaluated node gets its
+    ``probability`` and ``display_label`` updated.
+    """
+
+    def __init__(self) -> None:
+        self._values: Dict[int, float] = {}
+        self._signatures: Dict[int, Hashable] = {}
+        self._nodes: Dict[int, object] = {}
+
+    # ------------------------------------------------------------------
+    @staticmethod
+    def _is_leaf(node) -> bool:
+        return node.node_type.upper() == "BASIC EVENT" or not node.children
+
+    def _signature(self, node) -> Hashable:
+        """Return the inputs that determine ``node``'s own combination step."""
+        if self._is_leaf(node):
+            return ("leaf", getattr(node, "failure_prob", 0.0))
+        return (
+            (node.gate_type or "AND").upper(),
+            tuple(c.unique_id for c in node.children),
+        )
+
+    def _combine(self, node, child_probs: Iterable[float]) -> float:
+        if self._is_leaf(node):
+            return float(getattr(node, "failure_prob", 0.0))
+        if (node.gate_type or "AND").upper() == "AND":
+            prob = 1.0
+            for p in child_probs:
+                prob *= p
+            return prob
+        prod = 1.0
+        for p in child_probs:
+            prod *= 1 - p
+        return 1 - prod
+
+    # ------------------------------------------------------------------
+    def evaluate(self, node, verify: bool = True) -> float:
+        """Return the probability of failure for ``node``.
+
+        With ``verify`` enabled the whole subtree is scanned once and every
+        node whose inputs differ from the cached state is recomputed together
+        with its ancestors.  Passing ``verify=False`` trusts the cache and only
+        descends into nodes removed by :meth:`invalidate`, making repeated
+        calculations after a single edit proportional to the edited path.
+        """
+        values = self._values
+        done: set[int] = set()
+        changed: set[int] = set()
+        on_path: set[int] = set()
+        stack = [(node, False)]
+        while stack:
+            current, expanded = stack.pop()
+            uid = current.unique_id
+            if expanded:
+                on_path.discard(uid)
+                self._finish(current, done, changed, on_path)
+                done.add(uid)
+                continue
+            if uid in done or uid in on_path:
+                continue
+            if (
+                not verify
+                and uid in values
+                and self._nodes.get(uid) is current
+            ):
+                done.add(uid)
+                continue
+            on_path.add(uid)
+            stack.append((current, True))
+            if not self._is_leaf(current):
+                for child in reversed(current.children):
+                    cid = child.unique_id
+                    if cid not in done and cid not in on_path:
+                        stack.append((child, False))
+        return values[node.unique_id]
+
+    def _finish(self, node, done, changed, on_path) -> None:
+        uid = node.unique_id
+        sig = self._signature(node)
+        stale = (
+            uid not in self._values
+            or self._nodes.get(uid) is not node
+            or self._signatures.get(uid) != sig
+        )
+        if not stale and not self._is_leaf(node):
+            stale = any(c.unique_id in changed for c in node.children)
+        if not stale:
+            return
+        child_probs = []
+        if not self._is_leaf(node):
+            for child in node.children:
+                cid = child.unique_id
+                if cid in done or (cid not in on_path and cid in self._values):
+                    child_probs.append(self._values[cid])
+                else:
+                    # Cycle back to an ancestor: fall back to its last value.
+                    prob = getattr(child, "probability", None)
+                    child_probs.append(prob if prob is not None else 0.0)
+        prob = self._combine(node, child_probs)
+        if self._values.get(uid) != prob or self._nodes.get(uid) is not node:
+            changed.add(uid)
+        self._values[uid] = prob
+        self._signatures[uid] = sig
+        self._nodes[uid] = node
+        node.probability = prob
+        node.display_label = f"P={prob:.2e}"
+
+    def evaluate_all(self, top_events, verify: bool = True) -> Dict[int, float]:
+        """Evaluate ``top_events`` sharing cached subtrees between them."""
+        return {te.unique_id: self.evaluate(te, verify=verify) for te in top_events}
+
+    # ------------------------------------------------------------------
+    def invalidate(self, node) -> None:
+        """Drop cached results for ``node`` and all of its ancestors."""
+        stack = [node]
+        seen: set[int] = set()
+        while stack:
+            current = stack.pop()
+            uid = current.unique_id
+            if uid in seen:
+                continue
+            seen.add(uid)
+            self._values.pop(uid, None)
+            self._signatures.pop(uid, None)
+            self._nodes.pop(uid, None)
+            stack.extend(getattr(current, "parents", []))
+
+    def cached(self, node) -> float | None:
+        """Return the cached probability of ``node`` or ``None``."""
+        if self._nodes.get(node.unique_id) is not node:
+            return None
+        return self._values.get(node.unique_id)
+
+    def clear(self) -> None:
+        """Forget all cached results."""
+        self._values.clear()
+        self._signatures.clear()
+        self._nodes.clear()
@@ -0,0 +1,225 @@
+# Author: Miguel Marina <karel.capek.robotics@gmail.com>
+# SPDX-License-Identifier: GPL-3.0-or-later
+#
+# Copyright (C) 2025 Capek System Safety & Robotic Solutions
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+"""Headless BOM FIT calculation over several mission profiles.
+
+:func:`fit_matrix` evaluates a bill of materials against a list of
+:class:`~analysis.models.MissionProfile` objects in one call.  Components
+are grouped by ``comp_type`` and each reliability model is split into its
+attribute dependent ``base`` rate and the profile dependent ``stress``
+factor: bases are computed once per distinct attribute set of a group and
+stresses once per profile, so the component x profile matrix costs one
+multiplication per cell instead of one formula call.  Models without that
+split fall back to their ``formula`` evaluated once per distinct attribute
+set and profile.
+
+With NumPy installed the matrix is an array and each component group is
+filled with one outer product; without it the same cells are computed with
+nested lists.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, replace
+from typing import Dict, Hashable, List, Optional, Sequence
+
+from analysis.models import (
+    PASSIVE_QUAL_FACTORS,
+    RELIABILITY_MODELS,
+    MissionProfile,
+    ReliabilityComponent,
+    component_fit_map,
+)
+
+try:  # optional dependency
+    import numpy as np
+except Exception:  # pragma: no cover - NumPy may not be installed
+    np = None
+
+
+@dataclass
+class FitMatrix:
+    """FIT per unit of each component (rows) under each profile (columns).
+
+    ``rows`` is a two dimensional NumPy array, or a list of lists when NumPy
+    is not installed.
+    """
+
+    components: List[ReliabilityComponent]
+    profiles: List[Optional[MissionProfile]]
+    rows: "np.ndarray | List[List[float]]"
+
+    def column(self, index: int) -> List[float]:
+        """Return the FIT of every component under profile *index*."""
+        if isinstance(self.rows, list):
+            return [row[index] for row in self.rows]
+        return self.rows[:, index].tolist()
+
+    def fit_map(self, index: int) -> Dict[str, float]:
+        """Return ``component name -> FIT`` for profile *index*.
+
+        The mapping matches :func:`analysis.models.component_fit_map`:
+        quantities are applied and sub-BOM children contribute their stored
+        FIT.  It can be passed to ``compute_fmeda_metrics(fit_map=...)``.
+        """
+        mapping: Dict[str, float] = {}
+        for comp, fit in zip(self.components, self.column(index)):
+            mapping[comp.name] = mapping.get(comp.name, 0.0) + fit * comp.quantity
+            for bom in comp.sub_boms:
+                for name, fit in component_fit_map(bom).items():
+                    mapping[name] = mapping.get(name, 0.0) + fit * comp.quantity
+        return mapping
+
+    def totals(self) -> List[float]:
+        """Return the BOM total FIT under each profile."""
+        if not isinstance(self.rows, list):
+            quantities = np.array([comp.quantity for comp in self.components], dtype=float)
+            return (quantities @ self.rows).tolist()
+        totals = [0.0] * len(self.profiles)
+        for comp, row in zip(self.components, self.rows):
+            for j, fit in enumerate(row):
+                totals[j] += fit * comp.quantity
+        return totals
+
+    def apply(self, index: int) -> None:
+        """Store the FIT of profile *index* on the components."""
+        for comp, fit in zip(self.components, self.column(index)):
+            comp.fit = fit
+
+    def metrics(self, entries, sg_to_asil, sg_targets=None, get_node=lambda x: x) -> List[dict]:
+        """Return FMEDA metrics of *entries* for every profile."""
+        from analysis.fmeda_utils import compute_fmeda_metrics
+
+        return [
+            compute_fmeda_metrics(
+                entries,
+                self.components,
+                sg_to_asil,
+                sg_targets=sg_targets,
+                get_node=get_node,
+                fit_map=self.fit_map(j),
+            )
+            for j in range(len(self.profiles))
+        ]
+
+
+def _attributes_key(attributes: dict) -> Optional[Hashable]:
+    """Return a hashable key for *attributes* or ``None`` if impossible."""
+    try:
+        key = tuple(sorted(attributes.items()))
+        hash(key)
+    except TypeError:
+        return None
+    return key
+
+
+def _fill(rows, indices: List[int], rates: List[float], factors: List[float]) -> None:
+    """Set ``rows[i] = rate * factors`` for each of *indices* and *rates*."""
+    if isinstance(rows, list):
+        for index, rate in zip(indices, rates):
+            rows[index] = [rate * f for f in factors]
+        return
+    rows[indices] = np.outer(rates, factors)
+
+
+def _evaluate(group, info, profiles, rows) -> None:
+    """Fill ``rows`` for the components of one model."""
+    indices = [index for index, _comp, _qf in group]
+    base = info.get("base")
+    stress = info.get("stress")
+    if base is not None and stress is not None:
+        factors = [0.0 if mp is None else stress(mp) * mp.tau for mp in profiles]
+        cache: Dict[Hashable, float] = {}
+        rates = []
+        for _index, comp, qf in group:
+            key = _attributes_key(comp.attributes)
+            value = cache.get(key) if key is not None else None
+            if value is None:
+                value = base(comp.attributes)
+                if key is not None:
+                    cache[key] = value
+            rates.append(value * qf)
+        _fill(rows, indices, rates, factors)
+        return
+    formula = info["formula"]
+    cache_rows: Dict[Hashable, List[float]] = {}
+    values_per_row = []
+    for _index, comp, _qf in group:
+        key = _attributes_key(comp.attributes)
+        values = cache_rows.get(key) if key is not None else None
+        if values is None:
+            values = [
+                0.0 if mp is None else formula(comp.attributes, mp) * mp.tau
+                for mp in profiles
+            ]
+            if key is not None:
+                cache_rows[key] = values
+        values_per_row.append(values)
+    qfs = [qf for _index, _comp, qf in group]
+    if isinstance(rows, list):
+        for index, values, qf in zip(indices, values_per_row, qfs):
+            rows[index] = [v * qf for v in values]
+        return
+    rows[indices] = np.array(values_per_row, dtype=float) * np.array(qfs)[:, None]
+
+
+def fit_matrix(
+    components: Sequence[ReliabilityComponent],
+    profiles: Sequence[Optional[MissionProfile]],
+    standard: str,
+) -> FitMatrix:
+    """Return the FIT of *components* under each of *profiles*.
+
+    Components referencing ``sub_boms`` take the aggregated stored FIT of
+    those BOMs under every profile.  Components without a model for
+    *standard*, and any component under a ``None`` profile, get ``0.0``.
+    Passive qualification factors are applied as in the reliability window.
+    """
+    components = list(components)
+    profiles = list(profiles)
+    models = RELIABILITY_MODELS.get(standard, {})
+    if np is None:
+        rows = [[0.0] * len(profiles) for _ in components]
+    else:
+        rows = np.zeros((len(components), len(profiles)))
+    groups: Dict[str, list] = {}
+    for index, comp in enumerate(components):
+        if comp.sub_boms:
+            total = sum(sum(component_fit_map(bom).values()) for bom in comp.sub_boms)
+            rows[index] = [total] * len(profiles) if np is None else total
+            continue
+        if comp.comp_type not in models:
+            continue
+        qf = PASSIVE_QUAL_FACTORS.get(comp.qualification, 1.0) if comp.is_passive else 1.0
+        groups.setdefault(comp.comp_type, []).append((index, comp, qf))
+    for comp_type, group in groups.items():
+        _evaluate(group, models[comp_type], profiles, rows)
+    return FitMatrix(components, profiles, rows)
+
+
+def temperature_corners(profile: MissionProfile, temperatures: Sequence[float]) -> List[MissionProfile]:
+    """Return copies of *profile* with board and ambient maxima at each temperature."""
+    return [
+        replace(
+            profile,
+            name=f"{profile.name} @ {temp:g}C",
+            board_temp_max=temp,
+            ambient_temp_max=temp,
+        )
+        for temp in temperatures
+    ]
@@ -19,7 +19,7 @@
 # Author: Miguel Marina <karel.capek.robotics@gmail.com>
 from analysis.models import ASIL_ORDER, ASIL_TARGETS, component_fit_map
 from pathlib import Path
-from config import load_diagram_rules
+from config import config_registry
 
 # Node types treated as gates when determining component names
 _CONFIG_PATH = (
@@ -28,20 +28,25 @@ _CONFIG_PATH = (
     / "rules"
     / "diagram_rules.json"
 )
-_CONFIG = load_diagram_rules(_CONFIG_PATH)
+_CONFIG = config_registry.diagram_rules(_CONFIG_PATH)
 GATE_NODE_TYPES = set(_CONFIG.get("gate_node_types", []))
 
 
 def reload_config() -> None:
     """Reload gate node types from configuration."""
     global _CONFIG, GATE_NODE_TYPES
-    _CONFIG = load_diagram_rules(_CONFIG_PATH)
+    _CONFIG = config_registry.diagram_rules(_CONFIG_PATH)
     GATE_NODE_TYPES = set(_CONFIG.get("gate_node_types", []))
 
 
-def _aggregate_goal_metrics(entries, components, sg_to_asil, sg_targets=None, get_node=lambda x: x):
+config_registry.subscribe(reload_config)
+
+
+def _aggregate_goal_metrics(
+    entries, components, sg_to_asil, sg_targets=None, get_node=lambda x: x, fit_map=None
+):
     """Return metrics per safety goal."""
-    comp_fit = component_fit_map(components)
+    comp_fit = fit_map if fit_map is not None else component_fit_map(components)
     goals = {}
     for be in entries:
         src = get_node(be)
@@ -100,9 +105,18 @@ def _aggregate_goal_metrics(entries, components, sg_to_asil, sg_targets=None, ge
     return result
 
 
-def compute_fmeda_metrics(entries, components, sg_to_asil, sg_targets=None, get_node=lambda x: x):
-    """Return aggregate and per-goal FMEDA metrics."""
-    goal_metrics = _aggregate_goal_metrics(entries, components, sg_to_asil, sg_targets, get_node)
+def compute_fmeda_metrics(
+    entries, components, sg_to_asil, sg_targets=None, get_node=lambda x: x, fit_map=None
+):
+    """Return aggregate and per-goal FMEDA metrics.
+
+    ``fit_map`` optionally supplies the ``component name -> FIT`` mapping,
+    e.g. one profile column of :class:`analysis.fit_engine.FitMatrix`,
+    instead of deriving it from the stored FIT of *components*.
+    """
+    goal_metrics = _aggregate_goal_metrics(
+        entries, components, sg_to_asil, sg_targets, get_node, fit_map
+    )
 
     total = sum(m["total"] for m in goal_metrics.values())
     spf = sum(m["spfm_raw"] for m in goal_metrics.values())
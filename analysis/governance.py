@@ -22,7 +22,8 @@ from dataclasses import dataclass, field
 from typing import Any, Iterator, List, Tuple
 
 from pathlib import Path
-from config import load_diagram_rules, load_json_with_comments
+from config import config_registry
+from . import requirement_rule_generator
 from .requirement_rule_generator import generate_patterns_from_config
 
 import networkx as nx
@@ -34,7 +35,7 @@ _CONFIG_PATH = (
     / "rules"
     / "diagram_rules.json"
 )
-_CONFIG = load_diagram_rules(_CONFIG_PATH)
+_CONFIG = config_registry.diagram_rules(_CONFIG_PATH)
 
 # Element and relationship types associated with AI & safety lifecycle nodes.
 _AI_NODES = set(_CONFIG.get("ai_nodes", []))
@@ -77,31 +78,51 @@ _PATTERN_PATH = (
     / "patterns"
     / "requirement_patterns.json"
 )
-try:
-    _PATTERN_DEFS = load_json_with_comments(_PATTERN_PATH)
-    # ``requirement_patterns.json`` is optional and may contain an object when
-    # no custom patterns are defined.  Ensure we always work with a list so
-    # calls to ``extend`` below succeed.
-    if not isinstance(_PATTERN_DEFS, list):
-        _PATTERN_DEFS = []
-except FileNotFoundError:  # pragma: no cover - optional file
-    _PATTERN_DEFS = []
-
-# Automatically derive requirement patterns from the diagram rules so that any
-# configuration updates are reflected without manual pattern maintenance.
-_PATTERN_DEFS.extend(generate_patterns_from_config(_CONFIG))
-
 _TRIGGER_RE = re.compile(r"[^:]+:\s*(.*?)\s*--\[(.*?)\]-->\s*(.*)")
-_PATTERN_MAP: dict[tuple[str, str, str], list[dict[str, str]]] = {}
-for pat in _PATTERN_DEFS:
-    trig = pat.get("Trigger", "")
-    tmpl = pat.get("Template", "")
-    m = _TRIGGER_RE.fullmatch(trig)
-    if not m:
-        continue
-    src_t, label, dst_t = [g.strip().lower() for g in m.groups()]
-    key = (src_t, label.lower(), dst_t)
-    _PATTERN_MAP.setdefault(key, []).append(pat)
+
+
+def _build_pattern_defs() -> list[dict]:
+    """Return pattern definitions for the current files.
+
+    ``requirement_patterns.json`` is optional and may contain an object when no
+    custom patterns are defined; patterns derived automatically from the
+    diagram rules are appended so configuration updates are reflected without
+    manual pattern maintenance.
+    """
+    defs = list(config_registry.requirement_patterns(_PATTERN_PATH))
+    defs.extend(generate_patterns_from_config(config_registry.diagram_rules(_CONFIG_PATH)))
+    return defs
+
+
+def _pattern_map(defs: list[dict]) -> dict[tuple[str, str, str], list[dict[str, str]]]:
+    """Return *defs* grouped by ``(source, label, target)`` of their trigger."""
+    pattern_map: dict[tuple[str, str, str], list[dict[str, str]]] = {}
+    for pat in defs:
+        trig = pat.get("Trigger", "")
+        m = _TRIGGER_RE.fullmatch(trig)
+        if not m:
+            continue
+        src_t, label, dst_t = [g.strip().lower() for g in m.groups()]
+        key = (src_t, label.lower(), dst_t)
+        pattern_map.setdefault(key, []).append(pat)
+    return pattern_map
+
+
+def _load_patterns() -> tuple[list[dict], dict[tuple[str, str, str], list[dict[str, str]]]]:
+    """Return the pattern definitions and lookup map.
+
+    The definitions are cached across calls and launches; grouping them is
+    cheap and done in memory.
+    """
+    defs = config_registry.compile(
+        "governance_patterns",
+        (_CONFIG_PATH, _PATTERN_PATH, requirement_rule_generator.__file__, __file__),
+        _build_pattern_defs,
+    )
+    return defs, _pattern_map(defs)
+
+
+_PATTERN_DEFS, _PATTERN_MAP = _load_patterns()
 
 
 def _apply_pattern(
@@ -190,34 +211,17 @@ def _select_pattern(
 def reload_config() -> None:
     """Reload governance-related configuration."""
     global _CONFIG, _AI_NODES, _AI_RELATIONS, _REQUIREMENT_RULES, _NODE_ROLES, _PATTERN_DEFS, _PATTERN_MAP
-    _CONFIG = load_diagram_rules(_CONFIG_PATH)
+    _CONFIG = config_registry.diagram_rules(_CONFIG_PATH)
     _AI_NODES = set(_CONFIG.get("ai_nodes", []))
     _AI_RELATIONS = set(_CONFIG.get("ai_relations", []))
     _REQUIREMENT_RULES = _CONFIG.get(
         "requirement_rules", _CONFIG.get("relationship_rules", {})
     )
     _NODE_ROLES = _CONFIG.get("node_roles", {})
+    _PATTERN_DEFS, _PATTERN_MAP = _load_patterns()
 
-    try:
-        _PATTERN_DEFS = load_json_with_comments(_PATTERN_PATH)
-        if not isinstance(_PATTERN_DEFS, list):
-            _PATTERN_DEFS = []
-    except FileNotFoundError:  # pragma: no cover - optional file
-        _PATTERN_DEFS = []
-
-    # Regenerate patterns derived from the current diagram rule configuration
-    _PATTERN_DEFS.extend(generate_patterns_from_config(_CONFIG))
-    _PATTERN_MAP = {}
-    for pat in _PATTERN_DEFS:
-        trig = pat.get("Trigger", "")
-        tmpl = pat.get("Template", "")
-        m = _TRIGGER_RE.fullmatch(trig)
-        if not m:
-            continue
-        src_t, label, dst_t = [g.strip().lower() for g in m.groups()]
-        key = (src_t, label.lower(), dst_t)
-        _PATTERN_MAP.setdefault(key, []).append(pat)
 
+config_registry.subscribe(reload_config)
 
 @dataclass
 class GeneratedRequirement:
@@ -20,6 +20,7 @@
 from dataclasses import dataclass, field
 import datetime
 from typing import Optional
+from analysis.traceability import TraceDict
 from analysis.user_config import CURRENT_USER_NAME, CURRENT_USER_EMAIL
 
 
@@ -435,146 +436,124 @@ COMPONENT_ATTR_TEMPLATES = {
     "switch": {"cycles": "", "current_A": "", "voltage_V": ""},
 }
 
+def _stress(mp) -> float:
+    """Temperature and duty-cycle acceleration shared by every model."""
+    return (1 + max(mp.board_temp_max, mp.ambient_temp_max) / 100.0) * mp.duty_cycle
+
+
+def _model(text: str, base) -> dict:
+    """Return a reliability model entry.
+
+    ``base`` maps component attributes to the attribute dependent part of the
+    failure rate and ``stress`` maps a :class:`MissionProfile` to its
+    acceleration factor.  ``formula`` multiplies both so callers evaluating a
+    single component keep working, while :mod:`analysis.fit_engine` evaluates
+    the two factors separately over whole BOMs and profile sweeps.
+    """
+    return {
+        "text": text,
+        "base": base,
+        "stress": _stress,
+        "formula": lambda a, mp: base(a) * _stress(mp),
+    }
+
+
 RELIABILITY_MODELS = {
     "IEC 62380": {
-        "capacitor": {
-            "text": "Base*(1+T/100)*Duty*(1+V/100)",
-            "formula": lambda a, mp: (0.02 if a.get("dielectric", "ceramic") == "ceramic" else 0.04)
-            * (1 + max(mp.board_temp_max, mp.ambient_temp_max) / 100.0)
-            * (1 + safe_float(a.get("voltage_V", 0)) / 100.0)
-            * mp.duty_cycle,
-        },
-        "resistor": {
-            "text": "0.005*(1+T/100)*Duty*(1+P/10)",
-            "formula": lambda a, mp: 0.005
-            * (1 + max(mp.board_temp_max, mp.ambient_temp_max) / 100.0)
-            * (1 + safe_float(a.get("power_W", 0)) / 10.0)
-            * mp.duty_cycle,
-        },
-        "inductor": {
-            "text": "0.004*(1+T/100)*Duty*(1+I/10)",
-            "formula": lambda a, mp: 0.004
-            * (1 + max(mp.board_temp_max, mp.ambient_temp_max) / 100.0)
-            * (1 + safe_float(a.get("current_A", 0)) / 10.0)
-            * mp.duty_cycle,
-        },
-        "diode": {
-            "text": "0.008*(1+T/100)*Duty*(1+VR/100)",
-            "formula": lambda a, mp: 0.008
-            * (1 + max(mp.board_temp_max, mp.ambient_temp_max) / 100.0)
-            * (1 + safe_float(a.get("reverse_V", 0)) / 100.0)
-            * mp.duty_cycle,
-        },
-        "transistor": {
-            "text": "Base*(1+T/100)*Duty*(1+I/10) (base=0.01 BJT, 0.012 MOSFET)",
-            "formula": lambda a, mp: (0.01 if a.get("transistor_type", "BJT") == "BJT" else 0.012)
-            * (1 + max(mp.board_temp_max, mp.ambient_temp_max) / 100.0)
-            * (1 + safe_float(a.get("current_A", 0)) / 10.0)
-            * mp.duty_cycle,
-        },
-        "ic": {
-            "text": "Base*(1+T/100)*Duty*(1+pins/1000)*(1+trans/1e6) (base=0.04 analog, 0.03 digital, 0.05 MCU)",
-            "formula": lambda a, mp: (0.04 if a.get("type", "digital") == "analog" else 0.05 if a.get("type") == "mcu" else 0.03)
-            * (1 + max(mp.board_temp_max, mp.ambient_temp_max) / 100.0)
-            * mp.duty_cycle
+        "capacitor": _model(
+            "Base*(1+T/100)*Duty*(1+V/100)",
+            lambda a: (0.02 if a.get("dielectric", "ceramic") == "ceramic" else 0.04)
+            * (1 + safe_float(a.get("voltage_V", 0)) / 100.0),
+        ),
+        "resistor": _model(
+            "0.005*(1+T/100)*Duty*(1+P/10)",
+            lambda a: 0.005 * (1 + safe_float(a.get("power_W", 0)) / 10.0),
+        ),
+        "inductor": _model(
+            "0.004*(1+T/100)*Duty*(1+I/10)",
+            lambda a: 0.004 * (1 + safe_float(a.get("current_A", 0)) / 10.0),
+        ),
+        "diode": _model(
+            "0.008*(1+T/100)*Duty*(1+VR/100)",
+            lambda a: 0.008 * (1 + safe_float(a.get("reverse_V", 0)) / 100.0),
+        ),
+        "transistor": _model(
+            "Base*(1+T/100)*Duty*(1+I/10) (base=0.01 BJT, 0.012 MOSFET)",
+            lambda a: (0.01 if a.get("transistor_type", "BJT") == "BJT" else 0.012)
+            * (1 + safe_float(a.get("current_A", 0)) / 10.0),
+        ),
+        "ic": _model(
+            "Base*(1+T/100)*Duty*(1+pins/1000)*(1+trans/1e6) (base=0.04 analog, 0.03 digital, 0.05 MCU)",
+            lambda a: (0.04 if a.get("type", "digital") == "analog" else 0.05 if a.get("type") == "mcu" else 0.03)
             * (1 + safe_float(a.get("pins", 0)) / 1000.0)
             * (1 + safe_float(a.get("transistors", 0)) / 1_000_000.0),
-        },
-        "connector": {
-            "text": "0.002*(1+T/100)*Duty*(1+pins/100)",
-            "formula": lambda a, mp: 0.002
-            * (1 + max(mp.board_temp_max, mp.ambient_temp_max) / 100.0)
-            * (1 + safe_float(a.get("pins", 0)) / 100.0)
-            * mp.duty_cycle,
-        },
-        "relay": {
-            "text": "0.03*(1+T/100)*Duty*(cycles/1e6)*(1+I/10)",
-            "formula": lambda a, mp: 0.03
-            * (1 + max(mp.board_temp_max, mp.ambient_temp_max) / 100.0)
-            * mp.duty_cycle
+        ),
+        "connector": _model(
+            "0.002*(1+T/100)*Duty*(1+pins/100)",
+            lambda a: 0.002 * (1 + safe_float(a.get("pins", 0)) / 100.0),
+        ),
+        "relay": _model(
+            "0.03*(1+T/100)*Duty*(cycles/1e6)*(1+I/10)",
+            lambda a: 0.03
             * (safe_float(a.get("cycles", 1e6)) / 1e6)
             * (1 + safe_float(a.get("current_A", 0)) / 10.0),
-        },
-        "switch": {
-            "text": "0.02*(1+T/100)*Duty*(cycles/1e6)*(1+I/10)",
-            "formula": lambda a, mp: 0.02
-            * (1 + max(mp.board_temp_max, mp.ambient_temp_max) / 100.0)
-            * mp.duty_cycle
+        ),
+        "switch": _model(
+            "0.02*(1+T/100)*Duty*(cycles/1e6)*(1+I/10)",
+            lambda a: 0.02
             * (safe_float(a.get("cycles", 1e6)) / 1e6)
             * (1 + safe_float(a.get("current_A", 0)) / 10.0),
-        },
+        ),
     },
     "SN 29500": {
-        "capacitor": {
-            "text": "0.03*(1+T/100)*Duty*(1+V/100)",
-            "formula": lambda a, mp: 0.03
-            * (1 + max(mp.board_temp_max, mp.ambient_temp_max) / 100.0)
-            * (1 + safe_float(a.get("voltage_V", 0)) / 100.0)
-            * mp.duty_cycle,
-        },
-        "resistor": {
-            "text": "0.006*(1+T/100)*Duty*(1+P/10)",
-            "formula": lambda a, mp: 0.006
-            * (1 + max(mp.board_temp_max, mp.ambient_temp_max) / 100.0)
-            * (1 + safe_float(a.get("power_W", 0)) / 10.0)
-            * mp.duty_cycle,
-        },
-        "inductor": {
-            "text": "0.005*(1+T/100)*Duty*(1+I/10)",
-            "formula": lambda a, mp: 0.005
-            * (1 + max(mp.board_temp_max, mp.ambient_temp_max) / 100.0)
-            * (1 + safe_float(a.get("current_A", 0)) / 10.0)
-            * mp.duty_cycle,
-        },
-        "diode": {
-            "text": "0.009*(1+T/100)*Duty*(1+VR/100)",
-            "formula": lambda a, mp: 0.009
-            * (1 + max(mp.board_temp_max, mp.ambient_temp_max) / 100.0)
-            * (1 + safe_float(a.get("reverse_V", 0)) / 100.0)
-            * mp.duty_cycle,
-        },
-        "transistor": {
-            "text": "Base*(1+T/100)*Duty*(1+I/10) (base=0.012 BJT, 0.014 MOSFET)",
-            "formula": lambda a, mp: (0.012 if a.get("transistor_type", "BJT") == "BJT" else 0.014)
-            * (1 + max(mp.board_temp_max, mp.ambient_temp_max) / 100.0)
-            * (1 + safe_float(a.get("current_A", 0)) / 10.0)
-            * mp.duty_cycle,
-        },
-        "ic": {
-            "text": "Base*(1+T/100)*Duty*(1+pins/1000)*(1+trans/1e6) (base=0.05 analog, 0.04 digital, 0.06 MCU)",
-            "formula": lambda a, mp: (0.05 if a.get("type", "digital") == "analog" else 0.06 if a.get("type") == "mcu" else 0.04)
-            * (1 + max(mp.board_temp_max, mp.ambient_temp_max) / 100.0)
-            * mp.duty_cycle
+        "capacitor": _model(
+            "0.03*(1+T/100)*Duty*(1+V/100)",
+            lambda a: 0.03 * (1 + safe_float(a.get("voltage_V", 0)) / 100.0),
+        ),
+        "resistor": _model(
+            "0.006*(1+T/100)*Duty*(1+P/10)",
+            lambda a: 0.006 * (1 + safe_float(a.get("power_W", 0)) / 10.0),
+        ),
+        "inductor": _model(
+            "0.005*(1+T/100)*Duty*(1+I/10)",
+            lambda a: 0.005 * (1 + safe_float(a.get("current_A", 0)) / 10.0),
+        ),
+        "diode": _model(
+            "0.009*(1+T/100)*Duty*(1+VR/100)",
+            lambda a: 0.009 * (1 + safe_float(a.get("reverse_V", 0)) / 100.0),
+        ),
+        "transistor": _model(
+            "Base*(1+T/100)*Duty*(1+I/10) (base=0.012 BJT, 0.014 MOSFET)",
+            lambda a: (0.012 if a.get("transistor_type", "BJT") == "BJT" else 0.014)
+            * (1 + safe_float(a.get("current_A", 0)) / 10.0),
+        ),
+        "ic": _model(
+            "Base*(1+T/100)*Duty*(1+pins/1000)*(1+trans/1e6) (base=0.05 analog, 0.04 digital, 0.06 MCU)",
+            lambda a: (0.05 if a.get("type", "digital") == "analog" else 0.06 if a.get("type") == "mcu" else 0.04)
             * (1 + safe_float(a.get("pins", 0)) / 1000.0)
             * (1 + safe_float(a.get("transistors", 0)) / 1_000_000.0),
-        },
-        "connector": {
-            "text": "0.003*(1+T/100)*Duty*(1+pins/100)",
-            "formula": lambda a, mp: 0.003
-            * (1 + max(mp.board_temp_max, mp.ambient_temp_max) / 100.0)
-            * (1 + safe_float(a.get("pins", 0)) / 100.0)
-            * mp.duty_cycle,
-        },
-        "relay": {
-            "text": "0.035*(1+T/100)*Duty*(cycles/1e6)*(1+I/10)",
-            "formula": lambda a, mp: 0.035
-            * (1 + max(mp.board_temp_max, mp.ambient_temp_max) / 100.0)
-            * mp.duty_cycle
+        ),
+        "connector": _model(
+            "0.003*(1+T/100)*Duty*(1+pins/100)",
+            lambda a: 0.003 * (1 + safe_float(a.get("pins", 0)) / 100.0),
+        ),
+        "relay": _model(
+            "0.035*(1+T/100)*Duty*(cycles/1e6)*(1+I/10)",
+            lambda a: 0.035
             * (safe_float(a.get("cycles", 1e6)) / 1e6)
             * (1 + safe_float(a.get("current_A", 0)) / 10.0),
-        },
-        "switch": {
-            "text": "0.025*(1+T/100)*Duty*(cycles/1e6)*(1+I/10)",
-            "formula": lambda a, mp: 0.025
-            * (1 + max(mp.board_temp_max, mp.ambient_temp_max) / 100.0)
-            * mp.duty_cycle
+        ),
+        "switch": _model(
+            "0.025*(1+T/100)*Duty*(cycles/1e6)*(1+I/10)",
+            lambda a: 0.025
             * (safe_float(a.get("cycles", 1e6)) / 1e6)
             * (1 + safe_float(a.get("current_A", 0)) / 10.0),
-        },
+        ),
     },
 }
 
-global_requirements = {}
+# Requirement registry; mutations invalidate the traceability index.
+global_requirements = TraceDict()
 
 
 def ensure_requirement_defaults(req: dict) -> dict:
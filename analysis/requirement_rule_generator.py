@@ -39,7 +39,8 @@ The main entry point :func:`regenerate_requirement_patterns` reloads the
 ``config/rules/diagram_rules.json`` file, regenerates all patterns and writes
 the result to ``config/patterns/requirement_patterns.json``.  This helper is
 invoked by the application whenever the model changes so requirement patterns
-stay in sync with diagram rule updates and governance diagram creation.
+stay in sync with diagram rule updates and governance diagram creation; it
+only does work when the rules actually changed.
 """
 
 
@@ -48,9 +49,13 @@ import json
 import os
 import re
 import sys
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
 from pathlib import Path
 from typing import Any, Dict, Iterable, List, Tuple
 
+from config import config_registry
+
 # ============================================================================
 # JSON loader that accepts //, /* */, single quotes and trailing commas
 # ============================================================================
@@ -638,34 +643,96 @@ def generate_patterns_from_config(rules: dict) -> List[dict]:
     return generate_patterns_from_rules(rules)
 
 
+def _pattern_paths(
+    diagram_rules_path: str | Path | None, out_path: str | Path | None
+) -> Tuple[Path, Path]:
+    base = Path(__file__).resolve().parents[1] / "config"
+    return (
+        Path(diagram_rules_path or base / "rules" / "diagram_rules.json"),
+        Path(out_path or base / "patterns" / "requirement_patterns.json"),
+    )
+
+
+def _write_if_changed(path: Path, text: str) -> bool:
+    """Atomically replace *path* with *text* unless it already holds it."""
+    try:
+        if path.read_text(encoding="utf-8") == text:
+            return False
+    except OSError:
+        pass
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    try:
+        tmp.write_text(text, encoding="utf-8")
+        os.replace(tmp, path)
+    finally:
+        if tmp.exists():
+            tmp.unlink()
+    return True
+
+
+def _build_requirement_patterns(diag_path: Path, out_path: Path, pretty: bool) -> bool:
+    rules = clean_and_load_json(str(diag_path), quiet=True)
+    patterns = generate_patterns_from_config(rules)
+    text = json.dumps(patterns, indent=2 if pretty else None, ensure_ascii=False)
+    changed = _write_if_changed(out_path, text)
+    # Hand the generated table to consumers instead of having them parse it.
+    config_registry.compile("requirement_patterns", (out_path,), lambda: patterns)
+    return changed
+
+
+# Serialises builds; background requests run on a single worker thread.
+_build_lock = threading.Lock()
+_queue_lock = threading.Lock()
+_executor: ThreadPoolExecutor | None = None
+_queued: Dict[Path, Future] = {}
+
+
 def regenerate_requirement_patterns(
     diagram_rules_path: str | Path | None = None,
     out_path: str | Path | None = None,
     pretty: bool = True,
-) -> None:
-    """Reload rules and write ``requirement_patterns.json`` to disk."""
-
-    diag_path = Path(
-        diagram_rules_path
-        or Path(__file__).resolve().parents[1]
-        / "config"
-        / "rules"
-        / "diagram_rules.json"
-    )
-    out_path = Path(
-        out_path
-        or Path(__file__).resolve().parents[1]
-        / "config"
-        / "patterns"
-        / "requirement_patterns.json"
-    )
-    rules = clean_and_load_json(str(diag_path), quiet=True)
-    patterns = generate_patterns_from_config(rules)
-    with open(out_path, "w", encoding="utf-8") as f:
-        if pretty:
-            json.dump(patterns, f, indent=2, ensure_ascii=False)
-        else:
-            json.dump(patterns, f, ensure_ascii=False)
+    background: bool = False,
+) -> bool | Future:
+    """Rebuild ``requirement_patterns.json`` if the diagram rules changed.
+
+    Nothing is generated while the rules, this generator and the output
+    file keep the content they had after the previous build; the config
+    registry records their digests across launches.  The output is replaced
+    atomically and only when the generated text differs.  Returns whether
+    the file was rewritten.
+
+    With ``background=True`` the build runs on a worker thread and a
+    :class:`~concurrent.futures.Future` of that result is returned.  Calls
+    made while a build for the same file is still queued share it.
+    """
+    diag_path, out_path = _pattern_paths(diagram_rules_path, out_path)
+    if background:
+        return _schedule(diag_path, out_path, pretty)
+    changed = [False]
+
+    def build() -> bool:
+        changed[0] = _build_requirement_patterns(diag_path, out_path, pretty)
+        return True
+
+    with _build_lock:
+        config_registry.compile(
+            "requirement_patterns_file", (diag_path, out_path, __file__), build
+        )
+    return changed[0]
+
+
+def _schedule(diag_path: Path, out_path: Path, pretty: bool) -> Future:
+    global _executor
+    with _queue_lock:
+        future = _queued.get(out_path)
+        # A build that has not started yet still sees the latest rules.
+        if future is not None and not future.running() and not future.done():
+            return future
+        if _executor is None:
+            _executor = ThreadPoolExecutor(1, thread_name_prefix="requirement-patterns")
+        future = _executor.submit(regenerate_requirement_patterns, diag_path, out_path, pretty)
+        _queued[out_path] = future
+        return future
 
 
 # ============================================================================
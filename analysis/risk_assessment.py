@@ -18,6 +18,8 @@
 
 # Author: Miguel Marina <karel.capek.robotics@gmail.com>
 from .utils import derive_validation_target
+from .fault_tree_bdd import FaultTreeBDD
+from .fault_tree_probability import FaultTreeProbabilityEngine
 
 # Derived Maturity Table: (avg_confidence, avg_robustness) → maturity level
 DERIVED_MATURITY_TABLE = {
@@ -79,9 +81,11 @@ class AutoMLHelper:
       - Discretize a continuous value into a level from 1 to 5.
       - Combine input values based on gate type.
       - Recursively calculate assurance (or maturity/rigor) values.
+      - Calculate fault tree probabilities through a memoised engine.
     """
     def __init__(self):
         self.unique_node_id_counter = 1
+        self.probability_engine = FaultTreeProbabilityEngine()
 
     def aggregate_clone_requirements(self, clone_node):
         """
@@ -518,54 +522,23 @@ class AutoMLHelper:
             )
             return combined
 
-    def calculate_probability_recursive(self, node, visited=None):
+    def calculate_probability_recursive(self, node, verify=True):
         """Return the probability of failure for ``node``.
 
-        The method traverses the fault tree bottom-up, combining child
-        probabilities according to the node's ``gate_type``.  For an AND gate
-        the probabilities are multiplied, while an OR gate uses the
+        The fault tree is evaluated bottom-up, combining child probabilities
+        according to each node's ``gate_type``.  For an AND gate the
+        probabilities are multiplied, while an OR gate uses the
         ``1 - \u220f(1 - p)`` rule.  Basic events simply return their assigned
-        probability.
+        probability.  Evaluation is delegated to :attr:`probability_engine`
+        which visits shared subtrees only once and reuses results from
+        previous calculations for unchanged branches.
         """
-        if visited is None:
-            visited = set()
-
-        # Avoid infinite recursion but allow the same node to be evaluated
-        # along different branches when it appears more than once.
-        if node.unique_id in visited:
-            return node.probability if node.probability is not None else 0.0
-
-        visited.add(node.unique_id)
-        t = node.node_type.upper()
-        if t == "BASIC EVENT":
-            prob = float(node.failure_prob)
-            node.probability = prob
-            node.display_label = f"P={prob:.2e}"
-            return prob
-
-        if not node.children:
-            prob = float(getattr(node, "failure_prob", 0.0))
-            node.probability = prob
-            node.display_label = f"P={prob:.2e}"
-            return prob
-
-        # Use a fresh visited set for each child to ensure probabilities
-        # propagate correctly even when subtrees are shared between gates.
-        child_probs = [self.calculate_probability_recursive(c, visited.copy()) for c in node.children]
-
-        gate = (node.gate_type or "AND").upper()
-        if gate == "AND":
-            prob = 1.0
-            for p in child_probs:
-                prob *= p
-        else:
-            prod = 1.0
-            for p in child_probs:
-                prod *= (1 - p)
-            prob = 1 - prod
-        node.probability = prob
-        node.display_label = f"P={prob:.2e}"
-        return prob
-
+        return self.probability_engine.evaluate(node, verify=verify)
 
+    def calculate_exact_probability(self, node):
+        """Return the exact probability of ``node`` using a BDD.
 
+        Unlike :meth:`calculate_probability_recursive` the result accounts
+        for basic events (or clones) appearing in several branches.
+        """
+        return FaultTreeBDD(node).probability()
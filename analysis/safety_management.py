@@ -203,6 +203,138 @@ class GovernanceModule:
         return mod
 
 
+_PROPAGATION_TYPES = {
+    "propagate": "Propagate",
+    "propagate by review": "Propagate by Review",
+    "propagate by approval": "Propagate by Approval",
+}
+_USAGE_RELATIONS = {"used by", "used after review", "used after approval"}
+_REQUIREMENT_RELATIONS = {"satisfied by", "derived from"}
+
+
+class GovernancePolicy:
+    """Relationship tables compiled from the governance diagrams.
+
+    A policy answers the questions the toolbox used to recompute from every
+    governance diagram on each call: which phases and work products a phase
+    reuses, which work products trace to each other, which analyses use
+    which inputs, which requirement relations are allowed and how results
+    propagate.  It also indexes repository diagrams by ``(diag_type, name)``.
+    Tables are shared between callers and must be treated as read-only.
+    """
+
+    def __init__(self, toolbox: "SafetyManagementToolbox", repo: SysMLRepository) -> None:
+        from analysis.models import REQUIREMENT_WORK_PRODUCTS
+
+        self.reuse: Dict[str, Dict[str, set[str]]] = {}
+        self.trace: Dict[str, set[str]] = {}
+        self.analysis: Dict[str, Dict[str, set[str]]] = {}
+        self.propagation: Dict[tuple[str, str], str] = {}
+        # Requirement relations per governance diagram name so they can be
+        # restricted to the diagrams of the active phase.
+        self.req_relations: Dict[str, Dict[str, Dict[str, set[str]]]] = {}
+        self.by_type_and_name: Dict[tuple[str, str], object] = {}
+        self.by_name: Dict[str, object] = {}
+        self.phase_diagrams: Dict[str, set[str]] = {}
+        for diag in repo.diagrams.values():
+            self.by_type_and_name.setdefault((diag.diag_type, diag.name), diag)
+            self.by_name.setdefault(diag.name, diag)
+            if (
+                diag.diag_type == "Governance Diagram"
+                and "safety-management" in getattr(diag, "tags", [])
+                and diag.phase
+            ):
+                self.phase_diagrams.setdefault(diag.phase, set()).add(diag.name)
+        req_wps = set(REQUIREMENT_WORK_PRODUCTS)
+        for name, diag_id in toolbox.diagrams.items():
+            diag = repo.diagrams.get(diag_id)
+            if diag:
+                self._compile(name, diag, repo.diagram_visible(diag_id), req_wps)
+
+    # ------------------------------------------------------------------
+    def _compile(self, diagram: str, diag, visible: bool, req_wps: set[str]) -> None:
+        objects = getattr(diag, "objects", [])
+        obj_map = {
+            obj.get("obj_id"): (obj.get("obj_type"), obj.get("properties", {}).get("name"))
+            for obj in objects
+        }
+        wp_ids: Dict[object, object] = {}
+        id_to_name: Dict[int, str] = {}
+        for obj in objects:
+            if obj.get("obj_type") != "Work Product":
+                continue
+            name = obj.get("properties", {}).get("name")
+            wp_ids[name] = obj.get("obj_id")
+            if name:
+                id_to_name[obj.get("obj_id")] = name
+        # Propagation links only count between the last work products
+        # carrying each name, mirroring a search that keeps overwriting ids.
+        last_wp = {obj_id: name for name, obj_id in wp_ids.items()}
+
+        for conn in getattr(diag, "connections", []):
+            stereo = (conn.get("stereotype") or conn.get("conn_type") or "").lower()
+            if conn.get("conn_type") == "Re-use":
+                src = obj_map.get(conn.get("src"))
+                dst = obj_map.get(conn.get("dst"))
+                if src and dst and src[0] == "Lifecycle Phase":
+                    data = self.reuse.setdefault(
+                        src[1], {"work_products": set(), "phases": set()}
+                    )
+                    if dst[0] == "Work Product":
+                        data["work_products"].add(dst[1])
+                    elif dst[0] == "Lifecycle Phase":
+                        data["phases"].add(dst[1])
+            if stereo in _PROPAGATION_TYPES:
+                src_name = last_wp.get(conn.get("src"))
+                dst_name = last_wp.get(conn.get("dst"))
+                if src_name is not None and dst_name is not None and src_name != dst_name:
+                    self.propagation.setdefault(
+                        (src_name, dst_name),
+                        conn.get("conn_type") or _PROPAGATION_TYPES[stereo],
+                    )
+            if not visible:
+                continue
+            sname = id_to_name.get(conn.get("src"))
+            tname = id_to_name.get(conn.get("dst"))
+            if not sname or not tname:
+                continue
+            if stereo == "trace":
+                self.trace.setdefault(sname, set()).add(tname)
+                self.trace.setdefault(tname, set()).add(sname)
+            elif stereo in _USAGE_RELATIONS:
+                if sname == "STPA" and tname == "Architecture Diagram":
+                    sname, tname = tname, sname
+                if (
+                    sname in SAFETY_ANALYSIS_WORK_PRODUCTS
+                    and tname in SAFETY_ANALYSIS_WORK_PRODUCTS
+                    and sname != "Mission Profile"
+                    and (sname, tname) not in ALLOWED_ANALYSIS_USAGE
+                ):
+                    # Skip invalid safety analysis links that lack a
+                    # dependency in the metamodel.
+                    continue
+                self.analysis.setdefault(sname, {}).setdefault(stereo, set()).add(tname)
+            elif stereo in _REQUIREMENT_RELATIONS and sname in req_wps and tname in req_wps:
+                rels = self.req_relations.setdefault(diagram, {})
+                rels.setdefault(sname, {}).setdefault(stereo, set()).add(tname)
+
+    # ------------------------------------------------------------------
+    def requirement_relations(self, diagrams) -> Dict[str, Dict[str, set[str]]]:
+        """Return requirement relations declared on the named *diagrams*."""
+        mapping: Dict[str, Dict[str, set[str]]] = {}
+        for name in diagrams:
+            for src, rels in self.req_relations.get(name, {}).items():
+                for rel, targets in rels.items():
+                    mapping.setdefault(src, {}).setdefault(rel, set()).update(targets)
+        return mapping
+
+    def find_diagram(self, name: str, diag_type: Optional[str] = None):
+        """Return the first repository diagram called *name* or ``None``."""
+        if diag_type is None:
+            return self.by_name.get(name)
+        return self.by_type_and_name.get((diag_type, name))
+
+
 @dataclass
 class SafetyManagementToolbox:
     """Collect work products and governance artifacts for safety management.
@@ -231,11 +363,73 @@ class SafetyManagementToolbox:
     # Phases and diagrams that have been frozen due to created work products
     frozen_modules: set[str] = field(default_factory=set)
     frozen_diagrams: set[str] = field(default_factory=set)
+    # Compiled governance tables together with the state they were built from.
+    _policy_cache: Optional[tuple] = field(
+        default=None, init=False, repr=False, compare=False
+    )
 
     def __post_init__(self) -> None:
         global ACTIVE_TOOLBOX
         ACTIVE_TOOLBOX = self
 
+    # ------------------------------------------------------------------
+    def _policy_key(self, repo: SysMLRepository) -> tuple:
+        """Return a fingerprint of everything the compiled policy reads.
+
+        Governance diagrams are compared by identity, their object and
+        connection lists and modification stamp; the rest of the repository
+        only by its diagram revision, so the key stays cheap to compute.
+        """
+        governance = []
+        for name, diag_id in self.diagrams.items():
+            diag = repo.diagrams.get(diag_id)
+            objects = getattr(diag, "objects", None) or []
+            conns = getattr(diag, "connections", None) or []
+            governance.append(
+                (
+                    name,
+                    diag_id,
+                    id(diag),
+                    getattr(diag, "phase", None),
+                    getattr(diag, "modified", None),
+                    id(objects),
+                    len(objects),
+                    id(conns),
+                    len(conns),
+                )
+            )
+        return (
+            id(repo),
+            getattr(repo, "diagram_revision", 0),
+            len(repo.diagrams),
+            repo.active_phase,
+            frozenset(getattr(repo, "reuse_phases", ())),
+            frozenset(getattr(repo, "reuse_products", ())),
+            tuple(governance),
+        )
+
+    def _policy(self) -> GovernancePolicy:
+        """Return the compiled governance policy, rebuilding it when stale."""
+        repo = SysMLRepository.get_instance()
+        key = self._policy_key(repo)
+        cached = self._policy_cache
+        if cached is None or cached[0] != key:
+            cached = self._policy_cache = (key, GovernancePolicy(self, repo))
+        return cached[1]
+
+    def _find_diagram(self, name: str, diag_type: Optional[str] = None):
+        """Return the repository diagram called *name* of *diag_type*."""
+        diag = self._policy().find_diagram(name, diag_type)
+        if diag is not None and (
+            diag.name != name
+            or (diag_type is not None and diag.diag_type != diag_type)
+            or SysMLRepository.get_instance().diagrams.get(diag.diag_id) is not diag
+        ):
+            # Renamed or replaced without a repository revision bump.
+            self._policy_cache = None
+            diag = self._policy().find_diagram(name, diag_type)
+        return diag
+
     # ------------------------------------------------------------------
     def module_frozen(self, name: Optional[str]) -> bool:
         if not name:
@@ -379,35 +573,7 @@ class SafetyManagementToolbox:
     # ------------------------------------------------------------------
     def _reuse_map(self) -> Dict[str, Dict[str, set[str]]]:
         """Return mapping of phase -> reused work products and phases."""
-        repo = SysMLRepository.get_instance()
-        mapping: Dict[str, Dict[str, set[str]]] = {}
-        for diag_id in self.diagrams.values():
-            diag = repo.diagrams.get(diag_id)
-            if not diag:
-                continue
-            obj_map = {
-                obj.get("obj_id"): (
-                    obj.get("obj_type"),
-                    obj.get("properties", {}).get("name"),
-                )
-                for obj in getattr(diag, "objects", [])
-            }
-            for conn in getattr(diag, "connections", []):
-                if conn.get("conn_type") != "Re-use":
-                    continue
-                src = obj_map.get(conn.get("src"))
-                dst = obj_map.get(conn.get("dst"))
-                if not src or not dst:
-                    continue
-                if src[0] != "Lifecycle Phase":
-                    continue
-                phase = src[1]
-                data = mapping.setdefault(phase, {"work_products": set(), "phases": set()})
-                if dst[0] == "Work Product":
-                    data["work_products"].add(dst[1])
-                elif dst[0] == "Lifecycle Phase":
-                    data["phases"].add(dst[1])
-        return mapping
+        return self._policy().reuse
 
     # ------------------------------------------------------------------
     def document_visible(self, analysis: str, name: str) -> bool:
@@ -416,15 +582,7 @@ class SafetyManagementToolbox:
             return True
         phase = self.doc_phases.get(analysis, {}).get(name)
         if phase is None:
-            repo = SysMLRepository.get_instance()
-            diag = next(
-                (
-                    d
-                    for d in repo.diagrams.values()
-                    if d.diag_type == analysis and d.name == name
-                ),
-                None,
-            )
+            diag = self._find_diagram(name, analysis)
             phase = diag.phase if diag else None
         if phase is None:
             return False
@@ -451,15 +609,7 @@ class SafetyManagementToolbox:
             return False
         phase = self.doc_phases.get(analysis, {}).get(name)
         if phase is None:
-            repo = SysMLRepository.get_instance()
-            diag = next(
-                (
-                    d
-                    for d in repo.diagrams.values()
-                    if d.diag_type == analysis and d.name == name
-                ),
-                None,
-            )
+            diag = self._find_diagram(name, analysis)
             phase = diag.phase if diag else None
         if phase is None or phase == self.active_module:
             return False
@@ -566,13 +716,7 @@ class SafetyManagementToolbox:
 
             _collect(mod)
 
-        names.update(
-            d.name
-            for d in repo.diagrams.values()
-            if d.diag_type == "Governance Diagram"
-            and "safety-management" in getattr(d, "tags", [])
-            and d.phase == name
-        )
+        names.update(self._policy().phase_diagrams.get(name, ()))
         return names
 
     # ------------------------------------------------------------------
@@ -613,8 +757,7 @@ class SafetyManagementToolbox:
 
         # Fallback to the repository metadata when the diagram has a lifecycle
         # phase assigned but is not tracked inside the toolbox hierarchy.
-        repo = SysMLRepository.get_instance()
-        diag = next((d for d in repo.diagrams.values() if d.name == diagram), None)
+        diag = self._find_diagram(diagram)
         if not diag:
             return None
         return getattr(diag, "phase", None) or GLOBAL_PHASE
@@ -624,15 +767,7 @@ class SafetyManagementToolbox:
 
         phase = self.doc_phases.get(analysis, {}).get(name)
         if phase is None:
-            repo = SysMLRepository.get_instance()
-            diag = next(
-                (
-                    d
-                    for d in repo.diagrams.values()
-                    if d.diag_type == analysis and d.name == name
-                ),
-                None,
-            )
+            diag = self._find_diagram(name, analysis)
             phase = (diag.phase if diag else None) or (GLOBAL_PHASE if diag else None)
         return phase
 
@@ -777,41 +912,10 @@ class SafetyManagementToolbox:
         the two named work products using one of the propagation relationship
         types. ``None`` is returned when no such link exists."""
 
-        repo = SysMLRepository.get_instance()
         # Consider traces across all governance diagrams regardless of the
         # active module so relationships defined in earlier phases still
         # propagate to later analyses.
-        diag_ids = list(self.diagrams.values())
-        for diag_id in diag_ids:
-            diag = repo.diagrams.get(diag_id)
-            if not diag:
-                continue
-            src_id = dst_id = None
-            for obj in getattr(diag, "objects", []):
-                if obj.get("obj_type") != "Work Product":
-                    continue
-                name = obj.get("properties", {}).get("name")
-                if name == source:
-                    src_id = obj.get("obj_id")
-                elif name == target:
-                    dst_id = obj.get("obj_id")
-            if src_id is None or dst_id is None:
-                continue
-            for c in getattr(diag, "connections", []):
-                stereo = (c.get("stereotype") or c.get("conn_type") or "").lower()
-                if (
-                    c.get("src") == src_id
-                    and c.get("dst") == dst_id
-                    and stereo
-                    in {"propagate", "propagate by review", "propagate by approval"}
-                ):
-                    mapping = {
-                        "propagate": "Propagate",
-                        "propagate by review": "Propagate by Review",
-                        "propagate by approval": "Propagate by Approval",
-                    }
-                    return c.get("conn_type") or mapping[stereo]
-        return None
+        return self._policy().propagation.get((source, target))
 
     # ------------------------------------------------------------------
     def can_propagate(
@@ -841,73 +945,17 @@ class SafetyManagementToolbox:
     # ------------------------------------------------------------------
     def _trace_mapping(self) -> Dict[str, set[str]]:
         """Return mapping of work product name to traceable targets."""
-        repo = SysMLRepository.get_instance()
-        # Use all known governance diagrams; restricting to the active module
-        # prevents cross-phase links (e.g. Prototype traces feeding Series
-        # Development analyses) from being honoured.
-        diag_ids = list(self.diagrams.values())
-        mapping: Dict[str, set[str]] = {}
-        for diag_id in diag_ids:
-            if not repo.diagram_visible(diag_id):
-                continue
-            diag = repo.diagrams.get(diag_id)
-            if not diag:
-                continue
-            id_to_name: Dict[int, str] = {}
-            for obj in getattr(diag, "objects", []):
-                if obj.get("obj_type") == "Work Product":
-                    name = obj.get("properties", {}).get("name")
-                    if name:
-                        id_to_name[obj.get("obj_id")] = name
-            for conn in getattr(diag, "connections", []):
-                stereo = (conn.get("stereotype") or conn.get("conn_type") or "").lower()
-                if stereo == "trace":
-                    sname = id_to_name.get(conn.get("src"))
-                    tname = id_to_name.get(conn.get("dst"))
-                    if sname and tname:
-                        mapping.setdefault(sname, set()).add(tname)
-                        mapping.setdefault(tname, set()).add(sname)
-        return mapping
+        # All known governance diagrams are used; restricting to the active
+        # module prevents cross-phase links (e.g. Prototype traces feeding
+        # Series Development analyses) from being honoured.
+        return self._policy().trace
 
     # ------------------------------------------------------------------
     def _analysis_mapping(self) -> Dict[str, Dict[str, set[str]]]:
         """Return mapping of work product name to analysis targets by relation."""
-        repo = SysMLRepository.get_instance()
-        # Analyse all governance diagrams; limiting to the active module would
-        # hide relationships defined in other lifecycle phases.
-        diag_ids = list(self.diagrams.values())
-        mapping: Dict[str, Dict[str, set[str]]] = {}
-        for diag_id in diag_ids:
-            if not repo.diagram_visible(diag_id):
-                continue
-            diag = repo.diagrams.get(diag_id)
-            if not diag:
-                continue
-            id_to_name: Dict[int, str] = {}
-            for obj in getattr(diag, "objects", []):
-                if obj.get("obj_type") == "Work Product":
-                    name = obj.get("properties", {}).get("name")
-                    if name:
-                        id_to_name[obj.get("obj_id")] = name
-            for conn in getattr(diag, "connections", []):
-                stereo = (conn.get("stereotype") or conn.get("conn_type") or "").lower()
-                if stereo in {"used by", "used after review", "used after approval"}:
-                    sname = id_to_name.get(conn.get("src"))
-                    tname = id_to_name.get(conn.get("dst"))
-                    if sname and tname:
-                        if sname == "STPA" and tname == "Architecture Diagram":
-                            sname, tname = tname, sname
-                        if (
-                            sname in SAFETY_ANALYSIS_WORK_PRODUCTS
-                            and tname in SAFETY_ANALYSIS_WORK_PRODUCTS
-                            and sname != "Mission Profile"
-                            and (sname, tname) not in ALLOWED_ANALYSIS_USAGE
-                        ):
-                            # Skip invalid safety analysis links that lack a
-                            # dependency in the metamodel.
-                            continue
-                        mapping.setdefault(sname, {}).setdefault(stereo, set()).add(tname)
-        return mapping
+        # All governance diagrams are analysed; limiting to the active module
+        # would hide relationships defined in other lifecycle phases.
+        return self._policy().analysis
 
     # ------------------------------------------------------------------
     def _req_relation_mapping(self) -> Dict[str, Dict[str, set[str]]]:
@@ -917,37 +965,10 @@ class SafetyManagementToolbox:
         {targets}`` where *relation* is the connection stereotype used between
         work products such as ``"satisfied by"`` or ``"derived from"``.
         """
-        repo = SysMLRepository.get_instance()
-        diag_ids = self.diagrams.values()
+        names = self.diagrams.keys()
         if self.active_module:
             names = self.diagrams_in_module(self.active_module)
-            diag_ids = [self.diagrams.get(n) for n in names if self.diagrams.get(n)]
-        mapping: Dict[str, Dict[str, set[str]]] = {}
-        for diag_id in diag_ids:
-            if not repo.diagram_visible(diag_id):
-                continue
-            diag = repo.diagrams.get(diag_id)
-            if not diag:
-                continue
-            id_to_name: Dict[int, str] = {}
-            for obj in getattr(diag, "objects", []):
-                if obj.get("obj_type") == "Work Product":
-                    name = obj.get("properties", {}).get("name")
-                    if name:
-                        id_to_name[obj.get("obj_id")] = name
-            for conn in getattr(diag, "connections", []):
-                stereo = (conn.get("stereotype") or conn.get("conn_type") or "").lower()
-                if stereo in {"satisfied by", "derived from"}:
-                    sname = id_to_name.get(conn.get("src"))
-                    tname = id_to_name.get(conn.get("dst"))
-                    from analysis.models import REQUIREMENT_WORK_PRODUCTS
-                    req_wps = set(REQUIREMENT_WORK_PRODUCTS)
-                    if (
-                        sname in req_wps
-                        and tname in req_wps
-                    ):
-                        mapping.setdefault(sname, {}).setdefault(stereo, set()).add(tname)
-        return mapping
+        return self._policy().requirement_relations(names)
 
     # ------------------------------------------------------------------
     def _normalize_work_product(self, name: str) -> str:
@@ -1224,7 +1245,7 @@ class SafetyManagementToolbox:
         # consistent with repository contents.
         self.diagrams[diag.name] = diag.diag_id
         if was_empty:
-            regenerate_requirement_patterns()
+            regenerate_requirement_patterns(background=True)
         return diag.diag_id
 
     def delete_diagram(self, name: str) -> None:
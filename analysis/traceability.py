@@ -0,0 +1,448 @@
+# Author: Miguel Marina <karel.capek.robotics@gmail.com>
+# SPDX-License-Identifier: GPL-3.0-or-later
+#
+# Copyright (C) 2025 Capek System Safety & Robotic Solutions
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+"""Bidirectional requirement traceability index.
+
+Requirements are allocated to fault tree nodes, FMEA entries and SysML
+diagram objects, reach safety goals through the top events above those nodes
+and are covered by reviews.  Asking "where is this requirement allocated?"
+used to walk the whole model for every requirement.  :class:`TraceabilityIndex`
+collects every link in one pass and answers both directions:
+
+* requirement -> allocation names, nodes, diagram objects, goals and reviews,
+* node, diagram object, goal or review -> requirement ids.
+
+The index is rebuilt lazily when its fingerprint changes.  The fingerprint
+covers the SysML repository's diagram revision and a trace revision that the
+model's stores bump themselves: the requirement registry is a
+:class:`TraceDict`, and fault tree links, node requirements and FMEA entries
+are held in :class:`TraceList` objects, so every mutation method of those
+containers calls :func:`note_trace_change`.  Other edits, such as moving or
+renaming elements, leave the index alone: it keeps the linked nodes, FMEA
+entries and top events rather than their names, and names them when asked.
+"""
+
+from __future__ import annotations
+
+from collections import defaultdict
+from typing import Any, Dict, Hashable, Iterable, List, Optional, Set, Tuple
+
+_trace_revision = 0
+
+
+def note_trace_change() -> None:
+    """Record that requirement links or the fault tree structure changed."""
+    global _trace_revision
+    _trace_revision += 1
+
+
+def trace_revision() -> int:
+    """Return the counter :func:`note_trace_change` bumps."""
+    return _trace_revision
+
+
+class TraceList(list):
+    """``list`` calling :func:`note_trace_change` whenever it is mutated.
+
+    Creating a non-empty list counts as a mutation too, so documents built
+    from existing entries are noticed.
+    """
+
+    def __init__(self, items: Iterable[Any] = ()) -> None:
+        super().__init__(items)
+        if self:
+            note_trace_change()
+
+    def __reduce_ex__(self, protocol):
+        return TraceList, (list(self),)
+
+    def append(self, item: Any) -> None:
+        super().append(item)
+        note_trace_change()
+
+    def extend(self, items: Iterable[Any]) -> None:
+        super().extend(items)
+        note_trace_change()
+
+    def insert(self, index: int, item: Any) -> None:
+        super().insert(index, item)
+        note_trace_change()
+
+    def remove(self, item: Any) -> None:
+        super().remove(item)
+        note_trace_change()
+
+    def pop(self, index: int = -1) -> Any:
+        item = super().pop(index)
+        note_trace_change()
+        return item
+
+    def clear(self) -> None:
+        super().clear()
+        note_trace_change()
+
+    def sort(self, *args, **kwargs) -> None:
+        super().sort(*args, **kwargs)
+        note_trace_change()
+
+    def reverse(self) -> None:
+        super().reverse()
+        note_trace_change()
+
+    def __setitem__(self, key, value) -> None:
+        super().__setitem__(key, value)
+        note_trace_change()
+
+    def __delitem__(self, key) -> None:
+        super().__delitem__(key)
+        note_trace_change()
+
+    def __iadd__(self, items: Iterable[Any]) -> "TraceList":
+        self.extend(items)
+        return self
+
+    def __imul__(self, count: int) -> "TraceList":
+        super().__imul__(count)
+        note_trace_change()
+        return self
+
+
+def trace_list(items: Iterable[Any] = ()) -> TraceList:
+    """Return *items* as a :class:`TraceList`, reusing one if given."""
+    return items if isinstance(items, TraceList) else TraceList(items)
+
+
+class TraceDict(dict):
+    """``dict`` calling :func:`note_trace_change` whenever it is mutated."""
+
+    def __reduce_ex__(self, protocol):
+        return TraceDict, (dict(self),)
+
+    def __setitem__(self, key, value) -> None:
+        super().__setitem__(key, value)
+        note_trace_change()
+
+    def __delitem__(self, key) -> None:
+        super().__delitem__(key)
+        note_trace_change()
+
+    def pop(self, *args) -> Any:
+        value = super().pop(*args)
+        note_trace_change()
+        return value
+
+    def popitem(self) -> Tuple[Any, Any]:
+        item = super().popitem()
+        note_trace_change()
+        return item
+
+    def setdefault(self, key, default=None) -> Any:
+        value = super().setdefault(key, default)
+        note_trace_change()
+        return value
+
+    def update(self, *args, **kwargs) -> None:
+        super().update(*args, **kwargs)
+        note_trace_change()
+
+    def clear(self) -> None:
+        super().clear()
+        note_trace_change()
+
+    def __ior__(self, other) -> "TraceDict":
+        self.update(other)
+        return self
+
+
+def _req_id(req: Any) -> Any:
+    return req.get("id") if isinstance(req, dict) else getattr(req, "id", None)
+
+
+def _entry_requirements(entry: Any) -> list:
+    if isinstance(entry, dict):
+        return entry.get("safety_requirements", [])
+    return getattr(entry, "safety_requirements", [])
+
+
+def _goal_name(top_event: Any) -> str:
+    return top_event.safety_goal_description or (
+        top_event.user_name or f"SG {top_event.unique_id}"
+    )
+
+
+def _entry_name(entry: Any) -> str:
+    if isinstance(entry, dict):
+        return entry.get("description") or entry.get("user_name", f"BE {entry.get('unique_id','')}")
+    return getattr(entry, "description", "") or getattr(
+        entry, "user_name", f"BE {getattr(entry, 'unique_id', '')}"
+    )
+
+
+def diagram_allocations(repo: Any) -> Dict[Any, Set[str]]:
+    """Map requirement ids to ``"diagram:object"`` names in one pass.
+
+    Used by the requirement tables, which list the diagram objects of every
+    requirement and would otherwise rescan the diagrams per row.
+    """
+    names: Dict[Any, Set[str]] = defaultdict(set)
+    for diag in repo.diagrams.values():
+        dname = diag.name or diag.diag_id
+        for obj in getattr(diag, "objects", []):
+            reqs = obj.get("requirements", [])
+            if not reqs:
+                continue
+            oname = obj.get("properties", {}).get("name", obj.get("obj_type"))
+            for req in reqs:
+                names[req.get("id")].add(f"{dname}:{oname}")
+    return names
+
+
+class TraceabilityIndex:
+    """Requirement links of an application model, queryable both ways."""
+
+    def __init__(self, app: Any) -> None:
+        self.app = app
+        self._fingerprint: Optional[Hashable] = None
+        self._repo: Any = None
+        self.builds = 0
+        self._clear()
+
+    def _clear(self) -> None:
+        self._object_allocations: Dict[Any, List[str]] = defaultdict(list)
+        self._named_objects: Dict[Any, List[str]] = defaultdict(list)
+        self._entries: Dict[Any, List[Tuple[dict, Any]]] = defaultdict(list)
+        # Top events above allocated elements, by ``id``.
+        self._top_events: Dict[int, Any] = {}
+        self._tops: Dict[Any, Set[int]] = defaultdict(set)
+        self._by_top: Dict[int, Set[Any]] = defaultdict(set)
+        self._nodes: Dict[Any, List[Any]] = defaultdict(list)
+        self._objects: Dict[Any, List[Tuple[str, Any]]] = defaultdict(list)
+        self._reviews: Dict[Any, List[Any]] = defaultdict(list)
+        self._by_node: Dict[int, Set[Any]] = defaultdict(set)
+        self._by_object: Dict[Tuple[str, Any], Set[Any]] = defaultdict(set)
+        self._by_review: Dict[int, Set[Any]] = {}
+        self._elements_indexed = False
+        self._reviews_indexed = False
+        self._top_cache: Dict[int, frozenset] = {}
+
+    # ------------------------------------------------------------------
+    def fingerprint(self, repo: Any = None) -> Optional[Hashable]:
+        """Return the state the index was built from."""
+        app = self.app
+        from analysis.models import global_requirements
+
+        return (
+            _trace_revision,
+            id(repo),
+            getattr(repo, "diagram_revision", None),
+            id(global_requirements),
+            id(getattr(app, "root_node", None)),
+            id(getattr(app, "fmeas", None)),
+            tuple(
+                (id(r), tuple(getattr(r, "fta_ids", [])), tuple(getattr(r, "fmea_names", [])))
+                for r in getattr(app, "reviews", [])
+            ),
+        )
+
+    def ensure(self, repo: Any = None) -> "TraceabilityIndex":
+        """Rebuild the index if the model changed since the last build."""
+        fingerprint = self.fingerprint(repo)
+        if self._fingerprint is None or fingerprint != self._fingerprint:
+            self.rebuild(repo)
+            self._fingerprint = fingerprint
+        return self
+
+    def invalidate(self) -> None:
+        """Force a rebuild on the next query."""
+        self._fingerprint = None
+
+    # ------------------------------------------------------------------
+    def rebuild(self, repo: Any = None) -> None:
+        """Drop all links; they are collected again on the next query.
+
+        Element links (diagram objects, nodes and FMEA entries) and review
+        links are collected separately, each on first use.
+        """
+        self._clear()
+        self._repo = repo
+        self.builds += 1
+
+    def _index_elements(self) -> None:
+        if self._elements_indexed:
+            return
+        self._elements_indexed = True
+        if self._repo is not None:
+            self._index_diagrams(self._repo)
+        self._index_nodes()
+        self._index_fmeas()
+
+    def _index_diagrams(self, repo: Any) -> None:
+        for diag_id, diag in repo.diagrams.items():
+            objects = getattr(diag, "objects", [])
+            first_by_id: Dict[Any, dict] = {}
+            for obj in objects:
+                first_by_id.setdefault(obj.get("obj_id"), obj)
+            dname = getattr(diag, "name", "") if diag else ""
+            for obj in objects:
+                obj_id = obj.get("obj_id")
+                seen: Set[Any] = set()
+                named: Set[Any] = set()
+                for req in obj.get("requirements", []):
+                    rid = req.get("id") if isinstance(req, dict) else req
+                    if rid not in seen:
+                        # Matches ``SysMLRepository.find_requirements``.
+                        seen.add(rid)
+                        self._objects[rid].append((diag_id, obj_id))
+                        self._by_object[(diag_id, obj_id)].add(rid)
+                        target = first_by_id.get(obj_id)
+                        oname = target.get("properties", {}).get("name", "") if target else ""
+                        if dname and oname:
+                            self._object_allocations[rid].append(f"{dname}:{oname}")
+                        elif dname or oname:
+                            self._object_allocations[rid].append(dname or oname)
+                    if isinstance(req, dict) and rid not in named:
+                        named.add(rid)
+                        name = obj.get("properties", {}).get("name") or obj.get("obj_type", "")
+                        self._named_objects[rid].append(name)
+
+    def _tops_above(self, node: Any) -> frozenset:
+        """Return ids of the top events above *node*."""
+        cache = self._top_cache
+        key = id(node)
+        if key in cache:
+            return cache[key]
+        cache[key] = frozenset()  # guards against cycles in parent links
+        tops: Set[int] = set()
+        if node.node_type.upper() == "TOP EVENT":
+            tops.add(key)
+            self._top_events[key] = node
+        for parent in getattr(node, "parents", []):
+            tops |= self._tops_above(parent)
+        cache[key] = frozenset(tops)
+        return cache[key]
+
+    def _link_goals(self, rid: Any, node: Any) -> None:
+        for top in self._tops_above(node):
+            self._tops[rid].add(top)
+            self._by_top[top].add(rid)
+
+    def _index_nodes(self) -> None:
+        app = self.app
+        for node in app.get_all_nodes(app.root_node):
+            rids = {_req_id(r) for r in getattr(node, "safety_requirements", [])}
+            for rid in rids:
+                self._nodes[rid].append(node)
+                self._by_node[id(node)].add(rid)
+                self._link_goals(rid, node)
+
+    def _index_fmeas(self) -> None:
+        app = self.app
+        for fmea in getattr(app, "fmeas", []):
+            for entry in fmea.get("entries", []):
+                rids = {_req_id(r) for r in _entry_requirements(entry)}
+                if not rids:
+                    continue
+                parents = entry.get("parents") if isinstance(entry, dict) else getattr(entry, "parents", None)
+                parent = parents[0] if parents else None
+                if isinstance(parent, dict) and "unique_id" in parent:
+                    node = app.find_node_by_id_all(parent["unique_id"])
+                else:
+                    node = parent if hasattr(parent, "unique_id") else None
+                for rid in rids:
+                    self._entries[rid].append((fmea, entry))
+                    self._by_node[id(entry)].add(rid)
+                    if node:
+                        self._link_goals(rid, node)
+
+    def _index_reviews(self) -> None:
+        if self._reviews_indexed:
+            return
+        self._reviews_indexed = True
+        app = self.app
+        manager = getattr(app, "review_manager", None)
+        if manager is None:
+            return
+        for review in getattr(app, "reviews", []):
+            rids = set(manager.get_requirements_for_review(review))
+            self._by_review[id(review)] = rids
+            for rid in rids:
+                self._reviews[rid].append(review)
+
+    # ------------------------------------------------------------------
+    # requirement -> elements
+    def allocation_names(self, rid: Any) -> List[str]:
+        """Return names of elements ``rid`` is allocated to, diagrams first."""
+        self._index_elements()
+        return (
+            self._object_allocations.get(rid, [])
+            + self._named_objects.get(rid, [])
+            + [n.user_name or f"Node {n.unique_id}" for n in self._nodes.get(rid, ())]
+            + [
+                f"{fmea['name']}:{_entry_name(entry)}"
+                for fmea, entry in self._entries.get(rid, ())
+            ]
+        )
+
+    def goal_names(self, rid: Any) -> List[str]:
+        self._index_elements()
+        return sorted({_goal_name(self._top_events[t]) for t in self._tops.get(rid, ())})
+
+    def nodes(self, rid: Any) -> List[Any]:
+        self._index_elements()
+        return list(self._nodes.get(rid, []))
+
+    def diagram_objects(self, rid: Any) -> List[Tuple[str, Any]]:
+        self._index_elements()
+        return list(self._objects.get(rid, []))
+
+    def reviews(self, rid: Any) -> List[Any]:
+        self._index_reviews()
+        return list(self._reviews.get(rid, []))
+
+    # element -> requirements
+    def requirements_for_node(self, node: Any) -> Set[Any]:
+        self._index_elements()
+        return set(self._by_node.get(id(node), ()))
+
+    def requirements_for_object(self, diag_id: str, obj_id: Any) -> Set[Any]:
+        self._index_elements()
+        return set(self._by_object.get((diag_id, obj_id), ()))
+
+    def requirements_for_goal(self, goal: str) -> Set[Any]:
+        self._index_elements()
+        result: Set[Any] = set()
+        for top, node in self._top_events.items():
+            if _goal_name(node) == goal:
+                result |= self._by_top.get(top, set())
+        return result
+
+    def requirements_for_review(self, review: Any) -> Set[Any]:
+        self._index_reviews()
+        return set(self._by_review.get(id(review), ()))
+
+    def requirement_ids(self) -> Iterable[Any]:
+        """Return ids of every requirement linked to some element."""
+        self._index_elements()
+        self._index_reviews()
+        return (
+            set(self._objects)
+            | set(self._named_objects)
+            | set(self._nodes)
+            | set(self._entries)
+            | set(self._reviews)
+        )
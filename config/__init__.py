@@ -24,7 +24,9 @@ from .config_loader import (
     validate_requirement_patterns,
     load_report_template,
     validate_report_template,
+    resolve_config_path,
 )
+from .registry import ConfigRegistry, registry as config_registry
 
 __all__ = [
     "load_json_with_comments",
@@ -34,4 +36,7 @@ __all__ = [
     "validate_requirement_patterns",
     "load_report_template",
     "validate_report_template",
+    "resolve_config_path",
+    "ConfigRegistry",
+    "config_registry",
 ]
@@ -293,55 +293,31 @@ def validate_report_template(data: Any) -> dict[str, Any]:
     return data
 
 
+# Tokens that matter when stripping comments: string literals and escaped
+# characters (kept verbatim) and line or block comments (dropped).
+# Unterminated strings and comments run to the end of the text.
+_COMMENT_TOKEN_RE = re.compile(
+    r'"(?:[^"\\]|\\.|\\\Z)*(?:"|\Z)|\\(?:.|\Z)|//[^\n]*(?:\n|\Z)|/\*.*?(?:\*/|\Z)',
+    re.S,
+)
+
+
 def _strip_comments(text: str) -> str:
     """Return *text* with // and /* ... */ comments removed.
 
-    The function walks the string character by character so that comment tokens
-    inside quoted strings remain untouched.
+    A single regular expression scans string literals and comments so that
+    comment tokens inside quoted strings remain untouched while the text in
+    between is copied by the regex engine rather than character by character.
     """
 
-    result: list[str] = []
-    in_str = False
-    escape = False
-    i = 0
-    while i < len(text):
-        ch = text[i]
-        if escape:
-            result.append(ch)
-            escape = False
-            i += 1
-            continue
-        if ch == "\\":
-            result.append(ch)
-            escape = True
-            i += 1
-            continue
-        if ch == '"':
-            in_str = not in_str
-            result.append(ch)
-            i += 1
-            continue
-        if not in_str and text.startswith("//", i):
-            # Skip to end of line
-            j = text.find("\n", i)
-            if j == -1:
-                break
-            i = j + 1
-            continue
-        if not in_str and text.startswith("/*", i):
-            j = text.find("*/", i + 2)
-            if j == -1:
-                break
-            i = j + 2
-            continue
-        result.append(ch)
-        i += 1
-    return "".join(result)
+    def repl(match: re.Match[str]) -> str:
+        token = match.group(0)
+        return "" if token.startswith("/") else token
 
+    return _COMMENT_TOKEN_RE.sub(repl, text)
 
-def load_json_with_comments(path: str | Path) -> Any:
-    """Load a JSON file allowing // and /* */ comments and trailing commas."""
-    p = Path(path)
+
+def _candidate_paths(p: Path) -> list[Path]:
     candidates = [p]
     if getattr(sys, "frozen", False):  # pragma: no cover - only in bundled app
         exe_dir = Path(sys.executable).resolve().parent
@@ -350,9 +326,43 @@ def load_json_with_comments(path: str | Path) -> Any:
     cwd = Path.cwd()
     candidates.append(cwd / p.name)
     candidates.append(cwd / "config" / p.name)
+    return candidates
+
+
+def _resource_package(p: Path) -> str:
+    # Determine the package containing the resource.  The configuration
+    # files reside within a ``config`` package somewhere in the path.  By
+    # locating this segment we can construct the fully-qualified package
+    # name without relying on the current working directory.
+    try:
+        idx = p.parts.index("config")
+        return ".".join(p.parts[idx:-1])
+    except ValueError:
+        return p.parent.name
 
+
+def resolve_config_path(path: str | Path) -> Path | None:
+    """Return the file :func:`load_json_with_comments` would read for *path*.
+
+    ``None`` is returned when the file is only available as a non file-system
+    resource (for example inside a zip archive).
+    """
+    p = Path(path)
+    for cand in _candidate_paths(p):
+        if cand.is_file():
+            return cand
+    try:
+        res = resources.files(_resource_package(p)) / p.name
+    except ModuleNotFoundError:
+        return None
+    return res if isinstance(res, Path) and res.is_file() else None
+
+
+def load_json_with_comments(path: str | Path) -> Any:
+    """Load a JSON file allowing // and /* */ comments and trailing commas."""
+    p = Path(path)
     text = None
-    for cand in candidates:
+    for cand in _candidate_paths(p):
         try:
             text = _strip_comments(cand.read_text())
             break
@@ -362,17 +372,7 @@ def load_json_with_comments(path: str | Path) -> Any:
         # When running from a bundled executable the configuration files may be
         # packaged as importlib resources. Attempt to load the file from the
         # corresponding package if it is not found on disk.
-
-        # Determine the package containing the resource.  The configuration
-        # files reside within a ``config`` package somewhere in the path.  By
-        # locating this segment we can construct the fully-qualified package
-        # name without relying on the current working directory.
-        try:
-            idx = p.parts.index("config")
-            pkg = ".".join(p.parts[idx:-1])
-        except ValueError:
-            pkg = p.parent.name
-
+        pkg = _resource_package(p)
         try:
             with resources.as_file(resources.files(pkg) / p.name) as res:
                 text = _strip_comments(res.read_text())
@@ -0,0 +1,282 @@
+# Author: Miguel Marina <karel.capek.robotics@gmail.com>
+# SPDX-License-Identifier: GPL-3.0-or-later
+#
+# Copyright (C) 2025 Capek System Safety & Robotic Solutions
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+"""Process-wide registry of parsed and compiled configuration files.
+
+Several modules read ``diagram_rules.json`` and ``requirement_patterns.json``
+at import time.  :class:`ConfigRegistry` parses each file once per process
+and hands every consumer the same validated object.  Results derived from the
+shipped configuration are additionally persisted in a small on-disk cache
+keyed by the sources' modification stamps and content hashes so later
+launches skip parsing entirely.  Entries are stored as JSON, so only results
+their caller marks as plain JSON data are persisted; others are kept in
+memory only.
+
+Consumers register a callback with :meth:`ConfigRegistry.subscribe`;
+:meth:`ConfigRegistry.reload` calls all of them once any tracked source file
+changed.  Cached objects are shared and must be treated as read-only.
+
+The registry may be used from worker threads (see
+:mod:`analysis.requirement_rule_generator`); its bookkeeping is guarded by a
+lock while builders run outside of it.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import threading
+from pathlib import Path
+from typing import Any, Callable, Iterable
+
+from .config_loader import load_diagram_rules, load_json_with_comments, resolve_config_path
+
+# Bump when the layout of persisted entries changes.
+_CACHE_VERSION = 2
+
+# Only results derived from files inside the project are persisted; ad-hoc
+# files such as test fixtures are cached in memory only.
+_PROJECT_DIR = Path(__file__).resolve().parents[1]
+
+
+def _default_cache_dir() -> Path | None:
+    """Return the directory for persisted entries or ``None`` when disabled.
+
+    ``AUTOML_CONFIG_CACHE`` overrides the location; an empty value disables
+    the on-disk cache.
+    """
+    env = os.environ.get("AUTOML_CONFIG_CACHE")
+    if env is not None:
+        return Path(env) if env else None
+    return Path.home() / ".cache" / "automl" / "config"
+
+
+def _stamp(path: Path) -> tuple[int, int] | None:
+    try:
+        st = path.stat()
+    except OSError:
+        return None
+    return st.st_mtime_ns, st.st_size
+
+
+def _digest(path: Path) -> str | None:
+    try:
+        return hashlib.sha256(path.read_bytes()).hexdigest()
+    except OSError:
+        return None
+
+
+class _Entry:
+    __slots__ = ("stamps", "digests", "value")
+
+    def __init__(self, stamps: tuple, digests: tuple, value: Any) -> None:
+        self.stamps = stamps
+        self.digests = digests
+        self.value = value
+
+
+class ConfigRegistry:
+    """Cache configuration objects keyed by the files they were built from."""
+
+    def __init__(self, cache_dir: Path | None | str = "default") -> None:
+        self.cache_dir = _default_cache_dir() if cache_dir == "default" else cache_dir
+        self._entries: dict[tuple[str, tuple[Path, ...]], _Entry] = {}
+        self._listeners: list[Callable[[], None]] = []
+        # Stamp of every tracked source as of the last notification.
+        self._notified: dict[Path, tuple[int, int] | None] = {}
+        self._lock = threading.RLock()
+
+    # ------------------------------------------------------------------
+    # Generic access
+    # ------------------------------------------------------------------
+    def compile(
+        self,
+        kind: str,
+        sources: Iterable[str | Path],
+        build: Callable[[], Any],
+        persist: bool = False,
+    ) -> Any:
+        """Return ``build()`` cached for the current content of *sources*.
+
+        *kind* names the result; together with the resolved *sources* it
+        forms the cache key.  Source files that do not exist are tracked as
+        missing so the result is rebuilt once they appear.  Pass *persist*
+        when the result is plain JSON data (dicts with string keys, lists,
+        strings, numbers) to also keep it in the on-disk cache.
+        """
+        paths = tuple(self._resolve(s) for s in sources)
+        if any(p is None for p in paths):
+            # Packaged resource without a file-system path: nothing to stamp.
+            return build()
+        key = (kind, paths)
+        stamps = tuple(_stamp(p) for p in paths)
+        with self._lock:
+            for path, stamp in zip(paths, stamps):
+                self._notified.setdefault(path, stamp)
+            entry = self._entries.get(key)
+        if entry is not None and entry.stamps == stamps:
+            return entry.value
+        if entry is None and persist:
+            entry = self._read(key)
+            if entry is not None and entry.stamps == stamps:
+                self._store(key, entry)
+                return entry.value
+        digests = tuple(_digest(p) for p in paths)
+        if entry is not None and entry.digests == digests:
+            entry = _Entry(stamps, digests, entry.value)
+            self._store(key, entry)
+            if persist:
+                self._write(key, entry)
+            return entry.value
+        value = build()
+        # Stamp after building so builders that rewrite a source do not
+        # invalidate their own result.
+        entry = _Entry(
+            tuple(_stamp(p) for p in paths), tuple(_digest(p) for p in paths), value
+        )
+        self._store(key, entry)
+        if persist:
+            self._write(key, entry)
+        return value
+
+    def _store(self, key: tuple[str, tuple[Path, ...]], entry: _Entry) -> None:
+        with self._lock:
+            self._entries[key] = entry
+
+    @staticmethod
+    def _resolve(source: str | Path) -> Path | None:
+        found = resolve_config_path(source)
+        if found is not None:
+            return found.resolve()
+        p = Path(source)
+        # Missing files are tracked by their literal path.
+        return p.resolve() if not p.exists() and p.parent.exists() else None
+
+    # ------------------------------------------------------------------
+    # Typed accessors
+    # ------------------------------------------------------------------
+    def diagram_rules(self, path: str | Path) -> dict[str, Any]:
+        """Return the validated diagram rules stored at *path*."""
+        return self.compile(
+            "diagram_rules", (path,), lambda: load_diagram_rules(path), persist=True
+        )
+
+    def requirement_patterns(self, path: str | Path) -> list[dict[str, Any]]:
+        """Return the raw pattern list stored at *path* (``[]`` if absent)."""
+
+        def build() -> list[dict[str, Any]]:
+            try:
+                data = load_json_with_comments(path)
+            except FileNotFoundError:
+                return []
+            return data if isinstance(data, list) else []
+
+        return self.compile("requirement_patterns", (path,), build, persist=True)
+
+    # ------------------------------------------------------------------
+    # Change notification
+    # ------------------------------------------------------------------
+    def subscribe(self, listener: Callable[[], None]) -> None:
+        """Call *listener* whenever :meth:`reload` detects changed sources."""
+        if listener not in self._listeners:
+            self._listeners.append(listener)
+
+    def unsubscribe(self, listener: Callable[[], None]) -> None:
+        if listener in self._listeners:
+            self._listeners.remove(listener)
+
+    def changed_sources(self) -> set[Path]:
+        """Return tracked source files modified since the last notification."""
+        with self._lock:
+            notified = list(self._notified.items())
+        return {p for p, stamp in notified if _stamp(p) != stamp}
+
+    def reload(self, force: bool = False) -> bool:
+        """Notify subscribers if a source changed; return ``True`` if so.
+
+        Cached entries are rebuilt lazily the next time a consumer asks for
+        them, so listeners simply re-read their configuration.
+        """
+        changed = self.changed_sources()
+        if not force and not changed:
+            return False
+        with self._lock:
+            for path in changed:
+                self._notified[path] = _stamp(path)
+        for listener in list(self._listeners):
+            try:
+                listener()
+            except Exception:  # pragma: no cover - defensive programming
+                pass
+        return True
+
+    def clear(self) -> None:
+        """Forget all in-memory entries."""
+        with self._lock:
+            self._entries.clear()
+            self._notified.clear()
+
+    # ------------------------------------------------------------------
+    # Persistence
+    # ------------------------------------------------------------------
+    def _cache_file(self, key: tuple[str, tuple[Path, ...]]) -> Path | None:
+        kind, paths = key
+        if self.cache_dir is None or not all(
+            _PROJECT_DIR in p.parents for p in paths
+        ):
+            return None
+        name = hashlib.sha1("\0".join(map(str, paths)).encode()).hexdigest()[:16]
+        return Path(self.cache_dir) / f"{kind}-{name}.json"
+
+    def _read(self, key) -> _Entry | None:
+        path = self._cache_file(key)
+        if path is None:
+            return None
+        try:
+            with open(path, "r", encoding="utf-8") as fh:
+                version, stamps, digests, value = json.load(fh)
+            if version != _CACHE_VERSION:
+                return None
+            stamps = tuple(tuple(s) if s is not None else None for s in stamps)
+            return _Entry(stamps, tuple(digests), value)
+        except Exception:
+            return None
+
+    def _write(self, key, entry: _Entry) -> None:
+        path = self._cache_file(key)
+        if path is None:
+            return
+        try:
+            text = json.dumps(
+                [_CACHE_VERSION, entry.stamps, entry.digests, entry.value],
+                ensure_ascii=False,
+            )
+        except (TypeError, ValueError):
+            return
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+            tmp.write_text(text, encoding="utf-8")
+            os.replace(tmp, path)
+        except OSError:
+            pass
+
+
+registry = ConfigRegistry()
+"""Registry shared by all configuration consumers in the process."""
@@ -23,6 +23,8 @@ import tkinter as tk
 import tkinter.font as tkfont
 from typing import Callable, Optional
 
+from gui.utils import image_factory
+
 
 def _hex_to_rgb(value: str) -> tuple[int, int, int]:
     value = value.lstrip('#')
@@ -88,8 +90,9 @@ def _glow_image(img: tk.PhotoImage, factor: float = 1.5, mix: float = 0.1) -> tk
     when Pillow is available the image is converted to an ``RGBA`` bitmap where
     the colour channels are brightened and a hint of light green is blended in
     before the original alpha channel is reapplied.  If Pillow cannot be
-    imported we fall back to a pure Tk based implementation that skips pixels
-    reported as transparent.
+    imported, images built by :mod:`gui.utils.image_factory` are recoloured
+    from their source pixels; other images fall back to a pure Tk based
+    implementation that skips pixels reported as transparent.
     """
 
     try:  # Prefer Pillow for correct alpha handling
@@ -107,6 +110,11 @@ def _glow_image(img: tk.PhotoImage, factor: float = 1.5, mix: float = 0.1) -> tk
         light = Image.merge("RGBA", (*blended.split(), a))
         return ImageTk.PhotoImage(light)
     except Exception:  # pragma: no cover - Pillow may be unavailable
+        # Icons from the image factory are recoloured from their source
+        # pixels and rendered in one call.
+        glow = image_factory.recolor(img, lambda c: _glow_color(c, factor, mix))
+        if glow is not None:
+            return glow
         w, h = img.width(), img.height()
         new = tk.PhotoImage(width=w, height=h)
         for x in range(w):
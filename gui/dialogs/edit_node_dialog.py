@@ -38,6 +38,7 @@ from analysis.models import (
 from analysis.fmeda_utils import GATE_NODE_TYPES
 from analysis.risk_assessment import AutoMLHelper
 from config.automl_constants import VALID_SUBTYPES
+from mainappsrc.core.reporting_export import EVENT_SECTIONS, FMEA_SECTIONS
 
 AutoML_Helper = AutoMLHelper()
 
@@ -1054,6 +1055,7 @@ class EditNodeDialog(simpledialog.Dialog):
         return True
 
     def apply(self):
+        self.app.push_undo_state(touched=EVENT_SECTIONS + FMEA_SECTIONS)
         target_node = self.node if self.node.is_primary_instance else self.node.original
 
         old_desc = target_node.description
@@ -1088,8 +1090,10 @@ class EditNodeDialog(simpledialog.Dialog):
             else:
                 target_node.failure_prob = self.app.compute_failure_prob(
                     target_node, failure_mode_ref=getattr(target_node, 'failure_mode_ref', None), formula=target_node.prob_formula)
+            self.app.invalidate_probability(target_node)
         elif self.node.node_type.upper() in GATE_NODE_TYPES:
             target_node.gate_type = self.gate_var.get().strip().upper()
+            self.app.invalidate_probability(target_node)
             if old_desc != target_node.description:
                 for e in self.app.get_all_fmea_entries():
                     src = self.app.get_failure_mode_node(e)
@@ -31,6 +31,7 @@ from gui.dialogs.edit_node_dialog import EditNodeDialog, format_requirement
 from analysis.models import global_requirements, ensure_requirement_defaults
 from analysis.user_config import CURRENT_USER_NAME
 from analysis.fmeda_utils import GATE_NODE_TYPES
+from mainappsrc.core.reporting_export import EVENT_SECTIONS, FMEA_SECTIONS
 
 class FMEARowDialog(simpledialog.Dialog):
     def __init__(self, parent, node, app, fmea_entries, mechanisms=None, hide_diagnostics=False, is_fmeda=False):
@@ -348,6 +349,7 @@ class FMEARowDialog(simpledialog.Dialog):
         return self.effect_text
 
     def apply(self):
+        self.app.push_undo_state(touched=EVENT_SECTIONS + FMEA_SECTIONS)
         comp = self.comp_var.get()
         if self.node.parents and getattr(self.node.parents[0], "node_type", "").upper() not in GATE_NODE_TYPES:
             self.node.parents[0].user_name = comp
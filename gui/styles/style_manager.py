@@ -21,6 +21,8 @@ import sys
 from pathlib import Path
 import xml.etree.ElementTree as ET
 
+from gui.utils import text_layout
+
 # The default style XML lives in the ``config/styles`` directory in the
 # repository root.  ``style_manager.py`` sits two levels deeper under
 # ``gui/styles`` so ``parents[2]`` resolves to the project root.  The
@@ -86,6 +88,8 @@ class StyleManager:
             color = obj.get('color')
             if typ and color:
                 self.styles[typ] = color
+        # Measurements made under the previous style are not reused.
+        text_layout.clear()
 
     def save_style(self, path: str) -> None:
         root = ET.Element('style')
@@ -42,7 +42,6 @@ from analysis.models import (
     QUALIFICATIONS,
     COMPONENT_ATTR_TEMPLATES,
     RELIABILITY_MODELS,
-    PASSIVE_QUAL_FACTORS,
     component_fit_map,
     calc_asil,
     global_requirements,
@@ -58,6 +57,14 @@ from analysis.models import (
 )
 from analysis.safety_management import ACTIVE_TOOLBOX, SAFETY_ANALYSIS_WORK_PRODUCTS
 from analysis.fmeda_utils import compute_fmeda_metrics
+from analysis.fit_engine import fit_matrix
+from analysis.traceability import diagram_allocations
+from gui.utils.streaming_import import (
+    BomRowConverter,
+    StreamingImport,
+    iter_rows,
+    read_headers,
+)
 from analysis.constants import CHECK_MARK, CROSS_MARK
 from gui.controls.mac_button_style import apply_translucid_button_style
 from gui.utils.icon_factory import create_icon
@@ -315,20 +322,6 @@ def enable_treeview_reorder(
     return lambda: _move(-1), lambda: _move(1)
 
 
-def _total_fit_from_boms(boms):
-    """Return the aggregated FIT of all components in ``boms``.
-
-    Each element of ``boms`` is a list of :class:`ReliabilityComponent` objects.
-    The stored ``fit`` values of the components are used so pre-calculated
-    analyses can be combined without a mission profile.
-    """
-
-    total = 0.0
-    for bom in boms:
-        total += sum(component_fit_map(bom).values())
-    return total
-
-
 def _wrap_val(val, width=30):
     """Return text wrapped value for tree view cells."""
     if val is None:
@@ -1013,38 +1006,50 @@ class ReliabilityWindow(tk.Frame):
         self.refresh_tree()
 
     def load_csv(self):
-        path = filedialog.askopenfilename(filetypes=[("CSV", "*.csv")])
+        path = filedialog.askopenfilename(
+            filetypes=[("CSV", "*.csv"), ("Excel", "*.xlsx")]
+        )
         if not path:
             return
+        previous = getattr(self, "_bom_import", None)
+        if previous:
+            previous.cancel()
         self.components.clear()
-        with open(path, newline="") as f:
-            reader = csv.DictReader(f)
-            fields = reader.fieldnames or []
-            mapping = self.ask_mapping(fields)
-            if not mapping:
-                return
-            for row in reader:
-                try:
-                    name = row.get(mapping["name"], "")
-                    ctype = row.get(mapping["type"], "")
-                    qty = int(row.get(mapping["qty"], 1) or 1)
-                    qual = (
-                        row.get(mapping.get("qualification"), "")
-                        if mapping.get("qualification")
-                        else ""
-                    )
-                    comp = ReliabilityComponent(name, ctype, qty, {}, qual)
-                    template = COMPONENT_ATTR_TEMPLATES.get(ctype, {})
-                    for k, v in template.items():
-                        comp.attributes[k] = v[0] if isinstance(v, list) else v
-                    # store any extra columns as attributes
-                    for key, val in row.items():
-                        if key not in mapping.values():
-                            comp.attributes[key] = val
-                    self.components.append(comp)
-                except Exception:
-                    continue
+        try:
+            fields = read_headers(path)
+        except Exception as exc:
+            messagebox.showerror("Import", f"Failed to read {path}: {exc}")
+            return
+        mapping = self.ask_mapping(fields)
+        if not mapping:
+            return
+        # Rows are parsed on a worker thread; batches arrive on the Tk thread.
+        self._bom_import = StreamingImport(
+            lambda: iter_rows(path), BomRowConverter(mapping)
+        )
+        self._bom_import.start(
+            self,
+            on_batch=self.components.extend,
+            on_progress=lambda rows: self.formula_label.config(
+                text=f"Importing... {rows} rows"
+            ),
+            on_done=self._bom_import_done,
+        )
+
+    def _bom_import_done(self, result):
+        self._bom_import = None
+        self.formula_label.config(text="")
         self.refresh_tree()
+        if result.failure is not None:
+            messagebox.showerror("Import", f"Import stopped: {result.failure}")
+        if result.errors:
+            lines = [f"Row {e.row}: {e.message}" for e in result.errors[:10]]
+            if len(result.errors) > 10:
+                lines.append(f"... and {len(result.errors) - 10} more")
+            messagebox.showwarning(
+                "Import",
+                f"Skipped {len(result.errors)} invalid rows:\n" + "\n".join(lines),
+            )
 
     def ask_mapping(self, fields):
         if not fields:
@@ -1179,26 +1184,9 @@ class ReliabilityWindow(tk.Frame):
             messagebox.showwarning("FIT", "Select a mission profile")
             return
         std = self.standard_var.get()
-        total = 0.0
-        for comp in self.components:
-            if comp.sub_boms:
-                # Aggregate FIT from the referenced BOMs without recomputation
-                comp.fit = _total_fit_from_boms(comp.sub_boms)
-            else:
-                info = RELIABILITY_MODELS.get(std, {}).get(comp.comp_type)
-                if info:
-                    qf = (
-                        PASSIVE_QUAL_FACTORS.get(comp.qualification, 1.0)
-                        if comp.is_passive
-                        else 1.0
-                    )
-                    if mp is not None:
-                        comp.fit = info["formula"](comp.attributes, mp) * mp.tau * qf
-                    else:
-                        comp.fit = 0.0
-                else:
-                    comp.fit = 0.0
-            total += comp.fit * comp.quantity
+        # Sub-BOM components aggregate the stored FIT of the referenced BOMs
+        # without recomputation.
+        fit_matrix(self.components, [mp], std).apply(0)
 
         sg_targets = {
             sg.user_name: {
@@ -4333,6 +4321,7 @@ class RequirementsExplorerWindow(tk.Frame):
         phase = None
         if self.app and getattr(self.app, "safety_mgmt_toolbox", None):
             phase = getattr(self.app.safety_mgmt_toolbox, "active_module", None)
+        allocations = diagram_allocations(SysMLRepository.get_instance())
         for rid, req in global_requirements.items():
             req_phase = req.get("phase")
             if phase and req_phase not in (phase, None):
@@ -4345,7 +4334,7 @@ class RequirementsExplorerWindow(tk.Frame):
                 continue
             if status and req.get("status", "") != status:
                 continue
-            trace = ", ".join(self._get_requirement_allocations(rid))
+            trace = ", ".join(sorted(allocations.get(rid, ())))
             links = ", ".join(
                 f"{r.get('type')} {r.get('id')}" for r in req.get("relations", [])
             )
@@ -4427,18 +4416,6 @@ class RequirementsExplorerWindow(tk.Frame):
             global_requirements.pop(rid, None)
             self.tree.delete(item)
 
-    def _get_requirement_allocations(self, rid: str) -> list[str]:
-        repo = SysMLRepository.get_instance()
-        names: list[str] = []
-        for diag in repo.diagrams.values():
-            dname = diag.name or diag.diag_id
-            for obj in getattr(diag, "objects", []):
-                for r in obj.get("requirements", []):
-                    if r.get("id") == rid:
-                        oname = obj.get("properties", {}).get("name", obj.get("obj_type"))
-                        names.append(f"{dname}:{oname}")
-        return sorted(set(names))
-
 
 class CausalBayesianNetworkWindow(tk.Frame):
     """Minimal editor for Causal Bayesian Network analyses."""
@@ -28,7 +28,7 @@ import difflib
 import sys
 import re
 from pathlib import Path
-from config import load_diagram_rules
+from config import config_registry
 import json
 import time
 try:
@@ -40,16 +40,19 @@ except ModuleNotFoundError:  # pragma: no cover - pillow optional
 _CONFIG_PATH = (
     Path(__file__).resolve().parents[1] / "config" / "rules" / "diagram_rules.json"
 )
-_CONFIG = load_diagram_rules(_CONFIG_PATH)
+_CONFIG = config_registry.diagram_rules(_CONFIG_PATH)
 GATE_NODE_TYPES = set(_CONFIG.get("gate_node_types", []))
 
 
 def reload_config() -> None:
     """Reload gate node types from configuration."""
     global _CONFIG, GATE_NODE_TYPES
-    _CONFIG = load_diagram_rules(_CONFIG_PATH)
+    _CONFIG = config_registry.diagram_rules(_CONFIG_PATH)
     GATE_NODE_TYPES = set(_CONFIG.get("gate_node_types", []))
 
+
+config_registry.subscribe(reload_config)
+
 EMAIL_REGEX = re.compile(r"[^@]+@[^@]+\.[^@]+")
 
 # Access the drawing helper defined in the main application if available.
@@ -1298,6 +1301,9 @@ class ReviewDocumentDialog(tk.Frame):
             else:
                 conn_status[c] = "existing"
 
+        from mainappsrc.core.version_store import version_store_for
+
+        same = version_store_for(self.app).same_content
         status = {}
         for nid in set(map1) | set(map2):
             if nid in map1 and nid not in map2:
@@ -1305,7 +1311,7 @@ class ReviewDocumentDialog(tk.Frame):
             elif nid in map2 and nid not in map1:
                 status[nid] = "added"
             else:
-                if json.dumps(map1[nid], sort_keys=True) != json.dumps(map2[nid], sort_keys=True):
+                if not same(map1[nid], map2[nid]):
                     status[nid] = "added"
                 else:
                     status[nid] = "existing"
@@ -1487,7 +1493,7 @@ class ReviewDocumentDialog(tk.Frame):
                     st = "added"
                     entry = entries2[uid]
                 else:
-                    if json.dumps(entries1[uid], sort_keys=True) != json.dumps(entries2[uid], sort_keys=True):
+                    if not same(entries1[uid], entries2[uid]):
                         st = "added"
                         entry = entries2[uid]
                     else:
@@ -1681,7 +1687,7 @@ class ReviewDocumentDialog(tk.Frame):
                     text.insert(tk.END, f"Added: ")
                     self.insert_diff_text(text, "", fmt(r2))
                 else:
-                    if json.dumps(r1, sort_keys=True) != json.dumps(r2, sort_keys=True):
+                    if not same(r1, r2):
                         text.insert(tk.END, f"Updated: ")
                         self.insert_diff_text(text, fmt(r1), fmt(r2))
                     else:
@@ -2225,6 +2231,9 @@ class VersionCompareDialog(tk.Frame):
             else:
                 conn_status[c] = "existing"
 
+        from mainappsrc.core.version_store import version_store_for
+
+        same = version_store_for(self.app).same_content
         status = {}
         for nid in set(map1) | set(map2):
             if nid in map1 and nid not in map2:
@@ -2232,7 +2241,7 @@ class VersionCompareDialog(tk.Frame):
             elif nid in map2 and nid not in map1:
                 status[nid] = "added"
             else:
-                if json.dumps(map1[nid], sort_keys=True) != json.dumps(map2[nid], sort_keys=True):
+                if not same(map1[nid], map2[nid]):
                     status[nid] = "added"
                 else:
                     status[nid] = "existing"
@@ -2514,7 +2523,7 @@ class VersionCompareDialog(tk.Frame):
                 self.req_text.insert(tk.END, "Added: ")
                 self.insert_diff_text(self.req_text, "", fmt(r2))
             else:
-                if json.dumps(r1, sort_keys=True) != json.dumps(r2, sort_keys=True):
+                if not same(r1, r2):
                     self.req_text.insert(tk.END, "Updated: ")
                     self.insert_diff_text(self.req_text, fmt(r1), fmt(r2))
                 else:
@@ -2613,7 +2622,7 @@ class VersionCompareDialog(tk.Frame):
                     st = "added"
                     entry = entries2[uid]
                 else:
-                    if json.dumps(entries1[uid], sort_keys=True) != json.dumps(entries2[uid], sort_keys=True):
+                    if not same(entries1[uid], entries2[uid]):
                         st = "added"
                         entry = entries2[uid]
                     else:
@@ -2691,7 +2700,7 @@ class VersionCompareDialog(tk.Frame):
                     st = "added"
                     entry = ent2[uid]
                 else:
-                    if json.dumps(ent1[uid], sort_keys=True) != json.dumps(ent2[uid], sort_keys=True):
+                    if not same(ent1[uid], ent2[uid]):
                         st = "added"
                         entry = ent2[uid]
                     else:
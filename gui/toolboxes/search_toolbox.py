@@ -26,6 +26,10 @@ from tkinter import ttk
 
 from gui.controls import messagebox
 from gui.controls.mac_button_style import apply_translucid_button_style
+from gui.utils.search_index import SearchIndex
+
+# Number of results inserted into the listbox per event loop iteration.
+STREAM_CHUNK = 200
 
 # Additional model sections that can be searched.  Each tuple contains a
 # human-readable category name, the name of a method on the ``app`` object
@@ -160,17 +164,36 @@ class SearchToolbox(ttk.Frame):
 
     # ------------------------------------------------------------------
     def _init_handlers(self) -> None:
-        """Initialise search handlers for each supported category."""
-        self.handlers: dict[str, callable] = {
-            "nodes": self._search_nodes,
-            "connections": self._search_connections,
-            "failures": self._search_failures,
-            "hazards": self._search_hazards,
-            "faults": self._search_faults,
-            "malfunctions": self._search_malfunctions,
-            "failureslist": self._search_failure_list,
-            "triggers": self._search_triggers,
-            "funcins": self._search_funcins,
+        """Initialise search handlers for each supported category.
+
+        Each handler is a ``(documents, result)`` pair: ``documents()`` yields
+        ``(key, text, item)`` tuples fed to the :class:`SearchIndex` and
+        ``result(item)`` returns the ``(label, open_cb)`` of a match.
+        """
+        self.handlers: dict[str, tuple[callable, callable]] = {
+            "nodes": (self._node_documents, self._node_result),
+            "connections": (self._connection_documents, self._connection_result),
+            "failures": (self._failure_documents, self._failure_result),
+            "hazards": self._make_list_handler(
+                "hazards", "Hazard", "show_hazard_list"
+            ),
+            "faults": self._make_list_handler("faults", "Fault", "show_fault_list"),
+            "malfunctions": self._make_list_handler(
+                "malfunctions", "Malfunction", "show_malfunction_editor"
+            ),
+            "failureslist": self._make_list_handler(
+                "failures", "Failure", "show_failure_list"
+            ),
+            "triggers": self._make_list_handler(
+                "triggering_conditions",
+                "Triggering Condition",
+                "show_triggering_condition_list",
+            ),
+            "funcins": self._make_list_handler(
+                "functional_insufficiencies",
+                "Functional Insufficiency",
+                "show_functional_insufficiency_list",
+            ),
         }
         for name, fetcher, opener in EXTRA_CATEGORIES:
             parts = name.split()
@@ -183,24 +206,51 @@ class SearchToolbox(ttk.Frame):
 
     # ------------------------------------------------------------------
     def _make_extra_handler(self, name: str, fetcher: str, opener: str):
-        def handler(regex):
+        prefix = name[:-1] if name.endswith("s") else name
+
+        def documents():
             items = getattr(self.app, fetcher, lambda: [])()
-            for item in items:
-                text = self._obj_text(item)
-                if regex.search(text):
-                    prefix = name[:-1] if name.endswith("s") else name
-                    label = f"{prefix} - {self._obj_label(item)}"
+            return self._object_documents(items, self._obj_text)
 
-                    def _open(it=item, meth=opener):
-                        func = getattr(self.app, meth, lambda *_: None)
-                        try:
-                            func(it)
-                        except Exception:  # pragma: no cover - best effort
-                            func()
+        def result(item):
+            def _open(it=item, meth=opener):
+                func = getattr(self.app, meth, lambda *_: None)
+                try:
+                    func(it)
+                except Exception:  # pragma: no cover - best effort
+                    func()
 
-                    self._add_result(label, _open)
+            return f"{prefix} - {self._obj_label(item)}", _open
 
-        return handler
+        return documents, result
+
+    # ------------------------------------------------------------------
+    def _make_list_handler(self, attr: str, prefix: str, opener: str):
+        """Return a handler searching the string list ``app.<attr>``."""
+
+        def documents():
+            seen: dict[str, int] = {}
+            for text in getattr(self.app, attr, []):
+                count = seen[text] = seen.get(text, 0) + 1
+                yield (text, count), text, text
+
+        def result(text):
+            def _open():
+                func = getattr(self.app, opener, None)
+                if func is None and opener == "show_malfunction_editor":
+                    func = getattr(self.app, "show_malfunctions_editor", None)
+                if func is not None:
+                    func()
+
+            return f"{prefix} - {text}", _open
+
+        return documents, result
+
+    # ------------------------------------------------------------------
+    @staticmethod
+    def _object_documents(items, text_of):
+        for item in items:
+            yield id(item), text_of(item), item
 
     # ------------------------------------------------------------------
     def _add_result(self, label: str, open_cb) -> None:
@@ -208,279 +258,107 @@ class SearchToolbox(ttk.Frame):
         self.results.append({"label": label, "open": open_cb})
 
     # ------------------------------------------------------------------
-    def _search_nodes(self, regex) -> None:
+    def _node_documents(self):
         nodes = getattr(self.app, "get_all_nodes_in_model", lambda: [])()
-        for node in nodes:
-            text = f"{node.user_name}\n{getattr(node, 'description', '')}"
-            if regex.search(text):
-                label = (
-                    f"{type(node).__name__} ({getattr(node, 'node_type', '')}) - "
-                    f"{node.user_name} [{self._node_path(node)}]"
-                )
-                self._add_result(
-                    label,
-                    lambda n=node: self.app.window_controllers.open_page_diagram(getattr(n, "original", n)),
-                )
+        return self._object_documents(
+            nodes,
+            lambda node: f"{node.user_name}\n{getattr(node, 'description', '')}",
+        )
 
-    # ------------------------------------------------------------------
-    def _search_connections(self, regex) -> None:
-        connections = getattr(self.app, "get_all_connections", lambda: [])()
-        for conn in connections:
-            fields = [
-                getattr(conn, "name", ""),
-                getattr(conn, "conn_type", ""),
-                " ".join(getattr(conn, "guard", []) or []),
-            ]
-            if regex.search("\n".join(fields)):
-                label = f"{type(conn).__name__} - {getattr(conn, 'name', '')}"
-                self._add_result(
-                    label,
-                    lambda c=conn: getattr(self.app, "open_connection", lambda *_: None)(c),
-                )
+    def _node_result(self, node):
+        label = (
+            f"{type(node).__name__} ({getattr(node, 'node_type', '')}) - "
+            f"{node.user_name} [{self._node_path(node)}]"
+        )
+        return label, lambda n=node: self.app.window_controllers.open_page_diagram(
+            getattr(n, "original", n)
+        )
 
     # ------------------------------------------------------------------
-    def _search_failures(self, regex) -> None:
-        entries = getattr(self.app, "get_all_fmea_entries", lambda: [])()
-        for entry in entries:
-            fields = [
-                getattr(entry, "user_name", ""),
-                getattr(entry, "description", ""),
-                getattr(entry, "fmea_effect", ""),
-                getattr(entry, "fmea_cause", ""),
-            ]
-            if regex.search("\n".join(fields)):
-                doc_name = ""
-                is_fmeda = False
-                target_doc = None
-                for doc in getattr(self.app, "fmeas", []):
-                    if entry in doc.get("entries", []):
-                        doc_name = doc.get("name", "FMEA")
-                        target_doc = doc
-                        break
-                else:
-                    for doc in getattr(self.app, "fmedas", []):
-                        if entry in doc.get("entries", []):
-                            doc_name = doc.get("name", "FMEA")
-                            target_doc = doc
-                            break
-                label = (
-                    f"{type(entry).__name__} - {entry.user_name or entry.description}"
-                    f" [FMEA: {doc_name or 'Global'}]"
-                )
-
-                def _open(entry=entry, doc=target_doc, fmeda=is_fmeda):
-                    self.app.show_fmea_table(doc, fmeda=fmeda)
-                    tree = getattr(self.app, "_fmea_tree", None)
-                    node_map = getattr(self.app, "_fmea_node_map", {})
-                    if tree and node_map:
-                        for iid, node in node_map.items():
-                            if node is entry:
-                                tree.selection_set(iid)
-                                tree.focus(iid)
-                                tree.see(iid)
-                                break
-                    label = (
-                        f"{type(entry).__name__} - {entry.user_name or entry.description}"
-                        f" [FMEA: {doc_name or 'Global'}]"
-                    )
-                    self.results_box.insert(tk.END, label)
-
-                    def _open(entry=entry, doc=target_doc, fmeda=is_fmeda):
-                        self.app.show_fmea_table(doc, fmeda=fmeda)
-                        tree = getattr(self.app, "_fmea_tree", None)
-                        node_map = getattr(self.app, "_fmea_node_map", {})
-                        if tree and node_map:
-                            for iid, node in node_map.items():
-                                if node is entry:
-                                    tree.selection_set(iid)
-                                    tree.focus(iid)
-                                    tree.see(iid)
-                                    break
-
-                    self.results.append({"label": label, "open": _open})
-
-        if self.hazards_var.get():
-            for hazard in getattr(self.app, "hazards", []):
-                if regex.search(hazard):
-                    label = f"Hazard - {hazard}"
-                    self.results_box.insert(tk.END, label)
-                    self.results.append(
-                        {
-                            "label": label,
-                            "open": lambda h=hazard: getattr(
-                                self.app, "show_hazard_list", lambda *_: None
-                            )(),
-                        }
-                    )
-
-        if self.faults_var.get():
-            for fault in getattr(self.app, "faults", []):
-                if regex.search(fault):
-                    label = f"Fault - {fault}"
-                    self.results_box.insert(tk.END, label)
-                    self.results.append(
-                        {
-                            "label": label,
-                            "open": lambda f=fault: getattr(
-                                self.app,
-                                "show_fault_list",
-                                lambda *_: None,
-                            )(),
-                        }
-                    )
-
-        if self.malfunctions_var.get():
-            malfunc_cb = getattr(
-                self.app,
-                "show_malfunction_editor",
-                getattr(self.app, "show_malfunctions_editor", lambda *_: None),
-            )
-            for mal in getattr(self.app, "malfunctions", []):
-                if regex.search(mal):
-                    label = f"Malfunction - {mal}"
-                    self.results_box.insert(tk.END, label)
-                    self.results.append({"label": label, "open": lambda m=mal: malfunc_cb()})
-
-        if self.fail_list_var.get():
-            for failure in getattr(self.app, "failures", []):
-                if regex.search(failure):
-                    label = f"Failure - {failure}"
-                    self.results_box.insert(tk.END, label)
-                    self.results.append(
-                        {
-                            "label": label,
-                            "open": lambda f=failure: getattr(
-                                self.app,
-                                "show_failure_list",
-                                lambda *_: None,
-                            )(),
-                        }
-                    )
-
-        if self.trigger_var.get():
-            for tc in getattr(self.app, "triggering_conditions", []):
-                if regex.search(tc):
-                    label = f"Triggering Condition - {tc}"
-                    self.results_box.insert(tk.END, label)
-                    self.results.append(
-                        {
-                            "label": label,
-                            "open": lambda t=tc: getattr(
-                                self.app,
-                                "show_triggering_condition_list",
-                                lambda *_: None,
-                            )(),
-                        }
-                    )
-
-        if self.funcins_var.get():
-            for fi in getattr(self.app, "functional_insufficiencies", []):
-                if regex.search(fi):
-                    label = f"Functional Insufficiency - {fi}"
-                    self.results_box.insert(tk.END, label)
-                    self.results.append(
-                        {
-                            "label": label,
-                            "open": lambda f=fi: getattr(
-                                self.app,
-                                "show_functional_insufficiency_list",
-                                lambda *_: None,
-                            )(),
-                        }
-                    )
-
-        # Generic search for any additional categories defined in
-        # ``EXTRA_CATEGORIES`` above.  Each category simply exposes a function
-        # on ``app`` that returns an iterable of objects.  We attempt to match
-        # against common name/description attributes and call the configured
-        # opener when a match is selected.
-        for name, fetcher, opener in self.extra_sources:
-            if not self.extra_vars[name].get():
-                continue
-            items = getattr(self.app, fetcher, lambda: [])()
-            for item in items:
-                text = self._obj_text(item)
-                if regex.search(text):
-                    prefix = name[:-1] if name.endswith("s") else name
-                    label = f"{prefix} - {self._obj_label(item)}"
-                    self.results_box.insert(tk.END, label)
-
-                    def _open(it=item, meth=opener):
-                        func = getattr(self.app, meth, lambda *_: None)
-                        try:
-                            func(it)
-                        except Exception:  # pragma: no cover - best effort
-                            func()
-
-                self._add_result(label, _open)
+    def _connection_documents(self):
+        connections = getattr(self.app, "get_all_connections", lambda: [])()
+        return self._object_documents(
+            connections,
+            lambda conn: "\n".join(
+                [
+                    getattr(conn, "name", ""),
+                    getattr(conn, "conn_type", ""),
+                    " ".join(getattr(conn, "guard", []) or []),
+                ]
+            ),
+        )
 
-    # ------------------------------------------------------------------
-    def _search_hazards(self, regex) -> None:
-        for hazard in getattr(self.app, "hazards", []):
-            if regex.search(hazard):
-                label = f"Hazard - {hazard}"
-                self._add_result(
-                    label,
-                    lambda h=hazard: getattr(self.app, "show_hazard_list", lambda *_: None)(),
-                )
+    def _connection_result(self, conn):
+        label = f"{type(conn).__name__} - {getattr(conn, 'name', '')}"
+        return label, lambda c=conn: getattr(
+            self.app, "open_connection", lambda *_: None
+        )(c)
 
     # ------------------------------------------------------------------
-    def _search_faults(self, regex) -> None:
-        for fault in getattr(self.app, "faults", []):
-            if regex.search(fault):
-                label = f"Fault - {fault}"
-                self._add_result(
-                    label,
-                    lambda f=fault: getattr(self.app, "show_fault_list", lambda *_: None)(),
-                )
+    def _failure_documents(self):
+        entries = getattr(self.app, "get_all_fmea_entries", lambda: [])()
+        return self._object_documents(
+            entries,
+            lambda entry: "\n".join(
+                [
+                    getattr(entry, "user_name", ""),
+                    getattr(entry, "description", ""),
+                    getattr(entry, "fmea_effect", ""),
+                    getattr(entry, "fmea_cause", ""),
+                ]
+            ),
+        )
 
-    # ------------------------------------------------------------------
-    def _search_malfunctions(self, regex) -> None:
-        malfunc_cb = getattr(
-            self.app,
-            "show_malfunction_editor",
-            getattr(self.app, "show_malfunctions_editor", lambda *_: None),
+    def _failure_result(self, entry):
+        doc_name = ""
+        is_fmeda = False
+        target_doc = None
+        for docs, fmeda in (
+            (getattr(self.app, "fmeas", []), False),
+            (getattr(self.app, "fmedas", []), True),
+        ):
+            for doc in docs:
+                if any(e is entry for e in doc.get("entries", [])):
+                    doc_name = doc.get("name", "FMEA")
+                    target_doc = doc
+                    is_fmeda = fmeda
+                    break
+            if target_doc is not None:
+                break
+        label = (
+            f"{type(entry).__name__} - {entry.user_name or entry.description}"
+            f" [FMEA: {doc_name or 'Global'}]"
         )
-        for mal in getattr(self.app, "malfunctions", []):
-            if regex.search(mal):
-                label = f"Malfunction - {mal}"
-                self._add_result(label, lambda m=mal: malfunc_cb())
 
-    # ------------------------------------------------------------------
-    def _search_failure_list(self, regex) -> None:
-        for failure in getattr(self.app, "failures", []):
-            if regex.search(failure):
-                label = f"Failure - {failure}"
-                self._add_result(
-                    label,
-                    lambda f=failure: getattr(
-                        self.app, "show_failure_list", lambda *_: None
-                    )(),
-                )
+        def _open(entry=entry, doc=target_doc, fmeda=is_fmeda):
+            self.app.show_fmea_table(doc, fmeda=fmeda)
+            tree = getattr(self.app, "_fmea_tree", None)
+            node_map = getattr(self.app, "_fmea_node_map", {})
+            if tree and node_map:
+                for iid, node in node_map.items():
+                    if node is entry:
+                        tree.selection_set(iid)
+                        tree.focus(iid)
+                        tree.see(iid)
+                        break
 
-    # ------------------------------------------------------------------
-    def _search_triggers(self, regex) -> None:
-        for tc in getattr(self.app, "triggering_conditions", []):
-            if regex.search(tc):
-                label = f"Triggering Condition - {tc}"
-                self._add_result(
-                    label,
-                    lambda t=tc: getattr(
-                        self.app, "show_triggering_condition_list", lambda *_: None
-                    )(),
-                )
+        return label, _open
 
     # ------------------------------------------------------------------
-    def _search_funcins(self, regex) -> None:
-        for fi in getattr(self.app, "functional_insufficiencies", []):
-            if regex.search(fi):
-                label = f"Functional Insufficiency - {fi}"
-                self._add_result(
-                    label,
-                    lambda f=fi: getattr(
-                        self.app, "show_functional_insufficiency_list", lambda *_: None
-                    )(),
-                )
+    def _search_index(self, keys) -> SearchIndex:
+        """Return the index with the sources in *keys* synchronised.
+
+        Every query re-reads the sources so edits made without an undo
+        checkpoint are found too; only new or edited documents are
+        re-tokenised.
+        """
+        index = getattr(self, "_index", None)
+        if index is None:
+            index = self._index = SearchIndex()
+        for key in keys:
+            documents, _result = self.handlers[key]
+            index.update_source(key, documents())
+        return index
 
     # ------------------------------------------------------------------
     def _run_search(self) -> None:
@@ -496,23 +374,33 @@ class SearchToolbox(ttk.Frame):
             pattern = pattern.strip()
 
         flags = 0 if self.case_var.get() else re.IGNORECASE
+        literal = None
+        prefix = False
+        if self.regex_var.get():
+            source = pattern
+        elif pattern.endswith("*") and len(pattern) > 1:
+            # ``word*`` finds words starting with ``word``.
+            literal = pattern[:-1]
+            prefix = True
+            source = r"\b" + re.escape(literal)
+        else:
+            literal = pattern
+            source = re.escape(pattern)
         try:
-            regex = re.compile(
-                pattern if self.regex_var.get() else re.escape(pattern), flags
-            )
+            regex = re.compile(source, flags)
         except re.error as exc:  # pragma: no cover - user feedback path
             messagebox.showerror("Search", f"Invalid pattern: {exc}")
             return
 
+        self._stream_id = getattr(self, "_stream_id", 0) + 1
         self.results_box.delete(0, tk.END)
         self.results.clear()
         self.current_index = -1
 
-        keys = categories if categories else list(self.handlers.keys())
-        for key in keys:
-            handler = self.handlers.get(key)
-            if handler:
-                handler(regex)
+        keys = [k for k in (categories or self.handlers) if k in self.handlers]
+        index = self._search_index(keys)
+        matches = index.search(regex, keys, literal=literal, prefix=prefix)
+        self._stream_results(matches, self._stream_id)
 
         if self.results:
             self.current_index = 0
@@ -520,6 +408,23 @@ class SearchToolbox(ttk.Frame):
         else:
             messagebox.showinfo("Search", "No matches found.")
 
+    # ------------------------------------------------------------------
+    def _stream_results(self, matches, stream_id: int) -> None:
+        """Insert results from the *matches* iterator into the listbox.
+
+        The first :data:`STREAM_CHUNK` results are added immediately, the
+        rest in further chunks from the Tk event loop so large result sets
+        do not block the UI.  Starting a new search abandons the stream.
+        """
+        if stream_id != getattr(self, "_stream_id", stream_id):
+            return
+        for count, (key, item) in enumerate(matches):
+            label, open_cb = self.handlers[key][1](item)
+            self._add_result(label, open_cb)
+            if count + 1 >= STREAM_CHUNK and hasattr(self, "tk"):
+                self.after_idle(self._stream_results, matches, stream_id)
+                return
+
     # ------------------------------------------------------------------
     def _open_index(self, index: int) -> None:
         self.results_box.select_clear(0, tk.END)
@@ -21,6 +21,7 @@ import math
 import tkinter as tk
 import tkinter.font as tkFont
 from gui.styles.style_manager import StyleManager
+from gui.utils import text_layout
 
 TEXT_BOX_COLOR = "#CFD8DC"
 
@@ -61,6 +62,23 @@ class FTADrawingHelper:
         """No-op for API compatibility."""
         pass
 
+    def make_font(self, size: int = 10, family: str = "Arial"):
+        """Return the label font used when callers do not pass one.
+
+        Headless renderers override this and :meth:`bold_font` to measure
+        text without a Tk interpreter.
+        """
+        return tkFont.Font(family=family, size=size)
+
+    def bold_font(self, font_obj):
+        """Return a bold copy of *font_obj*."""
+        if getattr(font_obj, "headless", False):
+            font = font_obj.copy()
+        else:
+            font = tkFont.Font(font=font_obj)
+        font.configure(weight="bold")
+        return font
+
     def _resolve_outline(self, color: str | None) -> str:
         """Return *color* or the style manager's default outline color."""
         if color is None:
@@ -182,10 +200,7 @@ class FTADrawingHelper:
 
     def get_text_size(self, text, font_obj):
         """Return the (width, height) in pixels needed to render the text with the given font."""
-        lines = text.split("\n")
-        max_width = max(font_obj.measure(line) for line in lines)
-        height = font_obj.metrics("linespace") * len(lines)
-        return max_width, height
+        return text_layout.text_size(font_obj, text)
 
     def draw_page_clone_shape(
         self,
@@ -390,7 +405,7 @@ class FTADrawingHelper:
         """Draw a rotated AND gate shape with top and bottom text labels."""
         outline_color = self._resolve_outline(outline_color)
         if font_obj is None:
-            font_obj = tkFont.Font(family="Arial", size=10)
+            font_obj = self.make_font(10)
         raw_verts = self.compute_rotated_and_gate_vertices(scale)
         flipped = [(vx, -vy) for (vx, vy) in raw_verts]
         xs = [v[0] for v in flipped]
@@ -489,7 +504,7 @@ class FTADrawingHelper:
         """Draw a rotated OR gate shape with text labels."""
         outline_color = self._resolve_outline(outline_color)
         if font_obj is None:
-            font_obj = tkFont.Font(family="Arial", size=10)
+            font_obj = self.make_font(10)
         def cubic_bezier(P0, P1, P2, P3, t):
             return ((1 - t) ** 3 * P0[0] + 3 * (1 - t) ** 2 * t * P1[0] +
                     3 * (1 - t) * t ** 2 * P2[0] + t ** 3 * P3[0],
@@ -678,7 +693,7 @@ class FTADrawingHelper:
     ):
         outline_color = self._resolve_outline(outline_color)
         if font_obj is None:
-            font_obj = tkFont.Font(family="Arial", size=10)
+            font_obj = self.make_font(10)
         effective_scale = scale * 2  
         h = effective_scale * math.sqrt(3) / 2
         v1 = (0, -2 * h / 3)
@@ -901,7 +916,7 @@ class FTADrawingHelper:
         """Draw a triangle-shaped event and mark it as a clone using GSN notation."""
         outline_color = self._resolve_outline(outline_color)
         if font_obj is None:
-            font_obj = tkFont.Font(family="Arial", size=10)
+            font_obj = self.make_font(10)
         # Draw the base triangle as usual.
         self.draw_triangle_shape(
             canvas,
@@ -966,7 +981,7 @@ class GSNDrawingHelper(FTADrawingHelper):
     def _scaled_font(self, scale: float) -> tkFont.Font:
         """Return a font scaled proportionally to *scale*."""
         size = max(1, int(scale / 4))
-        return tkFont.Font(family="Arial", size=size)
+        return self.make_font(size)
 
     def draw_goal_shape(
         self,
@@ -1401,8 +1416,7 @@ class GSNDrawingHelper(FTADrawingHelper):
             width=w - 2 * padding,
             tags=(obj_id,),
         )
-        label_font = tkFont.Font(font=font_obj)
-        label_font.configure(weight="bold")
+        label_font = self.bold_font(font_obj)
         offset = padding
         canvas.create_text(
             right + offset,
@@ -1456,8 +1470,7 @@ class GSNDrawingHelper(FTADrawingHelper):
             width=w - 2 * padding,
             tags=(obj_id,),
         )
-        label_font = tkFont.Font(font=font_obj)
-        label_font.configure(weight="bold")
+        label_font = self.bold_font(font_obj)
         offset = padding
         canvas.create_text(
             right + offset,
@@ -1970,8 +1983,7 @@ class GSNDrawingHelper(FTADrawingHelper):
         )
 
         # A/J label at top-right of the semi-ellipse
-        label_font = tkFont.Font(font=font_obj)
-        label_font.configure(weight="bold")
+        label_font = self.bold_font(font_obj)
         canvas.create_text(
             right - padding,
             arc_top + padding,
@@ -2208,7 +2220,7 @@ class GSNDrawingHelper(FTADrawingHelper):
                            width=w - 2 * pad, tags=(obj_id,))
 
         # A/J OUTSIDE and clear of the stroke: above & to the right
-        lbl_font = tkFont.Font(font=font_obj); lbl_font.configure(weight="bold")
+        lbl_font = self.bold_font(font_obj)
         canvas.create_text(
             right + pad,                 # to the right of the shape
             rect_top - 2 * r_y - pad,    # above the cap
@@ -2306,7 +2318,7 @@ class GSNDrawingHelper(FTADrawingHelper):
 
     # Font sizing policy reused by FTADrawingHelper methods (e.g., circle)
     def _scaled_font(self, scale: float) -> tkFont.Font:
-        return tkFont.Font(family="Arial", size=max(1, int(scale / 4)))
+        return self.make_font(max(1, int(scale / 4)))
 
     # ------------------------
     # Standard (local) GSN nodes
@@ -2630,7 +2642,7 @@ class GSNDrawingHelper(FTADrawingHelper):
                            width=w - 2 * pad, tags=(obj_id,))
 
         # Label above-right of cap (clear of stroke)
-        lbl_font = tkFont.Font(font=font_obj); lbl_font.configure(weight="bold")
+        lbl_font = self.bold_font(font_obj)
         canvas.create_text(right + pad, rect_top - pad,
                            text=label, font=lbl_font, anchor="nw", tags=(obj_id,))
 
@@ -0,0 +1,1053 @@
+# Author: Miguel Marina <karel.capek.robotics@gmail.com>
+# SPDX-License-Identifier: GPL-3.0-or-later
+#
+# Copyright (C) 2025 Capek System Safety & Robotic Solutions
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+"""Render diagrams to images and SVG without a Tk display.
+
+The diagram code draws through the ``tk.Canvas`` item API.  A
+:class:`SceneCanvas` implements that API in pure Python and records the
+items into a :class:`Scene`, so the existing drawing routines - the shapes
+of :mod:`gui.utils.drawing_helper`, :class:`PageDiagram`, :class:`GSNDiagram`
+and the SysML diagram windows - produce the same geometry off-screen.
+Fonts are measured with :class:`HeadlessFont` and gradients are recorded as
+single items instead of hundreds of lines.
+
+Scenes are plain data: :func:`scene_to_svg` writes them as SVG and
+:func:`scene_to_image` rasterises them with Pillow.  :func:`export_scenes`
+writes many scenes through a process pool.
+"""
+
+from __future__ import annotations
+
+import copy
+import logging
+import math
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+from xml.sax.saxutils import escape, quoteattr
+
+from gui.styles.style_manager import StyleManager
+from gui.utils import text_layout
+from gui.utils.drawing_helper import FTADrawingHelper, GSNDrawingHelper
+
+try:  # optional dependency
+    from PIL import Image, ImageColor, ImageDraw, ImageFont
+except Exception:  # pragma: no cover - Pillow may not be installed
+    Image = ImageColor = ImageDraw = ImageFont = None
+
+logger = logging.getLogger(__name__)
+
+# Helvetica advance widths (1/1000 em) for printable ASCII.
+_WIDTHS = dict(
+    zip(
+        (chr(c) for c in range(32, 127)),
+        (
+            278, 278, 355, 556, 556, 889, 667, 191, 333, 333, 389, 584, 278, 333, 278, 278,
+            556, 556, 556, 556, 556, 556, 556, 556, 556, 556, 278, 278, 584, 584, 584, 556,
+            1015, 667, 667, 722, 722, 667, 611, 778, 722, 278, 500, 667, 556, 833, 722, 778,
+            667, 778, 722, 667, 611, 722, 667, 944, 667, 667, 611, 278, 278, 278, 469, 556,
+            333, 556, 556, 500, 556, 556, 278, 556, 556, 222, 222, 500, 222, 833, 556, 556,
+            556, 556, 333, 500, 278, 556, 500, 722, 500, 500, 500, 334, 260, 334, 584,
+        ),
+    )
+)
+_DEFAULT_WIDTH = 556
+_ASCENT = 0.905
+_DESCENT = 0.212
+# Tk point sizes are converted to pixels at 96 dpi.
+POINTS_TO_PIXELS = 96 / 72
+DEFAULT_FONT = ("Arial", 9, "normal")
+
+
+class HeadlessFont:
+    """``tkinter.font.Font`` stand-in with Helvetica metrics.
+
+    Only ``measure``, ``metrics``, ``actual``, ``cget``, ``configure`` and
+    ``copy`` are provided, which is all the drawing code uses.
+    """
+
+    headless = True
+
+    def __init__(self, family: str = "Arial", size: int = 10, weight: str = "normal", font=None) -> None:
+        if font is not None:
+            family, size, weight = font_spec(font)
+        self.family = family
+        self.size = int(size)
+        self.weight = weight
+
+    @property
+    def pixels(self) -> float:
+        """Return the font size in pixels."""
+        return -self.size if self.size < 0 else self.size * POINTS_TO_PIXELS
+
+    def measure(self, text: str) -> int:
+        units = sum(_WIDTHS.get(ch, _DEFAULT_WIDTH) for ch in str(text))
+        if self.weight == "bold":
+            units *= 1.06
+        return int(round(units * self.pixels / 1000))
+
+    def metrics(self, *options):
+        px = self.pixels
+        ascent = int(round(px * _ASCENT))
+        descent = int(round(px * _DESCENT))
+        values = {"ascent": ascent, "descent": descent, "linespace": ascent + descent, "fixed": 0}
+        if len(options) == 1:
+            return values[options[0]]
+        return values
+
+    def actual(self, option: Optional[str] = None):
+        values = {
+            "family": self.family,
+            "size": self.size,
+            "weight": self.weight,
+            "slant": "roman",
+            "underline": 0,
+            "overstrike": 0,
+        }
+        return values[option] if option else values
+
+    def cget(self, option: str):
+        return self.actual(option)
+
+    def configure(self, **options) -> None:
+        self.family = options.get("family", self.family)
+        self.size = int(options.get("size", self.size))
+        self.weight = options.get("weight", self.weight)
+
+    config = configure
+
+    def copy(self) -> "HeadlessFont":
+        return HeadlessFont(self.family, self.size, self.weight)
+
+
+def font_spec(font) -> Tuple[str, int, str]:
+    """Return ``(family, size, weight)`` of a Tk font description."""
+    if font is None or font == "":
+        return DEFAULT_FONT
+    if hasattr(font, "actual"):
+        try:
+            actual = font.actual()
+            return actual["family"], int(actual["size"]), actual.get("weight", "normal")
+        except Exception:
+            return DEFAULT_FONT
+    parts = font.split() if isinstance(font, str) else list(font)
+    family = str(parts[0]) if parts else DEFAULT_FONT[0]
+    try:
+        size = int(parts[1])
+    except (IndexError, TypeError, ValueError):
+        size = DEFAULT_FONT[1]
+    weight = "bold" if "bold" in [str(p) for p in parts[2:]] else "normal"
+    return family, size, weight
+
+
+def layout_text(text: str, font: HeadlessFont, width: float = 0) -> List[str]:
+    """Split *text* into lines, wrapping words at *width* pixels like Tk."""
+    return text_layout.wrap_like_tk(font, str(text), width)
+
+
+@dataclass
+class TextBlock:
+    """Laid out text: the top left corner of each line and the line height."""
+
+    lines: List[Tuple[float, float, str]]
+    box: Tuple[float, float, float, float]
+    font: HeadlessFont
+
+
+def text_block(item: "SceneItem") -> TextBlock:
+    """Return the layout of text *item* following Tk anchor and justify rules."""
+    x, y = item.coords[:2]
+    opts = item.options
+    font = HeadlessFont(*opts.get("font", DEFAULT_FONT))
+    lines = layout_text(opts.get("text", ""), font, float(opts.get("width") or 0))
+    widths = [text_layout.measure(font, line) for line in lines]
+    block_w = max(widths, default=0)
+    line_h = text_layout.linespace(font)
+    block_h = line_h * len(lines)
+    anchor = opts.get("anchor", "center")
+    left = x if "w" in anchor else x - block_w if "e" in anchor else x - block_w / 2
+    top = y if "n" in anchor else y - block_h if "s" in anchor else y - block_h / 2
+    justify = opts.get("justify", "left")
+    placed = []
+    for i, (line, w) in enumerate(zip(lines, widths)):
+        if justify == "center":
+            lx = left + (block_w - w) / 2
+        elif justify == "right":
+            lx = left + block_w - w
+        else:
+            lx = left
+        placed.append((lx, top + i * line_h, line))
+    return TextBlock(placed, (left, top, left + block_w, top + block_h), font)
+
+
+@dataclass
+class SceneItem:
+    """One canvas item: ``kind`` is the Tk item type or ``"gradient"``."""
+
+    kind: str
+    coords: List[float]
+    options: Dict[str, Any] = field(default_factory=dict)
+    tags: Tuple[str, ...] = ()
+    id: int = 0
+
+    def bbox(self) -> Optional[Tuple[float, float, float, float]]:
+        if self.kind == "text":
+            return text_block(self).box
+        if not self.coords:
+            return None
+        xs, ys = self.coords[0::2], self.coords[1::2]
+        pad = 0.0
+        if self.kind in ("line", "polygon", "rectangle", "oval", "arc"):
+            pad = float(self.options.get("width", 1) or 0) / 2
+            if self.kind == "line" and self.options.get("arrow", "none") != "none":
+                pad += _arrowshape(self.options)[2]
+        return min(xs) - pad, min(ys) - pad, max(xs) + pad, max(ys) + pad
+
+
+@dataclass
+class Scene:
+    """Recorded diagram items in drawing order."""
+
+    items: List[SceneItem] = field(default_factory=list)
+    background: str = "white"
+
+    def bbox(self) -> Optional[Tuple[float, float, float, float]]:
+        boxes = [b for b in (item.bbox() for item in self.items) if b]
+        if not boxes:
+            return None
+        return (
+            min(b[0] for b in boxes),
+            min(b[1] for b in boxes),
+            max(b[2] for b in boxes),
+            max(b[3] for b in boxes),
+        )
+
+
+def _flatten(args: Iterable) -> List[float]:
+    coords: List[float] = []
+    for arg in args:
+        if isinstance(arg, (list, tuple)):
+            coords.extend(_flatten(arg))
+        else:
+            coords.append(float(arg))
+    return coords
+
+
+def _tags(value) -> Tuple[str, ...]:
+    if value is None or value == "":
+        return ()
+    if isinstance(value, str):
+        return tuple(value.split())
+    return tuple(str(t) for t in value if t not in (None, ""))
+
+
+class SceneCanvas:
+    """``tk.Canvas`` stand-in recording items without a Tk interpreter."""
+
+    def __init__(self, width: int = 2000, height: int = 2000, background: str = "white") -> None:
+        self._items: Dict[int, SceneItem] = {}
+        self._order: List[int] = []
+        self._next = 0
+        self._options: Dict[str, Any] = {"width": width, "height": height, "bg": background}
+        self.master = None
+
+    # -- item creation -------------------------------------------------
+    def _create(self, kind: str, args: tuple, options: dict) -> int:
+        self._next += 1
+        opts = {k: v for k, v in options.items() if k not in ("tags", "tag")}
+        if "font" in opts:
+            opts["font"] = font_spec(opts["font"])
+        if kind in ("image", "window"):
+            # Photo images and embedded widgets cannot leave the process.
+            opts = {k: v for k, v in opts.items() if k in ("anchor", "width", "height")}
+        tags = _tags(options.get("tags", options.get("tag")))
+        self._items[self._next] = SceneItem(kind, _flatten(args), opts, tags, self._next)
+        self._order.append(self._next)
+        return self._next
+
+    def create_line(self, *args, **kw) -> int:
+        return self._create("line", args, kw)
+
+    def create_polygon(self, *args, **kw) -> int:
+        return self._create("polygon", args, kw)
+
+    def create_rectangle(self, *args, **kw) -> int:
+        return self._create("rectangle", args, kw)
+
+    def create_oval(self, *args, **kw) -> int:
+        return self._create("oval", args, kw)
+
+    def create_arc(self, *args, **kw) -> int:
+        return self._create("arc", args, kw)
+
+    def create_text(self, *args, **kw) -> int:
+        return self._create("text", args, kw)
+
+    def create_image(self, *args, **kw) -> int:
+        return self._create("image", args, kw)
+
+    def create_window(self, *args, **kw) -> int:
+        return self._create("window", args, kw)
+
+    def create_gradient(self, coords, color: str, shape: str = "polygon", tags=None) -> int:
+        """Record a white to *color* horizontal gradient filling *coords*.
+
+        ``shape`` is ``"polygon"`` for a point list or ``"oval"`` for a
+        bounding box.
+        """
+        return self._create("gradient", (coords,), {"fill": color, "shape": shape, "tags": tags})
+
+    # -- queries ---------------------------------------------------------
+    def _select(self, tag_or_id) -> List[int]:
+        if tag_or_id == "all":
+            return list(self._order)
+        if isinstance(tag_or_id, int) or (isinstance(tag_or_id, str) and tag_or_id.isdigit()):
+            item_id = int(tag_or_id)
+            return [item_id] if item_id in self._items else []
+        return [i for i in self._order if tag_or_id in self._items[i].tags]
+
+    def find_all(self) -> Tuple[int, ...]:
+        return tuple(self._order)
+
+    def find_withtag(self, tag) -> Tuple[int, ...]:
+        return tuple(self._select(tag))
+
+    def type(self, item) -> Optional[str]:
+        ids = self._select(item)
+        return self._items[ids[0]].kind if ids else None
+
+    def gettags(self, item) -> Tuple[str, ...]:
+        ids = self._select(item)
+        return self._items[ids[0]].tags if ids else ()
+
+    def coords(self, item, *args):
+        ids = self._select(item)
+        if not ids:
+            return []
+        if args:
+            self._items[ids[0]].coords = _flatten(args)
+        return list(self._items[ids[0]].coords)
+
+    def itemcget(self, item, option: str):
+        ids = self._select(item)
+        return self._items[ids[0]].options.get(option, "") if ids else ""
+
+    def itemconfigure(self, item, **options) -> None:
+        for i in self._select(item):
+            if "font" in options:
+                options["font"] = font_spec(options["font"])
+            if "tags" in options:
+                self._items[i].tags = _tags(options.pop("tags"))
+            self._items[i].options.update(options)
+
+    itemconfig = itemconfigure
+
+    def addtag_withtag(self, new_tag: str, tag) -> None:
+        for i in self._select(tag):
+            if new_tag not in self._items[i].tags:
+                self._items[i].tags += (new_tag,)
+
+    def bbox(self, *tags) -> Optional[Tuple[int, int, int, int]]:
+        boxes = []
+        for tag in tags or ("all",):
+            for i in self._select(tag):
+                item = self._items[i]
+                if item.options.get("state") == "hidden":
+                    continue
+                box = item.bbox()
+                if box:
+                    boxes.append(box)
+        if not boxes:
+            return None
+        return (
+            int(math.floor(min(b[0] for b in boxes))),
+            int(math.floor(min(b[1] for b in boxes))),
+            int(math.ceil(max(b[2] for b in boxes))),
+            int(math.ceil(max(b[3] for b in boxes))),
+        )
+
+    # -- modification ----------------------------------------------------
+    def delete(self, *tags) -> None:
+        for tag in tags:
+            for i in self._select(tag):
+                del self._items[i]
+                self._order.remove(i)
+
+    def move(self, tag, dx: float, dy: float) -> None:
+        for i in self._select(tag):
+            coords = self._items[i].coords
+            for j in range(len(coords)):
+                coords[j] += dx if j % 2 == 0 else dy
+
+    def tag_raise(self, tag, above=None) -> None:
+        self._restack(tag, above, raise_=True)
+
+    def tag_lower(self, tag, below=None) -> None:
+        self._restack(tag, below, raise_=False)
+
+    lift = tag_raise
+    lower = tag_lower
+
+    def _restack(self, tag, ref, raise_: bool) -> None:
+        moving = self._select(tag)
+        if not moving:
+            return
+        rest = [i for i in self._order if i not in moving]
+        refs = [i for i in self._select(ref) if i in rest] if ref is not None else []
+        if refs:
+            pos = rest.index(refs[-1]) + 1 if raise_ else rest.index(refs[0])
+        else:
+            pos = len(rest) if raise_ else 0
+        self._order = rest[:pos] + moving + rest[pos:]
+
+    # -- widget API used by drawing code -----------------------------------
+    def configure(self, **options) -> None:
+        if "background" in options:
+            options["bg"] = options.pop("background")
+        self._options.update(options)
+
+    config = configure
+
+    def cget(self, option: str):
+        return self._options.get("bg" if option == "background" else option, "")
+
+    def winfo_exists(self) -> bool:
+        return True
+
+    def winfo_width(self) -> int:
+        return int(self._options["width"])
+
+    def winfo_height(self) -> int:
+        return int(self._options["height"])
+
+    winfo_reqwidth = winfo_width
+    winfo_reqheight = winfo_height
+
+    def canvasx(self, x, gridspacing=None) -> float:
+        return float(x)
+
+    def canvasy(self, y, gridspacing=None) -> float:
+        return float(y)
+
+    def _ignore(self, *args, **kwargs) -> None:
+        return None
+
+    bind = tag_bind = pack = grid = update = update_idletasks = _ignore
+    xview = yview = scan_mark = scan_dragto = focus_set = _ignore
+
+    def scene(self) -> Scene:
+        """Return the visible drawable items as a :class:`Scene`."""
+        items = [
+            copy.deepcopy(self._items[i])
+            for i in self._order
+            if self._items[i].kind not in ("image", "window")
+            and self._items[i].options.get("state") != "hidden"
+        ]
+        return Scene(items, str(self._options.get("bg") or "white"))
+
+
+class _HeadlessShapes:
+    """Overrides making the drawing helpers work on a :class:`SceneCanvas`."""
+
+    def make_font(self, size: int = 10, family: str = "Arial"):
+        return HeadlessFont(family, size)
+
+    def _gradient(self, canvas, coords, color: str, shape: str, tag=None) -> List[int]:
+        # ``_interpolate_color`` resolves the names the helpers accept.
+        return [canvas.create_gradient(coords, self._interpolate_color(color, 1.0), shape, tag)]
+
+    def _fill_gradient_polygon(self, canvas, points, color: str) -> None:
+        self._gradient(canvas, points, color, "polygon")
+
+    def _fill_gradient_circle(self, canvas, cx, cy, radius, color, tag=None) -> List[int]:
+        return self._fill_gradient_oval(canvas, cx, cy, radius, radius, color, tag)
+
+    def _fill_gradient_oval(self, canvas, cx, cy, rx, ry, color, tag=None) -> List[int]:
+        if rx <= 0 or ry <= 0:
+            return []
+        return self._gradient(canvas, (cx - rx, cy - ry, cx + rx, cy + ry), color, "oval", tag)
+
+    def _fill_gradient_rect(self, canvas, left, top, right, bottom, color) -> None:
+        if right <= left:
+            return
+        points = [(left, top), (right, top), (right, bottom), (left, bottom)]
+        self._gradient(canvas, points, color, "polygon")
+
+
+class HeadlessFTADrawingHelper(_HeadlessShapes, FTADrawingHelper):
+    """Fault tree shapes for :class:`SceneCanvas`."""
+
+
+class HeadlessGSNDrawingHelper(_HeadlessShapes, GSNDrawingHelper):
+    """GSN shapes for :class:`SceneCanvas`."""
+
+
+# ----------------------------------------------------------------------
+# Geometry shared by the SVG and raster back ends
+# ----------------------------------------------------------------------
+def _pairs(coords: Sequence[float]) -> List[Tuple[float, float]]:
+    return list(zip(coords[0::2], coords[1::2]))
+
+
+def _is_true(value) -> bool:
+    return value not in (None, False, 0, "", "0", "false", "no", "none")
+
+
+def _spline(points: List[Tuple[float, float]], closed: bool, steps: int) -> List[Tuple[float, float]]:
+    """Return the quadratic spline Tk draws for ``smooth=True`` items."""
+    if len(points) < 3:
+        return points
+    if closed and points[0] == points[-1]:
+        points = points[:-1]
+    n = len(points)
+
+    def mid(a, b):
+        return ((a[0] + b[0]) / 2, (a[1] + b[1]) / 2)
+
+    segments = []
+    if closed:
+        for i in range(n):
+            segments.append((mid(points[i - 1], points[i]), points[i], mid(points[i], points[(i + 1) % n])))
+    else:
+        for i in range(1, n - 1):
+            start = points[0] if i == 1 else mid(points[i - 1], points[i])
+            end = points[-1] if i == n - 2 else mid(points[i], points[i + 1])
+            segments.append((start, points[i], end))
+    out = [segments[0][0]]
+    for p0, p1, p2 in segments:
+        for s in range(1, steps + 1):
+            t = s / steps
+            a, b, c = (1 - t) ** 2, 2 * (1 - t) * t, t * t
+            out.append((a * p0[0] + b * p1[0] + c * p2[0], a * p0[1] + b * p1[1] + c * p2[1]))
+    return out
+
+
+def _path(item: SceneItem) -> List[Tuple[float, float]]:
+    points = _pairs(item.coords)
+    if _is_true(item.options.get("smooth")):
+        steps = int(item.options.get("splinesteps", 12) or 12)
+        return _spline(points, item.kind == "polygon", steps)
+    return points
+
+
+def _arrowshape(options: dict) -> Tuple[float, float, float]:
+    shape = options.get("arrowshape", (8, 10, 3))
+    if isinstance(shape, str):
+        shape = shape.split()
+    return tuple(float(v) for v in shape)  # type: ignore[return-value]
+
+
+def _arrowheads(item: SceneItem, points: List[Tuple[float, float]]):
+    """Return the line shortened to the arrow necks and the arrow polygons."""
+    arrow = str(item.options.get("arrow", "none"))
+    if arrow == "none" or len(points) < 2:
+        return points, []
+    d1, d2, d3 = _arrowshape(item.options)
+    half = float(item.options.get("width", 1) or 1) / 2
+    points = list(points)
+    heads = []
+
+    def head(tip, prev):
+        dx, dy = tip[0] - prev[0], tip[1] - prev[1]
+        length = math.hypot(dx, dy) or 1.0
+        ux, uy = dx / length, dy / length
+        px, py = -uy, ux
+        side = d3 + half
+        back = (tip[0] - ux * d2, tip[1] - uy * d2)
+        neck = (tip[0] - ux * d1, tip[1] - uy * d1)
+        heads.append([tip, (back[0] + px * side, back[1] + py * side), neck, (back[0] - px * side, back[1] - py * side)])
+        return neck
+
+    if arrow in ("last", "both"):
+        points[-1] = head(points[-1], points[-2])
+    if arrow in ("first", "both"):
+        points[0] = head(points[0], points[1])
+    return points, heads
+
+
+def _dashes(options: dict) -> Tuple[float, ...]:
+    dash = options.get("dash")
+    if not dash:
+        return ()
+    if isinstance(dash, str):
+        return (2.0, 4.0) if dash.strip() == "." else (6.0, 4.0)
+    if isinstance(dash, (int, float)):
+        return (float(dash), float(dash))
+    return tuple(float(d) for d in dash)
+
+
+def _arc_point(box, angle: float) -> Tuple[float, float]:
+    x1, y1, x2, y2 = box
+    cx, cy, rx, ry = (x1 + x2) / 2, (y1 + y2) / 2, abs(x2 - x1) / 2, abs(y2 - y1) / 2
+    rad = math.radians(angle)
+    return cx + rx * math.cos(rad), cy - ry * math.sin(rad)
+
+
+def _color(value) -> Optional[str]:
+    """Return Tk colour *value* in a form SVG and Pillow understand."""
+    if value in (None, ""):
+        return None
+    color = str(value).strip()
+    if color.startswith("#") and len(color) == 13:
+        return "#" + color[1:3] + color[5:7] + color[9:11]
+    lower = color.lower().replace(" ", "")
+    for prefix in ("gray", "grey"):
+        if lower.startswith(prefix) and lower[len(prefix):].isdigit():
+            level = int(round(int(lower[len(prefix):]) * 255 / 100))
+            return f"#{level:02x}{level:02x}{level:02x}"
+    return lower if not color.startswith("#") else color
+
+
+def _defaults(item: SceneItem) -> Tuple[Optional[str], Optional[str]]:
+    """Return the ``(fill, outline)`` colours with Tk's per-type defaults."""
+    opts = item.options
+    if item.kind == "polygon":
+        return _color(opts.get("fill", "black")), _color(opts.get("outline", ""))
+    if item.kind in ("line", "text"):
+        return _color(opts.get("fill", "black")), None
+    return _color(opts.get("fill", "")), _color(opts.get("outline", "black"))
+
+
+# ----------------------------------------------------------------------
+# SVG
+# ----------------------------------------------------------------------
+def _svg_points(points) -> str:
+    return " ".join(f"{x:.2f},{y:.2f}" for x, y in points)
+
+
+def _svg_stroke(color: Optional[str], item: SceneItem) -> str:
+    if not color:
+        return ' stroke="none"'
+    width = float(item.options.get("width", 1) or 1)
+    attrs = f" stroke={quoteattr(color)} stroke-width=\"{width:g}\""
+    dashes = _dashes(item.options)
+    if dashes:
+        attrs += f' stroke-dasharray="{",".join(f"{d:g}" for d in dashes)}"'
+    return attrs
+
+
+def scene_to_svg(scene: Scene, scale: float = 1.0, margin: float = 10) -> str:
+    """Return *scene* as an SVG document."""
+    box = scene.bbox() or (0, 0, 1, 1)
+    x0, y0 = box[0] - margin, box[1] - margin
+    w, h = box[2] - box[0] + 2 * margin, box[3] - box[1] + 2 * margin
+    body: List[str] = []
+    gradients: Dict[str, str] = {}
+    for item in scene.items:
+        fill, outline = _defaults(item)
+        if item.kind == "gradient":
+            gid = gradients.setdefault(fill or "#000000", f"g{len(gradients)}")
+            paint = f' fill="url(#{gid})" stroke="none"'
+            if item.options.get("shape") == "oval":
+                x1, y1, x2, y2 = item.coords
+                body.append(
+                    f'<ellipse cx="{(x1 + x2) / 2:.2f}" cy="{(y1 + y2) / 2:.2f}" '
+                    f'rx="{abs(x2 - x1) / 2:.2f}" ry="{abs(y2 - y1) / 2:.2f}"{paint}/>'
+                )
+            else:
+                body.append(f'<polygon points="{_svg_points(_pairs(item.coords))}"{paint}/>')
+        elif item.kind == "line":
+            points, heads = _arrowheads(item, _path(item))
+            body.append(f'<polyline points="{_svg_points(points)}" fill="none"{_svg_stroke(fill, item)}/>')
+            for head in heads:
+                body.append(f'<polygon points="{_svg_points(head)}" fill={quoteattr(fill or "black")}/>')
+        elif item.kind == "polygon":
+            body.append(
+                f'<polygon points="{_svg_points(_path(item))}" '
+                f'fill={quoteattr(fill or "none")}{_svg_stroke(outline, item)}/>'
+            )
+        elif item.kind in ("rectangle", "oval"):
+            x1, y1, x2, y2 = item.coords[:4]
+            x1, x2 = sorted((x1, x2))
+            y1, y2 = sorted((y1, y2))
+            paint = f"fill={quoteattr(fill or 'none')}{_svg_stroke(outline, item)}"
+            if item.kind == "rectangle":
+                body.append(f'<rect x="{x1:.2f}" y="{y1:.2f}" width="{x2 - x1:.2f}" height="{y2 - y1:.2f}" {paint}/>')
+            else:
+                body.append(
+                    f'<ellipse cx="{(x1 + x2) / 2:.2f}" cy="{(y1 + y2) / 2:.2f}" '
+                    f'rx="{(x2 - x1) / 2:.2f}" ry="{(y2 - y1) / 2:.2f}" {paint}/>'
+                )
+        elif item.kind == "arc":
+            body.append(_svg_arc(item, fill, outline))
+        elif item.kind == "text":
+            block = text_block(item)
+            font = block.font
+            weight = ' font-weight="bold"' if font.weight == "bold" else ""
+            ascent = font.metrics("ascent")
+            for lx, ly, line in block.lines:
+                if line:
+                    body.append(
+                        f'<text x="{lx:.2f}" y="{ly + ascent:.2f}" font-family={quoteattr(font.family)} '
+                        f'font-size="{font.pixels:.2f}"{weight} fill={quoteattr(fill or "black")} '
+                        f'xml:space="preserve">{escape(line)}</text>'
+                    )
+    defs = "".join(
+        f'<linearGradient id="{gid}" x1="0" y1="0" x2="1" y2="0">'
+        f'<stop offset="0" stop-color="#ffffff"/><stop offset="1" stop-color={quoteattr(color)}/>'
+        "</linearGradient>"
+        for color, gid in gradients.items()
+    )
+    background = _color(scene.background) or "white"
+    return (
+        '<svg xmlns="http://www.w3.org/2000/svg" '
+        f'width="{w * scale:.0f}" height="{h * scale:.0f}" viewBox="{x0:.2f} {y0:.2f} {w:.2f} {h:.2f}">'
+        f"<defs>{defs}</defs>"
+        f'<rect x="{x0:.2f}" y="{y0:.2f}" width="{w:.2f}" height="{h:.2f}" fill={quoteattr(background)}/>'
+        + "".join(body)
+        + "</svg>"
+    )
+
+
+def _svg_arc(item: SceneItem, fill: Optional[str], outline: Optional[str]) -> str:
+    box = item.coords[:4]
+    start = float(item.options.get("start", 0))
+    extent = float(item.options.get("extent", 90))
+    style = item.options.get("style", "pieslice")
+    x1, y1, x2, y2 = box
+    rx, ry = abs(x2 - x1) / 2, abs(y2 - y1) / 2
+    p0 = _arc_point(box, start)
+    p1 = _arc_point(box, start + extent)
+    large = 1 if abs(extent) > 180 else 0
+    sweep = 0 if extent > 0 else 1
+    d = f"M{p0[0]:.2f},{p0[1]:.2f} A{rx:.2f},{ry:.2f} 0 {large} {sweep} {p1[0]:.2f},{p1[1]:.2f}"
+    if style == "pieslice":
+        d = f"M{(x1 + x2) / 2:.2f},{(y1 + y2) / 2:.2f} L" + d[1:] + " Z"
+    elif style == "chord":
+        d += " Z"
+    else:
+        fill = None
+    return f'<path d="{d}" fill={quoteattr(fill or "none")}{_svg_stroke(outline, item)}/>'
+
+
+# ----------------------------------------------------------------------
+# Raster
+# ----------------------------------------------------------------------
+_FONT_FILES = ("arial.ttf", "Arial.ttf", "DejaVuSans.ttf", "LiberationSans-Regular.ttf")
+_BOLD_FONT_FILES = ("arialbd.ttf", "Arial Bold.ttf", "DejaVuSans-Bold.ttf", "LiberationSans-Bold.ttf")
+_pil_fonts: Dict[Tuple[int, str], Any] = {}
+
+
+def _pil_font(pixels: int, weight: str):
+    key = (pixels, weight)
+    font = _pil_fonts.get(key)
+    if font is None:
+        files = _BOLD_FONT_FILES + _FONT_FILES if weight == "bold" else _FONT_FILES
+        for name in files:
+            try:
+                font = ImageFont.truetype(name, pixels)
+                break
+            except (IOError, OSError):
+                continue
+        else:
+            font = ImageFont.load_default()
+        _pil_fonts[key] = font
+    return font
+
+
+def _pil_color(value: Optional[str]):
+    if not value:
+        return None
+    try:
+        return ImageColor.getrgb(value)
+    except ValueError:
+        return (0, 0, 0)
+
+
+def _dashed(points, pattern) -> List[List[Tuple[float, float]]]:
+    """Split a polyline into the visible segments of a dash *pattern*."""
+    runs: List[List[Tuple[float, float]]] = []
+    index, left, on = 0, pattern[0], True
+    current: List[Tuple[float, float]] = [points[0]]
+    for a, b in zip(points, points[1:]):
+        length = math.hypot(b[0] - a[0], b[1] - a[1])
+        pos = 0.0
+        while length - pos > left:
+            pos += left
+            t = pos / length if length else 0
+            p = (a[0] + (b[0] - a[0]) * t, a[1] + (b[1] - a[1]) * t)
+            if on:
+                current.append(p)
+                runs.append(current)
+            current = [p]
+            on = not on
+            index = (index + 1) % len(pattern)
+            left = pattern[index]
+        left -= length - pos
+        current.append(b)
+    if on and len(current) > 1:
+        runs.append(current)
+    return runs
+
+
+def scene_to_image(scene: Scene, scale: float = 1.0, margin: float = 10):
+    """Return *scene* rasterised to an RGB :class:`PIL.Image.Image`."""
+    if Image is None:
+        raise ImportError("Pillow required")
+    box = scene.bbox() or (0, 0, 1, 1)
+    x0, y0 = box[0] - margin, box[1] - margin
+    size = (
+        max(1, int(math.ceil((box[2] - box[0] + 2 * margin) * scale))),
+        max(1, int(math.ceil((box[3] - box[1] + 2 * margin) * scale))),
+    )
+    img = Image.new("RGB", size, _pil_color(_color(scene.background) or "white"))
+    draw = ImageDraw.Draw(img)
+
+    def pt(p):
+        return ((p[0] - x0) * scale, (p[1] - y0) * scale)
+
+    def width_of(item) -> int:
+        return max(1, int(round(float(item.options.get("width", 1) or 1) * scale)))
+
+    for item in scene.items:
+        fill, outline = (_pil_color(c) for c in _defaults(item))
+        if item.kind == "gradient":
+            _paste_gradient(img, item, pt)
+        elif item.kind == "line":
+            points, heads = _arrowheads(item, _path(item))
+            points = [pt(p) for p in points]
+            pattern = tuple(d * scale for d in _dashes(item.options))
+            for run in _dashed(points, pattern) if pattern else [points]:
+                draw.line(run, fill=fill, width=width_of(item))
+            for head in heads:
+                draw.polygon([pt(p) for p in head], fill=fill)
+        elif item.kind == "polygon":
+            points = [pt(p) for p in _path(item)]
+            if fill:
+                draw.polygon(points, fill=fill)
+            if outline:
+                draw.line(points + points[:1], fill=outline, width=width_of(item))
+        elif item.kind in ("rectangle", "oval"):
+            x1, y1, x2, y2 = item.coords[:4]
+            (x1, y1), (x2, y2) = pt((min(x1, x2), min(y1, y2))), pt((max(x1, x2), max(y1, y2)))
+            shape = draw.rectangle if item.kind == "rectangle" else draw.ellipse
+            shape([x1, y1, x2, y2], fill=fill, outline=outline, width=width_of(item) if outline else 0)
+        elif item.kind == "arc":
+            x1, y1, x2, y2 = item.coords[:4]
+            bbox = [*pt((min(x1, x2), min(y1, y2))), *pt((max(x1, x2), max(y1, y2)))]
+            start = float(item.options.get("start", 0))
+            extent = float(item.options.get("extent", 90))
+            begin, end = (-(start + extent), -start) if extent > 0 else (-start, -(start + extent))
+            style = item.options.get("style", "pieslice")
+            if style == "arc":
+                draw.arc(bbox, begin, end, fill=outline, width=width_of(item))
+            else:
+                shape = draw.pieslice if style == "pieslice" else draw.chord
+                shape(bbox, begin, end, fill=fill, outline=outline, width=width_of(item) if outline else 0)
+        elif item.kind == "text":
+            block = text_block(item)
+            font = _pil_font(max(1, int(round(block.font.pixels * scale))), block.font.weight)
+            for lx, ly, line in block.lines:
+                if line:
+                    draw.text(pt((lx, ly)), line, fill=fill, font=font)
+    return img
+
+
+def _paste_gradient(img, item: SceneItem, pt) -> None:
+    if item.options.get("shape") == "oval":
+        x1, y1, x2, y2 = item.coords
+        outline = None
+    else:
+        outline = [pt(p) for p in _pairs(item.coords)]
+        xs, ys = [p[0] for p in outline], [p[1] for p in outline]
+        x1, y1, x2, y2 = min(xs), min(ys), max(xs), max(ys)
+    if item.options.get("shape") == "oval":
+        (x1, y1), (x2, y2) = pt((x1, y1)), pt((x2, y2))
+    left, top = int(math.floor(x1)), int(math.floor(y1))
+    w, h = int(math.ceil(x2)) - left + 1, int(math.ceil(y2)) - top + 1
+    if w <= 0 or h <= 0:
+        return
+    end = _pil_color(_color(item.options.get("fill"))) or (0, 0, 0)
+    strip = Image.new("RGB", (w, 1))
+    strip.putdata(
+        [
+            tuple(int(255 * (1 - r) + c * r) for c in end)
+            for r in ((x / (w - 1) if w > 1 else 1.0) for x in range(w))
+        ]
+    )
+    mask = Image.new("L", (w, h), 0)
+    mask_draw = ImageDraw.Draw(mask)
+    if outline is None:
+        mask_draw.ellipse([0, 0, w - 1, h - 1], fill=255)
+    else:
+        mask_draw.polygon([(x - left, y - top) for x, y in outline], fill=255)
+    img.paste(strip.resize((w, h)), (left, top), mask)
+
+
+# ----------------------------------------------------------------------
+# Scenes from model objects
+# ----------------------------------------------------------------------
+_fta_helper = HeadlessFTADrawingHelper()
+
+
+def _canvas() -> SceneCanvas:
+    return SceneCanvas(background=StyleManager.get_instance().canvas_bg)
+
+
+def fta_scene(app, page_node, diagram_mode: str = "FTA") -> Scene:
+    """Return the scene of the fault tree page rooted at *page_node*."""
+    from mainappsrc.core.page_diagram import PageDiagram
+
+    canvas = _canvas()
+    canvas.diagram_mode = diagram_mode
+    page = PageDiagram.__new__(PageDiagram)
+    page.app = app
+    page.root_node = page_node
+    page.canvas = canvas
+    page.diagram_mode = diagram_mode
+    page.zoom = 1.0
+    page.diagram_font = HeadlessFont("Arial", 8)
+    page.grid_size = 20
+    page.selected_node = None
+    page.project_properties = getattr(app, "project_properties", {})
+    page.drawing_helper = _fta_helper
+    page.redraw_canvas()
+    return canvas.scene()
+
+
+def gsn_scene(diagram, zoom: float = 1.0) -> Scene:
+    """Return the scene of GSN *diagram*."""
+    canvas = _canvas()
+    view = copy.copy(diagram)
+    view.drawing_helper = HeadlessGSNDrawingHelper()
+    view.draw(canvas, zoom)
+    return canvas.scene()
+
+
+def sysml_scene(diagram, repo=None) -> Scene:
+    """Return the scene of SysML *diagram* drawn by the diagram window code."""
+    from gui.windows.architecture import SysMLDiagramWindow
+    from mainappsrc.models.sysml.sysml_repository import SysMLRepository
+
+    repo = repo or SysMLRepository.get_instance()
+    canvas = _canvas()
+    # The Tk constructor builds toolboxes and bindings; only the state
+    # redraw reads is set up here, through the same initialiser.
+    win = SysMLDiagramWindow.__new__(SysMLDiagramWindow)
+    win.app = None
+    win._init_draw_state(repo, diagram.diag_id, HeadlessFont("Arial", 8), _fta_helper)
+    win.canvas = canvas
+    win._draw_gradient_rect = lambda x1, y1, x2, y2, color, _obj_id: _fta_helper._fill_gradient_rect(
+        canvas, min(x1, x2), min(y1, y2), max(x1, x2), max(y1, y2), color
+    )
+    win.redraw()
+    return canvas.scene()
+
+
+def cbn_scene(doc) -> Scene:
+    """Return the scene of Causal Bayesian Network *doc*.
+
+    Nodes and edges follow the analysis window; the probability tables
+    shown there as embedded widgets are not part of the scene.
+    """
+    from gui.windows.causal_bayesian_network_window import CausalBayesianNetworkWindow, node_style
+
+    canvas = _canvas()
+    radius = CausalBayesianNetworkWindow.NODE_RADIUS
+    outline = StyleManager.get_instance().outline_color
+    font = HeadlessFont("TkDefaultFont", 10)
+    positions = {name: doc.positions.get(name) or [(100, 100)] for name in doc.network.nodes}
+    for name in doc.network.nodes:
+        color, stereo = node_style(doc.types.get(name))
+        label = f"<<{stereo}>>\n{name}" if stereo else name
+        for x, y in positions[name]:
+            _fta_helper._fill_gradient_circle(canvas, x, y, radius, color)
+            canvas.create_oval(x - radius, y - radius, x + radius, y + radius, outline=outline, fill="")
+            canvas.create_text(x, y, text=label, font=font)
+    for child, parents in doc.network.parents.items():
+        for parent in parents:
+            if parent not in positions or child not in positions:
+                continue
+            (x1, y1), (x2, y2) = positions[parent][0], positions[child][0]
+            dx, dy = x2 - x1, y2 - y1
+            dist = math.hypot(dx, dy) or 1
+            canvas.create_line(
+                x1 + dx / dist * radius,
+                y1 + dy / dist * radius,
+                x2 - dx / dist * radius,
+                y2 - dy / dist * radius,
+                arrow="last",
+            )
+    return canvas.scene()
+
+
+def capture_image(build, *args, scale: float = 3.0):
+    """Return the image of the scene ``build(*args)`` or ``None``.
+
+    ``None`` means Pillow is missing or the diagram could not be drawn
+    headlessly, letting callers fall back to the Tk postscript capture.
+    """
+    if Image is None:
+        return None
+    try:
+        scene = build(*args)
+    except Exception:
+        logger.debug("Headless capture with %s failed", getattr(build, "__name__", build), exc_info=True)
+        return None
+    if not scene.items:
+        logger.debug("Headless capture with %s drew nothing", getattr(build, "__name__", build))
+        return None
+    return scene_to_image(scene, scale)
+
+
+# ----------------------------------------------------------------------
+# Export
+# ----------------------------------------------------------------------
+@dataclass
+class ExportJob:
+    """Write ``scene`` to ``path``; the extension selects SVG or an image format."""
+
+    scene: Scene
+    path: str
+    scale: float = 1.0
+
+
+def write_scene(scene: Scene, path: str, scale: float = 1.0) -> str:
+    """Write *scene* to *path* as SVG or, via Pillow, as an image."""
+    if path.lower().endswith(".svg"):
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(scene_to_svg(scene, scale))
+    else:
+        scene_to_image(scene, scale).save(path)
+    return path
+
+
+def _run_job(job: ExportJob) -> Tuple[str, Optional[str]]:
+    try:
+        write_scene(job.scene, job.path, job.scale)
+    except Exception as exc:
+        return job.path, str(exc) or exc.__class__.__name__
+    return job.path, None
+
+
+def export_scenes(jobs: Sequence[ExportJob], processes: Optional[int] = None) -> List[Tuple[str, Optional[str]]]:
+    """Write every job and return ``(path, error)`` pairs in job order.
+
+    Jobs run in a process pool of *processes* workers (default: CPU
+    count); a single job or ``processes=1`` runs in the calling process.
+    """
+    jobs = list(jobs)
+    workers = processes or os.cpu_count() or 1
+    if workers <= 1 or len(jobs) <= 1:
+        return [_run_job(job) for job in jobs]
+    # Forking would copy the Tk interpreter and the application threads.
+    context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=min(workers, len(jobs)), mp_context=context) as pool:
+        return list(pool.map(_run_job, jobs))
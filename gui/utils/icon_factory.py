@@ -20,6 +20,9 @@ import tkinter as tk
 from typing import Optional
 import math
 
+from gui.utils import image_factory
+from gui.utils.image_factory import PixelBuffer
+
 
 def create_icon(
     shape: str,
@@ -32,9 +35,10 @@ def create_icon(
     Icons now have filled interiors and simple outlines so they look like
     miniature versions of the objects they represent. By default the returned
     image has a transparent background so the icons blend with any widget.
-    The implementation is deliberately lightweight and only uses
-    ``tk.PhotoImage`` drawing primitives so it works in the same environments
-    as the previous icon helpers.
+    Shapes are painted into an off-screen
+    :class:`~gui.utils.image_factory.PixelBuffer` and rendered in one Tcl
+    call; the resulting image is cached and shared, so callers must not
+    modify it.
 
     Parameters
     ----------
@@ -47,7 +51,15 @@ def create_icon(
     size:
         Width and height of the icon in pixels.
     """
-    img = tk.PhotoImage(width=size, height=size)
+    return image_factory.icon(
+        (shape, color, bg, size),
+        size,
+        lambda img: _paint_icon(img, shape, color, bg, size),
+    )
+
+
+def _paint_icon(img: PixelBuffer, shape: str, color: str, bg: Optional[str], size: int) -> None:
+    """Draw *shape* into *img* using ``PhotoImage.put`` style calls."""
     if bg:
         img.put(bg, to=(0, 0, size - 1, size - 1))
     c = color
@@ -1002,4 +1014,3 @@ def create_icon(
         for y in range(2, size - 2):
             img.put(outline, (2, y))
             img.put(outline, (size - 2, y))
-    return img
@@ -0,0 +1,422 @@
+# Author: Miguel Marina <karel.capek.robotics@gmail.com>
+# SPDX-License-Identifier: GPL-3.0-or-later
+#
+# Copyright (C) 2025 Capek System Safety & Robotic Solutions
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+"""Batched and cached construction of ``tk.PhotoImage`` objects.
+
+Painting an image with one ``PhotoImage.put`` per pixel costs a Tcl round
+trip per pixel.  Drawing code instead paints into a :class:`PixelBuffer`,
+which accepts the same ``put`` calls in pure Python, and :func:`render`
+turns the finished buffer into a photo image with a single Tcl call: one
+``put`` of row data for opaque images.  Images with transparent pixels are
+handed to Pillow's ``ImageTk``; without Pillow they are loaded from an
+in-memory PNG written by a small built-in encoder.
+
+Rendered icons and gradients are kept in LRU caches keyed by their
+parameters so repeated requests share one image.  Icons can additionally be
+persisted as a pre-rendered atlas on disk with :func:`use_atlas` and
+:func:`save_atlas`.
+"""
+
+from __future__ import annotations
+
+import base64
+import io
+import json
+import os
+import struct
+import zlib
+from collections import OrderedDict
+from typing import Callable, Dict, Hashable, Iterable, List, Optional, Sequence, Tuple
+
+import tkinter as tk
+
+try:  # optional dependency
+    from PIL import Image, ImageTk
+except Exception:  # pragma: no cover - Pillow may not be installed
+    Image = ImageTk = None
+
+Color = Optional[str]
+RGB = Tuple[int, int, int]
+
+ICON_CACHE_SIZE = 512
+GRADIENT_CACHE_SIZE = 256
+
+
+class PixelBuffer:
+    """Off-screen RGB pixel grid understanding ``PhotoImage.put`` calls.
+
+    Pixels hold Tk colour strings; ``None`` marks a transparent pixel.
+    Writes outside the buffer are clipped.
+    """
+
+    def __init__(self, width: int, height: int) -> None:
+        self.width = max(1, int(width))
+        self.height = max(1, int(height))
+        self.pixels: List[List[Color]] = [[None] * self.width for _ in range(self.height)]
+
+    def put(self, data, to: Optional[Sequence[int]] = None) -> None:
+        """Write *data* like :meth:`tk.PhotoImage.put`.
+
+        *data* is a colour or a sequence of rows of colours.  With a two
+        element ``to`` the data is placed at that position; with four
+        elements it is tiled over the rectangle ``[x1, x2) x [y1, y2)``.
+        """
+        block = [[data]] if isinstance(data, str) else [list(row) for row in data]
+        if not block or not block[0]:
+            return
+        bh, bw = len(block), len(block[0])
+        if to is None:
+            x1, y1, x2, y2 = 0, 0, bw, bh
+        elif len(to) == 2:
+            x1, y1 = int(to[0]), int(to[1])
+            x2, y2 = x1 + bw, y1 + bh
+        else:
+            x1, y1, x2, y2 = (int(v) for v in to)
+            if x2 < x1:
+                x1, x2 = x2, x1
+            if y2 < y1:
+                y1, y2 = y2, y1
+        for y in range(max(0, y1), min(self.height, y2)):
+            src = block[(y - y1) % bh]
+            row = self.pixels[y]
+            for x in range(max(0, x1), min(self.width, x2)):
+                row[x] = src[(x - x1) % bw]
+
+    def get(self, x: int, y: int) -> Color:
+        """Return the colour at ``(x, y)`` or ``None`` if transparent."""
+        return self.pixels[y][x]
+
+    def opaque(self) -> bool:
+        """Return ``True`` if no pixel is transparent."""
+        return all(None not in row for row in self.pixels)
+
+    def recolor(self, func: Callable[[str], str]) -> "PixelBuffer":
+        """Return a copy with *func* applied to every opaque pixel."""
+        mapped: Dict[str, str] = {}
+        copy = PixelBuffer(self.width, self.height)
+        for y, row in enumerate(self.pixels):
+            out = copy.pixels[y]
+            for x, color in enumerate(row):
+                if color is not None:
+                    if color not in mapped:
+                        mapped[color] = func(color)
+                    out[x] = mapped[color]
+        return copy
+
+    def spans(self) -> Iterable[Tuple[int, int, List[str]]]:
+        """Yield ``(x, y, colours)`` for each run of opaque pixels."""
+        for y, row in enumerate(self.pixels):
+            x = 0
+            while x < self.width:
+                if row[x] is None:
+                    x += 1
+                    continue
+                start = x
+                while x < self.width and row[x] is not None:
+                    x += 1
+                yield start, y, row[start:x]
+
+
+def row_data(rows: Iterable[Sequence[str]]) -> str:
+    """Return *rows* of colours as the Tcl list accepted by ``put``."""
+    return " ".join("{" + " ".join(row) + "}" for row in rows)
+
+
+def parse_color(color: str, master=None) -> RGB:
+    """Return the 8-bit RGB value of Tk *color*.
+
+    Hex colours are parsed directly; names need a Tk interpreter and raise
+    :class:`ValueError` when none is available.
+    """
+    if color.startswith("#") and len(color) in (4, 7, 13):
+        digits = (len(color) - 1) // 3
+        try:
+            values = [int(color[1 + i * digits : 1 + (i + 1) * digits], 16) for i in range(3)]
+        except ValueError:
+            raise ValueError(f"unknown colour {color!r}") from None
+        scale = 16 ** digits - 1
+        return tuple(round(v * 255 / scale) for v in values)  # type: ignore[return-value]
+    widget = master or getattr(tk, "_default_root", None)
+    if widget is None:
+        raise ValueError(f"cannot resolve colour {color!r} without Tk")
+    try:
+        r, g, b = widget.winfo_rgb(color)
+    except tk.TclError:
+        raise ValueError(f"unknown colour {color!r}") from None
+    return r >> 8, g >> 8, b >> 8
+
+
+def _rgba_bytes(buffer: PixelBuffer, master=None) -> bytes:
+    """Return the pixels of *buffer* as 8-bit RGBA rows."""
+    resolved: Dict[str, bytes] = {}
+    raw = bytearray()
+    for row in buffer.pixels:
+        for color in row:
+            if color is None:
+                raw += b"\0\0\0\0"
+                continue
+            px = resolved.get(color)
+            if px is None:
+                px = resolved[color] = bytes(parse_color(color, master)) + b"\xff"
+            raw += px
+    return bytes(raw)
+
+
+def _pil_image(buffer: PixelBuffer, master=None):
+    return Image.frombytes("RGBA", (buffer.width, buffer.height), _rgba_bytes(buffer, master))
+
+
+def _encode_png(width: int, height: int, rgba: bytes) -> bytes:
+    """Encode RGBA rows as an unfiltered PNG, for use without Pillow."""
+    stride = width * 4
+    raw = b"".join(b"\0" + rgba[y * stride : (y + 1) * stride] for y in range(height))
+
+    def chunk(kind: bytes, body: bytes) -> bytes:
+        return struct.pack(">I", len(body)) + kind + body + struct.pack(">I", zlib.crc32(kind + body))
+
+    header = struct.pack(">IIBBBBB", width, height, 8, 6, 0, 0, 0)
+    return (
+        b"\x89PNG\r\n\x1a\n"
+        + chunk(b"IHDR", header)
+        + chunk(b"IDAT", zlib.compress(raw))
+        + chunk(b"IEND", b"")
+    )
+
+
+def png_bytes(buffer: PixelBuffer, master=None) -> bytes:
+    """Return *buffer* encoded as an RGBA PNG."""
+    if Image is None:
+        return _encode_png(buffer.width, buffer.height, _rgba_bytes(buffer, master))
+    out = io.BytesIO()
+    _pil_image(buffer, master).save(out, format="PNG")
+    return out.getvalue()
+
+
+def render(buffer: PixelBuffer, master=None) -> tk.PhotoImage:
+    """Return a photo image showing *buffer*, built in one Tcl call.
+
+    Transparent pixels need Pillow or the PNG path; if a colour cannot be
+    resolved there, opaque runs are written with one ``put`` per run
+    instead.
+    """
+    kwargs = {"master": master} if master is not None else {}
+    if buffer.opaque():
+        img = tk.PhotoImage(width=buffer.width, height=buffer.height, **kwargs)
+        img.put(row_data(buffer.pixels), to=(0, 0))
+        return img
+    try:
+        if ImageTk is not None:
+            return ImageTk.PhotoImage(_pil_image(buffer, master), **kwargs)
+        data = base64.b64encode(png_bytes(buffer, master)).decode("ascii")
+        return tk.PhotoImage(data=data, format="png", **kwargs)
+    except (ValueError, tk.TclError):
+        pass
+    img = tk.PhotoImage(width=buffer.width, height=buffer.height, **kwargs)
+    for x, y, colors in buffer.spans():
+        img.put(row_data([colors]), to=(x, y))
+    return img
+
+
+class LRUCache:
+    """Mapping bounded to *maxsize* entries, evicting the least recently used."""
+
+    def __init__(self, maxsize: int) -> None:
+        self.maxsize = maxsize
+        self._items: "OrderedDict[Hashable, object]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._items
+
+    def get(self, key: Hashable, default=None):
+        try:
+            self._items.move_to_end(key)
+        except KeyError:
+            return default
+        return self._items[key]
+
+    def put(self, key: Hashable, value) -> None:
+        self._items[key] = value
+        self._items.move_to_end(key)
+        while len(self._items) > self.maxsize:
+            self._items.popitem(last=False)
+
+    def pop(self, key: Hashable, default=None):
+        return self._items.pop(key, default)
+
+    def clear(self) -> None:
+        self._items.clear()
+
+
+_icons = LRUCache(ICON_CACHE_SIZE)
+_gradients = LRUCache(GRADIENT_CACHE_SIZE)
+# Source pixels of images built here, by Tk image name, for recolouring.
+_sources = LRUCache(ICON_CACHE_SIZE + GRADIENT_CACHE_SIZE)
+_atlas: Optional["IconAtlas"] = None
+
+
+def _root():
+    # Images belong to an interpreter; a new root must not reuse old images.
+    return getattr(tk, "_default_root", None)
+
+
+def _remember(img: tk.PhotoImage, buffer: PixelBuffer) -> tk.PhotoImage:
+    _sources.put(str(img), buffer)
+    return img
+
+
+class IconAtlas:
+    """Pre-rendered icons stored as base64 PNG data in a JSON file."""
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self.entries: Dict[str, str] = {}
+        self.dirty = False
+        try:
+            with open(path, encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            data = {}
+        if isinstance(data, dict):
+            self.entries = {str(k): v for k, v in data.items() if isinstance(v, str)}
+
+    @staticmethod
+    def key(params: Sequence) -> str:
+        return "|".join("" if p is None else str(p) for p in params)
+
+    def add(self, params: Sequence, buffer: PixelBuffer) -> None:
+        try:
+            data = base64.b64encode(png_bytes(buffer)).decode("ascii")
+        except ValueError:
+            return
+        name = self.key(params)
+        if self.entries.get(name) != data:
+            self.entries[name] = data
+            self.dirty = True
+
+    def save(self) -> None:
+        if not self.dirty:
+            return
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        with open(self.path, "w", encoding="utf-8") as f:
+            json.dump(self.entries, f, sort_keys=True)
+        self.dirty = False
+
+
+def use_atlas(path: Optional[str]) -> Optional[IconAtlas]:
+    """Load icons from the atlas at *path*; ``None`` disables the atlas."""
+    global _atlas
+    _atlas = IconAtlas(path) if path else None
+    return _atlas
+
+
+def save_atlas() -> None:
+    """Write icons rendered since :func:`use_atlas` back to the atlas file."""
+    if _atlas is not None:
+        _atlas.save()
+
+
+def icon(params: Tuple, size: int, paint: Callable[[PixelBuffer], None]) -> tk.PhotoImage:
+    """Return the cached icon for *params*, painting it on first use.
+
+    *paint* draws into a fresh ``size`` x ``size`` :class:`PixelBuffer`.
+    Callers share the returned image and must not modify it.
+    """
+    key = (_root(),) + tuple(params)
+    img = _icons.get(key)
+    if img is not None:
+        return img
+    if _atlas is not None:
+        data = _atlas.entries.get(IconAtlas.key(params))
+        if data is not None:
+            try:
+                img = tk.PhotoImage(data=data, format="png")
+            except tk.TclError:
+                img = None
+            if img is not None:
+                _icons.put(key, img)
+                return img
+    buffer = PixelBuffer(size, size)
+    paint(buffer)
+    if _atlas is not None:
+        _atlas.add(params, buffer)
+    img = _remember(render(buffer), buffer)
+    _icons.put(key, img)
+    return img
+
+
+def gradient_row(width: int, color: str) -> List[str]:
+    """Return the colours of a left-to-right white to *color* gradient."""
+    r, g, b = parse_color(color)
+    row = []
+    for x in range(width):
+        ratio = x / (width - 1) if width > 1 else 1
+        nr = int(255 * (1 - ratio) + r * ratio)
+        ng = int(255 * (1 - ratio) + g * ratio)
+        nb = int(255 * (1 - ratio) + b * ratio)
+        row.append(f"#{nr:02x}{ng:02x}{nb:02x}")
+    return row
+
+
+def gradient(width: int, height: int, color: str, master=None) -> tk.PhotoImage:
+    """Return a cached ``width`` x ``height`` horizontal gradient image.
+
+    The image is filled by tiling one row of colours in a single ``put``.
+    """
+    width = max(1, int(width))
+    height = max(1, int(height))
+    key = (master or _root(), width, height, color)
+    img = _gradients.get(key)
+    if img is not None:
+        return img
+    row = gradient_row(width, color)
+    kwargs = {"master": master} if master is not None else {}
+    img = tk.PhotoImage(width=width, height=height, **kwargs)
+    img.put(row_data([row]), to=(0, 0, width, height))
+    _gradients.put(key, img)
+    return img
+
+
+def recolor(img: tk.PhotoImage, func: Callable[[str], str]) -> Optional[tk.PhotoImage]:
+    """Return a copy of *img* with *func* applied to its opaque pixels.
+
+    Only images built by this module are known; ``None`` is returned for
+    others.  Colour names are converted to ``#rrggbb`` before *func* sees
+    them.
+    """
+    buffer = _sources.get(str(img))
+    if buffer is None:
+        return None
+
+    def mapped(color: str) -> str:
+        return func("#%02x%02x%02x" % parse_color(color))
+
+    try:
+        new = buffer.recolor(mapped)
+    except ValueError:
+        return None
+    return _remember(render(new), new)
+
+
+def clear_cache() -> None:
+    """Drop all cached images."""
+    _icons.clear()
+    _gradients.clear()
+    _sources.clear()
@@ -0,0 +1,105 @@
+# Author: Miguel Marina <karel.capek.robotics@gmail.com>
+# SPDX-License-Identifier: GPL-3.0-or-later
+#
+# Copyright (C) 2025 Capek System Safety & Robotic Solutions
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+"""Bookkeeping for retained-mode canvas rendering.
+
+Diagram windows draw each object and connection through a
+:class:`TaggingCanvas` so every canvas item belonging to it carries one
+group tag.  :class:`CanvasScene` remembers, per group, the state it was
+drawn from.  Later frames compare the live model with that state and patch
+the canvas: a translated group is shifted with a single ``canvas.move``
+call, a group whose appearance changed is deleted and drawn again, and
+untouched groups cost no canvas calls at all.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Any, Dict, Hashable, List, Optional, Tuple
+
+
+class TaggingCanvas:
+    """Proxy for a canvas adding ``tag`` to every item it creates."""
+
+    def __init__(self, canvas: Any, tag: str) -> None:
+        self._canvas = canvas
+        self._tag = tag
+
+    def __getattr__(self, name: str) -> Any:
+        attr = getattr(self._canvas, name)
+        if not name.startswith("create_"):
+            return attr
+
+        def create(*args, **kwargs):
+            tags = kwargs.get("tags")
+            if tags is None or tags == "":
+                kwargs["tags"] = self._tag
+            elif isinstance(tags, str):
+                kwargs["tags"] = (tags, self._tag)
+            else:
+                kwargs["tags"] = (*tags, self._tag)
+            return attr(*args, **kwargs)
+
+        return create
+
+
+@dataclass
+class Group:
+    """Canvas items drawn for one model object or connection."""
+
+    tag: str
+    state: Tuple[Any, ...]
+
+
+class CanvasScene:
+    """Map model objects and connections to their canvas item groups."""
+
+    def __init__(self) -> None:
+        self.objects: Dict[int, Group] = {}
+        self.connections: Dict[int, Group] = {}
+        self.frame: Optional[Hashable] = None
+        self.object_order: List[int] = []
+        self.connection_order: List[int] = []
+        self._serial = 0
+
+    def clear(self) -> None:
+        self.objects.clear()
+        self.connections.clear()
+        self.frame = None
+        self.object_order = []
+        self.connection_order = []
+
+    def new_tag(self, kind: str) -> str:
+        self._serial += 1
+        return f"_{kind}{self._serial}"
+
+    def matches(
+        self, frame: Hashable, object_order: List[int], connection_order: List[int]
+    ) -> bool:
+        """Return ``True`` if the scene can be patched for this frame.
+
+        The frame key captures everything drawn identically for all groups
+        (zoom, fonts, colours, ...); the orders capture which objects and
+        connections are visible and how they are stacked.
+        """
+        return (
+            self.frame is not None
+            and self.frame == frame
+            and self.object_order == object_order
+            and self.connection_order == connection_order
+        )
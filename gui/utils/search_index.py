@@ -0,0 +1,268 @@
+# Author: Miguel Marina <karel.capek.robotics@gmail.com>
+# SPDX-License-Identifier: GPL-3.0-or-later
+#
+# Copyright (C) 2025 Capek System Safety & Robotic Solutions
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+"""Incremental inverted index used by the search toolbox.
+
+Documents are grouped in *sources* (one per search category) and identified
+by a key that is stable within the source.  Each document's case-folded text
+is indexed by trigram and by word token:
+
+* substring queries intersect the posting sets of the query's trigrams,
+* prefix queries look up the sorted token list with :mod:`bisect`, or fall
+  back to the substring lookup when the prefix is not a single word,
+* regular expressions are reduced to their longest mandatory literal which
+  selects the candidates the compiled pattern is then run against.
+
+The index only narrows the set of documents; the final decision is always
+taken by the caller's compiled regular expression so results are identical
+to a full scan.  :meth:`SearchIndex.update_source` re-tokenises only the
+documents whose text changed since the previous update.  Searches snapshot
+their candidates first, so results can be consumed lazily while the index
+is updated.
+"""
+
+from __future__ import annotations
+
+import bisect
+import re
+from typing import Any, Dict, Hashable, Iterable, Iterator, List, Optional, Set, Tuple
+
+try:  # Python 3.11+
+    import re._parser as _sre_parse
+    from re._constants import LITERAL, SUBPATTERN
+except ImportError:  # pragma: no cover - older interpreters
+    import sre_parse as _sre_parse
+    from sre_constants import LITERAL, SUBPATTERN
+
+GRAM = 3
+
+_TOKEN_RE = re.compile(r"\w+")
+
+
+def _fold(text: str) -> str:
+    return text.casefold()
+
+
+def _grams(folded: str) -> Set[str]:
+    return {folded[i : i + GRAM] for i in range(len(folded) - GRAM + 1)}
+
+
+def required_literal(pattern: str, flags: int = 0) -> str:
+    """Return the longest literal every match of *pattern* must contain.
+
+    Only literal runs at the top level of the pattern (or inside plain
+    groups) are considered, so alternations, classes and repeated items
+    simply end the current run.  An empty string means the pattern has no
+    usable literal and every document is a candidate.
+    """
+    try:
+        parsed = _sre_parse.parse(pattern, flags)
+    except re.error:
+        return ""
+    best = ""
+
+    def walk(items) -> None:
+        nonlocal best
+        run: List[str] = []
+        for op, arg in items:
+            if op is LITERAL:
+                run.append(chr(arg))
+                continue
+            if len(run) > len(best):
+                best = "".join(run)
+            run = []
+            if op is SUBPATTERN:
+                walk(arg[-1])
+        if len(run) > len(best):
+            best = "".join(run)
+
+    walk(parsed)
+    return best
+
+
+class _Document:
+    __slots__ = ("doc_id", "source", "key", "text", "folded", "item", "seq")
+
+    def __init__(self, doc_id: int, source: str, key: Hashable, text: str, item: Any, seq: int):
+        self.doc_id = doc_id
+        self.source = source
+        self.key = key
+        self.text = text
+        self.folded = _fold(text)
+        self.item = item
+        self.seq = seq
+
+
+class SearchIndex:
+    """Trigram and token index over the text of model objects."""
+
+    def __init__(self) -> None:
+        self._docs: Dict[int, _Document] = {}
+        self._by_key: Dict[str, Dict[Hashable, _Document]] = {}
+        self._grams: Dict[str, Set[int]] = {}
+        self._tokens: Dict[str, Set[int]] = {}
+        self._sorted_tokens: Optional[List[str]] = None
+        self._next_id = 0
+
+    def __len__(self) -> int:
+        return len(self._docs)
+
+    # ------------------------------------------------------------------
+    # Maintenance
+    # ------------------------------------------------------------------
+    def _add(self, doc: _Document) -> None:
+        self._docs[doc.doc_id] = doc
+        for gram in _grams(doc.folded):
+            self._grams.setdefault(gram, set()).add(doc.doc_id)
+        for token in set(_TOKEN_RE.findall(doc.folded)):
+            postings = self._tokens.get(token)
+            if postings is None:
+                postings = self._tokens[token] = set()
+                self._sorted_tokens = None
+            postings.add(doc.doc_id)
+
+    def _discard(self, doc: _Document) -> None:
+        del self._docs[doc.doc_id]
+        for gram in _grams(doc.folded):
+            postings = self._grams.get(gram)
+            if postings is not None:
+                postings.discard(doc.doc_id)
+                if not postings:
+                    del self._grams[gram]
+        for token in set(_TOKEN_RE.findall(doc.folded)):
+            postings = self._tokens.get(token)
+            if postings is not None:
+                postings.discard(doc.doc_id)
+                if not postings:
+                    del self._tokens[token]
+                    self._sorted_tokens = None
+
+    def update_source(
+        self, source: str, documents: Iterable[Tuple[Hashable, str, Any]]
+    ) -> None:
+        """Synchronise *source* with ``(key, text, item)`` *documents*.
+
+        Documents whose key and text are unchanged keep their postings; only
+        new, edited and vanished documents touch the index.
+        """
+        previous = self._by_key.get(source, {})
+        current: Dict[Hashable, _Document] = {}
+        for seq, (key, text, item) in enumerate(documents):
+            if key in current:
+                continue
+            doc = previous.pop(key, None)
+            if doc is not None and doc.text == text:
+                doc.item = item
+                doc.seq = seq
+            else:
+                if doc is not None:
+                    self._discard(doc)
+                doc = _Document(self._next_id, source, key, text, item, seq)
+                self._next_id += 1
+                self._add(doc)
+            current[key] = doc
+        for doc in previous.values():
+            self._discard(doc)
+        self._by_key[source] = current
+
+    def remove_source(self, source: str) -> None:
+        """Forget every document of *source*."""
+        for doc in self._by_key.pop(source, {}).values():
+            self._discard(doc)
+
+    def clear(self) -> None:
+        self.__init__()
+
+    # ------------------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------------------
+    def substring_candidates(self, literal: str) -> Optional[Set[int]]:
+        """Return ids of documents containing *literal* ignoring case.
+
+        ``None`` means *literal* is too short to use the index and every
+        document is a candidate.
+        """
+        folded = _fold(literal)
+        if len(folded) < GRAM:
+            return None
+        grams = sorted(_grams(folded), key=lambda g: len(self._grams.get(g, ())))
+        result: Optional[Set[int]] = None
+        for gram in grams:
+            postings = self._grams.get(gram)
+            if not postings:
+                return set()
+            result = set(postings) if result is None else result & postings
+            if not result:
+                return result
+        return {i for i in result if folded in self._docs[i].folded}
+
+    def prefix_candidates(self, prefix: str) -> Set[int]:
+        """Return ids of documents holding a word starting with *prefix*."""
+        folded = _fold(prefix)
+        if self._sorted_tokens is None:
+            self._sorted_tokens = sorted(self._tokens)
+        tokens = self._sorted_tokens
+        result: Set[int] = set()
+        start = bisect.bisect_left(tokens, folded)
+        for token in tokens[start:]:
+            if not token.startswith(folded):
+                break
+            result |= self._tokens[token]
+        return result
+
+    def search(
+        self,
+        regex: "re.Pattern[str]",
+        sources: Optional[Iterable[str]] = None,
+        literal: Optional[str] = None,
+        prefix: bool = False,
+    ) -> Iterator[Tuple[str, Any]]:
+        """Yield ``(source, item)`` for documents matched by *regex*.
+
+        Results follow the order of *sources* and, within a source, the order
+        documents were supplied in.  *literal* is the text every match must
+        contain; it defaults to the longest mandatory literal of *regex*.
+        When *prefix* is true *literal* must start a word instead; prefixes
+        that are not a single word token are looked up as substrings.
+
+        The candidates are collected before this returns and the regular
+        expression is run as the iterator is consumed, so later index
+        updates do not affect a search in progress.
+        """
+        if literal is None:
+            literal = required_literal(regex.pattern, regex.flags)
+        if prefix and _TOKEN_RE.fullmatch(_fold(literal)):
+            candidates: Optional[Set[int]] = self.prefix_candidates(literal)
+        else:
+            candidates = self.substring_candidates(literal) if literal else None
+        grouped: Dict[str, List[_Document]] = {}
+        if candidates is not None:
+            for doc_id in candidates:
+                doc = self._docs[doc_id]
+                grouped.setdefault(doc.source, []).append(doc)
+        order = list(self._by_key) if sources is None else list(sources)
+        pool: List[Tuple[str, str, Any]] = []
+        for source in order:
+            if candidates is None:
+                docs: Iterable[_Document] = self._by_key.get(source, {}).values()
+            else:
+                docs = sorted(grouped.get(source, ()), key=lambda d: d.seq)
+            pool.extend((source, doc.text, doc.item) for doc in docs)
+        return (
+            (source, item) for source, text, item in pool if regex.search(text)
+        )
@@ -0,0 +1,544 @@
+# Author: Miguel Marina <karel.capek.robotics@gmail.com>
+# SPDX-License-Identifier: GPL-3.0-or-later
+#
+# Copyright (C) 2025 Capek System Safety & Robotic Solutions
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+"""Spatial indexes for diagram hit-testing.
+
+:class:`DiagramObjectStore` and :class:`DiagramConnectionStore` are ``list``
+subclasses so diagram windows keep appending, sorting and slicing
+``objects`` and ``connections`` as before.  Every mutation also maintains a
+:class:`UniformGrid` over bounding boxes expressed in diagram units, which
+makes the boxes independent of the canvas zoom.  Objects and connections
+notify the store they belong to when a geometric attribute is reassigned
+(see ``SysMLObject.__setattr__`` and ``DiagramConnection.__setattr__``);
+bend points are held in a :class:`PointList` that reports in-place edits.
+
+The link from an item to its store is kept in a module-level table rather
+than on the item, so ``obj.__dict__`` stays a plain field mapping that can be
+written to the repository and serialised.
+"""
+
+from __future__ import annotations
+
+import math
+import weakref
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+BBox = Tuple[float, float, float, float]
+
+# Attributes of ``SysMLObject`` that affect its position in the indexes.
+OBJECT_FIELDS = ("obj_id", "x", "y", "width", "height")
+
+# Attributes of ``DiagramConnection`` that affect its bounding box.
+CONNECTION_FIELDS = ("src", "dst", "style", "points")
+
+# Store owning each indexed item, keyed by ``id(item)``.  An entry only lives
+# while the item is a member, during which the store keeps the item alive and
+# its id cannot be reused.
+_OWNERS: Dict[int, "weakref.ref[_IndexedList]"] = {}
+
+
+def _forget_owners(keys: Iterable[int]) -> None:
+    """Drop table entries left behind by a collected store."""
+    for key in list(keys):
+        ref = _OWNERS.get(key)
+        if ref is not None and ref() is None:
+            del _OWNERS[key]
+
+
+def store_of(item: Any) -> Optional["_IndexedList"]:
+    """Return the store *item* is a member of, or ``None``."""
+    ref = _OWNERS.get(id(item))
+    store = ref() if ref is not None else None
+    if store is not None and id(item) in store._counts:
+        return store
+    return None
+
+
+class UniformGrid:
+    """Bucket items by the grid cells their bounding box overlaps.
+
+    Items covering more than ``max_cells`` cells are kept aside and returned
+    by every query instead of filling thousands of buckets.
+    """
+
+    def __init__(self, cell_size: float = 128.0, max_cells: int = 256) -> None:
+        self.cell_size = cell_size
+        self.max_cells = max_cells
+        self._cells: Dict[Tuple[int, int], Dict[int, Any]] = {}
+        self._spans: Dict[int, Optional[Tuple[int, int, int, int]]] = {}
+        self._large: Dict[int, Any] = {}
+
+    def __len__(self) -> int:
+        return len(self._spans)
+
+    def __contains__(self, key: int) -> bool:
+        return key in self._spans
+
+    def _span(self, bbox: BBox) -> Optional[Tuple[int, int, int, int]]:
+        size = self.cell_size
+        left, top, right, bottom = bbox
+        if not all(math.isfinite(v) for v in bbox):
+            return None
+        span = (
+            math.floor(left / size),
+            math.floor(top / size),
+            math.floor(right / size),
+            math.floor(bottom / size),
+        )
+        cells = (span[2] - span[0] + 1) * (span[3] - span[1] + 1)
+        return span if cells <= self.max_cells else None
+
+    def insert(self, key: int, item: Any, bbox: BBox) -> None:
+        """Add *item* under *key*, replacing any previous entry."""
+        span = self._span(bbox)
+        if key in self._spans:
+            if self._spans[key] == span and span is not None:
+                for cx in range(span[0], span[2] + 1):
+                    for cy in range(span[1], span[3] + 1):
+                        self._cells[(cx, cy)][key] = item
+                return
+            self.remove(key)
+        self._spans[key] = span
+        if span is None:
+            self._large[key] = item
+            return
+        for cx in range(span[0], span[2] + 1):
+            for cy in range(span[1], span[3] + 1):
+                self._cells.setdefault((cx, cy), {})[key] = item
+
+    def remove(self, key: int) -> None:
+        if key not in self._spans:
+            return
+        span = self._spans.pop(key)
+        if span is None:
+            self._large.pop(key, None)
+            return
+        for cx in range(span[0], span[2] + 1):
+            for cy in range(span[1], span[3] + 1):
+                bucket = self._cells.get((cx, cy))
+                if bucket is not None:
+                    bucket.pop(key, None)
+                    if not bucket:
+                        del self._cells[(cx, cy)]
+
+    def query(self, left: float, top: float, right: float, bottom: float) -> Dict[int, Any]:
+        """Return ``{key: item}`` for items whose cells overlap the rectangle."""
+        found = dict(self._large)
+        span = self._span((left, top, right, bottom))
+        if span is None:
+            for bucket in self._cells.values():
+                found.update(bucket)
+            return found
+        for cx in range(span[0], span[2] + 1):
+            for cy in range(span[1], span[3] + 1):
+                bucket = self._cells.get((cx, cy))
+                if bucket:
+                    found.update(bucket)
+        return found
+
+    def clear(self) -> None:
+        self._cells.clear()
+        self._spans.clear()
+        self._large.clear()
+
+
+class PointList(list):
+    """Bend point list reporting in-place edits to its connection."""
+
+    def __init__(self, items: Iterable[Any] = (), owner: Any = None) -> None:
+        super().__init__(items)
+        self._owner = weakref.ref(owner) if owner is not None else None
+
+    def _changed(self) -> None:
+        owner = self._owner() if self._owner is not None else None
+        if owner is not None:
+            notify_attribute_change(owner, "points")
+
+    def __reduce_ex__(self, protocol):
+        # Copies and pickles are plain lists without an owner.
+        return list, (list(self),)
+
+    def append(self, item: Any) -> None:
+        super().append(item)
+        self._changed()
+
+    def extend(self, items: Iterable[Any]) -> None:
+        super().extend(items)
+        self._changed()
+
+    def insert(self, index: int, item: Any) -> None:
+        super().insert(index, item)
+        self._changed()
+
+    def remove(self, item: Any) -> None:
+        super().remove(item)
+        self._changed()
+
+    def pop(self, index: int = -1) -> Any:
+        item = super().pop(index)
+        self._changed()
+        return item
+
+    def clear(self) -> None:
+        super().clear()
+        self._changed()
+
+    def __setitem__(self, key, value) -> None:
+        super().__setitem__(key, value)
+        self._changed()
+
+    def __delitem__(self, key) -> None:
+        super().__delitem__(key)
+        self._changed()
+
+    def __iadd__(self, items: Iterable[Any]) -> "PointList":
+        self.extend(items)
+        return self
+
+
+class _IndexedList(list):
+    """``list`` base class keeping per-item indexes in sync on mutation.
+
+    Subclasses implement :meth:`_index` and :meth:`_unindex`; they run when an
+    object enters or finally leaves the list, so temporarily duplicated
+    entries (as produced by swapping two items) keep their index entries.
+    """
+
+    def __init__(self, items: Iterable[Any] = ()) -> None:
+        super().__init__(items)
+        self._positions: Optional[Dict[int, int]] = None
+        self._counts: Dict[int, int] = {}
+        weakref.finalize(self, _forget_owners, self._counts)
+        for item in list.__iter__(self):
+            self._add(item)
+
+    def _add(self, item: Any) -> None:
+        count = self._counts.get(id(item), 0)
+        self._counts[id(item)] = count + 1
+        if not count:
+            _OWNERS[id(item)] = weakref.ref(self)
+            self._index(item)
+
+    def _drop(self, item: Any) -> None:
+        count = self._counts.get(id(item), 0) - 1
+        if count > 0:
+            self._counts[id(item)] = count
+            return
+        self._counts.pop(id(item), None)
+        ref = _OWNERS.get(id(item))
+        if ref is not None and ref() is self:
+            del _OWNERS[id(item)]
+        self._unindex(item)
+
+    def _index(self, item: Any) -> None:
+        raise NotImplementedError
+
+    def _unindex(self, item: Any) -> None:
+        raise NotImplementedError
+
+    def _attribute_changed(self, item: Any, name: str, old: Any = None) -> None:
+        raise NotImplementedError
+
+    def position(self, item: Any) -> int:
+        """Return the list index of *item* in O(1) amortised time."""
+        if self._positions is None:
+            self._positions = {}
+            for i, other in enumerate(list.__iter__(self)):
+                self._positions.setdefault(id(other), i)
+        return self._positions[id(item)]
+
+    def _in_order(self, items: Iterable[Any]) -> List[Any]:
+        return sorted(items, key=self.position)
+
+    # ------------------------------------------------------------------
+    # Mutators
+    # ------------------------------------------------------------------
+    def append(self, item: Any) -> None:
+        super().append(item)
+        if self._positions is not None:
+            self._positions.setdefault(id(item), len(self) - 1)
+        self._add(item)
+
+    def extend(self, items: Iterable[Any]) -> None:
+        for item in items:
+            self.append(item)
+
+    def __iadd__(self, items: Iterable[Any]):
+        self.extend(items)
+        return self
+
+    def insert(self, index: int, item: Any) -> None:
+        super().insert(index, item)
+        self._positions = None
+        self._add(item)
+
+    def remove(self, item: Any) -> None:
+        # ``list.remove`` matches by equality; prefer the identical object.
+        for idx, other in enumerate(list.__iter__(self)):
+            if other is item:
+                del self[idx]
+                return
+        del self[self.index(item)]
+
+    def pop(self, index: int = -1) -> Any:
+        item = super().pop(index)
+        self._positions = None
+        self._drop(item)
+        return item
+
+    def clear(self) -> None:
+        items = list(list.__iter__(self))
+        super().clear()
+        self._positions = None
+        for item in items:
+            self._drop(item)
+
+    def sort(self, *args, **kwargs) -> None:
+        super().sort(*args, **kwargs)
+        self._positions = None
+
+    def reverse(self) -> None:
+        super().reverse()
+        self._positions = None
+
+    def __setitem__(self, key, value) -> None:
+        old = self[key] if isinstance(key, slice) else [self[key]]
+        new = list(value) if isinstance(key, slice) else [value]
+        super().__setitem__(key, new if isinstance(key, slice) else value)
+        self._positions = None
+        for item in new:
+            self._add(item)
+        for item in old:
+            self._drop(item)
+
+    def __delitem__(self, key) -> None:
+        old = self[key] if isinstance(key, slice) else [self[key]]
+        super().__delitem__(key)
+        self._positions = None
+        for item in old:
+            self._drop(item)
+
+    def __imul__(self, count: int):
+        items = list(list.__iter__(self))
+        super().__imul__(count)
+        self._positions = None
+        for _ in range(max(count, 0) - 1):
+            for item in items:
+                self._add(item)
+        if count <= 0:
+            for item in items:
+                self._drop(item)
+        return self
+
+
+def object_bbox(obj: Any) -> BBox:
+    """Return ``(left, top, right, bottom)`` of a centre-anchored object."""
+    x = getattr(obj, "x", 0.0)
+    y = getattr(obj, "y", 0.0)
+    w = getattr(obj, "width", 0.0) / 2
+    h = getattr(obj, "height", 0.0) / 2
+    return x - w, y - h, x + w, y + h
+
+
+class DiagramObjectStore(_IndexedList):
+    """``list`` of diagram objects indexed by ``obj_id`` and bounding box.
+
+    ``on_change`` is called with an ``obj_id`` whenever an object with that
+    id is added, removed, moved or resized so dependent indexes (connection
+    routes) can refresh.
+    """
+
+    def __init__(self, items: Iterable[Any] = (), cell_size: float = 128.0) -> None:
+        self._by_id: Dict[Any, Dict[int, Any]] = {}
+        self._grid = UniformGrid(cell_size)
+        self.on_change: Optional[Callable[[Any], None]] = None
+        super().__init__(items)
+
+    def _changed(self, obj_id: Any) -> None:
+        if self.on_change is not None:
+            self.on_change(obj_id)
+
+    def _index(self, obj: Any) -> None:
+        obj_id = getattr(obj, "obj_id", None)
+        self._by_id.setdefault(obj_id, {})[id(obj)] = obj
+        self._grid.insert(id(obj), obj, object_bbox(obj))
+        self._changed(obj_id)
+
+    def _unindex(self, obj: Any) -> None:
+        obj_id = getattr(obj, "obj_id", None)
+        bucket = self._by_id.get(obj_id)
+        if bucket is not None:
+            bucket.pop(id(obj), None)
+            if not bucket:
+                del self._by_id[obj_id]
+        self._grid.remove(id(obj))
+        self._changed(obj_id)
+
+    def _attribute_changed(self, obj: Any, name: str, old: Any = None) -> None:
+        if name == "obj_id":
+            bucket = self._by_id.get(old)
+            if bucket is not None:
+                bucket.pop(id(obj), None)
+                if not bucket:
+                    del self._by_id[old]
+            self._by_id.setdefault(obj.obj_id, {})[id(obj)] = obj
+            self._changed(old)
+        else:
+            self._grid.insert(id(obj), obj, object_bbox(obj))
+        self._changed(obj.obj_id)
+
+    # ------------------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------------------
+    def get(self, obj_id: Any) -> Optional[Any]:
+        """Return the first object with ``obj_id`` or ``None``."""
+        bucket = self._by_id.get(obj_id)
+        if not bucket:
+            return None
+        if len(bucket) == 1:
+            return next(iter(bucket.values()))
+        return min(bucket.values(), key=self.position)
+
+    def at(self, x: float, y: float, pad: float = 0.0) -> List[Any]:
+        """Return objects whose box, grown by *pad*, contains ``(x, y)``.
+
+        Coordinates are in diagram units; results keep list order.
+        """
+        hits = []
+        for obj in self._grid.query(x - pad, y - pad, x + pad, y + pad).values():
+            left, top, right, bottom = object_bbox(obj)
+            if left - pad <= x <= right + pad and top - pad <= y <= bottom + pad:
+                hits.append(obj)
+        return self._in_order(hits)
+
+    def overlapping(self, left: float, top: float, right: float, bottom: float) -> List[Any]:
+        """Return objects whose box intersects the rectangle, in list order."""
+        hits = []
+        for obj in self._grid.query(left, top, right, bottom).values():
+            o_left, o_top, o_right, o_bottom = object_bbox(obj)
+            if o_left <= right and left <= o_right and o_top <= bottom and top <= o_bottom:
+                hits.append(obj)
+        return self._in_order(hits)
+
+
+class DiagramConnectionStore(_IndexedList):
+    """``list`` of diagram connections indexed by the box of their route.
+
+    ``bounds`` returns the diagram-unit box enclosing every segment drawn
+    for a connection, or ``None`` when an endpoint is missing.  Boxes depend
+    on the connected objects, so they are recomputed lazily for connections
+    marked dirty by :meth:`object_changed` or by their own attributes.
+    """
+
+    def __init__(
+        self,
+        items: Iterable[Any] = (),
+        bounds: Optional[Callable[[Any], Optional[BBox]]] = None,
+        cell_size: float = 128.0,
+    ) -> None:
+        self._grid = UniformGrid(cell_size)
+        self._by_end: Dict[Any, Dict[int, Any]] = {}
+        self._ends_of: Dict[int, Tuple[Any, Any]] = {}
+        self._dirty: Dict[int, Any] = {}
+        self.bounds = bounds
+        super().__init__(items)
+
+    def _link(self, conn: Any, end: Any) -> None:
+        self._by_end.setdefault(end, {})[id(conn)] = conn
+
+    def _unlink(self, conn: Any, end: Any) -> None:
+        bucket = self._by_end.get(end)
+        if bucket is not None:
+            bucket.pop(id(conn), None)
+            if not bucket:
+                del self._by_end[end]
+
+    def _ends(self, conn: Any) -> Tuple[Any, Any]:
+        return getattr(conn, "src", None), getattr(conn, "dst", None)
+
+    def _index(self, conn: Any) -> None:
+        points = getattr(conn, "points", None)
+        if type(points) is list:
+            # Copies carry plain lists; track their bend points again.
+            conn.__dict__["points"] = PointList(points, owner=conn)
+        self._ends_of[id(conn)] = ends = self._ends(conn)
+        for end in ends:
+            self._link(conn, end)
+        self._dirty[id(conn)] = conn
+
+    def _unindex(self, conn: Any) -> None:
+        for end in self._ends_of.pop(id(conn), ()):
+            self._unlink(conn, end)
+        self._grid.remove(id(conn))
+        self._dirty.pop(id(conn), None)
+
+    def _attribute_changed(self, conn: Any, name: str, old: Any = None) -> None:
+        if name in ("src", "dst"):
+            for end in self._ends_of.get(id(conn), ()):
+                self._unlink(conn, end)
+            self._ends_of[id(conn)] = ends = self._ends(conn)
+            for end in ends:
+                self._link(conn, end)
+        self._dirty[id(conn)] = conn
+
+    def object_changed(self, obj_id: Any) -> None:
+        """Mark connections attached to ``obj_id`` for re-indexing."""
+        self._dirty.update(self._by_end.get(obj_id, {}))
+
+    def invalidate(self) -> None:
+        """Recompute every route box on the next query."""
+        for conn in list.__iter__(self):
+            self._dirty[id(conn)] = conn
+
+    def _flush(self) -> None:
+        if not self._dirty:
+            return
+        dirty, self._dirty = self._dirty, {}
+        for key, conn in dirty.items():
+            box = self.bounds(conn) if self.bounds is not None else None
+            if box is None:
+                self._grid.remove(key)
+            else:
+                self._grid.insert(key, conn, box)
+
+    # ------------------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------------------
+    def near(self, x: float, y: float, pad: float = 0.0) -> List[Any]:
+        """Return connections whose route box grown by *pad* holds ``(x, y)``.
+
+        Connections without a known route (``bounds`` returned ``None``) are
+        never returned.  Results keep list order.
+        """
+        if self.bounds is None:
+            return list(self)
+        self._flush()
+        return self._in_order(
+            self._grid.query(x - pad, y - pad, x + pad, y + pad).values()
+        )
+
+    def attached_to(self, obj_id: Any) -> List[Any]:
+        """Return connections with ``obj_id`` as source or destination."""
+        return self._in_order(self._by_end.get(obj_id, {}).values())
+
+
+def notify_attribute_change(item: Any, name: str, old: Any = None) -> None:
+    """Update the store owning *item* after attribute *name* changed."""
+    store = store_of(item)
+    if store is not None:
+        store._attribute_changed(item, name, old)
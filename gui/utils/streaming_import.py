@@ -0,0 +1,273 @@
+# Author: Miguel Marina <karel.capek.robotics@gmail.com>
+# SPDX-License-Identifier: GPL-3.0-or-later
+#
+# Copyright (C) 2025 Capek System Safety & Robotic Solutions
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+"""Chunked CSV/XLSX import on a worker thread.
+
+:func:`iter_rows` yields the rows of a CSV file or of the active sheet of a
+workbook lazily, using ``openpyxl`` read-only iteration, so large files are
+never held in memory as a whole.  :class:`StreamingImport` converts those
+rows in chunks on a daemon thread.  Finished batches go through a bounded
+queue that the Tk thread drains with ``after()``, so widgets are only ever
+touched from the Tk thread and a slow consumer throttles the parser.
+Destroying the widget cancels its import so the worker never waits on a
+poller that is gone.
+"""
+
+from __future__ import annotations
+
+import csv
+import queue
+import threading
+import tkinter as tk
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional
+
+from analysis.models import COMPONENT_ATTR_TEMPLATES, ReliabilityComponent
+
+try:  # optional dependency
+    from openpyxl import load_workbook
+except Exception:  # pragma: no cover - openpyxl may not be installed
+    load_workbook = None
+
+DEFAULT_CHUNK_SIZE = 500
+# Batches allowed in flight before the worker waits for the Tk thread.
+MAX_PENDING_BATCHES = 8
+
+
+def is_workbook(path: str) -> bool:
+    """Return ``True`` if *path* names an Excel workbook."""
+    return path.lower().endswith(".xlsx")
+
+
+def _open_workbook(path: str):
+    if load_workbook is None:
+        raise ImportError("openpyxl required")
+    return load_workbook(path, read_only=True)
+
+
+def read_headers(path: str) -> List[Any]:
+    """Return the column headers of *path* without reading its rows."""
+    if is_workbook(path):
+        wb = _open_workbook(path)
+        try:
+            return list(next(wb.active.iter_rows(max_row=1, values_only=True)))
+        finally:
+            wb.close()
+    with open(path, newline="") as f:
+        return csv.DictReader(f).fieldnames or []
+
+
+def iter_rows(path: str) -> Iterator[dict]:
+    """Yield the data rows of *path* as ``header -> value`` dictionaries."""
+    if is_workbook(path):
+        wb = _open_workbook(path)
+        try:
+            rows = wb.active.iter_rows(values_only=True)
+            headers = list(next(rows))
+            for row in rows:
+                yield {headers[i]: row[i] for i in range(len(headers))}
+        finally:
+            wb.close()
+        return
+    with open(path, newline="") as f:
+        yield from csv.DictReader(f)
+
+
+class BomRowConverter:
+    """Build :class:`ReliabilityComponent` objects from mapped BOM rows.
+
+    ``mapping`` maps ``name``, ``type``, ``qty`` and optionally
+    ``qualification`` to column headers.  Template defaults from
+    :data:`COMPONENT_ATTR_TEMPLATES` are resolved once per component type
+    and unmapped columns are stored as attributes.
+    """
+
+    def __init__(self, mapping: Dict[str, str]) -> None:
+        self.mapping = mapping
+        self._mapped = set(mapping.values())
+        self._defaults: Dict[Any, dict] = {}
+
+    def defaults(self, comp_type: Any) -> dict:
+        """Return the default attributes of *comp_type*."""
+        defaults = self._defaults.get(comp_type)
+        if defaults is None:
+            template = COMPONENT_ATTR_TEMPLATES.get(comp_type, {})
+            defaults = self._defaults[comp_type] = {
+                k: v[0] if isinstance(v, list) else v for k, v in template.items()
+            }
+        return defaults
+
+    def __call__(self, row: dict) -> ReliabilityComponent:
+        mapping = self.mapping
+        name = row.get(mapping["name"], "")
+        ctype = row.get(mapping["type"], "")
+        qty = int(row.get(mapping["qty"], 1) or 1)
+        qual = (
+            row.get(mapping.get("qualification"), "")
+            if mapping.get("qualification")
+            else ""
+        )
+        attributes = dict(self.defaults(ctype))
+        for key, val in row.items():
+            if key not in self._mapped:
+                attributes[key] = val
+        return ReliabilityComponent(name, ctype, qty, attributes, qual)
+
+
+@dataclass
+class RowError:
+    """A data row (1-based, header excluded) that could not be converted."""
+
+    row: int
+    message: str
+
+
+@dataclass
+class ImportResult:
+    """Outcome of an import.
+
+    ``items`` is only filled by :meth:`StreamingImport.run`; background
+    imports deliver items through their batch callback instead.
+    ``failure`` holds the exception that aborted reading, if any.
+    """
+
+    rows: int = 0
+    errors: List[RowError] = field(default_factory=list)
+    failure: Optional[BaseException] = None
+    items: List[Any] = field(default_factory=list)
+
+
+class StreamingImport:
+    """Convert rows from ``rows()`` in chunks, optionally off the Tk thread.
+
+    ``rows`` is called on the thread doing the work so files are opened
+    there.  ``convert`` maps a row to an item; rows raising an exception are
+    skipped and reported as :class:`RowError` entries.
+    """
+
+    def __init__(
+        self,
+        rows: Callable[[], Iterable[Any]],
+        convert: Optional[Callable[[Any], Any]] = None,
+        *,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+    ) -> None:
+        self._rows = rows
+        self._convert = convert
+        self.chunk_size = max(1, chunk_size)
+        self._cancelled = threading.Event()
+
+    # ------------------------------------------------------------------
+    def _produce(self, emit: Callable[[tuple], None]) -> None:
+        result = ImportResult()
+        batch: List[Any] = []
+        convert = self._convert
+        try:
+            for number, row in enumerate(self._rows(), start=1):
+                if self._cancelled.is_set():
+                    return
+                result.rows = number
+                if convert is None:
+                    batch.append(row)
+                else:
+                    try:
+                        batch.append(convert(row))
+                    except Exception as exc:
+                        result.errors.append(RowError(number, str(exc)))
+                if len(batch) >= self.chunk_size:
+                    emit(("batch", batch, number))
+                    batch = []
+        except Exception as exc:
+            result.failure = exc
+        if batch:
+            emit(("batch", batch, result.rows))
+        emit(("done", result))
+
+    def run(self) -> ImportResult:
+        """Import synchronously and return the result including all items."""
+        items: List[Any] = []
+        done: List[ImportResult] = []
+
+        def emit(message: tuple) -> None:
+            if message[0] == "batch":
+                items.extend(message[1])
+            else:
+                done.append(message[1])
+
+        self._produce(emit)
+        result = done[0]
+        result.items = items
+        return result
+
+    def start(
+        self,
+        widget: Any,
+        on_batch: Callable[[List[Any]], None],
+        on_done: Callable[[ImportResult], None],
+        on_progress: Optional[Callable[[int], None]] = None,
+        poll_ms: int = 50,
+    ) -> None:
+        """Import on a worker thread, calling back on *widget*'s Tk thread.
+
+        The import is cancelled when *widget* is destroyed.
+        """
+        pending: "queue.Queue[tuple]" = queue.Queue(maxsize=MAX_PENDING_BATCHES)
+
+        def emit(message: tuple) -> None:
+            while not self._cancelled.is_set():
+                try:
+                    pending.put(message, timeout=0.1)
+                    return
+                except queue.Full:
+                    continue
+
+        def poll() -> None:
+            if self._cancelled.is_set():
+                return
+            while True:
+                try:
+                    message = pending.get_nowait()
+                except queue.Empty:
+                    break
+                if message[0] == "batch":
+                    on_batch(message[1])
+                    if on_progress:
+                        on_progress(message[2])
+                else:
+                    on_done(message[1])
+                    return
+            schedule()
+
+        def schedule() -> None:
+            try:
+                widget.after(poll_ms, poll)
+            except tk.TclError:
+                # The application went away without a <Destroy> event.
+                self.cancel()
+
+        def on_destroy(event) -> None:
+            if event.widget is widget:
+                self.cancel()
+
+        widget.bind("<Destroy>", on_destroy, add="+")
+        threading.Thread(target=self._produce, args=(emit,), daemon=True).start()
+        schedule()
+
+    def cancel(self) -> None:
+        """Stop the import; no further callbacks are made."""
+        self._cancelled.set()
@@ -0,0 +1,285 @@
+# Author: Miguel Marina <karel.capek.robotics@gmail.com>
+# SPDX-License-Identifier: GPL-3.0-or-later
+#
+# Copyright (C) 2025 Capek System Safety & Robotic Solutions
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+"""Shared, cached text measurement and word wrapping for diagram renderers.
+
+Every ``Font.measure`` call on a Tk font is a round trip to the Tcl
+interpreter, and wrapping a label measures each growing candidate line, so
+redrawing a diagram used to re-measure the same strings over and over.
+:class:`TextLayout` caches widths, line heights, wrapped lines and text
+sizes per font description.  The description is read from ``actual()`` once
+per font object and remembered until :func:`invalidate` is called, which
+code that reconfigures a font (for example when zooming) must do.  Loading
+a different style clears the whole cache.
+
+The canvas windows, the FTA/GSN drawing helpers and the headless exporter
+all use the module level functions, which share one :class:`TextLayout`.
+"""
+
+from __future__ import annotations
+
+import weakref
+from typing import Dict, Hashable, List, Optional, Tuple
+
+from gui.utils.image_factory import LRUCache
+
+# Number of fonts whose measurements are kept and entries kept per font.
+FONT_CACHE_SIZE = 64
+TEXT_CACHE_SIZE = 4096
+
+
+class _FontCache:
+    """Measurements made with one font description."""
+
+    __slots__ = ("widths", "layouts", "linespace")
+
+    def __init__(self, maxsize: int) -> None:
+        self.widths = LRUCache(maxsize)
+        self.layouts = LRUCache(maxsize)
+        self.linespace: Optional[int] = None
+
+
+class TextLayout:
+    """Cache of text widths, wrapped lines and sizes keyed by font."""
+
+    def __init__(self, maxsize: int = TEXT_CACHE_SIZE, max_fonts: int = FONT_CACHE_SIZE) -> None:
+        self.maxsize = maxsize
+        self._caches = LRUCache(max_fonts)
+        # ``tkinter.font.Font`` is unhashable, so keys are stored by identity.
+        self._keys: Dict[int, Tuple[weakref.ref, Hashable]] = {}
+        self.hits = 0
+        self.misses = 0
+
+    # ------------------------------------------------------------------
+    def font_key(self, font) -> Optional[Hashable]:
+        """Return the cache key describing *font* or ``None`` if it has none."""
+        entry = self._keys.get(id(font))
+        if entry is not None and entry[0]() is font:
+            return entry[1]
+        try:
+            actual = font.actual()
+        except Exception:
+            actual = None
+        if not isinstance(actual, dict):
+            # Fonts that cannot describe themselves are measured directly.
+            return None
+        key = (
+            getattr(font, "headless", False) is True,
+            tuple(sorted((k, str(v)) for k, v in actual.items())),
+        )
+        try:
+            ref = weakref.ref(font, lambda _r, i=id(font): self._keys.pop(i, None))
+        except TypeError:  # pragma: no cover - font type without weakrefs
+            return key
+        self._keys[id(font)] = (ref, key)
+        return key
+
+    def _cache(self, font) -> _FontCache:
+        key = self.font_key(font)
+        if key is None:
+            return _FontCache(self.maxsize)
+        cache = self._caches.get(key)
+        if cache is None:
+            cache = _FontCache(self.maxsize)
+            self._caches.put(key, cache)
+        return cache
+
+    # ------------------------------------------------------------------
+    def measure(self, font, text: str) -> int:
+        """Return the width of *text* in pixels."""
+        widths = self._cache(font).widths
+        width = widths.get(text)
+        if width is None:
+            self.misses += 1
+            width = font.measure(text)
+            widths.put(text, width)
+        else:
+            self.hits += 1
+        return width
+
+    def linespace(self, font) -> int:
+        """Return the height of one line of text."""
+        cache = self._cache(font)
+        if cache.linespace is None:
+            cache.linespace = font.metrics("linespace")
+        return cache.linespace
+
+    def text_size(self, font, text: str) -> Tuple[int, int]:
+        """Return the ``(width, height)`` of the lines of *text*."""
+        lines = text.split("\n")
+        width = max(self.measure(font, line) for line in lines)
+        return width, self.linespace(font) * len(lines)
+
+    def _layout(self, mode: str, font, text: str, width: float, build) -> List[str]:
+        layouts = self._cache(font).layouts
+        key = (mode, text, width)
+        lines = layouts.get(key)
+        if lines is None:
+            lines = build(lambda s: self.measure(font, s), text, width)
+            layouts.put(key, lines)
+        return list(lines)
+
+    def wrap_words(self, font, text: str, width: float) -> List[str]:
+        """Wrap *text* at whitespace, keeping explicit line breaks.
+
+        Words wider than *width* are left on their own line.
+        """
+        return self._layout("words", font, text, width, _wrap_words)
+
+    def wrap_to_width(self, font, text: str, width: float) -> List[str]:
+        """Wrap *text* at whitespace and split words wider than *width*."""
+        return self._layout("chars", font, text, width, _wrap_chars)
+
+    def wrap_like_tk(self, font, text: str, width: float) -> List[str]:
+        """Wrap *text* the way a Tk canvas text item with ``width`` does."""
+        return self._layout("tk", font, text, width, _wrap_tk)
+
+    # ------------------------------------------------------------------
+    def invalidate(self, font=None) -> None:
+        """Forget *font*'s measurements, or everything when *font* is None.
+
+        Call this after ``font.configure`` so the new size or weight is
+        read again.
+        """
+        if font is None:
+            self.clear()
+            return
+        entry = self._keys.pop(id(font), None)
+        if entry is not None:
+            self._caches.pop(entry[1])
+
+    def clear(self) -> None:
+        """Drop all cached measurements."""
+        self._caches.clear()
+        self._keys.clear()
+
+
+def _break_word(measure, word: str, width: float, lines: List[str]) -> str:
+    """Append full-width pieces of *word* to *lines*; return the remainder."""
+    part = ""
+    for ch in word:
+        if measure(part + ch) <= width:
+            part += ch
+        else:
+            if part:
+                lines.append(part)
+            part = ch
+    return part
+
+
+def _wrap_words(measure, text: str, width: float) -> List[str]:
+    lines: List[str] = []
+    for line in text.split("\n"):
+        if not line:
+            lines.append("")
+            continue
+        current = ""
+        for word in line.split():
+            candidate = f"{current} {word}".strip()
+            if current and measure(candidate) > width:
+                lines.append(current)
+                current = word
+            else:
+                current = candidate
+        if current:
+            lines.append(current)
+    return lines
+
+
+def _wrap_chars(measure, text: str, width: float) -> List[str]:
+    if measure(text) <= width:
+        return [text]
+    words = text.split() or [text]
+    lines: List[str] = []
+    if len(words) == 1 and measure(words[0]) > width:
+        current = _break_word(measure, words[0], width, lines)
+        if current:
+            lines.append(current)
+        return lines
+    current = words[0]
+    for word in words[1:]:
+        candidate = current + " " + word
+        if measure(candidate) <= width:
+            current = candidate
+        else:
+            lines.append(current)
+            if measure(word) <= width:
+                current = word
+            else:
+                current = _break_word(measure, word, width, lines)
+    if current:
+        lines.append(current)
+    return lines
+
+
+def _wrap_tk(measure, text: str, width: float) -> List[str]:
+    lines: List[str] = []
+    for line in str(text).split("\n"):
+        if not width or measure(line) <= width:
+            lines.append(line)
+            continue
+        current = ""
+        for word in line.split(" "):
+            candidate = f"{current} {word}" if current else word
+            if current and measure(candidate) > width:
+                lines.append(current)
+                current = word
+            else:
+                current = candidate
+        lines.append(current)
+    return lines
+
+
+_layout = TextLayout()
+
+
+def get_layout() -> TextLayout:
+    """Return the layout cache shared by all renderers."""
+    return _layout
+
+
+def measure(font, text: str) -> int:
+    return _layout.measure(font, text)
+
+
+def linespace(font) -> int:
+    return _layout.linespace(font)
+
+
+def text_size(font, text: str) -> Tuple[int, int]:
+    return _layout.text_size(font, text)
+
+
+def wrap_words(font, text: str, width: float) -> List[str]:
+    return _layout.wrap_words(font, text, width)
+
+
+def wrap_to_width(font, text: str, width: float) -> List[str]:
+    return _layout.wrap_to_width(font, text, width)
+
+
+def wrap_like_tk(font, text: str, width: float) -> List[str]:
+    return _layout.wrap_like_tk(font, text, width)
+
+
+def invalidate(font=None) -> None:
+    _layout.invalidate(font)
+
+
+def clear() -> None:
+    _layout.clear()
@@ -0,0 +1,151 @@
+# Author: Miguel Marina <karel.capek.robotics@gmail.com>
+# SPDX-License-Identifier: GPL-3.0-or-later
+#
+# Copyright (C) 2025 Capek System Safety & Robotic Solutions
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+"""Keyed virtual model of a ``ttk.Treeview`` and its reconciler.
+
+Views describe their desired content by calling :meth:`TreeModel.insert`
+with the same arguments they would pass to ``Treeview.insert``.  Each item
+is keyed by its parent's key and its tags, which name the model object it
+shows, so the same logical item keeps its key between refreshes even when
+it is renamed.  Items without tags, such as section headers, are keyed by
+their text.  :class:`TreeReconciler` then applies the model to a real
+tree: items that vanished are deleted, new items inserted, reordered items
+moved and changed options updated, while untouched items, their expansion
+state and the selection are left alone.
+"""
+
+from __future__ import annotations
+
+from typing import Any, Dict, List
+
+# Options a later refresh may change on an existing item.  ``open`` is only
+# applied when an item is created so user expansion state survives.
+UPDATABLE_OPTIONS = ("text", "tags", "image", "values")
+
+
+class TreeModel:
+    """Desired content of a tree, built with ``Treeview.insert`` calls."""
+
+    def __init__(self) -> None:
+        self.children: Dict[str, List[str]] = {"": []}
+        self.options: Dict[str, Dict[str, Any]] = {}
+
+    def insert(self, parent: str, index: Any = "end", text: str = "", **options: Any) -> str:
+        """Record an item below *parent* and return its key.
+
+        ``index`` other than ``"end"`` is honoured like ``Treeview.insert``
+        and a ``None`` parent stands for the root.
+        """
+        parent = parent or ""
+        options.pop("iid", None)
+        options["text"] = text
+        tags = options.get("tags", ())
+        if isinstance(tags, str):
+            tags = (tags,)
+        label = "\x1f".join(map(str, tags)) if tags else f"\x1c{text}"
+        key = f"{parent}\x1e{label}"
+        if key in self.options:
+            n = 2
+            while f"{key}\x1d{n}" in self.options:
+                n += 1
+            key = f"{key}\x1d{n}"
+        self.options[key] = options
+        self.children[key] = []
+        siblings = self.children[parent]
+        if index == "end":
+            siblings.append(key)
+        else:
+            siblings.insert(int(index), key)
+        return key
+
+    def __len__(self) -> int:
+        return len(self.options)
+
+
+class TreeReconciler:
+    """Apply successive :class:`TreeModel` snapshots to a tree widget.
+
+    Model keys are mapped to short item ids that stay stable while the item
+    exists.  Trees lacking ``move``/``item``/``exists`` (such as minimal test
+    doubles) are cleared and filled from scratch instead.
+    """
+
+    def __init__(self) -> None:
+        self._iids: Dict[str, str] = {}
+        self._applied: Dict[str, Dict[str, Any]] = {}
+        self._serial = 0
+
+    def _iid(self, key: str) -> str:
+        iid = self._iids.get(key)
+        if iid is None:
+            self._serial += 1
+            iid = self._iids[key] = f"v{self._serial}"
+        return iid
+
+    def apply(self, tree: Any, model: TreeModel) -> None:
+        if not all(hasattr(tree, name) for name in ("move", "item", "exists")):
+            self._rebuild(tree, model)
+            return
+        self._iids = {k: v for k, v in self._iids.items() if k in model.options}
+        self._applied = {k: v for k, v in self._applied.items() if k in model.options}
+        self._sync(tree, model, "", "")
+
+    def _rebuild(self, tree: Any, model: TreeModel) -> None:
+        tree.delete(*tree.get_children())
+        self._iids.clear()
+        self._applied.clear()
+
+        def add(key: str, parent_iid: str) -> None:
+            for child in model.children[key]:
+                add(child, tree.insert(parent_iid, "end", **model.options[child]))
+
+        add("", "")
+
+    def _sync(self, tree: Any, model: TreeModel, key: str, iid: str) -> None:
+        wanted = [self._iid(k) for k in model.children[key]]
+        wanted_set = set(wanted)
+        existing = list(tree.get_children(iid))
+        stale = [i for i in existing if i not in wanted_set]
+        if stale:
+            tree.delete(*stale)
+        current = [i for i in existing if i in wanted_set]
+        present = set(current)
+        for pos, (child_key, child_iid) in enumerate(zip(model.children[key], wanted)):
+            options = model.options[child_key]
+            if child_iid in present:
+                if pos >= len(current) or current[pos] != child_iid:
+                    tree.move(child_iid, iid, pos)
+                    current.remove(child_iid)
+                    current.insert(pos, child_iid)
+                applied = self._applied.get(child_key) or {}
+                changed = {
+                    name: "" if options.get(name) is None else options[name]
+                    for name in UPDATABLE_OPTIONS
+                    if applied.get(name) != options.get(name)
+                }
+                if changed:
+                    tree.item(child_iid, **changed)
+            else:
+                if tree.exists(child_iid):
+                    # Left over below another parent, e.g. after external edits.
+                    tree.delete(child_iid)
+                tree.insert(iid, pos, iid=child_iid, **options)
+                current.insert(pos, child_iid)
+                present.add(child_iid)
+            self._applied[child_key] = options
+            self._sync(tree, model, child_key, child_iid)
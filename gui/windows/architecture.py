@@ -38,9 +38,21 @@ from typing import Dict, List, Tuple, Callable
 from mainappsrc.models.sysml.sysml_repository import SysMLRepository, SysMLDiagram, SysMLElement
 from gui.styles.style_manager import StyleManager
 from gui.utils.drawing_helper import fta_drawing_helper
-from config import load_diagram_rules, load_json_with_comments
+from config import config_registry
 import json
 from gui.utils.icon_factory import create_icon
+from gui.utils import image_factory, text_layout
+from gui.utils.retained_canvas import CanvasScene, Group, TaggingCanvas
+from gui.utils.spatial_index import (
+    CONNECTION_FIELDS,
+    OBJECT_FIELDS,
+    DiagramConnectionStore,
+    DiagramObjectStore,
+    PointList,
+    notify_attribute_change,
+    object_bbox,
+    store_of,
+)
 from gui.controls.button_utils import set_uniform_button_width
 from tools.memory_manager import manager as memory_manager
 
@@ -52,6 +64,7 @@ from analysis.models import (
     REQUIREMENT_WORK_PRODUCTS,
     REQUIREMENT_TYPE_OPTIONS,
 )
+from analysis.traceability import note_trace_change
 from analysis.safety_management import (
     ALLOWED_PROPAGATIONS,
     ALLOWED_ANALYSIS_USAGE,
@@ -84,7 +97,7 @@ CONNECTION_SELECT_RADIUS = 15
 _CONFIG_PATH = (
     Path(__file__).resolve().parents[1] / "config" / "rules" / "diagram_rules.json"
 )
-_CONFIG = load_diagram_rules(_CONFIG_PATH)
+_CONFIG = config_registry.diagram_rules(_CONFIG_PATH)
 
 _REQ_PATTERN_PATH = (
     Path(__file__).resolve().parents[1]
@@ -98,7 +111,7 @@ def _load_requirement_relations(path: Path = _REQ_PATTERN_PATH) -> list[str]:
     """Return unique relationship labels referenced by requirement patterns."""
 
     try:
-        patterns = load_json_with_comments(path)
+        patterns = config_registry.requirement_patterns(path)
     except Exception:  # pragma: no cover - fallback if file missing
         return []
     rels: set[str] = set()
@@ -787,7 +800,7 @@ def reload_config() -> None:
     global SAFETY_AI_RELATION_RULES, CONNECTION_RULES, NODE_CONNECTION_LIMITS, GUARD_NODES
     global NODE_TO_GROUP, GOV_CORE_NODES, REQ_PATTERN_RELATIONS, _BASE_CONN_TYPES
     global _ARROW_FORWARD_BASE
-    _CONFIG = load_diagram_rules(_CONFIG_PATH)
+    _CONFIG = config_registry.diagram_rules(_CONFIG_PATH)
     ARCH_DIAGRAM_TYPES = set(_CONFIG.get("arch_diagram_types", []))
     SAFETY_AI_NODES = _CONFIG.get("ai_nodes", [])
     SAFETY_AI_NODE_TYPES = set(SAFETY_AI_NODES)
@@ -838,6 +851,9 @@ def reload_config() -> None:
             ARCH_WINDOWS.discard(ref)
 
 
+config_registry.subscribe(reload_config)
+
+
 def _work_product_name(diag_type: str) -> str:
     """Return work product name for a given diagram type."""
     return "Architecture Diagram" if diag_type in ARCH_DIAGRAM_TYPES else diag_type
@@ -2714,6 +2730,15 @@ class SysMLObject:
     collapsed: Dict[str, bool] = field(default_factory=dict)
     phase: str | None = field(default_factory=lambda: SysMLRepository.get_instance().active_phase)
 
+    def __setattr__(self, name: str, value) -> None:
+        if name in OBJECT_FIELDS and store_of(self) is not None:
+            old = self.__dict__.get(name)
+            object.__setattr__(self, name, value)
+            if old != value:
+                notify_attribute_change(self, name, old)
+            return
+        object.__setattr__(self, name, value)
+
     # ------------------------------------------------------------
     def display_name(self) -> str:
         """Return the object's name annotated with its creation phase."""
@@ -2749,6 +2774,14 @@ def calculate_allocated_asil(requirements: List[dict]) -> str:
     return asil
 
 
+def _note_link_change(diagram_id: str | None) -> None:
+    """Tell the traceability index an object's requirements changed."""
+    if diagram_id:
+        SysMLRepository.get_instance().touch_diagram(diagram_id)
+    else:
+        note_trace_change()
+
+
 def link_requirement_to_object(obj, req_id: str, diagram_id: str | None = None) -> None:
     """Link requirement *req_id* to *obj* and update global traces.
 
@@ -2792,6 +2825,7 @@ def link_requirement_to_object(obj, req_id: str, diagram_id: str | None = None)
         else:
             if not any(r.get("id") == req_id for r in obj.requirements):
                 obj.requirements.append(req)
+    _note_link_change(diagram_id)
 
 
 def unlink_requirement_from_object(obj, req_id: str, diagram_id: str | None = None) -> None:
@@ -2832,6 +2866,7 @@ def unlink_requirement_from_object(obj, req_id: str, diagram_id: str | None = No
             obj["requirements"] = [r for r in obj.get("requirements", []) if r.get("id") != req_id]
         else:
             obj.requirements = [r for r in obj.requirements if r.get("id") != req_id]
+    _note_link_change(diagram_id)
 
 
 # ---------------------------------------------------------------------------
@@ -3539,6 +3574,18 @@ class DiagramConnection:
     stereotype: str = ""
     phase: str | None = field(default_factory=lambda: SysMLRepository.get_instance().active_phase)
 
+    def __setattr__(self, name: str, value) -> None:
+        if name == "points" and isinstance(value, list):
+            # Track in-place bend point edits for the connection index.
+            value = PointList(value, owner=self)
+        if name in CONNECTION_FIELDS and store_of(self) is not None:
+            old = self.__dict__.get(name)
+            object.__setattr__(self, name, value)
+            if name == "points" or old != value:
+                notify_attribute_change(self, name, old)
+            return
+        object.__setattr__(self, name, value)
+
     def __post_init__(self) -> None:
         if isinstance(self.guard, str):
             self.guard = [self.guard]
@@ -3617,6 +3664,37 @@ def format_diagram_name(diagram: "SysMLDiagram | None") -> str:
     return name
 
 
+def _copy_font(font):
+    """Return a modifiable copy of *font*.
+
+    Fonts of headless renderers copy themselves since creating a
+    ``tkFont.Font`` needs a Tk interpreter.
+    """
+    if getattr(font, "headless", False):
+        return font.copy()
+    return tkFont.Font(font=font)
+
+
+def load_diagram_content(
+    repo: SysMLRepository, diag_id: str
+) -> tuple[List[SysMLObject], List[DiagramConnection]]:
+    """Return the visible objects and connections stored for *diag_id*."""
+    objects: List[SysMLObject] = []
+    for data in repo.visible_objects(diag_id):
+        if "requirements" not in data:
+            data["requirements"] = []
+        data.setdefault("phase", _repo_phase(repo))
+        obj = SysMLObject(**data)
+        if obj.obj_type == "Part":
+            asil = calculate_allocated_asil(obj.requirements)
+            obj.properties.setdefault("asil", asil)
+            if obj.element_id and obj.element_id in repo.elements:
+                repo.elements[obj.element_id].properties.setdefault("asil", asil)
+        objects.append(obj)
+    connections = [DiagramConnection(**data) for data in repo.visible_connections(diag_id)]
+    return objects, connections
+
+
 class SysMLDiagramWindow(tk.Frame):
     """Base frame for AutoML diagrams with zoom and pan support."""
 
@@ -3649,54 +3727,15 @@ class SysMLDiagramWindow(tk.Frame):
         if isinstance(self.master, tk.Toplevel):
             self.master.protocol("WM_DELETE_WINDOW", self.on_close)
 
-        # Load any saved objects and connections for this diagram
-        self.objects: List[SysMLObject] = []
-        for data in self.repo.visible_objects(diagram.diag_id):
-            if "requirements" not in data:
-                data["requirements"] = []
-            data.setdefault("phase", _repo_phase(self.repo))
-            obj = SysMLObject(**data)
-            if obj.obj_type == "Part":
-                asil = calculate_allocated_asil(obj.requirements)
-                obj.properties.setdefault("asil", asil)
-                if obj.element_id and obj.element_id in self.repo.elements:
-                    self.repo.elements[obj.element_id].properties.setdefault(
-                        "asil", asil
-                    )
-            self.objects.append(obj)
-        self.sort_objects()
-        self.connections: List[DiagramConnection] = [
-            DiagramConnection(**data)
-            for data in self.repo.visible_connections(diagram.diag_id)
-        ]
+        # Load any saved objects and connections for this diagram and use
+        # the default drawing helper for gradient fills and shapes
+        self._init_draw_state(
+            self.repo, diagram.diag_id, tkFont.Font(family="Arial", size=8), fta_drawing_helper
+        )
         if self.objects:
             global _next_obj_id
             _next_obj_id = max(o.obj_id for o in self.objects) + 1
 
-        self.zoom = 1.0
-        self.font = tkFont.Font(family="Arial", size=int(8 * self.zoom))
-        self.current_tool = None
-        self.start = None
-        self.selected_obj: SysMLObject | None = None
-        self.selected_objs: list[SysMLObject] = []
-        self.selected_conn: DiagramConnection | None = None
-        self.drag_offset = (0, 0)
-        self.dragging_point_index: int | None = None
-        self.dragging_endpoint: str | None = None  # "src" or "dst"
-        self.conn_drag_offset: tuple[float, float] | None = None
-        self.dragging_conn_mid: tuple[float, float] | None = None
-        self.dragging_conn_vec: tuple[float, float] | None = None
-        self.resizing_obj: SysMLObject | None = None
-        self.resize_edge: str | None = None
-        self.select_rect_start: tuple[float, float] | None = None
-        self.select_rect_id: int | None = None
-        self.temp_line_end: tuple[float, float] | None = None
-        self.endpoint_drag_pos: tuple[float, float] | None = None
-        self.rc_dragged = False
-
-        # Provide default drawing helper for gradient fills and shapes
-        self.drawing_helper = fta_drawing_helper
-
         self.toolbox_container = ttk.Frame(self)
         self.toolbox_container.pack(side=tk.LEFT, fill=tk.Y)
         self.toolbox_container.pack_propagate(False)
@@ -3841,11 +3880,6 @@ class SysMLDiagramWindow(tk.Frame):
             self._conn_tip = None
         self._conn_tip_obj = None
 
-        # Keep references to gradient images used for element backgrounds
-        self.gradient_cache: dict[int, tk.PhotoImage] = {}
-        # Track bounding boxes for compartment toggle buttons
-        self.compartment_buttons: list[tuple[int, str, tuple[float, float, float, float]]] = []
-
         self.canvas.bind("<Button-1>", self.on_left_press)
         self.canvas.bind("<B1-Motion>", self.on_left_drag)
         self.canvas.bind("<ButtonRelease-1>", self.on_left_release)
@@ -3877,6 +3911,46 @@ class SysMLDiagramWindow(tk.Frame):
         if not isinstance(self.master, tk.Toplevel):
             self.pack(fill=tk.BOTH, expand=True)
 
+    def _init_draw_state(self, repo, diagram_id: str, font, drawing_helper) -> None:
+        """Load *diagram_id* from *repo* and reset what :meth:`redraw` reads.
+
+        Shared by the window and the headless renderer, which supply their
+        own *font* and *drawing_helper* and attach a canvas afterwards.
+        """
+
+        self.repo = repo
+        self.diagram_id = diagram_id
+        self.objects: List[SysMLObject]
+        self.connections: List[DiagramConnection]
+        self.objects, self.connections = load_diagram_content(repo, diagram_id)
+        self.sort_objects()
+
+        self.zoom = 1.0
+        self.font = font
+        self.drawing_helper = drawing_helper
+        self.current_tool = None
+        self.start = None
+        self.selected_obj: SysMLObject | None = None
+        self.selected_objs: list[SysMLObject] = []
+        self.selected_conn: DiagramConnection | None = None
+        self.drag_offset = (0, 0)
+        self.dragging_point_index: int | None = None
+        self.dragging_endpoint: str | None = None  # "src" or "dst"
+        self.conn_drag_offset: tuple[float, float] | None = None
+        self.dragging_conn_mid: tuple[float, float] | None = None
+        self.dragging_conn_vec: tuple[float, float] | None = None
+        self.resizing_obj: SysMLObject | None = None
+        self.resize_edge: str | None = None
+        self.select_rect_start: tuple[float, float] | None = None
+        self.select_rect_id: int | None = None
+        self.temp_line_end: tuple[float, float] | None = None
+        self.endpoint_drag_pos: tuple[float, float] | None = None
+        self.rc_dragged = False
+        # Keep references to gradient images used for element backgrounds
+        self.gradient_cache: dict[int, tk.PhotoImage] = {}
+        # Track bounding boxes for compartment toggle buttons
+        self.compartment_buttons: list[tuple[int, str, tuple[float, float, float, float]]] = []
+
     def _on_focus_in(self, event=None):
         if self.app:
             self.app.active_arch_window = self
@@ -5065,8 +5139,8 @@ class SysMLDiagramWindow(tk.Frame):
                 if getattr(self, "font", None):
                     label_lines = self._object_label_lines(obj)
                     if label_lines:
-                        text_w = max(self.font.measure(line) for line in label_lines)
-                        text_h = self.font.metrics("linespace") * len(label_lines)
+                        text_w = max(text_layout.measure(self.font, line) for line in label_lines)
+                        text_h = text_layout.linespace(self.font) * len(label_lines)
                         min_w = max(min_w, (text_w + 10 * self.zoom) / self.zoom)
                         min_h = max(min_h, (text_h + 10 * self.zoom) / self.zoom)
             left = obj.x - obj.width / 2
@@ -5113,7 +5187,7 @@ class SysMLDiagramWindow(tk.Frame):
             if obj.obj_type == "Block Boundary":
                 update_ports_for_boundary(obj, self.objects)
                 ensure_boundary_contains_parts(obj, self.objects)
-            self.redraw()
+            self.redraw_changed()
             return
         if self.selected_obj.obj_type == "Port" and "parent" in self.selected_obj.properties:
             parent = self.get_object(int(self.selected_obj.properties["parent"]))
@@ -5169,10 +5243,9 @@ class SysMLDiagramWindow(tk.Frame):
             boundary = self.get_ibd_boundary()
             if boundary:
                 ensure_boundary_contains_parts(boundary, self.objects)
-        self.redraw()
-        self._sync_to_repository()
-        if self.app:
-            self.app.update_views()
+        self.redraw_changed()
+        # The repository and the other views catch up on button release.
+        self._drag_moved = True
 
     def _connection_targets(self, source: SysMLObject, conn_type: str) -> list[str]:
         """Return valid target object types for a connection."""
@@ -5560,6 +5633,9 @@ class SysMLDiagramWindow(tk.Frame):
                 else:
                     self.selected_obj.properties.pop("boundary", None)
             self._sync_to_repository()
+            if getattr(self, "_drag_moved", False) and self.app:
+                self.app.update_views()
+        self._drag_moved = False
         self.redraw()
 
     def on_mouse_move(self, event):
@@ -5878,14 +5954,85 @@ class SysMLDiagramWindow(tk.Frame):
         else:
             self.zoom_out()
 
+    # ------------------------------------------------------------
+    # Spatial index
+    # ------------------------------------------------------------
+    @property
+    def objects(self) -> DiagramObjectStore:
+        return self._objects
+
+    @objects.setter
+    def objects(self, value) -> None:
+        store = value if isinstance(value, DiagramObjectStore) else DiagramObjectStore(value)
+        store.on_change = self._object_geometry_changed
+        self._objects = store
+        conns = self.__dict__.get("_connections")
+        if conns is not None:
+            conns.invalidate()
+
+    @property
+    def connections(self) -> DiagramConnectionStore:
+        return self._connections
+
+    @connections.setter
+    def connections(self, value) -> None:
+        store = DiagramConnectionStore(value, bounds=self._connection_bounds)
+        self._connections = store
+
+    def _object_geometry_changed(self, obj_id) -> None:
+        conns = self.__dict__.get("_connections")
+        if conns is not None:
+            conns.object_changed(obj_id)
+
+    def _connection_bounds(self, conn: DiagramConnection):
+        """Return the diagram-unit box enclosing every segment of *conn*."""
+        src = self.get_object(conn.src)
+        dst = self.get_object(conn.dst)
+        if not src or not dst:
+            return None
+        a, b = object_bbox(src), object_bbox(dst)
+        left, top = min(a[0], b[0]), min(a[1], b[1])
+        right, bottom = max(a[2], b[2]), max(a[3], b[3])
+        for px, py in conn.points or ():
+            left, right = min(left, px), max(right, px)
+            top, bottom = min(top, py), max(bottom, py)
+        if conn.src == conn.dst:
+            # Self loops are drawn up and to the right of the object.
+            size = max(src.width, src.height) * 0.5
+            right += size
+            top -= size
+        # Ports are drawn as 12x12 squares whatever their size.
+        return left - 6, top - 6, right + 6, bottom + 6
+
+    def _objects_at(self, x: float, y: float, pad: float = 1.0) -> list[SysMLObject]:
+        """Return objects near canvas point ``(x, y)`` in drawing order.
+
+        The result is a superset of the objects containing the point; callers
+        still apply their exact hit test.
+        """
+        objects = self.objects
+        if isinstance(objects, DiagramObjectStore):
+            return objects.at(x / self.zoom, y / self.zoom, pad / self.zoom)
+        return objects
+
+    def _connections_near(self, x: float, y: float) -> list[DiagramConnection]:
+        connections = self.connections
+        if isinstance(connections, DiagramConnectionStore) and isinstance(
+            self.objects, DiagramObjectStore
+        ):
+            pad = (CONNECTION_SELECT_RADIUS + 1) / self.zoom
+            return connections.near(x / self.zoom, y / self.zoom, pad)
+        return connections
+
     # ------------------------------------------------------------
     # Utility methods
     # ------------------------------------------------------------
     def _find_object_strategy1(
         self, x: float, y: float, prefer_port: bool = False
     ) -> SysMLObject | None:
+        candidates = self._objects_at(x, y)
         if prefer_port:
-            for obj in reversed(self.objects):
+            for obj in reversed(candidates):
                 if obj.obj_type != "Port":
                     continue
                 ox = obj.x * self.zoom
@@ -5895,7 +6042,7 @@ class SysMLDiagramWindow(tk.Frame):
                 if ox - w <= x <= ox + w and oy - h <= y <= oy + h:
                     return obj
 
-        for obj in reversed(self.objects):
+        for obj in reversed(candidates):
             ox = obj.x * self.zoom
             oy = obj.y * self.zoom
             w = obj.width * self.zoom / 2
@@ -5911,8 +6058,9 @@ class SysMLDiagramWindow(tk.Frame):
     def _find_object_strategy2(
         self, x: float, y: float, prefer_port: bool = False
     ) -> SysMLObject | None:
+        candidates = self._objects_at(x, y)
         if prefer_port:
-            for obj in self.objects:
+            for obj in candidates:
                 if obj.obj_type != "Port":
                     continue
                 ox = obj.x * self.zoom
@@ -5922,7 +6070,7 @@ class SysMLDiagramWindow(tk.Frame):
                 if ox - w <= x <= ox + w and oy - h <= y <= oy + h:
                     return obj
 
-        for obj in self.objects:
+        for obj in candidates:
             ox = obj.x * self.zoom
             oy = obj.y * self.zoom
             w = obj.width * self.zoom / 2
@@ -5934,9 +6082,10 @@ class SysMLDiagramWindow(tk.Frame):
     def _find_object_strategy3(
         self, x: float, y: float, prefer_port: bool = False
     ) -> SysMLObject | None:
+        candidates = self._objects_at(x, y)
         closest = None
         best = float("inf")
-        for obj in self.objects:
+        for obj in candidates:
             ox = obj.x * self.zoom
             oy = obj.y * self.zoom
             w = obj.width * self.zoom / 2
@@ -5951,8 +6100,9 @@ class SysMLDiagramWindow(tk.Frame):
     def _find_object_strategy4(
         self, x: float, y: float, prefer_port: bool = False
     ) -> SysMLObject | None:
+        candidates = self._objects_at(x, y, pad=2.0)
         rx, ry = round(x), round(y)
-        for obj in reversed(self.objects):
+        for obj in reversed(candidates):
             ox = round(obj.x * self.zoom)
             oy = round(obj.y * self.zoom)
             w = round(obj.width * self.zoom / 2)
@@ -6212,7 +6362,7 @@ class SysMLDiagramWindow(tk.Frame):
 
     def find_connection(self, x: float, y: float) -> DiagramConnection | None:
         diag = self.repo.diagrams.get(self.diagram_id)
-        for conn in self.connections:
+        for conn in self._connections_near(x, y):
             src = self.get_object(conn.src)
             dst = self.get_object(conn.dst)
             if not src or not dst:
@@ -6555,11 +6705,13 @@ class SysMLDiagramWindow(tk.Frame):
     def zoom_in(self):
         self.zoom *= 1.2
         self.font.config(size=int(8 * self.zoom))
+        text_layout.invalidate(self.font)
         self.redraw()
 
     def zoom_out(self):
         self.zoom /= 1.2
         self.font.config(size=int(8 * self.zoom))
+        text_layout.invalidate(self.font)
         self.redraw()
 
     def _block_compartments(self, obj: SysMLObject) -> list[tuple[str, str]]:
@@ -6598,7 +6750,7 @@ class SysMLDiagramWindow(tk.Frame):
         """Return minimum width and height to display all Block text."""
         name = _format_label(self, obj.properties.get('name', ''), obj.phase, obj)
         header = f"<<block>> {name}".strip()
-        width_px = self.font.measure(header) + 8 * self.zoom
+        width_px = text_layout.measure(self.font, header) + 8 * self.zoom
         compartments = self._block_compartments(obj)
         total_lines = 1
         button_w = 12 * self.zoom
@@ -6613,13 +6765,13 @@ class SysMLDiagramWindow(tk.Frame):
                 # compartment title when collapsed so that it simply reads
                 # "Parts".
                 disp = f"{label}:"
-                width_px = max(width_px, self.font.measure(disp) + button_w + 8 * self.zoom)
+                width_px = max(width_px, text_layout.measure(self.font, disp) + button_w + 8 * self.zoom)
                 total_lines += 1
             else:
                 disp = f"{label}:"
-                width_px = max(width_px, self.font.measure(disp) + button_w + 8 * self.zoom)
+                width_px = max(width_px, text_layout.measure(self.font, disp) + button_w + 8 * self.zoom)
                 for line in lines:
-                    width_px = max(width_px, self.font.measure(line) + 8 * self.zoom)
+                    width_px = max(width_px, text_layout.measure(self.font, line) + 8 * self.zoom)
                 total_lines += 1 + len(lines)
         height_px = total_lines * 20 * self.zoom
         return width_px / self.zoom, height_px / self.zoom
@@ -6637,8 +6789,8 @@ class SysMLDiagramWindow(tk.Frame):
         lines = self._object_label_lines(full_width_obj)
         if not lines:
             return (10.0, 10.0)
-        text_width = max(self.font.measure(line) for line in lines)
-        text_height = self.font.metrics("linespace") * len(lines)
+        text_width = max(text_layout.measure(self.font, line) for line in lines)
+        text_height = text_layout.linespace(self.font) * len(lines)
         padding = 6 * self.zoom
         return (text_width + padding) / self.zoom, (text_height + padding) / self.zoom
 
@@ -6650,59 +6802,19 @@ class SysMLDiagramWindow(tk.Frame):
         lines = [line for comp in compartments for line in comp.splitlines()]
         if not lines:
             lines = [""]
-        text_width = max(self.font.measure(line) for line in lines)
+        text_width = max(text_layout.measure(self.font, line) for line in lines)
         padding = 8 * self.zoom
         total_lines = sum(max(len(comp.splitlines()), 1) for comp in compartments)
-        text_height = self.font.metrics("linespace") * max(total_lines, 1)
+        text_height = text_layout.linespace(self.font) * max(total_lines, 1)
         return (text_width + padding) / self.zoom, (text_height + padding) / self.zoom
 
     def _wrap_text_to_width(self, text: str, width_px: float) -> list[str]:
-        """Return *text* wrapped to fit within *width_px* pixels."""
-        if self.font.measure(text) <= width_px:
-            return [text]
-        words = text.split()
-        if not words:
-            words = [text]
-
-        if len(words) == 1 and self.font.measure(words[0]) > width_px:
-            # single long word - wrap by characters
-            lines: list[str] = []
-            current = ""
-            for ch in words[0]:
-                if self.font.measure(current + ch) <= width_px:
-                    current += ch
-                else:
-                    if current:
-                        lines.append(current)
-                    current = ch
-            if current:
-                lines.append(current)
-            return lines
+        """Return *text* wrapped to fit within *width_px* pixels.
 
-        lines: list[str] = []
-        current = words[0]
-        for word in words[1:]:
-            candidate = current + " " + word
-            if self.font.measure(candidate) <= width_px:
-                current = candidate
-            else:
-                lines.append(current)
-                if self.font.measure(word) <= width_px:
-                    current = word
-                else:
-                    # break long word
-                    part = ""
-                    for ch in word:
-                        if self.font.measure(part + ch) <= width_px:
-                            part += ch
-                        else:
-                            if part:
-                                lines.append(part)
-                            part = ch
-                    current = part
-        if current:
-            lines.append(current)
-        return lines
+        Words wider than *width_px* are split between characters.  Results
+        are cached by :mod:`gui.utils.text_layout`.
+        """
+        return text_layout.wrap_to_width(self.font, text, width_px)
 
     def _object_label_lines(self, obj: SysMLObject) -> list[str]:
         """Return the lines of text displayed inside *obj*."""
@@ -6865,8 +6977,8 @@ class SysMLDiagramWindow(tk.Frame):
             if not label_lines:
                 return
 
-            text_width = max(self.font.measure(line) for line in label_lines)
-            text_height = self.font.metrics("linespace") * len(label_lines)
+            text_width = max(text_layout.measure(self.font, line) for line in label_lines)
+            text_height = text_layout.linespace(self.font) * len(label_lines)
             if obj.obj_type in ("Action", "CallBehaviorAction"):
                 padding = 6 * self.zoom
                 if text_width + padding <= obj.width * self.zoom:
@@ -6922,22 +7034,46 @@ class SysMLDiagramWindow(tk.Frame):
 
         self.objects.sort(key=key)
 
-    def redraw(self):
-        self.canvas.configure(bg=StyleManager.get_instance().canvas_bg)
-        self.canvas.delete("all")
-        self.gradient_cache.clear()
-        self.compartment_buttons = []
-        self.sort_objects()
-        remove_orphan_ports(self.objects)
-        for obj in list(self.objects):
-            if getattr(obj, "hidden", False):
-                continue
-            if obj.obj_type == "Part":
-                self.sync_ports(obj)
-            if obj.obj_type == "Block Boundary":
-                self.sync_boundary_ports(obj)
-            self.ensure_text_fits(obj)
-            self.draw_object(obj)
+    # ------------------------------------------------------------
+    # Retained-mode rendering
+    # ------------------------------------------------------------
+    def _retained_scene(self) -> CanvasScene | None:
+        """Return the scene tracking canvas item groups, if supported.
+
+        Only real Tk canvases are tracked; stand-in canvases used by tests
+        are always redrawn from scratch.
+        """
+        if not isinstance(getattr(self, "canvas", None), tk.Canvas):
+            return None
+        scene = self.__dict__.get("_scene")
+        if scene is None:
+            scene = self._scene = CanvasScene()
+        return scene
+
+    def _render_frame_key(self) -> tuple:
+        """Return the state shared by every group drawn in a frame."""
+        return (
+            self.zoom,
+            StyleManager.get_instance().canvas_bg,
+            id(self.selected_conn),
+            self.dragging_endpoint,
+            self.endpoint_drag_pos,
+            bool(self.start and self.temp_line_end),
+        )
+
+    def _object_render_state(self, obj: SysMLObject, selected: set[int]) -> tuple:
+        return (
+            obj.x,
+            obj.y,
+            obj.width,
+            obj.height,
+            id(obj) in selected,
+            obj is self.selected_obj,
+        )
+
+    def _visible_connections(self) -> list[tuple]:
+        """Return ``(conn, src, dst)`` for every connection to draw."""
+        visible = []
         for conn in self.connections:
             src = self.get_object(conn.src)
             dst = self.get_object(conn.dst)
@@ -6953,7 +7089,129 @@ class SysMLDiagramWindow(tk.Frame):
                     and self.endpoint_drag_pos
                 ):
                     continue
-                self.draw_connection(src, dst, conn, conn is self.selected_conn)
+                visible.append((conn, src, dst))
+        return visible
+
+    def _draw_object_group(self, obj: SysMLObject, scene: CanvasScene | None, selected=None) -> None:
+        if scene is None:
+            self.draw_object(obj)
+            return
+        tag = scene.new_tag("obj")
+        canvas = self.canvas
+        self.canvas = TaggingCanvas(canvas, tag)
+        try:
+            self.draw_object(obj)
+        finally:
+            self.canvas = canvas
+        if selected is None:
+            selected = {id(o) for o in self.selected_objs}
+        scene.objects[id(obj)] = Group(tag, self._object_render_state(obj, selected))
+
+    def _draw_connection_group(self, conn, src, dst, scene: CanvasScene | None) -> None:
+        if scene is None:
+            self.draw_connection(src, dst, conn, conn is self.selected_conn)
+            return
+        tag = scene.new_tag("conn")
+        canvas = self.canvas
+        self.canvas = TaggingCanvas(canvas, tag)
+        try:
+            self.draw_connection(src, dst, conn, conn is self.selected_conn)
+        finally:
+            self.canvas = canvas
+        scene.connections[id(conn)] = Group(tag, ())
+
+    def redraw_changed(self) -> None:
+        """Update the canvas after objects moved, resized or changed selection.
+
+        Object groups that were only translated are shifted with
+        ``canvas.move``; resized or re-selected objects and the connections
+        attached to any changed object are drawn again.  Other model edits
+        are not detected, so callers changing anything else use
+        :meth:`redraw`, which this method also falls back to whenever the
+        set or order of visible items changed.
+        """
+        scene = self._retained_scene()
+        if scene is None:
+            self.redraw()
+            return
+        visible = [o for o in self.objects if not getattr(o, "hidden", False)]
+        conns = self._visible_connections()
+        if not scene.matches(
+            self._render_frame_key(),
+            [id(o) for o in visible],
+            [id(c) for c, _src, _dst in conns],
+        ):
+            self.redraw()
+            return
+        selected = {id(o) for o in self.selected_objs}
+        changed: set[int] = set()
+        prev_tag = None
+        for obj in visible:
+            group = scene.objects[id(obj)]
+            state = self._object_render_state(obj, selected)
+            if state != group.state:
+                old = group.state
+                if old[2:] == state[2:]:
+                    dx = (obj.x - old[0]) * self.zoom
+                    dy = (obj.y - old[1]) * self.zoom
+                    self.canvas.move(group.tag, dx, dy)
+                    self.compartment_buttons = [
+                        (oid, label, (x1 + dx, y1 + dy, x2 + dx, y2 + dy))
+                        if oid == obj.obj_id
+                        else (oid, label, (x1, y1, x2, y2))
+                        for oid, label, (x1, y1, x2, y2) in self.compartment_buttons
+                    ]
+                    group.state = state
+                else:
+                    self.canvas.delete(group.tag)
+                    self.compartment_buttons = [
+                        b for b in self.compartment_buttons if b[0] != obj.obj_id
+                    ]
+                    self._draw_object_group(obj, scene, selected)
+                    tag = scene.objects[id(obj)].tag
+                    if prev_tag:
+                        self.canvas.tag_raise(tag, prev_tag)
+                    else:
+                        self.canvas.tag_lower(tag)
+                changed.add(obj.obj_id)
+            prev_tag = scene.objects[id(obj)].tag
+        if not changed:
+            return
+        for conn, src, dst in conns:
+            if conn.src in changed or conn.dst in changed:
+                self.canvas.delete(scene.connections[id(conn)].tag)
+                self._draw_connection_group(conn, src, dst, scene)
+        self.canvas.config(scrollregion=self.canvas.bbox("all"))
+
+    def redraw(self):
+        self.canvas.configure(bg=StyleManager.get_instance().canvas_bg)
+        self.canvas.delete("all")
+        self.gradient_cache.clear()
+        self.compartment_buttons = []
+        scene = self._retained_scene()
+        if scene is not None:
+            scene.clear()
+        self.sort_objects()
+        remove_orphan_ports(self.objects)
+        selected = {id(o) for o in self.selected_objs} if scene is not None else None
+        drawn = []
+        for obj in list(self.objects):
+            if getattr(obj, "hidden", False):
+                continue
+            if obj.obj_type == "Part":
+                self.sync_ports(obj)
+            if obj.obj_type == "Block Boundary":
+                self.sync_boundary_ports(obj)
+            self.ensure_text_fits(obj)
+            self._draw_object_group(obj, scene, selected)
+            drawn.append(id(obj))
+        conns = self._visible_connections()
+        for conn, src, dst in conns:
+            self._draw_connection_group(conn, src, dst, scene)
+        if scene is not None:
+            scene.frame = self._render_frame_key()
+            scene.object_order = drawn
+            scene.connection_order = [id(c) for c, _src, _dst in conns]
         if (
             self.selected_conn
             and self.dragging_endpoint is not None
@@ -7082,23 +7340,15 @@ class SysMLDiagramWindow(tk.Frame):
         return self.canvas.create_polygon(points, smooth=True, splinesteps=36, **kwargs)
 
     def _create_gradient_image(self, width: int, height: int, color: str) -> tk.PhotoImage:
-        """Return a left-to-right gradient image from white to *color*."""
-        width = max(1, int(width))
-        height = max(1, int(height))
+        """Return a left-to-right gradient image from white to *color*.
+
+        Images come from the shared image factory cache, so redraws reuse
+        the gradient of every unchanged object instead of repainting it.
+        """
         try:
-            img = tk.PhotoImage(width=width, height=height)
+            return image_factory.gradient(width, height, color)
         except RuntimeError:  # pragma: no cover - headless tests
             return None
-        r = int(color[1:3], 16)
-        g = int(color[3:5], 16)
-        b = int(color[5:7], 16)
-        for x in range(width):
-            ratio = x / (width - 1) if width > 1 else 1
-            nr = int(255 * (1 - ratio) + r * ratio)
-            ng = int(255 * (1 - ratio) + g * ratio)
-            nb = int(255 * (1 - ratio) + b * ratio)
-            img.put(f"#{nr:02x}{ng:02x}{nb:02x}", to=(x, 0, x + 1, height))
-        return img
 
     def _draw_gradient_rect(self, x1: float, y1: float, x2: float, y2: float, color: str, obj_id: int) -> None:
         """Draw a gradient rectangle on the canvas and cache the image."""
@@ -7998,7 +8248,7 @@ class SysMLDiagramWindow(tk.Frame):
                 x + r, cy + r * 0.2, x + r * 0.2, y + h, x, cy + r * 0.2,
                 fill=color, outline=outline
             )
-            label_font = tkFont.Font(font=self.font)
+            label_font = _copy_font(self.font)
             label_font.configure(weight="bold")
             self.canvas.create_text(
                 x,
@@ -8355,7 +8605,7 @@ class SysMLDiagramWindow(tk.Frame):
                 avail_h = max(obj.height * self.zoom - 16 * self.zoom, 1)
 
                 try:
-                    font = tkFont.Font(font=self.font)
+                    font = _copy_font(self.font)
                     char_w = max(font.measure("M"), 1)
                     line_h = max(font.metrics("linespace"), 1)
                 except Exception:
@@ -9363,6 +9613,8 @@ class SysMLDiagramWindow(tk.Frame):
                 )
 
     def get_object(self, oid: int) -> SysMLObject | None:
+        if isinstance(self.objects, DiagramObjectStore):
+            return self.objects.get(oid)
         for o in self.objects:
             if o.obj_id == oid:
                 return o
@@ -9413,7 +9665,13 @@ class SysMLDiagramWindow(tk.Frame):
         left, right = sorted([x0, x])
         top, bottom = sorted([y0, y])
         selected: list[SysMLObject] = []
-        for obj in self.objects:
+        objects = self.objects
+        if isinstance(objects, DiagramObjectStore):
+            z = self.zoom
+            objects = objects.overlapping(
+                (left - 1) / z, (top - 1) / z, (right + 1) / z, (bottom + 1) / z
+            )
+        for obj in objects:
             ox = obj.x * self.zoom
             oy = obj.y * self.zoom
             w = obj.width * self.zoom / 2
@@ -9422,7 +9680,7 @@ class SysMLDiagramWindow(tk.Frame):
                 selected.append(obj)
         self.selected_objs = selected
         self.selected_obj = selected[0] if len(selected) == 1 else None
-        self.redraw()
+        self.redraw_changed()
         self.update_property_view()
 
     # ------------------------------------------------------------
@@ -10051,11 +10309,15 @@ class SysMLDiagramWindow(tk.Frame):
 
     def _sync_to_repository(self) -> None:
         """Persist current objects and connections back to the repository."""
-        self.repo.push_undo_state(sync_app=False)
-        undo = getattr(self.app, "push_undo_state", None)
-        if undo:
-            undo(sync_repo=False)
         diag = self.repo.diagrams.get(self.diagram_id)
+        if diag and diag.diag_type != "Internal Block Diagram":
+            # Only this diagram changes; IBDs also update their block parts.
+            self.repo.push_undo_state(touched=[("diagrams", self.diagram_id)])
+        else:
+            self.repo.push_undo_state(sync_app=False)
+            undo = getattr(self.app, "push_undo_state", None)
+            if undo:
+                undo(sync_repo=False)
         if diag:
             existing_objs = getattr(diag, "objects", [])
             hidden_objs = [
@@ -10116,10 +10378,8 @@ class SysMLDiagramWindow(tk.Frame):
             if obj.element_id:
                 targets = [
                     self.repo.elements[r.target].name
-                    for r in self.repo.relationships
-                    if r.rel_type == "Trace"
-                    and r.source == obj.element_id
-                    and r.target in self.repo.elements
+                    for r in self.repo.relationships.by_source(obj.element_id, "Trace")
+                    if r.target in self.repo.elements
                 ]
                 if targets:
                     obj.properties["trace_to"] = ", ".join(sorted(targets))
@@ -13243,6 +13503,7 @@ class DiagramPropertiesDialog(simpledialog.Dialog):
         self.diagram.name = self.name_var.get()
         self.diagram.description = self.desc_var.get()
         self.diagram.color = self.color_var.get()
+        SysMLRepository.get_instance().touch_diagram(self.diagram.diag_id)
         if self.diagram.diag_type == "Governance Diagram":
             app = getattr(self.master, "app", None)
             toolbox = getattr(app, "safety_mgmt_toolbox", None)
@@ -13742,6 +14003,7 @@ class ArchitectureManagerDialog(tk.Frame):
                 name = simpledialog.askstring("Rename Diagram", "Name:", initialvalue=diag.name)
                 if name:
                     diag.name = name
+                    self.repo.touch_diagram(diag.diag_id)
                     self.populate()
         elif item.startswith("obj_"):
             return
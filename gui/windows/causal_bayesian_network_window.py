@@ -38,6 +38,19 @@ from gui.controls.button_utils import set_uniform_button_width
 
 CBN_WINDOWS: set[weakref.ReferenceType] = set()
 
+# Node fill colour and stereotype per node kind.
+_NODE_STYLES = {
+    "trigger": ("lightblue", "triggering condition"),
+    "insufficiency": ("lightyellow", "functional insufficiency"),
+    "malfunction": ("lightgreen", "malfunction"),
+    "variable": ("lightgray", "variable"),
+}
+
+
+def node_style(kind: str | None) -> tuple[str, str | None]:
+    """Return the fill colour and stereotype used to draw a *kind* node."""
+    return _NODE_STYLES.get(kind, ("lightyellow", None))
+
 
 class CausalBayesianNetworkWindow(tk.Frame):
     """Editor for Causal Bayesian Network analyses with diagram support."""
@@ -627,21 +640,7 @@ class CausalBayesianNetworkWindow(tk.Frame):
     ) -> None:
         """Draw a node as a filled circle with a text label."""
         r = self.NODE_RADIUS
-        if kind == "trigger":
-            color = "lightblue"
-            stereo = "triggering condition"
-        elif kind == "insufficiency":
-            color = "lightyellow"
-            stereo = "functional insufficiency"
-        elif kind == "malfunction":
-            color = "lightgreen"
-            stereo = "malfunction"
-        elif kind == "variable":
-            color = "lightgray"
-            stereo = "variable"
-        else:
-            color = "lightyellow"
-            stereo = None
+        color, stereo = node_style(kind)
         self.nodes.setdefault(name, [])
         idx = idx if idx is not None else len(self.nodes[name])
         fill_tag = self._generate_fill_tag(name, idx)
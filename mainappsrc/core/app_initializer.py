@@ -40,6 +40,7 @@ from mainappsrc.managers.product_goal_manager import ProductGoalManager
 from mainappsrc.managers.gsn_manager import GSNManager
 from mainappsrc.core.structure_tree_operations import Structure_Tree_Operations
 from mainappsrc.core.probability_reliability import Probability_Reliability
+from mainappsrc.core.version_store import VersionStore
 from gui.utils.drawing_helper import fta_drawing_helper
 from .project_properties_manager import ProjectPropertiesManager
 from .diagram_clipboard_manager import DiagramClipboardManager
@@ -157,6 +158,7 @@ class AppInitializer:
         app.enabled_work_products = set()
         app.work_product_menus = {}
         app.versions = []
+        app.version_store = VersionStore()
         app.diff_nodes = []
         app.fi2tc_entries = []
         app.tc2fi_entries = []
@@ -20,6 +20,7 @@
 import math
 import sys
 import json
+import hashlib
 from concurrent.futures import ThreadPoolExecutor
 import tkinter as tk
 import os, sys
@@ -257,6 +258,7 @@ from gui.toolboxes import (
 from pathlib import Path
 from gui.dialogs.user_info_dialog import UserInfoDialog
 
+from config import config_registry
 from . import config_utils
 from .config_utils import _reload_local_config
 from .project_properties_manager import ProjectPropertiesManager
@@ -295,6 +297,10 @@ class AutoMLApp(
     """Main application window for AutoML Analyzer."""
 
     _instance: Optional["AutoMLApp"] = None
+    #: Store a content hash on save and let :meth:`has_unsaved_changes`
+    #: compare it instead of the model revision, which also recognises edits
+    #: reverted by hand.  Costs a full model export per save and check.
+    verify_saved_state = False
 
     #: Maximum number of characters displayed for a notebook tab title. Longer
     #: titles are truncated with an ellipsis to avoid giant tabs that overflow
@@ -1085,7 +1091,7 @@ class AutoMLApp(
         self.grid_size = 20
         self.update_views()
         # Track the last saved state so we can prompt on exit
-        self.last_saved_state = json.dumps(self.export_model_data(), sort_keys=True)
+        self.set_last_saved_state()
         root.protocol("WM_DELETE_WINDOW", self.confirm_close)
         self.use_case_windows = []
         self.activity_windows = []
@@ -1871,6 +1877,12 @@ class AutoMLApp(
         """Refresh project views via the dedicated :class:`ViewUpdater`."""
         self.view_updater.update_views()
 
+    def flush_views(self):
+        """Run a view refresh :meth:`update_views` deferred to idle time now."""
+        updater = getattr(self, "view_updater", None)
+        if updater is not None:
+            updater.flush()
+
     def update_basic_event_probabilities(self):
         return self.safety_analysis.update_basic_event_probabilities()
 
@@ -1903,14 +1915,19 @@ class AutoMLApp(
                     return False
             return False
 
-    def compute_failure_prob(self, node, failure_mode_ref=None, formula=None):
-        return self.probability_reliability.compute_failure_prob(node, failure_mode_ref=failure_mode_ref, formula=formula)
+    def compute_failure_prob(self, node, failure_mode_ref=None, formula=None, fm=None):
+        return self.probability_reliability.compute_failure_prob(
+            node, failure_mode_ref=failure_mode_ref, formula=formula, fm=fm
+        )
 
 
     def propagate_failure_mode_attributes(self, fm_node):
         """Update basic events referencing ``fm_node`` and recompute probability."""
         return self.fmeda_manager.propagate_failure_mode_attributes(fm_node)
 
+    def invalidate_probability(self, node):
+        return self.probability_reliability.invalidate_probability(node)
+
 
     def refresh_model(self):
         return self.safety_analysis.refresh_model()
@@ -1976,6 +1993,11 @@ class AutoMLApp(
     def calculate_pmfh(self):
         return self.probability_reliability.calculate_pmfh()
 
+    def calculate_pmhf_uncertainty(self, samples=100_000, seed=None, fit_error_factor=3.0, distributions=None):
+        return self.probability_reliability.calculate_pmhf_uncertainty(
+            samples=samples, seed=seed, fit_error_factor=fit_error_factor, distributions=distributions
+        )
+
     def show_requirements_matrix(self):
         return self.editors.show_requirements_matrix()
 
@@ -2211,16 +2233,10 @@ class AutoMLApp(
     def reload_config(self) -> None:
         """Reload diagram rule configuration across all interested modules."""
 
-        import sys
-
         _reload_local_config()
-
-        for mod in list(sys.modules.values()):
-            if hasattr(mod, "reload_config"):
-                try:  # pragma: no cover - defensive programming
-                    mod.reload_config()
-                except Exception:
-                    pass
+        # Every module caching the configuration subscribed to the registry;
+        # an explicit reload refreshes them even if no file stamp changed.
+        config_registry.reload(force=True)
 
         if hasattr(self, "canvas") and getattr(self.canvas, "winfo_exists", lambda: False)():
             self.redraw_canvas()
@@ -2728,33 +2744,84 @@ class AutoMLApp(
 
 
 
+    def _model_revision(self):
+        return getattr(getattr(self, "undo_manager", None), "model_version", None)
+
+    def _model_digest(self) -> str:
+        data = json.dumps(self.export_model_data(), sort_keys=True)
+        return hashlib.sha256(data.encode("utf-8")).hexdigest()
+
+    def mark_model_changed(self) -> None:
+        """Record an edit that was applied without an undo checkpoint."""
+        manager = getattr(self, "undo_manager", None)
+        if manager is not None:
+            manager.mark_changed()
+
+    def settle_model_changes(self) -> None:
+        """Count edits the last undo checkpoint covers (see :meth:`UndoRedoManager.settle`)."""
+        manager = getattr(self, "undo_manager", None)
+        if manager is not None:
+            manager.settle()
+
     def set_last_saved_state(self):
-        """Record the current model state for change detection."""
-        self.last_saved_state = json.dumps(self.export_model_data(), sort_keys=True)
+        """Record the current model as saved for change detection.
+
+        Only the model revision is stored; the content hash is computed when
+        :attr:`verify_saved_state` asks for it.
+        """
+        self.flush_views()
+        manager = getattr(self, "undo_manager", None)
+        if manager is not None:
+            manager.mark_saved()
+        self.last_saved_revision = self._model_revision()
+        self.last_saved_digest = self._model_digest() if self.verify_saved_state else None
 
     def has_unsaved_changes(self):
-        """Return True if the model differs from the last saved state."""
-        current_state = json.dumps(self.export_model_data(), sort_keys=True)
-        return current_state != getattr(self, "last_saved_state", None)
+        """Return True if the model changed since the last save.
+
+        Mutation paths record an undo checkpoint before editing, so the undo
+        manager knows whether an edit happened since the save without
+        reading the model (see :meth:`UndoRedoManager.is_dirty`).  With
+        :attr:`verify_saved_state` the stored content hash is compared
+        instead.
+        """
+        # A deferred refresh may still settle pending checkpoint scopes.
+        self.flush_views()
+        digest = getattr(self, "last_saved_digest", None)
+        if self.verify_saved_state and digest is not None:
+            return self._model_digest() != digest
+        manager = getattr(self, "undo_manager", None)
+        saved = getattr(self, "last_saved_revision", None)
+        if manager is None or saved is None:
+            return True
+        return manager.is_dirty(saved)
 
     # ------------------------------------------------------------
     # ------------------------------------------------------------
     # Undo support
     # ------------------------------------------------------------
-    def push_undo_state(self, strategy: str = "v4", sync_repo: bool = True) -> None:
-        self.undo_manager.push_undo_state(strategy=strategy, sync_repo=sync_repo)
+    def push_undo_state(
+        self,
+        strategy: str = "v4",
+        sync_repo: bool = True,
+        touched=None,
+        moved: bool = False,
+    ) -> None:
+        self.undo_manager.push_undo_state(
+            strategy=strategy, sync_repo=sync_repo, touched=touched, moved=moved
+        )
 
-    def _push_undo_state_v1(self, state: dict, stripped: dict) -> bool:
-        return self.undo_manager._push_undo_state_v1(state, stripped)
+    def _push_undo_state_v1(self, checkpoint, status: int) -> bool:
+        return self.undo_manager._push_undo_state_v1(checkpoint, status)
 
-    def _push_undo_state_v2(self, state: dict, stripped: dict) -> bool:
-        return self.undo_manager._push_undo_state_v2(state, stripped)
+    def _push_undo_state_v2(self, checkpoint, status: int) -> bool:
+        return self.undo_manager._push_undo_state_v2(checkpoint, status)
 
-    def _push_undo_state_v3(self, state: dict, stripped: dict) -> bool:
-        return self.undo_manager._push_undo_state_v3(state, stripped)
+    def _push_undo_state_v3(self, checkpoint, status: int) -> bool:
+        return self.undo_manager._push_undo_state_v3(checkpoint, status)
 
-    def _push_undo_state_v4(self, state: dict, stripped: dict) -> bool:
-        return self.undo_manager._push_undo_state_v4(state, stripped)
+    def _push_undo_state_v4(self, checkpoint, status: int) -> bool:
+        return self.undo_manager._push_undo_state_v4(checkpoint, status)
 
     def _undo_hotkey(self, event):
         """Keyboard shortcut handler for undo."""
@@ -2794,6 +2861,9 @@ class AutoMLApp(
     def export_model_data(self, include_versions=True):
         return self.reporting_export.export_model_data(include_versions)
 
+    def export_model_sections(self, names):
+        return self.reporting_export.export_model_sections(names)
+
     def _load_project_properties(self, data: dict) -> None:
         """Delegate project property loading to the manager."""
         self.project_properties = self.project_properties_manager.load_project_properties(
@@ -2806,6 +2876,9 @@ class AutoMLApp(
     def apply_model_data(self, data: dict, ensure_root: bool = True):
         return self.project_manager.apply_model_data(data, ensure_root)
 
+    def apply_model_sections(self, sections: dict):
+        return self.project_manager.apply_model_sections(sections)
+
     def _reset_on_load(self):
         """Close all open windows and clear state before loading a project."""
 
@@ -24,7 +24,7 @@ from __future__ import annotations
 from pathlib import Path
 from typing import Any
 
-from config import load_diagram_rules
+from config import config_registry
 from analysis.requirement_rule_generator import regenerate_requirement_patterns
 from analysis.risk_assessment import AutoMLHelper
 
@@ -37,7 +37,7 @@ _CONFIG_PATH = (
     / "rules"
     / "diagram_rules.json"
 )
-_CONFIG: dict[str, Any] = load_diagram_rules(_CONFIG_PATH)
+_CONFIG: dict[str, Any] = config_registry.diagram_rules(_CONFIG_PATH)
 GATE_NODE_TYPES: set[str] = set(_CONFIG.get("gate_node_types", []))
 
 _PATTERN_PATH = (
@@ -54,7 +54,9 @@ _REPORT_TEMPLATE_PATH = (
 )
 
 # Generate requirement patterns on import so consumers have up-to-date data.
-regenerate_requirement_patterns()
+# Nothing is rebuilt when neither the rules, the generator nor the generated
+# file changed since the last launch.
+regenerate_requirement_patterns(_CONFIG_PATH, _PATTERN_PATH)
 
 
 # ---------------------------------------------------------------------------
@@ -63,10 +65,10 @@ regenerate_requirement_patterns()
 def _reload_local_config() -> None:
     """Reload gate node types from the external configuration file."""
     global _CONFIG
-    _CONFIG = load_diagram_rules(_CONFIG_PATH)
+    _CONFIG = config_registry.diagram_rules(_CONFIG_PATH)
     GATE_NODE_TYPES.clear()
     GATE_NODE_TYPES.update(_CONFIG.get("gate_node_types", []))
-    regenerate_requirement_patterns()
+    regenerate_requirement_patterns(_CONFIG_PATH, _PATTERN_PATH, background=True)
 
 
 # Global Unique ID counter and helper instance
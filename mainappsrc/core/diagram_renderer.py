@@ -34,6 +34,7 @@ import tkinter as tk
 from tkinter import filedialog, messagebox, ttk
 
 from gui.styles.style_manager import StyleManager
+from gui.utils import headless_renderer, text_layout
 from gui.utils.drawing_helper import fta_drawing_helper
 from .config_utils import AutoML_Helper, GATE_NODE_TYPES
 
@@ -561,11 +562,13 @@ class DiagramRenderer:
     def zoom_in(self) -> None:
         self.app.zoom *= 1.2
         self.app.diagram_font.config(size=int(8 * self.app.zoom))
+        text_layout.invalidate(self.app.diagram_font)
         self.redraw_canvas()
 
     def zoom_out(self) -> None:
         self.app.zoom /= 1.2
         self.app.diagram_font.config(size=int(8 * self.app.zoom))
+        text_layout.invalidate(self.app.diagram_font)
         self.redraw_canvas()
 
     def create_diagram_image(self):  # pragma: no cover - delegation
@@ -645,6 +648,9 @@ class DiagramRenderer:
 
     def capture_sysml_diagram(self, diagram):
         """Return a PIL Image of the given SysML diagram."""
+        img = headless_renderer.capture_image(headless_renderer.sysml_scene, diagram)
+        if img is not None:
+            return img
         from io import BytesIO
         from PIL import Image
         from gui.windows.use_case_diagram_window import UseCaseDiagramWindow
@@ -693,6 +699,9 @@ class DiagramRenderer:
 
     def capture_cbn_diagram(self, doc):
         """Return a PIL Image of the given Causal Bayesian Network diagram."""
+        img = headless_renderer.capture_image(headless_renderer.cbn_scene, doc)
+        if img is not None:
+            return img
         from io import BytesIO
         from PIL import Image
         from gui.causal_bayesian_network_window import CausalBayesianNetworkWindow
@@ -723,6 +732,9 @@ class DiagramRenderer:
 
     def capture_gsn_diagram(self, diagram):
         """Return a PIL Image of the given GSN diagram."""
+        img = headless_renderer.capture_image(headless_renderer.gsn_scene, diagram)
+        if img is not None:
+            return img
         from io import BytesIO
         from PIL import Image
         from gui.causal_bayesian_network_window import CausalBayesianNetworkWindow
@@ -82,6 +82,7 @@ class Editing_Labels_Styling:
             )
             if new_gt is not None and new_gt.upper() in ["AND", "OR"]:
                 self.selected_node.gate_type = new_gt.upper()
+                self.invalidate_probability(self.selected_node)
                 # Reflect gate type changes everywhere.
                 self.sync_nodes_by_id(self.selected_node)
                 self.update_views()
@@ -40,6 +40,7 @@ from analysis.models import (
     COMPONENT_ATTR_TEMPLATES,
 )
 from analysis.constants import CHECK_MARK, CROSS_MARK
+from analysis.traceability import diagram_allocations
 from gui.controls import messagebox
 from gui.controls.mac_button_style import apply_translucid_button_style
 from gui.dialogs.req_dialog import ReqDialog
@@ -52,10 +53,68 @@ from gui.windows.architecture import (
     link_requirements,
     unlink_requirements,
 )
+from mainappsrc.core.reporting_export import EVENT_SECTIONS, FMEA_SECTIONS
 from mainappsrc.models.fta.fault_tree_node import FaultTreeNode
 from mainappsrc.models.sysml.sysml_repository import SysMLRepository
 
 
+def _baseline_traceability(data):
+    """Return allocation names and goal names per requirement of a baseline.
+
+    *data* is an exported model; both maps are built in one pass so the
+    requirements matrix can diff every requirement against the baseline.
+    """
+    alloc: dict = {}
+    goals: dict = {}
+    if not data:
+        return alloc, goals
+
+    def req_ids(d):
+        return {r.get("id") for r in d.get("safety_requirements", [])}
+
+    nodes = []
+    stack = list(reversed(data.get("top_events", [])))
+    while stack:
+        nd = stack.pop()
+        nodes.append(nd)
+        stack.extend(reversed(nd.get("children", [])))
+    id_map = {n["unique_id"]: n for n in nodes}
+    memo: dict = {}
+
+    def goals_above(nd):
+        uid = nd.get("unique_id")
+        if uid in memo:
+            return memo[uid]
+        memo[uid] = frozenset()
+        acc = set()
+        if nd.get("node_type", "").upper() == "TOP EVENT":
+            acc.add(nd.get("safety_goal_description") or nd.get("user_name") or f"SG {uid}")
+        for p in nd.get("parents", []):
+            pid = p.get("unique_id")
+            if pid and pid in id_map:
+                acc |= goals_above(id_map[pid])
+        memo[uid] = frozenset(acc)
+        return memo[uid]
+
+    for nd in nodes:
+        for rid in req_ids(nd):
+            alloc.setdefault(rid, []).append(nd.get("user_name") or f"Node {nd.get('unique_id')}")
+            goals.setdefault(rid, set()).update(goals_above(nd))
+    for fmea in data.get("fmeas", []):
+        for e in fmea.get("entries", []):
+            rids = req_ids(e)
+            if not rids:
+                continue
+            name = e.get("description") or e.get("user_name", f"BE {e.get('unique_id','')}")
+            parents = e.get("parents", [])
+            pid = parents[0].get("unique_id") if parents else None
+            for rid in rids:
+                alloc.setdefault(rid, []).append(f"{fmea['name']}:{name}")
+                if pid and pid in id_map:
+                    goals.setdefault(rid, set()).update(goals_above(id_map[pid]))
+    return alloc, goals
+
+
 class Editors:
     """Group editor dialogs and tables delegated from :class:`AutoMLApp`."""
 
@@ -184,24 +243,13 @@ class Editors:
         tree_frame.grid_rowconfigure(0, weight=1)
         tree_frame.grid_columnconfigure(0, weight=1)
 
-        def _get_requirement_allocations(rid: str) -> list[str]:
-            repo = SysMLRepository.get_instance()
-            names: list[str] = []
-            for diag in repo.diagrams.values():
-                dname = diag.name or diag.diag_id
-                for obj in getattr(diag, "objects", []):
-                    for r in obj.get("requirements", []):
-                        if r.get("id") == rid:
-                            oname = obj.get("properties", {}).get("name", obj.get("obj_type"))
-                            names.append(f"{dname}:{oname}")
-            return sorted(set(names))
-
         def refresh_tree() -> None:
             tree.delete(*tree.get_children())
             max_lines = 1
+            allocations = diagram_allocations(SysMLRepository.get_instance())
             for req in global_requirements.values():
                 rid = req.get("id", "")
-                trace = ", ".join(_get_requirement_allocations(rid))
+                trace = ", ".join(sorted(allocations.get(rid, ())))
                 links = ", ".join(
                     f"{r.get('type')} {r.get('id')}" for r in req.get("relations", [])
                 )
@@ -248,6 +296,7 @@ class Editors:
                         if n.node_type.upper() == "BASIC EVENT"]
         reqs = list(global_requirements.values())
         reqs.sort(key=lambda r: r.get("req_type", ""))
+        trace = app.requirements_manager.traceability()
 
         win = tk.Toplevel(app.root)
         win.title("Requirements Matrix")
@@ -279,7 +328,7 @@ class Editors:
                 req.get("text", ""),
             ]
             for be in basic_events:
-                linked = any(r.get("id") == req.get("id") for r in getattr(be, "safety_requirements", []))
+                linked = req.get("id") in trace.requirements_for_node(be)
                 row.append("X" if linked else "")
             tree.insert("", "end", values=row)
 
@@ -295,56 +344,15 @@ class Editors:
         vbar.pack(side=tk.RIGHT, fill=tk.Y)
 
         base_data = app.versions[-1]["data"] if app.versions else None
+        base_alloc, base_goals = _baseline_traceability(base_data)
 
         def alloc_from_data(req_id):
-            if not base_data:
-                return ""
-            names = []
-            def traverse(d):
-                if any(r.get("id") == req_id for r in d.get("safety_requirements", [])):
-                    names.append(d.get("user_name") or f"Node {d.get('unique_id')}")
-                for ch in d.get("children", []):
-                    traverse(ch)
-            for t in base_data.get("top_events", []):
-                traverse(t)
-            for fmea in base_data.get("fmeas", []):
-                for e in fmea.get("entries", []):
-                    if any(r.get("id") == req_id for r in e.get("safety_requirements", [])):
-                        name = e.get("description") or e.get("user_name", f"BE {e.get('unique_id','')}")
-                        names.append(f"{fmea['name']}:{name}")
-            return ", ".join(names)
+            return ", ".join(base_alloc.get(req_id, []))
 
         def goals_from_data(req_id):
             if not base_data:
                 return ""
-            nodes = []
-            def gather(n):
-                nodes.append(n)
-                for ch in n.get("children", []):
-                    gather(ch)
-            for t in base_data.get("top_events", []):
-                gather(t)
-            id_map = {n["unique_id"]: n for n in nodes}
-            def collect_goal_names(nd, acc):
-                if nd.get("node_type", "").upper() == "TOP EVENT":
-                    acc.add(nd.get("safety_goal_description") or nd.get("user_name") or f"SG {nd.get('unique_id')}")
-                for p in nd.get("parents", []):
-                    pid = p.get("unique_id")
-                    if pid and pid in id_map:
-                        collect_goal_names(id_map[pid], acc)
-            goals = set()
-            for n in nodes:
-                if any(r.get("id") == req_id for r in n.get("safety_requirements", [])):
-                    collect_goal_names(n, goals)
-            for fmea in base_data.get("fmeas", []):
-                for e in fmea.get("entries", []):
-                    if any(r.get("id") == req_id for r in e.get("safety_requirements", [])):
-                        parents = e.get("parents", [])
-                        if parents:
-                            pid = parents[0].get("unique_id")
-                            if pid and pid in id_map:
-                                collect_goal_names(id_map[pid], goals)
-            return ", ".join(sorted(goals))
+            return ", ".join(sorted(base_goals.get(req_id, ())))
 
         import difflib
 
@@ -384,8 +392,8 @@ class Editors:
 
         for req in reqs:
             rid = req.get("id")
-            alloc = ", ".join(app.get_requirement_allocation_names(rid))
-            goals = ", ".join(app.get_requirement_goal_names(rid))
+            alloc = ", ".join(trace.allocation_names(rid))
+            goals = ", ".join(trace.goal_names(rid))
             text.insert(tk.END, f"[{rid}] {req.get('text','')}\n")
             text.insert(tk.END, "  Allocated to: ")
             if base_data:
@@ -826,6 +834,8 @@ class Editors:
         def add_failure_mode():
             dialog = SelectBaseEventDialog(win, basic_events, allow_new=True)
             node = dialog.selected
+            if node:
+                app.push_undo_state(touched=EVENT_SECTIONS + FMEA_SECTIONS)
             if node == "NEW":
                 node = FaultTreeNode("", "Basic Event")
                 entries.append(node)
@@ -875,6 +885,7 @@ class Editors:
             if not sel:
                 messagebox.showwarning("Remove Entry", "Select a row to remove.")
                 return
+            app.push_undo_state(touched=EVENT_SECTIONS + FMEA_SECTIONS)
             for iid in sel:
                 node = node_map.get(iid)
                 if node in entries:
@@ -892,6 +903,7 @@ class Editors:
                 return
             if not messagebox.askyesno("Delete Failure Mode", "Remove selected failure modes from the FMEA?"):
                 return
+            app.push_undo_state(touched=EVENT_SECTIONS + FMEA_SECTIONS)
             for iid in sel:
                 node = node_map.get(iid)
                 if node in entries:
@@ -25,6 +25,7 @@ import datetime
 import tkinter as tk
 from tkinter import ttk, simpledialog, messagebox
 
+from analysis.traceability import TraceList
 from analysis.user_config import CURRENT_USER_NAME
 from mainappsrc.models.fta.fault_tree_node import FaultTreeNode
 
@@ -34,7 +35,7 @@ class FMEAService:
 
     def __init__(self, app: tk.Misc) -> None:
         self.app = app
-        self.fmeas: list[dict] = []
+        self.fmeas: list[dict] = TraceList()
         self._fmea_tab: tk.Widget | None = None
 
     # ------------------------------------------------------------------
@@ -42,10 +43,10 @@ class FMEAService:
         """Load FMEA documents from project data."""
         self.fmeas.clear()
         for fmea_data in data.get("fmeas", []):
-            entries = [
+            entries = TraceList(
                 FaultTreeNode.from_dict(e)
                 for e in fmea_data.get("entries", [])
-            ]
+            )
             self.fmeas.append(
                 {
                     "name": fmea_data.get("name", "FMEA"),
@@ -64,9 +65,9 @@ class FMEAService:
                 }
             )
         if not self.fmeas and "fmea_entries" in data:
-            entries = [
+            entries = TraceList(
                 FaultTreeNode.from_dict(e) for e in data.get("fmea_entries", [])
-            ]
+            )
             self.fmeas.append(
                 {"name": "Default FMEA", "file": "fmea_default.csv", "entries": entries}
             )
@@ -123,7 +124,7 @@ class FMEAService:
                 now = datetime.datetime.now().isoformat()
                 doc = {
                     "name": name,
-                    "entries": [],
+                    "entries": TraceList(),
                     "file": file_name,
                     "created": now,
                     "author": CURRENT_USER_NAME,
@@ -25,6 +25,7 @@ from typing import TYPE_CHECKING
 from analysis.fmeda_utils import GATE_NODE_TYPES
 from gui.dialogs.edit_node_dialog import EditNodeDialog
 from gui.toolboxes.search_toolbox import SearchToolbox
+from mainappsrc.core.reporting_export import EVENT_SECTIONS
 
 if TYPE_CHECKING:  # pragma: no cover - for type checking only
     from .automl_core import AutoMLApp
@@ -76,7 +77,7 @@ class Navigation_Selection_Input:
                 break
         app.selected_node = clicked_node
         if clicked_node:
-            app.push_undo_state()
+            app.push_undo_state(touched=EVENT_SECTIONS)
             app.dragging_node = clicked_node
             app.drag_offset_x = x - clicked_node.x
             app.drag_offset_y = y - clicked_node.y
@@ -124,7 +125,7 @@ class Navigation_Selection_Input:
         if app.dragging_node:
             app.dragging_node.x = round(app.dragging_node.x / app.grid_size) * app.grid_size
             app.dragging_node.y = round(app.dragging_node.y / app.grid_size) * app.grid_size
-            app.push_undo_state()
+            app.push_undo_state(touched=EVENT_SECTIONS)
         app.dragging_node = None
         app.drag_offset_x = 0
         app.drag_offset_y = 0
@@ -132,16 +133,27 @@ class Navigation_Selection_Input:
     # ------------------------------------------------------------------
     # Tree view interactions
     # ------------------------------------------------------------------
+    def _flush_views(self) -> None:
+        # The explorer may still wait for a refresh deferred to idle time;
+        # bring it up to date before reading its selection.
+        flush = getattr(self.app, "flush_views", None)
+        if flush is not None:
+            flush()
+
     def on_treeview_click(self, event):
+        self._flush_views()
         return self.app.tree_app.on_treeview_click(self.app, event)
 
     def on_analysis_tree_double_click(self, event):
+        self._flush_views()
         return self.app.tree_app.on_analysis_tree_double_click(self.app, event)
 
     def on_analysis_tree_right_click(self, event):
+        self._flush_views()
         return self.app.tree_app.on_analysis_tree_right_click(self.app, event)
 
     def on_analysis_tree_select(self, _event):
+        self._flush_views()
         return self.app.tree_app.on_analysis_tree_select(self.app, _event)
 
     def on_tool_list_double_click(self, event):
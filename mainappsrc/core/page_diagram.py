@@ -25,8 +25,10 @@ from pathlib import Path
 import tkinter as tk
 import tkinter.font as tkFont
 
-from config import load_diagram_rules
+from config import config_registry
+from gui.utils import text_layout
 from gui.utils.drawing_helper import fta_drawing_helper
+from mainappsrc.core.reporting_export import EVENT_SECTIONS
 
 # Node types treated as gates when rendering and editing
 _CONFIG_PATH = (
@@ -35,11 +37,25 @@ _CONFIG_PATH = (
     / "rules"
     / "diagram_rules.json"
 )
-_CONFIG = load_diagram_rules(_CONFIG_PATH)
+_CONFIG = config_registry.diagram_rules(_CONFIG_PATH)
 GATE_NODE_TYPES = set(_CONFIG.get("gate_node_types", []))
 
 
+def reload_config() -> None:
+    """Reload gate node types from configuration."""
+    global _CONFIG
+    _CONFIG = config_registry.diagram_rules(_CONFIG_PATH)
+    GATE_NODE_TYPES.clear()
+    GATE_NODE_TYPES.update(_CONFIG.get("gate_node_types", []))
+
+
+config_registry.subscribe(reload_config)
+
+
 class PageDiagram:
+    # Shape helper; ``None`` uses the shared :data:`fta_drawing_helper`.
+    drawing_helper = None
+
     def __init__(self, app, page_gate_node, canvas):
         self.app = app
         self.root_node = page_gate_node
@@ -233,7 +249,7 @@ class PageDiagram:
         self.selected_node = clicked_node
         self.app.selected_node = clicked_node
         if clicked_node and clicked_node is not self.root_node:
-            self.app.push_undo_state()
+            self.app.push_undo_state(touched=EVENT_SECTIONS)
             self.dragging_node = clicked_node
             self.drag_offset_x = x - clicked_node.x
             self.drag_offset_y = y - clicked_node.y
@@ -277,7 +293,7 @@ class PageDiagram:
             self.dragging_node.x = round(self.dragging_node.x / self.grid_size) * self.grid_size
             self.dragging_node.y = round(self.dragging_node.y / self.grid_size) * self.grid_size
             self.app.sync_nodes_by_id(self.dragging_node)
-            self.app.push_undo_state()
+            self.app.push_undo_state(touched=EVENT_SECTIONS)
         self.dragging_node = None
         self.drag_offset_x = 0
         self.drag_offset_y = 0
@@ -285,11 +301,13 @@ class PageDiagram:
     def zoom_in(self):
         self.zoom *= 1.2
         self.diagram_font.config(size=int(8 * self.zoom))
+        text_layout.invalidate(self.diagram_font)
         self.redraw_canvas()
 
     def zoom_out(self):
         self.zoom /= 1.2
         self.diagram_font.config(size=int(8 * self.zoom))
+        text_layout.invalidate(self.diagram_font)
         self.redraw_canvas()
 
     def auto_arrange(self):
@@ -350,6 +368,7 @@ class PageDiagram:
         if id(node) in drawn_ids:
             return
         drawn_ids.add(id(node))
+        helper = self.drawing_helper or fta_drawing_helper
         if node.is_page and node.is_primary_instance and node != self.root_node:
             return
         if node.children:
@@ -362,7 +381,7 @@ class PageDiagram:
                     parent_bottom[1],
                 )
                 child_top = (child.x * self.zoom, child.y * self.zoom - 45 * self.zoom)
-                fta_drawing_helper.draw_90_connection(
+                helper.draw_90_connection(
                     self.canvas, parent_conn, child_top, outline_color="dimgray", line_width=1
                 )
             for child in node.children:
@@ -373,6 +392,7 @@ class PageDiagram:
 
         # If the node is a clone, use its original for configuration (non-positional attributes)
         source = node if node.is_primary_instance else node.original
+        helper = self.drawing_helper or fta_drawing_helper
 
         # For display purposes, show the clone marker on the clone's display_label.
         if node.is_primary_instance:
@@ -410,7 +430,7 @@ class PageDiagram:
             # For clones, draw them in the shape of the original with a bottom line marker.
             if node_type_upper in GATE_NODE_TYPES:
                 if source.gate_type.upper() == "OR":
-                    fta_drawing_helper.draw_rotated_or_gate_clone_shape(
+                    helper.draw_rotated_or_gate_clone_shape(
                         self.canvas,
                         eff_x,
                         eff_y,
@@ -423,7 +443,7 @@ class PageDiagram:
                         font_obj=font_obj,
                     )
                 else:
-                    fta_drawing_helper.draw_rotated_and_gate_clone_shape(
+                    helper.draw_rotated_and_gate_clone_shape(
                         self.canvas,
                         eff_x,
                         eff_y,
@@ -436,7 +456,7 @@ class PageDiagram:
                         font_obj=font_obj,
                     )
             elif source.is_page and source != self.root_node:
-                fta_drawing_helper.draw_triangle_clone_shape(
+                helper.draw_triangle_clone_shape(
                     self.canvas,
                     eff_x,
                     eff_y,
@@ -449,7 +469,7 @@ class PageDiagram:
                     font_obj=font_obj,
                 )
             else:
-                fta_drawing_helper.draw_circle_event_clone_shape(
+                helper.draw_circle_event_clone_shape(
                     self.canvas,
                     eff_x,
                     eff_y,
@@ -465,7 +485,7 @@ class PageDiagram:
             # Primary node: use normal drawing routines.
             if node_type_upper in GATE_NODE_TYPES:
                 if source.is_page and source != self.root_node:
-                    fta_drawing_helper.draw_triangle_shape(
+                    helper.draw_triangle_shape(
                         self.canvas,
                         eff_x,
                         eff_y,
@@ -479,7 +499,7 @@ class PageDiagram:
                     )
                 else:
                     if source.gate_type.upper() == "OR":
-                        fta_drawing_helper.draw_rotated_or_gate_shape(
+                        helper.draw_rotated_or_gate_shape(
                             self.canvas,
                             eff_x,
                             eff_y,
@@ -492,7 +512,7 @@ class PageDiagram:
                             font_obj=font_obj,
                         )
                     else:
-                        fta_drawing_helper.draw_rotated_and_gate_shape(
+                        helper.draw_rotated_and_gate_shape(
                             self.canvas,
                             eff_x,
                             eff_y,
@@ -505,7 +525,7 @@ class PageDiagram:
                             font_obj=font_obj,
                         )
             elif node_type_upper in ["CONFIDENCE LEVEL", "ROBUSTNESS SCORE"]:
-                fta_drawing_helper.draw_circle_event_shape(
+                helper.draw_circle_event_shape(
                     self.canvas,
                     eff_x,
                     eff_y,
@@ -519,7 +539,7 @@ class PageDiagram:
                 )
             else:
                 if hasattr(self.canvas, "create_line"):
-                    fta_drawing_helper.draw_circle_event_shape(
+                    helper.draw_circle_event_shape(
                         self.canvas,
                         eff_x,
                         eff_y,
@@ -556,7 +576,7 @@ class PageDiagram:
         if self.app.occurrence_counts.get(node.unique_id, 0) > 1:
             marker_x = eff_x + 30 * self.zoom
             marker_y = eff_y - 30 * self.zoom
-            fta_drawing_helper.draw_shared_marker(self.canvas, marker_x, marker_y, self.zoom)
+            helper.draw_shared_marker(self.canvas, marker_x, marker_y, self.zoom)
 
 
 __all__ = ["PageDiagram"]
@@ -23,6 +23,7 @@ from __future__ import annotations
 
 import tkinter as tk
 from gui.styles.style_manager import StyleManager
+from gui.utils import headless_renderer
 from gui.utils.drawing_helper import fta_drawing_helper, draw_90_connection
 
 from .page_diagram import PageDiagram, GATE_NODE_TYPES
@@ -221,6 +222,11 @@ class Pages_and_PAA:
 
     def capture_page_diagram(self, page_node):
         """Return a PIL Image of the given page diagram."""
+        img = headless_renderer.capture_image(
+            headless_renderer.fta_scene, self.app, page_node
+        )
+        if img is not None:
+            return img
         from io import BytesIO
         from PIL import Image
 
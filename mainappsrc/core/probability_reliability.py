@@ -27,6 +27,7 @@ from tkinter import ttk
 import tkinter.font as tkFont
 
 from analysis.constants import CHECK_MARK, CROSS_MARK
+from analysis.uncertainty import Fixed, LogNormal, RateProbability, propagate_pmhf
 from config.automl_constants import PMHF_TARGETS
 from analysis.utils import update_probability_tables as _update_probability_tables
 
@@ -48,18 +49,23 @@ class Probability_Reliability:
         _update_probability_tables(exposure, controllability, severity)
 
     # ------------------------------------------------------------------
-    def compute_failure_prob(self, node, failure_mode_ref=None, formula=None):
-        """Return probability of failure for ``node`` based on FIT rate."""
+    def _failure_rate_inputs(self, node, failure_mode_ref=None, formula=None, fm=None):
+        """Return ``(formula, fit, tau)`` deriving ``node``'s probability.
+
+        ``fit`` is the FIT of one unit of the node's component and is only
+        resolved for FIT based formulas; it is ``0.0`` for ``constant``.
+        """
         tau = 1.0
         if self.app.mission_profiles:
             tau = self.app.mission_profiles[0].tau
         if tau <= 0:
             tau = 1.0
-        fm = (
-            self.app.find_node_by_id_all(failure_mode_ref)
-            if failure_mode_ref
-            else self.app.get_failure_mode_node(node)
-        )
+        if fm is None:
+            fm = (
+                self.app.find_node_by_id_all(failure_mode_ref)
+                if failure_mode_ref
+                else self.app.get_failure_mode_node(node)
+            )
         if (
             getattr(node, "fault_ref", "")
             and failure_mode_ref is None
@@ -68,9 +74,23 @@ class Probability_Reliability:
             fit = self.app.get_fit_for_fault(node.fault_ref)
         else:
             fit = getattr(fm, "fmeda_fit", getattr(node, "fmeda_fit", 0.0))
-        t = tau
         formula = formula or getattr(node, "prob_formula", getattr(fm, "prob_formula", "linear"))
         f = str(formula).strip().lower()
+        if f == "constant" or fit <= 0:
+            return f, 0.0, tau
+        comp_name = self.app.get_component_name_for_node(fm)
+        qty = next((c.quantity for c in self.app.reliability_components if c.name == comp_name), 1)
+        if qty <= 0:
+            qty = 1
+        return f, fit / qty, tau
+
+    def compute_failure_prob(self, node, failure_mode_ref=None, formula=None, fm=None):
+        """Return probability of failure for ``node`` based on FIT rate.
+
+        Callers that already resolved the failure mode of ``node`` pass it as
+        ``fm`` to skip the model wide lookup.
+        """
+        f, fit, t = self._failure_rate_inputs(node, failure_mode_ref, formula, fm)
         if f == "constant":
             try:
                 return float(getattr(node, "failure_prob", 0.0))
@@ -78,21 +98,73 @@ class Probability_Reliability:
                 return 0.0
         if fit <= 0:
             return 0.0
-        comp_name = self.app.get_component_name_for_node(fm)
-        qty = next((c.quantity for c in self.app.reliability_components if c.name == comp_name), 1)
-        if qty <= 0:
-            qty = 1
-        lam = (fit / qty) / 1e9
+        lam = fit / 1e9
         if f == "exponential":
             return 1 - math.exp(-lam * t)
         else:
             return lam * t
 
+    def basic_event_distribution(self, node, fit_error_factor=3.0, fm=None):
+        """Return the uncertainty distribution of ``node``'s failure probability.
+
+        FIT based events get a lognormal FIT with ``fit_error_factor`` around
+        the value used by :meth:`compute_failure_prob`; events with a
+        ``constant`` formula get a lognormal probability around
+        ``failure_prob``.
+        """
+        f, fit, t = self._failure_rate_inputs(node, fm=fm)
+        if f == "constant":
+            try:
+                prob = float(getattr(node, "failure_prob", 0.0))
+            except (TypeError, ValueError):
+                prob = 0.0
+            return LogNormal(prob, fit_error_factor) if prob > 0 else Fixed(0.0)
+        if fit <= 0:
+            return Fixed(0.0)
+        formula = "exponential" if f == "exponential" else "linear"
+        return RateProbability(LogNormal(fit, fit_error_factor), t, formula)
+
+    def calculate_pmhf_uncertainty(
+        self, samples=100_000, seed=None, fit_error_factor=3.0, distributions=None
+    ):
+        """Return Monte Carlo bands of the PMHF and of each counted top event.
+
+        The top events are those :meth:`calculate_pmfh` adds up.  Every basic
+        event gets :meth:`basic_event_distribution`; ``distributions`` maps
+        basic event ids to replacements.  Returns ``(per_top_event, total)``
+        as produced by :func:`analysis.uncertainty.propagate_pmhf`.
+        """
+        dists = {
+            be.unique_id: self.basic_event_distribution(be, fit_error_factor)
+            for be in self.app.get_all_basic_events()
+            if getattr(be, "is_primary_instance", True)
+        }
+        dists.update(distributions or {})
+        tops = [
+            te
+            for te in self.app.top_events
+            if (getattr(te, "safety_goal_asil", "") or "") in PMHF_TARGETS
+        ]
+        return propagate_pmhf(tops, dists, samples=samples, seed=seed)
+
     # ------------------------------------------------------------------
     def update_basic_event_probabilities(self):
         """Update failure probabilities for all basic events."""
         for be in self.app.get_all_basic_events():
-            be.failure_prob = self.compute_failure_prob(be)
+            prob = self.compute_failure_prob(be)
+            if prob != getattr(be, "failure_prob", None):
+                be.failure_prob = prob
+                self.invalidate_probability(be)
+
+    def invalidate_probability(self, node):
+        """Drop the cached probabilities of ``node`` and its ancestors.
+
+        Called whenever an edit changes a basic event's ``failure_prob`` or a
+        gate's type so the next calculation recomputes only that path.
+        """
+        engine = getattr(getattr(self.app, "helper", None), "probability_engine", None)
+        if engine is not None:
+            engine.invalidate(node)
 
     # ------------------------------------------------------------------
     def calculate_pmfh(self):
@@ -0,0 +1,301 @@
+# Author: Miguel Marina <karel.capek.robotics@gmail.com>
+# SPDX-License-Identifier: GPL-3.0-or-later
+#
+# Copyright (C) 2025 Capek System Safety & Robotic Solutions
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+"""Dependency graph driving the FMEA/FTA attribute refresh.
+
+``refresh_model`` copies failure mode attributes onto the basic events that
+reference them, recomputes basic event probabilities and assigns safety goals
+and their targets to every FTA, FMEA and FMEDA entry.  Done naively this scans
+every basic event per failure mode and walks every top event per entry.
+
+:class:`PropagationGraph` instead links the model once and keeps the links
+across refreshes:
+
+* failure mode ``unique_id`` -> basic events referencing it,
+* node ``unique_id`` -> top events whose tree contains the node,
+* malfunction -> top events raising it,
+* safety goal name -> first top event defining it.
+
+The links are rebuilt only when the fault tree structure changed: the node
+registry's revision moves when nodes are created, re-identified or deleted,
+the trace revision moves when structure operations re-parent nodes or the
+model is replaced, and the top events and FMEA document sizes are compared
+directly.  Failure mode references are re-read from the linked basic events
+on every refresh, which is cheap.
+
+Each basic event remembers a signature of the inputs of its probability, the
+way :class:`analysis.fault_tree_probability.FaultTreeProbabilityEngine`
+remembers gate inputs, so after an edit only the events downstream of the
+changed failure mode, component or mission profile are recomputed.
+"""
+
+from __future__ import annotations
+
+from collections import defaultdict
+from typing import Dict, Hashable, List, Optional
+
+from analysis.traceability import trace_revision
+from mainappsrc.models.fta.node_registry import NODE_REGISTRY
+
+
+def _split_malfunctions(entry) -> List[str]:
+    return [m.strip() for m in getattr(entry, "fmeda_malfunction", "").split(";") if m.strip()]
+
+
+class PropagationGraph:
+    """Propagate failure mode and safety goal data through the model."""
+
+    def __init__(self, app) -> None:
+        self.app = app
+        self._signatures: Dict[int, Hashable] = {}
+        self._events: Dict[int, object] = {}
+        # Number of basic event probabilities computed by the last refresh.
+        self.recomputed = 0
+        # Number of times the links were rebuilt.
+        self.builds = 0
+        self._links_key: Optional[Hashable] = None
+        self._reset_links()
+
+    def _reset_links(self) -> None:
+        self.basic_events: List[object] = []
+        self.nodes_by_id: Dict[object, object] = {}
+        self.events_by_failure_mode: Dict[object, List[object]] = defaultdict(list)
+        self.tops_by_node: Dict[object, List[int]] = defaultdict(list)
+        self.tops_by_malfunction: Dict[str, List[int]] = defaultdict(list)
+        self.top_by_goal: Dict[str, object] = {}
+
+    # ------------------------------------------------------------------
+    def invalidate_links(self) -> None:
+        """Rebuild the links on the next refresh."""
+        self._links_key = None
+
+    def invalidate(self, node=None) -> None:
+        """Recompute *node*, or every basic event, on the next refresh."""
+        if node is None:
+            self._signatures.clear()
+            self._events.clear()
+        else:
+            self._signatures.pop(id(node), None)
+            self._events.pop(id(node), None)
+
+    def rebuild(self) -> None:
+        """Link failure modes, basic events, top events and safety goals."""
+        app = self.app
+        self._reset_links()
+        self.builds += 1
+        self.basic_events = list(app.get_all_basic_events())
+        self._link_failure_modes()
+
+        # Same search order as ``find_node_by_id_all``: fault trees first,
+        # then FMEA entries, then FMEA and FMEDA documents.
+        by_id = self.nodes_by_id
+        for te in app.top_events:
+            stack = [te]
+            seen = set()
+            while stack:
+                node = stack.pop()
+                uid = node.unique_id
+                if uid in seen:
+                    continue
+                seen.add(uid)
+                by_id.setdefault(uid, node)
+                stack.extend(reversed(node.children))
+        entries = list(app.fmea_entries)
+        for doc in list(app.fmeas) + list(app.fmedas):
+            entries.extend(doc.get("entries", []))
+        for entry in entries:
+            uid = getattr(entry, "unique_id", None)
+            if uid is not None:
+                by_id.setdefault(uid, entry)
+
+        for index, te in enumerate(app.top_events):
+            for uid in {n.unique_id for n in app.get_all_nodes(te)}:
+                self.tops_by_node[uid].append(index)
+            mal = getattr(te, "malfunction", "")
+            if mal:
+                self.tops_by_malfunction[mal].append(index)
+            for name in (te.user_name, te.safety_goal_description):
+                self.top_by_goal.setdefault(name, te)
+
+    def _structure_key(self) -> Hashable:
+        app = self.app
+        return (
+            NODE_REGISTRY.revision,
+            trace_revision(),
+            len(app.fmea_entries),
+            tuple(
+                (id(doc), len(doc.get("entries", [])))
+                for doc in list(app.fmeas) + list(app.fmedas)
+            ),
+            tuple(
+                (id(te), te.user_name, te.safety_goal_description, getattr(te, "malfunction", ""))
+                for te in app.top_events
+            ),
+        )
+
+    def _link_failure_modes(self) -> None:
+        by_ref = self.events_by_failure_mode = defaultdict(list)
+        for be in self.basic_events:
+            ref = getattr(be, "failure_mode_ref", None)
+            if ref:
+                by_ref[ref].append(be)
+
+    # ------------------------------------------------------------------
+    def failure_mode_node(self, node):
+        """Return the failure mode *node* refers to, like ``get_failure_mode_node``."""
+        ref = getattr(node, "failure_mode_ref", None)
+        if ref:
+            found = self.nodes_by_id.get(ref)
+            if found:
+                return found
+        return node
+
+    @staticmethod
+    def _goal(te) -> str:
+        return te.safety_goal_description or te.user_name or ""
+
+    def safety_goals(self, entry) -> List[str]:
+        """Return the safety goals of *entry* as ``refresh_model`` assigns them."""
+        tops = self.app.top_events
+        indices = sorted(
+            {i for m in _split_malfunctions(entry) for i in self.tops_by_malfunction.get(m, ())}
+        )
+        goals: List[str] = []
+        for i in indices:
+            sg = self._goal(tops[i])
+            if sg and sg not in goals:
+                goals.append(sg)
+        if goals:
+            return goals
+        target = self.failure_mode_node(entry)
+        return [
+            sg
+            for sg in (self._goal(tops[i]) for i in self.tops_by_node.get(target.unique_id, ()))
+            if sg
+        ]
+
+    # ------------------------------------------------------------------
+    def _context(self) -> Hashable:
+        app = self.app
+        profiles = getattr(app, "mission_profiles", [])
+        return (
+            profiles[0].tau if profiles else None,
+            tuple((c.name, c.quantity) for c in getattr(app, "reliability_components", [])),
+        )
+
+    @staticmethod
+    def _probability_inputs(be, fm, context) -> Optional[Hashable]:
+        if getattr(be, "fault_ref", "") and getattr(be, "failure_mode_ref", None) is None:
+            # FIT rates of faults are summed over FMEA causes; always refresh.
+            return None
+        parents = getattr(fm, "parents", None) or []
+        parent = parents[0] if parents else None
+        return (
+            context,
+            id(fm),
+            getattr(fm, "fmeda_fit", None),
+            getattr(fm, "prob_formula", None),
+            getattr(fm, "fmea_component", ""),
+            id(parent),
+            getattr(parent, "user_name", ""),
+            getattr(parent, "node_type", ""),
+            getattr(be, "failure_mode_ref", None),
+            getattr(be, "fmeda_fit", None),
+            getattr(be, "prob_formula", None),
+            getattr(be, "failure_prob", None),
+        )
+
+    def _propagate_failure_modes(self) -> None:
+        for fm in self.app.get_all_failure_modes():
+            for be in self.events_by_failure_mode.get(fm.unique_id, ()):
+                be.fmeda_fit = fm.fmeda_fit
+                be.fmeda_diag_cov = fm.fmeda_diag_cov
+                # Always propagate the formula so edits take effect
+                be.prob_formula = fm.prob_formula
+
+    def _update_probabilities(self) -> None:
+        app = self.app
+        context = self._context()
+        signatures = self._signatures
+        events = self._events
+        live = set()
+        self.recomputed = 0
+        for be in self.basic_events:
+            key = id(be)
+            live.add(key)
+            fm = self.failure_mode_node(be)
+            sig = self._probability_inputs(be, fm, context)
+            if sig is not None and events.get(key) is be and signatures.get(key) == sig:
+                continue
+            prob = app.compute_failure_prob(be, fm=fm)
+            if prob != getattr(be, "failure_prob", None):
+                be.failure_prob = prob
+                app.invalidate_probability(be)
+            self.recomputed += 1
+            events[key] = be
+            signatures[key] = self._probability_inputs(be, fm, context)
+        for key in list(events):
+            if key not in live:
+                del events[key]
+                signatures.pop(key, None)
+
+    def _iter_analysis_events(self):
+        yield from self.basic_events
+        app = self.app
+        yield from app.fmea_entries
+        for doc in app.fmeas:
+            yield from doc.get("entries", [])
+        for doc in app.fmedas:
+            yield from doc.get("entries", [])
+
+    def _assign_safety_goals(self) -> None:
+        for entry in self._iter_analysis_events():
+            goals = self.safety_goals(entry)
+            if not goals:
+                continue
+            entry.fmeda_safety_goal = ", ".join(goals)
+            te = self.top_by_goal.get(goals[0])
+            if te:
+                entry.fmeda_dc_target = getattr(te, "sg_dc_target", 0.0)
+                entry.fmeda_spfm_target = getattr(te, "sg_spfm_target", 0.0)
+                entry.fmeda_lpfm_target = getattr(te, "sg_lpfm_target", 0.0)
+
+    def refresh(self) -> None:
+        """Recompute everything downstream of an edit.
+
+        The model is relinked first when its structure changed since the
+        previous refresh.
+        """
+        key = self._structure_key()
+        if key != self._links_key:
+            self.rebuild()
+            self._links_key = key
+        else:
+            self._link_failure_modes()
+        self._propagate_failure_modes()
+        self._assign_safety_goals()
+        self._update_probabilities()
+
+
+def propagation_graph_for(app) -> PropagationGraph:
+    """Return the propagation graph kept on *app*, creating it when needed."""
+    graph = getattr(app, "propagation_graph", None)
+    if graph is None:
+        graph = PropagationGraph(app)
+        app.propagation_graph = graph
+    return graph
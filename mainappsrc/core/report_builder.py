@@ -0,0 +1,378 @@
+# Author: Miguel Marina <karel.capek.robotics@gmail.com>
+# SPDX-License-Identifier: GPL-3.0-or-later
+#
+# Copyright (C) 2025 Capek System Safety & Robotic Solutions
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+"""Template driven report pipeline writing HTML as it is produced.
+
+:class:`ReportBuilder` walks the sections of a report template and writes
+every fragment straight to the output file.  Fault tree, HARA, FMEA and
+FMEDA fragments are cached by the content digest of their document in a
+:class:`FragmentCache`, so regenerating a report after an edit only renders
+the documents that changed.  Diagrams are drawn with
+:mod:`gui.utils.headless_renderer`; their files are written by a process
+pool while the builder continues with the following sections.
+"""
+
+from __future__ import annotations
+
+import html
+import multiprocessing
+import os
+import re
+from concurrent.futures import Future, ProcessPoolExecutor
+from dataclasses import asdict, is_dataclass
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, TextIO, Tuple
+
+from analysis.fmeda_utils import GATE_NODE_TYPES
+from gui.utils import headless_renderer
+from mainappsrc.core.version_store import content_digest
+from mainappsrc.models.sysml.sysml_repository import SysMLRepository
+
+HTML_HEAD = """<!DOCTYPE html>
+<html>
+<head>
+<meta charset="UTF-8">
+<title>{title}</title>
+<style>body {{ font-family: Arial; }} details {{ margin-left: 20px; }}
+table {{ border-collapse: collapse; }} td, th {{ border: 1px solid #999; padding: 2px 4px; }}</style>
+</head>
+<body>
+<h1>{title}</h1>
+"""
+HTML_TAIL = "</body>\n</html>\n"
+
+_PLACEHOLDER = re.compile(r"<([^<>/]+)>")
+
+HARA_COLUMNS = [
+    ("Malfunction", "malfunction"),
+    ("Hazard", "hazard"),
+    ("Scenario", "scenario"),
+    ("S", "severity"),
+    ("C", "controllability"),
+    ("E", "exposure"),
+    ("ASIL", "asil"),
+    ("Safety Goal", "safety_goal"),
+]
+FMEA_COLUMNS = [
+    ("Component", "fmea_component"),
+    ("Failure Mode", "description"),
+    ("Effect", "fmea_effect"),
+    ("Cause", "fmea_cause"),
+    ("S", "fmea_severity"),
+    ("O", "fmea_occurrence"),
+    ("D", "fmea_detection"),
+]
+FMEDA_COLUMNS = FMEA_COLUMNS[:2] + [
+    ("Malfunction", "fmeda_malfunction"),
+    ("Safety Goal", "fmeda_safety_goal"),
+    ("FIT", "fmeda_fit"),
+    ("DC", "fmeda_diag_cov"),
+    ("Fault Type", "fmeda_fault_type"),
+]
+
+
+def walk_tree(root, indent: int = 0) -> Iterator[Tuple[Any, int, bool]]:
+    """Yield ``(node, depth, entering)`` for a depth-first walk of *root*.
+
+    Every node is reported when entered and again when left, after all of
+    its children, without recursion.
+    """
+    stack: List[Tuple[Any, int, bool]] = [(root, indent, True)]
+    while stack:
+        node, depth, entering = stack.pop()
+        yield node, depth, entering
+        if entering:
+            stack.append((node, depth, False))
+            for child in reversed(node.children):
+                stack.append((child, depth + 1, True))
+
+
+def iter_node_html(root) -> Iterator[str]:
+    """Yield the nested ``<details>`` HTML of the fault tree under *root*."""
+    for node, _depth, entering in walk_tree(root):
+        if not entering:
+            yield "</details>\n"
+            continue
+        txt = f"{node.name} ({node.node_type}"
+        if node.node_type.upper() in GATE_NODE_TYPES:
+            txt += f", {node.gate_type}"
+        txt += ")"
+        if node.display_label:
+            txt += f" => {node.display_label}"
+        if node.description:
+            txt += f"<br>Desc: {node.description}"
+        if node.rationale:
+            txt += f"<br>Rationale: {node.rationale}"
+        yield f"<details open><summary>{txt}</summary>\n"
+
+
+def _payload(doc) -> Any:
+    """Return the serialisable content of *doc* used for its digest."""
+    if hasattr(doc, "to_dict"):
+        return doc.to_dict()
+    if is_dataclass(doc):
+        return asdict(doc)
+    if isinstance(doc, dict):
+        return {k: _payload(v) if k == "entries" else v for k, v in doc.items()}
+    if isinstance(doc, list):
+        return [_payload(v) for v in doc]
+    return doc
+
+
+def _field(entry, name: str):
+    if isinstance(entry, dict):
+        return entry.get(name, "")
+    return getattr(entry, name, "")
+
+
+def table_html(entries: Iterable, columns: List[Tuple[str, str]]) -> str:
+    """Return an HTML table with one row per entry."""
+    parts = ["<table>\n<tr>"]
+    parts.extend(f"<th>{html.escape(title)}</th>" for title, _name in columns)
+    parts.append("</tr>\n")
+    for entry in entries:
+        parts.append("<tr>")
+        parts.extend(
+            f"<td>{html.escape(str(_field(entry, name)))}</td>" for _title, name in columns
+        )
+        parts.append("</tr>\n")
+    parts.append("</table>\n")
+    return "".join(parts)
+
+
+def _slug(text: str) -> str:
+    return "".join(c if c.isalnum() or c in "-_" else "_" for c in str(text)) or "diagram"
+
+
+class FragmentCache:
+    """Rendered report fragments keyed by document and content digest."""
+
+    def __init__(self) -> None:
+        self._entries: Dict[Tuple[str, str], Tuple[str, str]] = {}
+        # Digest of the model behind every diagram file already written.
+        self.diagrams: Dict[str, str] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, kind: str, name: str, doc, render: Callable[[], str]) -> str:
+        """Return the fragment of *doc*, calling *render* only if it changed."""
+        digest = content_digest(_payload(doc))
+        entry = self._entries.get((kind, name))
+        if entry is not None and entry[0] == digest:
+            self.hits += 1
+            return entry[1]
+        self.misses += 1
+        fragment = render()
+        self._entries[(kind, name)] = (digest, fragment)
+        return fragment
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self.diagrams.clear()
+
+
+def fragment_cache_for(app: Any) -> FragmentCache:
+    """Return the :class:`FragmentCache` of *app*, creating it when missing."""
+    cache = getattr(app, "report_fragment_cache", None)
+    if cache is None:
+        cache = app.report_fragment_cache = FragmentCache()
+    return cache
+
+
+class ReportBuilder:
+    """Stream a report for *app* into an HTML file.
+
+    ``processes`` sets the size of the diagram pool; ``1`` draws diagrams
+    in the calling process.  Diagram files go to ``<report>_files`` next to
+    the report.
+    """
+
+    def __init__(self, app, cache: Optional[FragmentCache] = None, processes: Optional[int] = None) -> None:
+        self.app = app
+        self.cache = cache if cache is not None else fragment_cache_for(app)
+        self.processes = processes
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._pending: List[Tuple[str, str, Future]] = []
+        self._asset_dir = ""
+        self._asset_prefix = ""
+        self.errors: List[Tuple[str, str]] = []
+
+    # ------------------------------------------------------------------
+    # Output
+    # ------------------------------------------------------------------
+    def write_html(self, path: str, template: Optional[dict] = None, title: str = "AutoML-Analyzer") -> None:
+        """Write the report to *path*, section by section."""
+        stem = os.path.splitext(os.path.basename(path))[0]
+        self._asset_dir = os.path.join(os.path.dirname(os.path.abspath(path)), f"{stem}_files")
+        self._asset_prefix = f"{stem}_files/"
+        with open(path, "w", encoding="utf-8") as out:
+            self.stream(out, template, title)
+
+    def stream(self, out: TextIO, template: Optional[dict] = None, title: str = "AutoML-Analyzer") -> None:
+        """Write the report to the open file *out*.
+
+        Without a *template* the report is the fault tree of the current
+        root node.
+        """
+        try:
+            out.write(HTML_HEAD.format(title=html.escape(title)))
+            if template is None:
+                root = getattr(self.app, "root_node", None)
+                if root is not None:
+                    out.writelines(iter_node_html(root))
+            else:
+                for fragment in self.iter_template(template):
+                    out.write(fragment)
+            out.write(HTML_TAIL)
+        finally:
+            self._finish()
+
+    def iter_template(self, template: dict) -> Iterator[str]:
+        """Yield the HTML fragments of every section of *template*."""
+        elements = template.get("elements", {})
+        for section in template.get("sections", []):
+            yield f"<h2>{html.escape(section.get('title', ''))}</h2>\n"
+            content = section.get("content", "")
+            pos = 0
+            for match in _PLACEHOLDER.finditer(content):
+                key = match.group(1)
+                if key not in elements:
+                    continue
+                yield from self._text(content[pos:match.start()])
+                pos = match.end()
+                yield from self.iter_element(key, elements[key])
+            yield from self._text(content[pos:])
+
+    @staticmethod
+    def _text(text: str) -> Iterator[str]:
+        if text.strip():
+            yield f"<p>{html.escape(text.strip())}</p>\n"
+
+    # ------------------------------------------------------------------
+    # Elements
+    # ------------------------------------------------------------------
+    def iter_element(self, key: str, kind: str) -> Iterator[str]:
+        """Yield the fragments of template element *key* of type *kind*."""
+        app = self.app
+        if kind in ("analysis:fault_tree", "page_diagrams"):
+            for event in getattr(app, "top_events", []):
+                name = event.user_name or f"SG {event.unique_id}"
+                yield f"<h3>{html.escape(name)}</h3>\n"
+                yield self.diagram(
+                    f"fta_{event.unique_id}", event, headless_renderer.fta_scene, app, event
+                )
+                yield self.cache.get(
+                    "fta", str(event.unique_id), event, lambda e=event: "".join(iter_node_html(e))
+                )
+        elif kind in ("analysis:hazard", "hara"):
+            for doc in getattr(app, "hara_docs", []):
+                yield self._document("hara", doc.name, doc, doc.entries, HARA_COLUMNS)
+        elif kind in ("analysis:fmea", "fmea_tables"):
+            for doc in getattr(app, "fmeas", []):
+                yield self._document("fmea", doc["name"], doc, doc["entries"], FMEA_COLUMNS)
+        elif kind in ("analysis:fmeda", "fmeda_tables"):
+            for doc in getattr(app, "fmedas", []):
+                yield self._document("fmeda", doc["name"], doc, doc["entries"], FMEDA_COLUMNS)
+        elif kind in ("analysis:bayesian_network", "cbn"):
+            for doc in getattr(app, "cbn_docs", []):
+                yield f"<h3>{html.escape(doc.name)}</h3>\n"
+                yield self.diagram(f"cbn_{doc.name}", _cbn_payload(doc), headless_renderer.cbn_scene, doc)
+        elif kind == "diagram:gsn":
+            for diagram in getattr(app, "all_gsn_diagrams", []):
+                name = diagram.root.user_name
+                yield f"<h3>{html.escape(name)}</h3>\n"
+                model = {"diagram": diagram.to_dict(), "nodes": [n.to_dict() for n in diagram.nodes]}
+                yield self.diagram(f"gsn_{diagram.diag_id}", model, headless_renderer.gsn_scene, diagram)
+        elif kind.startswith("diagram:"):
+            diag_type = f"{kind.split(':', 1)[1]} diagram"
+            repo = SysMLRepository.get_instance()
+            for diagram in list(repo.diagrams.values()):
+                if diagram.diag_type.lower() != diag_type:
+                    continue
+                name = diagram.name or diagram.diag_id
+                yield f"<h3>{html.escape(name)}</h3>\n"
+                yield self.diagram(
+                    f"sysml_{diagram.diag_id}", diagram, headless_renderer.sysml_scene, diagram, repo
+                )
+        else:
+            yield f"<!-- {html.escape(key)}: {html.escape(kind)} is not rendered -->\n"
+
+    def _document(self, kind: str, name: str, doc, entries, columns) -> str:
+        return self.cache.get(
+            kind,
+            name,
+            doc,
+            lambda: f"<h3>{html.escape(name)}</h3>\n" + table_html(entries, columns),
+        )
+
+    def diagram(self, name: str, model, build: Callable, *args) -> str:
+        """Return an ``<img>`` tag for a diagram drawn by ``build(*args)``.
+
+        The file is written in the background and skipped entirely when
+        *model* is unchanged since the last report.
+        """
+        if not self._asset_dir:
+            return ""
+        filename = f"{_slug(name)}.svg"
+        path = os.path.join(self._asset_dir, filename)
+        digest = content_digest(_payload(model))
+        if self.cache.diagrams.get(path) != digest or not os.path.exists(path):
+            try:
+                scene = build(*args)
+            except Exception as exc:
+                self.errors.append((path, str(exc) or exc.__class__.__name__))
+                return ""
+            os.makedirs(self._asset_dir, exist_ok=True)
+            self.cache.diagrams.pop(path, None)
+            self._submit(path, digest, scene)
+        return f'<img src="{html.escape(self._asset_prefix + filename)}" alt="{html.escape(name)}">\n'
+
+    def _submit(self, path: str, digest: str, scene) -> None:
+        if self.processes == 1:
+            try:
+                headless_renderer.write_scene(scene, path)
+                self.cache.diagrams[path] = digest
+            except Exception as exc:
+                self.errors.append((path, str(exc) or exc.__class__.__name__))
+            return
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(
+                max_workers=self.processes, mp_context=multiprocessing.get_context("spawn")
+            )
+        self._pending.append((path, digest, self._pool.submit(headless_renderer.write_scene, scene, path)))
+
+    def _finish(self) -> None:
+        for path, digest, future in self._pending:
+            try:
+                future.result()
+                self.cache.diagrams[path] = digest
+            except Exception as exc:
+                self.errors.append((path, str(exc) or exc.__class__.__name__))
+        self._pending = []
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+
+
+def _cbn_payload(doc) -> dict:
+    network = doc.network
+    return {
+        "nodes": list(network.nodes),
+        "parents": network.parents,
+        "positions": doc.positions,
+        "types": doc.types,
+    }
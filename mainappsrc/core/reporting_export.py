@@ -23,10 +23,9 @@ from __future__ import annotations
 
 import csv
 import json
-import html
 from dataclasses import asdict
 from pathlib import Path
-from io import BytesIO
+from io import BytesIO, StringIO
 
 from tkinter import filedialog, messagebox
 
@@ -35,10 +34,17 @@ try:  # pragma: no cover - pillow optional
 except ModuleNotFoundError:  # pragma: no cover
     Image = None
 
-from analysis.fmeda_utils import GATE_NODE_TYPES
+from mainappsrc.core.report_builder import ReportBuilder
+from mainappsrc.core.version_store import version_store_for
 from mainappsrc.models.sysml.sysml_repository import SysMLRepository
 
 
+# Fault tree and FMEA sections of :meth:`Reporting_Export.export_model_data`
+# that can be exported on their own, e.g. for undo checkpoints of editors.
+EVENT_SECTIONS = ("top_events", "cta_events", "paa_events")
+FMEA_SECTIONS = ("fmeas", "fmedas")
+
+
 class Reporting_Export:
     """Encapsulate reporting and export related methods."""
 
@@ -65,7 +71,12 @@ class Reporting_Export:
     # ------------------------------------------------------------------
     # Reporting helpers
     def _generate_pdf_report(self) -> None:
-        """Export a PDF report using a JSON template."""
+        """Export a report rendered from a JSON template.
+
+        No PDF is written: the template is rendered by :class:`ReportBuilder`
+        into an HTML file next to the chosen path and the template itself is
+        kept as JSON beside it.
+        """
         pdf_path = filedialog.asksaveasfilename(
             defaultextension=".pdf", filetypes=[("PDF", "*.pdf")]
         )
@@ -84,9 +95,14 @@ class Reporting_Export:
             debug_path = Path(pdf_path).with_suffix(".json")
             with open(debug_path, "w", encoding="utf-8") as dbg:
                 json.dump(template, dbg)
-            messagebox.showinfo("Report", "PDF report generated.")
+            html_path = Path(pdf_path).with_suffix(".html")
+            builder = ReportBuilder(self.app)
+            builder.write_html(str(html_path), template)
+            self._report_written(
+                builder, f"HTML report written to {html_path}; template saved to {debug_path}."
+            )
         except Exception as exc:  # pragma: no cover - best effort error path
-            messagebox.showerror("Report", f"Failed to generate PDF report: {exc}")
+            messagebox.showerror("Report", f"Failed to generate report: {exc}")
 
     def generate_pdf_report(self) -> None:
         """Public wrapper for :meth:`_generate_pdf_report`."""
@@ -97,49 +113,36 @@ class Reporting_Export:
             defaultextension=".html", filetypes=[("HTML", "*.html")]
         )
         if path:
-            html_content = self.build_html_report()
-            with open(path, "w", encoding="utf-8") as f:
-                f.write(html_content)
-            messagebox.showinfo("Report", "HTML report generated.")
+            builder = ReportBuilder(self.app)
+            builder.write_html(path)
+            self._report_written(builder, f"HTML report written to {path}.")
 
-    def build_html_report(self) -> str:
-        def node_to_html(n):
-            txt = f"{n.name} ({n.node_type}"
-            if n.node_type.upper() in GATE_NODE_TYPES:
-                txt += f", {n.gate_type}"
-            txt += ")"
-            if n.display_label:
-                txt += f" => {n.display_label}"
-            if n.description:
-                txt += f"<br>Desc: {n.description}"
-            if n.rationale:
-                txt += f"<br>Rationale: {n.rationale}"
-            content = f"<details open><summary>{txt}</summary>\n"
-            for c in n.children:
-                content += node_to_html(c)
-            content += "</details>\n"
-            return content
-
-        return (
-            f"""<!DOCTYPE html>
-                    <html>
-                    <head>
-                    <meta charset=\"UTF-8\">
-                    <title>AutoML-Analyzer</title>
-                    <style>body {{ font-family: Arial; }} details {{ margin-left: 20px; }}</style>
-                    </head>
-                    <body>
-                    <h1>AutoML-Analyzer</h1>
-                    {node_to_html(self.app.root_node)}
-                    </body>
-                    </html>"""
+    @staticmethod
+    def _report_written(builder: ReportBuilder, message: str) -> None:
+        """Show *message*, listing the diagrams *builder* failed to draw."""
+        if not builder.errors:
+            messagebox.showinfo("Report", message)
+            return
+        failed = "\n".join(f"{Path(path).name}: {error}" for path, error in builder.errors)
+        messagebox.showwarning(
+            "Report", f"{message}\n\nSome diagrams could not be drawn:\n{failed}"
         )
 
+    def build_html_report(self) -> str:
+        out = StringIO()
+        ReportBuilder(self.app).stream(out)
+        return out.getvalue()
+
     # ------------------------------------------------------------------
     # Export helpers
     def export_model_data(self, include_versions: bool = True):
         app = self.app
         app.update_odd_elements()
+        # Baselines are saved as manifests referencing shared chunks.
+        versions: list = []
+        version_chunks: dict = {}
+        if include_versions and app.versions:
+            versions, version_chunks = version_store_for(app).export(app.versions)
         reviews = []
         for r in getattr(app, "reviews", []):
             reviews.append(
@@ -168,34 +171,7 @@ class Reporting_Export:
         current_name = review_data.name if review_data else None
         repo = SysMLRepository.get_instance()
         data = {
-            "top_events": [event.to_dict() for event in getattr(app, "top_events", [])],
-            "cta_events": [event.to_dict() for event in getattr(app, "cta_events", [])],
-            "paa_events": [event.to_dict() for event in getattr(app, "paa_events", [])],
-            "fmeas": [
-                {
-                    "name": f["name"],
-                    "file": f["file"],
-                    "entries": [e.to_dict() for e in f["entries"]],
-                    "created": f.get("created", ""),
-                    "author": f.get("author", ""),
-                    "modified": f.get("modified", ""),
-                    "modified_by": f.get("modified_by", ""),
-                }
-                for f in app.fmeas
-            ],
-            "fmedas": [
-                {
-                    "name": d["name"],
-                    "file": d["file"],
-                    "entries": [e.to_dict() for e in d["entries"]],
-                    "bom": d.get("bom", ""),
-                    "created": d.get("created", ""),
-                    "author": d.get("author", ""),
-                    "modified": d.get("modified", ""),
-                    "modified_by": d.get("modified_by", ""),
-                }
-                for d in app.fmedas
-            ],
+            **self.export_model_sections(EVENT_SECTIONS + FMEA_SECTIONS),
             "mechanism_libraries": [
                 {
                     "name": lib.name,
@@ -249,7 +225,7 @@ class Reporting_Export:
             "scenario_libraries": [asdict(lib) for lib in app.scenario_libraries],
             "odd_libraries": [asdict(lib) for lib in app.odd_libraries],
             "odd_elements": [asdict(e) for e in app.odd_elements],
-            "versions": app.versions if include_versions else [],
+            "versions": versions,
             "fmea_settings": app.fmea_service.get_settings_dict(),
             "req_editor": app.requirements_manager.export_state(),
             "sysml_repository": repo.export_state() if repo else {},
@@ -260,8 +236,53 @@ class Reporting_Export:
             "gsn_modules": [m.to_dict() for m in app.gsn_modules],
             "gsn_diagrams": [d.to_dict() for d in app.gsn_diagrams],
         }
+        if version_chunks:
+            data["version_chunks"] = version_chunks
         return data
 
+    def export_model_sections(self, names) -> dict:
+        """Return the *names* sections of :meth:`export_model_data`.
+
+        Fault tree and FMEA sections are exported directly; any other name
+        requires a full export.
+        """
+        names = list(names)
+        if not set(names) <= set(EVENT_SECTIONS + FMEA_SECTIONS):
+            data = self.export_model_data(include_versions=False)
+            return {name: data[name] for name in names if name in data}
+        return {name: self._export_section(name) for name in names}
+
+    def _export_section(self, name: str) -> list:
+        app = self.app
+        if name == "fmeas":
+            return [
+                {
+                    "name": f["name"],
+                    "file": f["file"],
+                    "entries": [e.to_dict() for e in f["entries"]],
+                    "created": f.get("created", ""),
+                    "author": f.get("author", ""),
+                    "modified": f.get("modified", ""),
+                    "modified_by": f.get("modified_by", ""),
+                }
+                for f in app.fmeas
+            ]
+        if name == "fmedas":
+            return [
+                {
+                    "name": d["name"],
+                    "file": d["file"],
+                    "entries": [e.to_dict() for e in d["entries"]],
+                    "bom": d.get("bom", ""),
+                    "created": d.get("created", ""),
+                    "author": d.get("author", ""),
+                    "modified": d.get("modified", ""),
+                    "modified_by": d.get("modified_by", ""),
+                }
+                for d in app.fmedas
+            ]
+        return [event.to_dict() for event in getattr(app, name, [])]
+
     def export_product_goal_requirements(self) -> None:
         path = filedialog.asksaveasfilename(
             defaultextension=".csv", filetypes=[("CSV", "*.csv")]
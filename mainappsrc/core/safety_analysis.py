@@ -36,9 +36,12 @@ from gui.controls.mac_button_style import apply_translucid_button_style
 from gui.styles.style_manager import StyleManager
 from analysis.models import QUALIFICATIONS, COMPONENT_ATTR_TEMPLATES, component_fit_map
 from analysis.fmeda_utils import GATE_NODE_TYPES, ASIL_TARGETS
+from analysis.traceability import TraceList, trace_list
 from mainappsrc.models.fta.fault_tree_node import FaultTreeNode
 from mainappsrc.subapps.fta_subapp import FTASubApp
 from mainappsrc.core.fmea_service import FMEAService
+from mainappsrc.core.propagation_graph import propagation_graph_for
+from mainappsrc.core.reporting_export import EVENT_SECTIONS
 from mainappsrc.managers.fmeda_manager import FMEDAManager
 from gui.windows.fault_prioritization import SelectFaultDialog
 from . import config_utils
@@ -51,7 +54,7 @@ class SafetyAnalysis_FTA_FMEA(FTASubApp, FMEAService, FMEDAManager):
         # Internal storage for FMEA and FMEDA documents used by property
         # accessors defined later in this class.  Parent initialisers will
         # populate these via the property setters to avoid recursion.
-        self._fmeas: list[dict] = []
+        self._fmeas: list[dict] = TraceList()
         self._fmedas: list[dict] = []
 
         # Initialise parent helper classes that require the application
@@ -104,6 +107,8 @@ class SafetyAnalysis_FTA_FMEA(FTASubApp, FMEAService, FMEDAManager):
 
             def map_nodes(n):
                 nodes_by_id[n.unique_id] = n
+                original = getattr(n, "original", None) or n
+                nodes_by_id.setdefault(original.unique_id, original)
                 for child in n.children:
                     map_nodes(child)
 
@@ -246,7 +251,7 @@ class SafetyAnalysis_FTA_FMEA(FTASubApp, FMEAService, FMEDAManager):
 
     @fmeas.setter
     def fmeas(self, value: list[dict]) -> None:
-        self._fmeas = value
+        self._fmeas = trace_list(value)
 
     @property
     def fmedas(self) -> list[dict]:
@@ -336,7 +341,7 @@ class SafetyAnalysis_FTA_FMEA(FTASubApp, FMEAService, FMEDAManager):
 
     def add_fault_event(self) -> None:
         app = self.app
-        app.push_undo_state()
+        app.push_undo_state(touched=EVENT_SECTIONS)
         fault = self._prompt_fault_selection(app)
         if not fault:
             return
@@ -455,7 +460,7 @@ class SafetyAnalysis_FTA_FMEA(FTASubApp, FMEAService, FMEDAManager):
 
     def delete_top_events_for_malfunction(self, name: str) -> None:
         app = self.app
-        app.push_undo_state()
+        app.push_undo_state(touched=EVENT_SECTIONS)
         removed = [te for te in app.top_events if getattr(te, "malfunction", "") == name]
         if not removed:
             return
@@ -947,43 +952,21 @@ class SafetyAnalysis_FTA_FMEA(FTASubApp, FMEAService, FMEDAManager):
     # Model refresh and requirement utilities
     # ------------------------------------------------------------------
     def refresh_model(self):
+        """Propagate failure mode, probability and safety goal data.
+
+        The work is done by the app's :class:`PropagationGraph`, which links
+        the model once and only recomputes basic event probabilities whose
+        inputs changed since the previous refresh.
+        """
         app = self.app
         app.ensure_asil_consistency()
-        for fm in app.get_all_failure_modes():
-            app.propagate_failure_mode_attributes(fm)
-
-        def iter_analysis_events():
-            for be in self.get_all_basic_events():
-                yield be
-            for e in app.fmea_entries:
-                yield e
-            for doc in self.fmeas:
-                for e in doc.get("entries", []):
-                    yield e
-            for doc in self.fmedas:
-                for e in doc.get("entries", []):
-                    yield e
-
-        for entry in iter_analysis_events():
-            mals = [m.strip() for m in getattr(entry, "fmeda_malfunction", "").split(";") if m.strip()]
-            goals = self.get_safety_goals_for_malfunctions(mals) or self.get_top_event_safety_goals(entry)
-            if goals:
-                sg = ", ".join(goals)
-                entry.fmeda_safety_goal = sg
-                first = goals[0]
-                te = next((t for t in app.top_events if first in [t.user_name, t.safety_goal_description]), None)
-                if te:
-                    entry.fmeda_dc_target = getattr(te, "sg_dc_target", 0.0)
-                    entry.fmeda_spfm_target = getattr(te, "sg_spfm_target", 0.0)
-                    entry.fmeda_lpfm_target = getattr(te, "sg_lpfm_target", 0.0)
-
-        self.update_basic_event_probabilities()
+        propagation_graph_for(app).refresh()
         app.sync_cyber_risk_to_goals()
 
     def refresh_all(self):
         app = self.app
         app.update_views()
-        config_utils.regenerate_requirement_patterns()
+        config_utils.regenerate_requirement_patterns(background=True)
         app.gsn_manager.refresh()
         for attr in dir(app):
             if attr.endswith("_window"):
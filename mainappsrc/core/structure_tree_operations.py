@@ -22,6 +22,8 @@ from __future__ import annotations
 
 
 from gui.controls import messagebox
+from mainappsrc.models.fta.node_registry import NODE_REGISTRY
+from mainappsrc.core.reporting_export import EVENT_SECTIONS
 
 
 class Structure_Tree_Operations:
@@ -109,7 +111,7 @@ class Structure_Tree_Operations:
 
     def remove_node(self):
         app = self.app
-        app.push_undo_state()
+        app.push_undo_state(touched=EVENT_SECTIONS)
         sel = app.analysis_tree.selection()
         target = None
         if sel:
@@ -123,13 +125,14 @@ class Structure_Tree_Operations:
                     if target in p.children:
                         p.children.remove(target)
                 target.parents = []
+            NODE_REGISTRY.discard_subtree(target)
             app.update_views()
         else:
             messagebox.showwarning("Invalid", "Cannot remove the root node.")
 
     def remove_connection(self, node):
         app = self.app
-        app.push_undo_state()
+        app.push_undo_state(touched=EVENT_SECTIONS)
         if node and node != app.root_node:
             if node.parents:
                 for p in node.parents:
@@ -150,7 +153,7 @@ class Structure_Tree_Operations:
 
     def delete_node_and_subtree(self, node):
         app = self.app
-        app.push_undo_state()
+        app.push_undo_state(touched=EVENT_SECTIONS)
         if node:
             if node in app.top_events:
                 app.top_events.remove(node)
@@ -159,12 +162,66 @@ class Structure_Tree_Operations:
                     if node in p.children:
                         p.children.remove(node)
                 node.parents = []
+            NODE_REGISTRY.discard_subtree(node)
             app.update_views()
             messagebox.showinfo("Delete Node", f"Deleted {node.name} and its subtree.")
         else:
             messagebox.showwarning("Delete Node", "Select a node to delete.")
 
+    def _fmea_entry_lists(self):
+        app = self.app
+        yield app.fmea_entries
+        for fmea in app.fmeas:
+            yield fmea.get("entries", [])
+        for d in app.fmedas:
+            yield d.get("entries", [])
+
+    def _reaches_top_event(self, node, top_ids):
+        stack = [node]
+        seen = set()
+        while stack:
+            n = stack.pop()
+            if id(n) in seen:
+                continue
+            seen.add(id(n))
+            if id(n) in top_ids:
+                return True
+            stack.extend(getattr(n, "parents", []))
+        return False
+
+    def _find_registered_node(self, unique_id):
+        """Return the live node registered under *unique_id*, if any.
+
+        The registry may still hold nodes of a replaced model, so a candidate
+        only counts when it hangs below a current top event or is listed in
+        an FMEA/FMEDA document.
+        """
+        candidates = NODE_REGISTRY.nodes(unique_id)
+        if not candidates:
+            return None
+        top_ids = {id(t) for t in self.app.top_events}
+        for node in candidates:
+            if self._reaches_top_event(node, top_ids):
+                return node
+        cand_ids = {id(n) for n in candidates}
+        for entries in self._fmea_entry_lists():
+            for e in entries:
+                if id(e) in cand_ids:
+                    return e
+        return None
+
     def find_node_by_id_all(self, unique_id):
+        result = self._find_registered_node(unique_id)
+        if result is not None:
+            return result
+        # Nodes copied without going through FaultTreeNode (e.g. deepcopy)
+        # are not registered; locate them the slow way and record them.
+        result = self._find_node_by_id_walk(unique_id)
+        if result is not None and hasattr(result, "_unique_id"):
+            NODE_REGISTRY.rekey(result, None, unique_id)
+        return result
+
+    def _find_node_by_id_walk(self, unique_id):
         app = self.app
         for top in app.top_events:
             result = self.find_node_by_id(top, unique_id)
@@ -18,14 +18,33 @@
 
 from __future__ import annotations
 
-"""Synchronization helpers for nodes keyed by unique IDs."""
+"""Synchronization helpers for nodes keyed by unique IDs.
 
-from typing import TYPE_CHECKING, List, Any
+Fault tree nodes are synchronised through :data:`NODE_REGISTRY`, which
+indexes primaries by ``unique_id`` and clones by their original, so an edit
+touches only the *k* instances sharing the edited node's ID.  Nodes that are not
+registered (GSN nodes) fall back to collecting every node of the model.
+"""
+
+from typing import TYPE_CHECKING, Iterable, List, Any
+
+from mainappsrc.models.fta.node_registry import NODE_REGISTRY
 
 if TYPE_CHECKING:  # pragma: no cover - only for type hints
     from .automl_core import AutoMLApp
 
 
+def _dedup(nodes: Iterable[Any]) -> List[Any]:
+    """Return *nodes* without repeated objects, preserving order."""
+    seen: set[int] = set()
+    result: List[Any] = []
+    for n in nodes:
+        if id(n) not in seen:
+            seen.add(id(n))
+            result.append(n)
+    return result
+
+
 class Syncing_And_IDs:
     """Collect and synchronise nodes that share unique identifiers."""
 
@@ -48,11 +67,7 @@ class Syncing_And_IDs:
         for attr in ("all_gsn_diagrams", "gsn_diagrams"):
             for diag in getattr(self.app, attr, []):
                 nodes.extend(getattr(diag, "nodes", []))
-        dedup: List[Any] = []
-        for n in nodes:
-            if n not in dedup:
-                dedup.append(n)
-        return dedup
+        return _dedup(nodes)
 
     def _collect_sync_nodes_strategy2(self) -> List[Any]:
         nodes: List[Any] = []
@@ -67,11 +82,7 @@ class Syncing_And_IDs:
         for attr in ("all_gsn_diagrams", "gsn_diagrams"):
             for diag in getattr(self.app, attr, []):
                 nodes.extend(getattr(diag, "nodes", []))
-        dedup: List[Any] = []
-        for n in nodes:
-            if n not in dedup:
-                dedup.append(n)
-        return dedup
+        return _dedup(nodes)
 
     def _collect_sync_nodes_strategy3(self) -> List[Any]:
         visited = set()
@@ -124,7 +135,10 @@ class Syncing_And_IDs:
             self.app._copy_attrs_no_xy(updated_node, clone, attrs)
             updated_node.display_label = clone.display_label.replace(" (clone)", "")
         updated_primary_id = updated_node.unique_id
-        nodes_to_check = self._collect_sync_nodes()
+        if NODE_REGISTRY.contains(updated_node):
+            nodes_to_check = NODE_REGISTRY.instances_of(updated_primary_id)
+        else:
+            nodes_to_check = self._collect_sync_nodes()
         for node in nodes_to_check:
             if node is updated_node or node is clone:
                 continue
@@ -28,6 +28,7 @@ utilities when required.
 """
 
 from gui.controls import messagebox
+from mainappsrc.core.reporting_export import EVENT_SECTIONS
 
 from ..models.fta.fault_tree_node import FaultTreeNode
 
@@ -43,7 +44,7 @@ class Top_Event_Workflows:
     def create_top_event_for_malfunction(self, name: str) -> None:
         """Create a new top level event linked to the given malfunction."""
         app = self.app
-        app.push_undo_state()
+        app.push_undo_state(touched=EVENT_SECTIONS)
         new_event = FaultTreeNode("", "TOP EVENT")
         new_event.x, new_event.y = 300, 200
         new_event.is_top_event = True
@@ -63,7 +64,7 @@ class Top_Event_Workflows:
 
     def add_gate_from_failure_mode(self) -> None:
         app = self.app
-        app.push_undo_state()
+        app.push_undo_state(touched=EVENT_SECTIONS)
         modes = app.get_available_failure_modes_for_gates()
         if not modes:
             messagebox.showinfo("No Failure Modes", "No failure modes available.")
@@ -0,0 +1,478 @@
+# Author: Miguel Marina <karel.capek.robotics@gmail.com>
+# SPDX-License-Identifier: GPL-3.0-or-later
+#
+# Copyright (C) 2025 Capek System Safety & Robotic Solutions
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+"""Structural-diff undo journal shared by the application and repository.
+
+Undo history used to store a complete JSON copy of the model for every edit
+and compared position-stripped deep copies to merge drag moves.  The journal
+instead freezes each checkpoint *against the previous one*: entities (FTA
+nodes, elements, relationships, diagrams and diagram objects) that did not
+change are shared by reference, so a checkpoint only allocates the entities
+touched by the edit.  While freezing, the journal classifies the change as
+position-only or structural which lets drag moves coalesce without extra
+copies.  Because unchanged entities keep their identity between
+checkpoints, owners can replay an undo step by rebuilding only the entities
+whose frozen form differs (see :meth:`SysMLRepository._replay_state`).
+
+Mutation paths that know which entities they are about to change record a
+*partial* checkpoint instead (see :meth:`UndoJournal.patch`).  It holds the
+frozen form of just those entities, or :data:`ABSENT` for entities the edit
+creates, so recording and undoing the step costs time and memory in
+proportion to the edit rather than to the model.  Owners read their live
+model through a ``read(keys)`` callable: ``read(None)`` returns the full
+live view and ``read(keys)`` a mapping of each key to its live value or
+:data:`ABSENT`.
+"""
+
+from __future__ import annotations
+
+import copy
+from dataclasses import dataclass
+from typing import Any, Callable, Iterable
+
+# Fields ignored when deciding whether two states differ only by a move.
+POSITION_FIELDS = frozenset({"x", "y", "modified", "modified_by", "modified_by_email"})
+
+# Keys identifying entities inside lists of the exported model.
+ENTITY_KEYS = ("unique_id", "elem_id", "rel_id", "diag_id", "obj_id")
+
+SAME = 0
+POSITION = 1
+STRUCTURE = 2
+
+_MISSING = object()
+# Reference meaning "the live model, unread"; see UndoJournal.mark_clean.
+_LIVE = object()
+
+
+class _Absent:
+    """Placeholder for an entity that does not exist in a partial checkpoint."""
+
+    def __repr__(self) -> str:
+        return "ABSENT"
+
+    def __deepcopy__(self, memo) -> "_Absent":
+        return self
+
+
+ABSENT = _Absent()
+
+
+@dataclass(eq=False)
+class Checkpoint:
+    """Frozen model state stored in an undo or redo stack.
+
+    ``moved`` records whether the change from the checkpoint below this one
+    only touched :data:`POSITION_FIELDS`.  A ``partial`` checkpoint maps
+    entity keys to frozen forms instead of holding the whole model.
+    """
+
+    state: Any
+    moved: bool = False
+    partial: bool = False
+
+
+def entity_key(item: Any) -> tuple | None:
+    """Return the identity of *item* when it is a keyed entity."""
+    if isinstance(item, dict):
+        for key in ENTITY_KEYS:
+            if key in item:
+                return key, item[key]
+    return None
+
+
+def thaw(value: Any) -> Any:
+    """Return a mutable deep copy of a frozen *value*."""
+    return copy.deepcopy(value)
+
+
+def freeze(new: Any, old: Any = _MISSING, field: str | None = None) -> tuple[Any, int]:
+    """Return ``(frozen, status)`` for *new* sharing structure with *old*.
+
+    Sub-structures equal to the corresponding part of *old* are reused by
+    reference; everything else is copied.  ``status`` is :data:`SAME`,
+    :data:`POSITION` or :data:`STRUCTURE` depending on what differs.
+    """
+    if isinstance(new, dict):
+        if not isinstance(old, dict):
+            return _copy(new), STRUCTURE
+        status = SAME
+        if old.keys() != new.keys():
+            extra = old.keys() ^ new.keys()
+            status = POSITION if extra <= POSITION_FIELDS else STRUCTURE
+        out = {}
+        for key, value in new.items():
+            child, st = freeze(value, old.get(key, _MISSING), key)
+            out[key] = child
+            if st > status:
+                status = st
+        return (old, SAME) if status == SAME else (out, status)
+    if isinstance(new, (list, tuple)):
+        if not isinstance(old, list):
+            return _copy(new), STRUCTURE
+        return _freeze_list(new, old, field)
+    if old is not _MISSING and type(old) is type(new) and old == new:
+        return old, SAME
+    return new, (POSITION if field in POSITION_FIELDS else STRUCTURE)
+
+
+def _freeze_list(new, old: list, field: str | None) -> tuple[list, int]:
+    if len(new) == len(old) and all(
+        entity_key(o) == entity_key(n) for o, n in zip(old, new)
+    ):
+        status = SAME
+        out = []
+        for o, n in zip(old, new):
+            child, st = freeze(n, o, field)
+            out.append(child)
+            if st > status:
+                status = st
+        return (old, SAME) if status == SAME else (out, status)
+    # Entities were added, removed or reordered: match them by identity so
+    # unchanged entities are still shared.
+    by_key: dict[tuple, Any] = {}
+    for o in old:
+        key = entity_key(o)
+        if key is not None:
+            by_key.setdefault(key, o)
+    out = []
+    for idx, n in enumerate(new):
+        key = entity_key(n)
+        if key is not None:
+            match = by_key.get(key, _MISSING)
+        elif idx < len(old) and entity_key(old[idx]) is None:
+            match = old[idx]
+        else:
+            match = _MISSING
+        out.append(freeze(n, match, field)[0])
+    return out, STRUCTURE
+
+
+def _copy(value: Any) -> Any:
+    if isinstance(value, dict):
+        return {k: _copy(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_copy(v) for v in value]
+    return value
+
+
+def _freeze_forms(live: dict, old: dict) -> tuple[dict, int]:
+    """Freeze the values of *live* against the forms in *old* (see :func:`freeze`)."""
+    status = SAME
+    out = {}
+    for key, value in live.items():
+        before = old.get(key, _MISSING)
+        if value is ABSENT or before is ABSENT:
+            frozen, st = value, (SAME if value is before else STRUCTURE)
+        else:
+            frozen, st = freeze(value, before)
+        out[key] = frozen
+        if st > status:
+            status = st
+    return out, status
+
+
+class UndoJournal:
+    """Undo and redo stacks of structurally shared :class:`Checkpoint` objects.
+
+    The ``v1`` to ``v4`` push strategies reproduce the historical snapshot
+    coalescing rules on top of the move classification computed by
+    :func:`freeze`.  When a strategy drops a partial checkpoint its forms are
+    folded into the checkpoint below so undoing still restores every entity
+    the dropped step covered.
+
+    :attr:`reference` is the checkpoint the live model matched when last
+    observed: after a push, an undo or redo step, :meth:`rebase` or
+    :meth:`mark_clean`.  Owners ask :meth:`drifted` whether the model moved
+    away from it to tell real edits from checkpoints that turned out to be
+    no-ops.
+    """
+
+    def __init__(self, limit: int) -> None:
+        self.limit = limit
+        self.undo_stack: list = []
+        self.redo_stack: list = []
+        self.reference: Any = None
+        self._move_run_length = 0
+        self._in_move_run = False
+
+    # ------------------------------------------------------------------
+    @staticmethod
+    def state_of(entry: Any) -> Any:
+        return entry.state if isinstance(entry, Checkpoint) else entry
+
+    @staticmethod
+    def is_partial(entry: Any) -> bool:
+        return getattr(entry, "partial", False)
+
+    def _reference(self) -> Any:
+        for stack in (self.undo_stack, self.redo_stack):
+            for entry in reversed(stack):
+                if not self.is_partial(entry):
+                    return self.state_of(entry)
+        return _MISSING
+
+    def checkpoint(self, state: Any) -> tuple[Checkpoint, int]:
+        """Freeze *state* and classify it against the top of the undo stack."""
+        if self.undo_stack and not self.is_partial(self.undo_stack[-1]):
+            frozen, status = freeze(state, self.state_of(self.undo_stack[-1]))
+        else:
+            frozen, status = freeze(state, self._reference())
+            status = STRUCTURE
+        return Checkpoint(frozen, status == POSITION), status
+
+    def patch(
+        self, read: Callable[[Any], Any], keys: Iterable, moved: bool = False
+    ) -> tuple[Checkpoint, int]:
+        """Return a partial checkpoint of the entities *keys* are about to change.
+
+        The status classifies the step recorded by the partial checkpoint on
+        top of the undo stack, the only change whose extent is known without
+        reading the whole model.  When that step turned out to be a no-op the
+        top checkpoint is widened to *keys* and :data:`SAME` is returned so
+        the strategies skip the push.  An empty *keys* records a step that
+        changed nothing owned by this journal; it keeps paired journals in
+        step and takes its ``moved`` flag from the caller.
+        """
+        keys = list(dict.fromkeys(keys))
+        if not keys:
+            return Checkpoint({}, moved, partial=True), POSITION if moved else STRUCTURE
+        top = self.undo_stack[-1] if self.undo_stack else None
+        if not (self.is_partial(top) and top.state):
+            forms, _ = _freeze_forms(read(keys), {})
+            return Checkpoint(forms, partial=True), STRUCTURE
+        live = read(list(top.state) + [k for k in keys if k not in top.state])
+        seen, status = _freeze_forms({k: live[k] for k in top.state}, top.state)
+        forms = {k: seen[k] if k in seen else _freeze_forms({k: live[k]}, {})[0][k] for k in keys}
+        if status == SAME:
+            top.state = {**forms, **top.state}
+        return Checkpoint(forms, status == POSITION, partial=True), status
+
+    def _capture(self, read: Callable[[Any], Any], like: Any) -> tuple[Checkpoint, int]:
+        """Freeze the live model over the scope of *like* and compare them."""
+        if self.is_partial(like):
+            forms, status = _freeze_forms(read(list(like.state)), like.state)
+            return Checkpoint(forms, partial=True), status
+        frozen, status = freeze(read(None), self.state_of(like))
+        return Checkpoint(frozen), status
+
+    def drifted(
+        self, read: Callable[[Any], Any], status: int | None = None, full: bool = True
+    ) -> bool:
+        """Return whether the live model differs from :attr:`reference`.
+
+        *status* is the result of a full :meth:`checkpoint` just taken; it
+        answers without another comparison when the reference is the top of
+        the undo stack.  With ``full=False`` a reference covering the whole
+        model is not compared and counts as unchanged.
+        """
+        ref = self.reference
+        if ref is _LIVE:
+            return False
+        if ref is None:
+            return True
+        if self.is_partial(ref):
+            if not ref.state:
+                return False
+        elif status is not None and self.undo_stack and ref is self.undo_stack[-1]:
+            return status != SAME
+        elif not full:
+            return False
+        return self._capture(read, ref)[1] != SAME
+
+    def observe(self) -> None:
+        """Make the top of the undo stack the reference after a push."""
+        if self.undo_stack:
+            self._observed(self.undo_stack[-1])
+
+    def mark_clean(self) -> None:
+        """Take the live model as the reference without reading it.
+
+        Owners call this when the live model is the baseline by definition,
+        e.g. right after saving it; :meth:`drifted` reports no change until
+        the next checkpoint records that state.
+        """
+        self.reference = _LIVE
+
+    def covers_all(self) -> bool:
+        """Return whether :attr:`reference` is a checkpoint of the whole model."""
+        ref = self.reference
+        return isinstance(ref, Checkpoint) and not ref.partial
+
+    def rebase(self, read: Callable[[Any], Any]) -> None:
+        """Make the live model the reference, over the scope of the last step."""
+        like = self.undo_stack[-1] if self.undo_stack else self.reference
+        if like is None or like is _LIVE or (self.is_partial(like) and not like.state):
+            like = self.reference
+        if like is None or like is _LIVE:
+            self.reference = Checkpoint(freeze(read(None))[0])
+        else:
+            self.reference = self._capture(read, like)[0]
+
+    def _trim(self, stack: list) -> None:
+        while len(stack) > self.limit:
+            stack.pop(0)
+
+    def _drop(self, index: int) -> bool:
+        """Remove ``undo_stack[index]`` keeping what it restores.
+
+        A partial checkpoint is folded into the one below it, whose older
+        forms win.  A full checkpoint cannot be folded into a partial one, so
+        it is kept and ``False`` returned.
+        """
+        stack = self.undo_stack
+        index %= len(stack)
+        dropped = stack[index]
+        if index:
+            below = stack[index - 1]
+            if self.is_partial(below):
+                if not self.is_partial(dropped):
+                    return False
+                below.state = {**dropped.state, **below.state}
+        del stack[index]
+        return True
+
+    def _replace_top(self, cp: Checkpoint) -> None:
+        self._drop(-1)
+        self.undo_stack.append(cp)
+
+    # ------------------------------------------------------------------
+    # Push strategies
+    def push(self, state: Any, strategy: str = "v4") -> bool:
+        """Record *state*; return ``True`` when the undo stack changed."""
+        cp, status = self.checkpoint(state)
+        handler = getattr(self, f"push_{strategy}", self.push_v1)
+        changed = handler(cp, status)
+        if changed:
+            self._trim(self.undo_stack)
+            self.redo_stack.clear()
+        self.observe()
+        return changed
+
+    def push_v1(self, cp: Checkpoint, status: int) -> bool:
+        if not self.undo_stack:
+            self.undo_stack.append(cp)
+            return True
+        if status == SAME:
+            return False
+        top = self.undo_stack[-1]
+        if status == POSITION and len(self.undo_stack) >= 2 and getattr(top, "moved", False):
+            self._replace_top(cp)
+            return True
+        self.undo_stack.append(cp)
+        return True
+
+    def push_v2(self, cp: Checkpoint, status: int) -> bool:
+        if self.undo_stack and status == SAME:
+            return False
+        if self.undo_stack and status == POSITION:
+            if self._in_move_run:
+                self._replace_top(cp)
+            else:
+                self.undo_stack.append(cp)
+                self._in_move_run = True
+            return True
+        self._in_move_run = False
+        self.undo_stack.append(cp)
+        return True
+
+    def push_v3(self, cp: Checkpoint, status: int) -> bool:
+        if self.undo_stack and status == SAME:
+            return False
+        if self.undo_stack and status == POSITION:
+            if self._move_run_length:
+                self._replace_top(cp)
+            else:
+                self.undo_stack.append(cp)
+            self._move_run_length += 1
+            return True
+        self._move_run_length = 0
+        self.undo_stack.append(cp)
+        return True
+
+    def push_v4(self, cp: Checkpoint, status: int) -> bool:
+        if self.undo_stack and status == SAME:
+            return False
+        self.undo_stack.append(cp)
+        if (
+            len(self.undo_stack) >= 3
+            and cp.moved
+            and getattr(self.undo_stack[-2], "moved", False)
+        ):
+            self._drop(-2)
+        return True
+
+    # ------------------------------------------------------------------
+    # Undo / redo
+    def undo(self, read: Callable[[Any], Any], keep_current: bool = False) -> tuple[bool, Any]:
+        """Step back from the live model returned by *read*.
+
+        Returns ``(changed, target)`` where ``target`` is the checkpoint to
+        restore or ``None`` when only the history changed.  A checkpoint that
+        still matches the live model is skipped first.  The live forms of the
+        target's scope end up on top of the redo stack; when the stack held
+        just the current state ``keep_current`` still moves it there.
+        Callers must :func:`thaw` the target state before handing it to code
+        that may mutate it.
+        """
+        if not self.undo_stack:
+            return False, None
+        top = self.undo_stack[-1]
+        cp, status = self._capture(read, top)
+        if status == SAME and not (self.is_partial(top) and not top.state):
+            self.undo_stack.pop()
+            if not self.undo_stack:
+                if keep_current:
+                    self.redo_stack.append(cp)
+                    self._trim(self.redo_stack)
+                    self._observed(cp)
+                    return True, None
+                return False, None
+            if self.is_partial(top) or self.is_partial(self.undo_stack[-1]):
+                cp = None
+        target = self.undo_stack.pop()
+        if cp is None:
+            cp, _ = self._capture(read, target)
+        self.redo_stack.append(cp)
+        self._trim(self.redo_stack)
+        self._observed(target)
+        return True, target
+
+    def redo(self, read: Callable[[Any], Any]) -> tuple[bool, Any]:
+        """Reapply the most recently undone checkpoint (see :meth:`undo`)."""
+        if not self.redo_stack:
+            return False, None
+        target = self.redo_stack.pop()
+        # Freeze against the target so unchanged entities share identity
+        # with it; moves never coalesce across a redo.
+        cp, _ = self._capture(read, target)
+        self.undo_stack.append(cp)
+        self._trim(self.undo_stack)
+        self._observed(target)
+        return True, target
+
+    def _observed(self, entry: Any) -> None:
+        # Raw states and empty steps say nothing about the live model.
+        if isinstance(entry, Checkpoint) and (entry.state or not entry.partial):
+            self.reference = entry
+
+    def clear(self) -> None:
+        self.undo_stack.clear()
+        self.redo_stack.clear()
+        self._move_run_length = 0
+        self._in_move_run = False
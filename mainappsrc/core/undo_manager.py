@@ -16,14 +16,33 @@
 # You should have received a copy of the GNU General Public License
 # along with this program.  If not, see <https://www.gnu.org/licenses/>.
 
-"""Centralised undo/redo state management."""
+"""Centralised undo/redo state management.
+
+History is kept in an :class:`~mainappsrc.core.undo_journal.UndoJournal` so
+each checkpoint only stores the parts of the model touched by the edit.
+Callers that know which :meth:`export_model_data` sections an edit changes
+pass them to :meth:`UndoRedoManager.push_undo_state` so only those sections
+are exported, and undoing such a step loads only those sections back through
+``apply_model_sections``.
+
+The manager doubles as the model change notifier:
+:attr:`UndoRedoManager.model_version` increases when a checkpoint finds that
+the previous step really changed the model, when history is replayed, when
+:meth:`UndoRedoManager.settle` finds an edit the last checkpoint covers, or
+when an edit is announced with :meth:`UndoRedoManager.mark_changed`.
+Listeners added with :meth:`UndoRedoManager.add_change_listener` are called
+at the same points.  Mutation paths record a checkpoint right before they
+edit, so :attr:`UndoRedoManager.pending` marks a checkpoint whose edit has
+not been counted yet; together with the version it answers whether the
+model changed since :meth:`UndoRedoManager.mark_saved` without reading it.
+"""
 
 from __future__ import annotations
 
-import json
-from typing import Any
+from typing import Any, Callable, Iterable
 
 from mainappsrc.models.sysml.sysml_repository import SysMLRepository
+from mainappsrc.core.undo_journal import ABSENT, Checkpoint, UndoJournal, thaw
 
 
 class UndoRedoManager:
@@ -31,115 +50,220 @@ class UndoRedoManager:
 
     def __init__(self, app: Any):
         self.app = app
-        self._undo_stack: list[dict] = []
-        self._redo_stack: list[dict] = []
-        self._last_move_base: dict | None = None
-        self._move_run_length = 0
+        self._journal = UndoJournal(limit=20)
+        self.model_version = 0
+        # True when a checkpoint was recorded whose following edit is not
+        # reflected in model_version yet.
+        self.pending = False
+        self._listeners: list[Callable[[], None]] = []
 
     # ------------------------------------------------------------
-    # Helpers
+    # Change notification
     # ------------------------------------------------------------
-    def _strip_object_positions(self, data: dict) -> dict:
-        """Return a copy of *data* without concrete object positions."""
+    def add_change_listener(self, callback: Callable[[], None]) -> None:
+        """Call *callback* whenever the model may have changed."""
 
-        cleaned = json.loads(json.dumps(data))
+        if callback not in self._listeners:
+            self._listeners.append(callback)
 
-        def scrub(obj: Any) -> None:
-            if isinstance(obj, dict):
-                for field in ("x", "y", "modified", "modified_by", "modified_by_email"):
-                    obj.pop(field, None)
-                for value in obj.values():
-                    scrub(value)
-            elif isinstance(obj, list):
-                for item in obj:
-                    scrub(item)
+    def remove_change_listener(self, callback: Callable[[], None]) -> None:
+        if callback in self._listeners:
+            self._listeners.remove(callback)
 
-        scrub(cleaned)
-        return cleaned
+    def mark_changed(self) -> None:
+        """Announce an edit that was applied without recording a checkpoint."""
+
+        self._notify_change()
+
+    def _notify_change(self) -> None:
+        self.model_version += 1
+        for callback in list(self._listeners):
+            callback()
+
+    def _journals(self) -> list:
+        repo = SysMLRepository.get_instance()
+        pairs = [(self._journal, self._read_sections)]
+        journal = getattr(repo, "_journal", None)
+        if journal is not None:
+            pairs.append((journal, repo._undo_read))
+        return pairs
+
+    def settle(self) -> bool:
+        """Count the edit following the last checkpoint without a new one.
+
+        Only steps that recorded part of the model are compared, which costs
+        in proportion to that part; after a full checkpoint the edit stays
+        :attr:`pending`.  Returns whether an edit was found.
+        """
+
+        if not self.pending:
+            return False
+        found = False
+        full = False
+        for journal, read in self._journals():
+            if journal.drifted(read, full=False):
+                journal.rebase(read)
+                found = True
+            full = full or journal.covers_all()
+        self.pending = full
+        if found:
+            self._notify_change()
+        return found
+
+    def mark_saved(self) -> None:
+        """Make the live model the baseline for later change detection."""
+
+        for journal, _read in self._journals():
+            journal.mark_clean()
+        self.pending = False
+
+    def is_dirty(self, saved_version: int) -> bool:
+        """Return whether the model changed since *saved_version* was current."""
+
+        self.settle()
+        return self.model_version != saved_version or self.pending
 
     # ------------------------------------------------------------
-    # State recording
+    # Stack access
     # ------------------------------------------------------------
-    def push_undo_state(self, strategy: str = "v4", sync_repo: bool = True) -> None:
-        """Save the current model state for undo operations."""
+    @property
+    def _undo_stack(self) -> list:
+        return self._journal.undo_stack
 
-        repo = SysMLRepository.get_instance()
-        if sync_repo:
-            repo.push_undo_state(strategy=strategy, sync_app=False)
+    @_undo_stack.setter
+    def _undo_stack(self, value: list) -> None:
+        self._journal.undo_stack = list(value)
+
+    @property
+    def _redo_stack(self) -> list:
+        return self._journal.redo_stack
+
+    @_redo_stack.setter
+    def _redo_stack(self, value: list) -> None:
+        self._journal.redo_stack = list(value)
+
+    def _export_state(self) -> dict:
         try:
-            state = self.app.export_model_data(include_versions=False)
-            stripped = self._strip_object_positions(state)
+            return self.app.export_model_data(include_versions=False)
         except AttributeError:
-            state = {}
-            stripped = {}
+            return {}
 
-        handler = getattr(self, f"_push_undo_state_{strategy}", self._push_undo_state_v1)
-        changed = handler(state, stripped)
+    def _read_sections(self, names=None) -> dict:
+        """Return the live sections :class:`UndoJournal` freezes for *names*."""
 
-        if changed and len(self._undo_stack) > 20:
-            self._undo_stack.pop(0)
-        if changed:
-            self._redo_stack.clear()
+        if names is None:
+            return self._export_state()
+        try:
+            data = self.app.export_model_sections(names)
+        except AttributeError:
+            data = self._export_state()
+        return {name: data.get(name, ABSENT) for name in names}
+
+    def _reader(self, stack: list) -> Callable:
+        """Return a journal reader for an undo or redo step from *stack*.
+
+        Full checkpoints compare against the model as it was before the
+        repository took its own step, so the full export is taken up front.
+        """
+
+        journal = self._journal
+        full = None
+        if any(not journal.is_partial(entry) for entry in stack[-2:]):
+            full = self.app.export_model_data(include_versions=False)
+
+        def read(names=None):
+            if names is None and full is not None:
+                return full
+            return self._read_sections(names)
+
+        return read
+
+    def _apply(self, target: Any) -> None:
+        state = self._journal.state_of(target)
+        if not self._journal.is_partial(target):
+            self.app.apply_model_data(thaw(state))
+        elif state:
+            sections = {
+                name: None if form is ABSENT else thaw(form)
+                for name, form in state.items()
+            }
+            try:
+                self.app.apply_model_sections(sections)
+            except AttributeError:
+                data = self.app.export_model_data(include_versions=False)
+                for name, section in sections.items():
+                    if section is None:
+                        data.pop(name, None)
+                    else:
+                        data[name] = section
+                self.app.apply_model_data(data)
 
-    def _push_undo_state_v1(self, state: dict, stripped: dict) -> bool:
-        if self._undo_stack:
-            last = self._undo_stack[-1]
-            if last == state:
-                return False
-            if self._strip_object_positions(last) == stripped:
-                if (
-                    len(self._undo_stack) >= 2
-                    and self._strip_object_positions(self._undo_stack[-2]) == stripped
-                ):
-                    self._undo_stack[-1] = state
-                    return True
-                self._undo_stack.append(state)
-                return True
+    # ------------------------------------------------------------
+    # State recording
+    # ------------------------------------------------------------
+    def push_undo_state(
+        self,
+        strategy: str = "v4",
+        sync_repo: bool = True,
+        touched: Iterable[str] | None = None,
+        moved: bool = False,
+    ) -> None:
+        """Save the current model state for undo operations.
+
+        *touched* names the :meth:`export_model_data` sections the caller is
+        about to change so only those are recorded; the repository is then
+        left out unless ``"sysml_repository"`` is among them.  An empty
+        *touched* pairs a repository step, whose ``moved`` flag is passed
+        along so both histories coalesce alike.
+        """
+
+        repo = SysMLRepository.get_instance()
+        journal = self._journal
+        drifted = False
+        if touched is None:
+            if sync_repo:
+                drifted = bool(repo.push_undo_state(strategy=strategy, sync_app=False))
+            checkpoint, status = journal.checkpoint(self._export_state())
+            drifted = journal.drifted(self._read_sections, status) or drifted
         else:
-            self._undo_stack.append(state)
-            return True
+            touched = list(touched)
+            checkpoint, status = journal.patch(self._read_sections, touched, moved)
+            if touched:
+                drifted = journal.drifted(self._read_sections)
 
-        self._undo_stack.append(state)
-        return True
+        handler = getattr(self, f"_push_undo_state_{strategy}", self._push_undo_state_v1)
+        changed = handler(checkpoint, status)
+        journal.observe()
 
-    def _push_undo_state_v2(self, state: dict, stripped: dict) -> bool:
-        if self._undo_stack and self._undo_stack[-1] == state:
-            return False
-        if self._undo_stack and self._strip_object_positions(self._undo_stack[-1]) == stripped:
-            if self._last_move_base == stripped:
-                self._undo_stack[-1] = state
-            else:
-                self._undo_stack.append(state)
-                self._last_move_base = stripped
-            return True
-        self._last_move_base = None
-        self._undo_stack.append(state)
-        return True
-
-    def _push_undo_state_v3(self, state: dict, stripped: dict) -> bool:
-        if self._undo_stack and self._undo_stack[-1] == state:
-            return False
-        if self._undo_stack and self._strip_object_positions(self._undo_stack[-1]) == stripped:
-            if self._move_run_length:
-                self._undo_stack[-1] = state
-            else:
-                self._undo_stack.append(state)
-            self._move_run_length += 1
-            return True
-        self._move_run_length = 0
-        self._undo_stack.append(state)
-        return True
-
-    def _push_undo_state_v4(self, state: dict, stripped: dict) -> bool:
-        if self._undo_stack and self._undo_stack[-1] == state:
-            return False
-        self._undo_stack.append(state)
-        if len(self._undo_stack) >= 3:
-            s1 = self._strip_object_positions(self._undo_stack[-3])
-            s2 = self._strip_object_positions(self._undo_stack[-2])
-            if s1 == s2 == stripped:
-                self._undo_stack.pop(-2)
-        return True
+        if changed:
+            journal._trim(self._undo_stack)
+            self._redo_stack.clear()
+            if sync_repo and touched is not None:
+                drifted = bool(
+                    repo.push_undo_state(
+                        strategy=strategy,
+                        sync_app=False,
+                        touched=None if "sysml_repository" in touched else (),
+                        moved=checkpoint.moved,
+                    )
+                ) or drifted
+        # Checkpoints are recorded right before an edit, which may not
+        # record another one.
+        self.pending = True
+        if drifted:
+            self._notify_change()
+
+    def _push_undo_state_v1(self, checkpoint: Checkpoint, status: int) -> bool:
+        return self._journal.push_v1(checkpoint, status)
+
+    def _push_undo_state_v2(self, checkpoint: Checkpoint, status: int) -> bool:
+        return self._journal.push_v2(checkpoint, status)
+
+    def _push_undo_state_v3(self, checkpoint: Checkpoint, status: int) -> bool:
+        return self._journal.push_v3(checkpoint, status)
+
+    def _push_undo_state_v4(self, checkpoint: Checkpoint, status: int) -> bool:
+        return self._journal.push_v4(checkpoint, status)
 
     # ------------------------------------------------------------
     # Undo/Redo public interface
@@ -152,11 +276,8 @@ class UndoRedoManager:
         changed = handler(repo)
         if not changed:
             return
-        for tab in getattr(self.app, "diagram_tabs", {}).values():
-            for child in tab.winfo_children():
-                if hasattr(child, "refresh_from_repository"):
-                    child.refresh_from_repository()
-        self.app.refresh_all()
+        self._notify_change()
+        self._refresh()
 
     def redo(self, strategy: str = "v4") -> None:
         """Reapply a state previously reverted with :meth:`undo`."""
@@ -166,6 +287,10 @@ class UndoRedoManager:
         changed = handler(repo)
         if not changed:
             return
+        self._notify_change()
+        self._refresh()
+
+    def _refresh(self) -> None:
         for tab in getattr(self.app, "diagram_tabs", {}).values():
             for child in tab.winfo_children():
                 if hasattr(child, "refresh_from_repository"):
@@ -175,129 +300,58 @@ class UndoRedoManager:
     def clear_history(self) -> None:
         """Remove all undo and redo history."""
 
-        self._undo_stack.clear()
-        self._redo_stack.clear()
+        self._journal.clear()
         repo = SysMLRepository.get_instance()
         getattr(repo, "_undo_stack", []).clear()
         getattr(repo, "_redo_stack", []).clear()
+        self._notify_change()
 
     # ------------------------------------------------------------
     # Undo variants
     # ------------------------------------------------------------
-    def _undo_v1(self, repo: Any) -> bool:
+    def _undo_with(self, repo: Any, strategy: str, keep_current: bool = False) -> bool:
         if not self._undo_stack:
             return False
-        current = self.app.export_model_data(include_versions=False)
-        repo.undo(strategy="v1")
-        if self._undo_stack and self._undo_stack[-1] == current:
-            self._undo_stack.pop()
-            if not self._undo_stack:
-                return False
-        state = self._undo_stack.pop()
-        self._redo_stack.append(current)
-        if len(self._redo_stack) > 20:
-            self._redo_stack.pop(0)
-        self.app.apply_model_data(state)
-        return True
+        read = self._reader(self._undo_stack)
+        repo.undo(strategy=strategy)
+        changed, target = self._journal.undo(read, keep_current=keep_current)
+        if target is not None:
+            self._apply(target)
+        return changed
+
+    def _undo_v1(self, repo: Any) -> bool:
+        return self._undo_with(repo, "v1")
 
     def _undo_v2(self, repo: Any) -> bool:
-        if not self._undo_stack:
-            return False
-        current = self.app.export_model_data(include_versions=False)
-        repo.undo(strategy="v2")
-        if self._undo_stack and self._undo_stack[-1] == current:
-            self._undo_stack.pop()
-            if not self._undo_stack:
-                return False
-        state = self._undo_stack.pop()
-        self._redo_stack.append(current)
-        if len(self._redo_stack) > 20:
-            self._redo_stack.pop(0)
-        self.app.apply_model_data(state)
-        return True
+        return self._undo_with(repo, "v2")
 
     def _undo_v3(self, repo: Any) -> bool:
-        if not self._undo_stack:
-            return False
-        current = self.app.export_model_data(include_versions=False)
-        repo.undo(strategy="v3")
-        if self._undo_stack and self._undo_stack[-1] == current:
-            self._undo_stack.pop()
-            if not self._undo_stack:
-                return False
-        state = self._undo_stack.pop()
-        self._redo_stack.append(current)
-        if len(self._redo_stack) > 20:
-            self._redo_stack.pop(0)
-        self.app.apply_model_data(state)
-        return True
+        return self._undo_with(repo, "v3")
 
     def _undo_v4(self, repo: Any) -> bool:
-        if not self._undo_stack:
-            return False
-        current = self.app.export_model_data(include_versions=False)
-        repo.undo(strategy="v4")
-        if self._undo_stack and self._undo_stack[-1] == current:
-            self._undo_stack.pop()
-            if not self._undo_stack:
-                self._redo_stack.append(current)
-                if len(self._redo_stack) > 20:
-                    self._redo_stack.pop(0)
-                return True
-        state = self._undo_stack.pop()
-        self._redo_stack.append(current)
-        if len(self._redo_stack) > 20:
-            self._redo_stack.pop(0)
-        self.app.apply_model_data(state)
-        return True
+        return self._undo_with(repo, "v4", keep_current=True)
 
     # ------------------------------------------------------------
     # Redo variants
     # ------------------------------------------------------------
-    def _redo_v1(self, repo: Any) -> bool:
+    def _redo_with(self, repo: Any, strategy: str) -> bool:
         if not self._redo_stack:
             return False
-        current = self.app.export_model_data(include_versions=False)
-        repo.redo(strategy="v1")
-        state = self._redo_stack.pop()
-        self._undo_stack.append(current)
-        if len(self._undo_stack) > 20:
-            self._undo_stack.pop(0)
-        self.app.apply_model_data(state)
-        return True
+        read = self._reader(self._redo_stack[-1:])
+        repo.redo(strategy=strategy)
+        changed, target = self._journal.redo(read)
+        if target is not None:
+            self._apply(target)
+        return changed
+
+    def _redo_v1(self, repo: Any) -> bool:
+        return self._redo_with(repo, "v1")
 
     def _redo_v2(self, repo: Any) -> bool:
-        if not self._redo_stack:
-            return False
-        current = self.app.export_model_data(include_versions=False)
-        repo.redo(strategy="v2")
-        state = self._redo_stack.pop()
-        self._undo_stack.append(current)
-        if len(self._undo_stack) > 20:
-            self._undo_stack.pop(0)
-        self.app.apply_model_data(state)
-        return True
+        return self._redo_with(repo, "v2")
 
     def _redo_v3(self, repo: Any) -> bool:
-        if not self._redo_stack:
-            return False
-        current = self.app.export_model_data(include_versions=False)
-        repo.redo(strategy="v3")
-        state = self._redo_stack.pop()
-        self._undo_stack.append(current)
-        if len(self._undo_stack) > 20:
-            self._undo_stack.pop(0)
-        self.app.apply_model_data(state)
-        return True
+        return self._redo_with(repo, "v3")
 
     def _redo_v4(self, repo: Any) -> bool:
-        if not self._redo_stack:
-            return False
-        current = self.app.export_model_data(include_versions=False)
-        repo.redo(strategy="v4")
-        state = self._redo_stack.pop()
-        self._undo_stack.append(current)
-        if len(self._undo_stack) > 20:
-            self._undo_stack.pop(0)
-        self.app.apply_model_data(state)
-        return True
+        return self._redo_with(repo, "v4")
@@ -0,0 +1,176 @@
+# Author: Miguel Marina <karel.capek.robotics@gmail.com>
+# SPDX-License-Identifier: GPL-3.0-or-later
+#
+# Copyright (C) 2025 Capek System Safety & Robotic Solutions
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+"""Content-addressed storage for project versions and baselines.
+
+Each baseline is split into chunks: every FTA tree, every document of the
+top-level lists (FMEAs, HAZOPs, ...) and every element, relationship and
+diagram of the SysML repository.  Chunks are keyed by the SHA-256 of their
+canonical JSON and stored once, so baselines share every chunk that did
+not change and adding one costs the size of the changed chunks.
+
+Version entries keep the historical ``{"name": ..., "data": ...}`` shape:
+``data`` is rebuilt from the shared chunk objects and must be treated as
+read-only.  The ``manifest`` mirrors ``data`` with chunk references and is
+what projects persist together with the referenced chunks.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+# Containers nested deeper than this are stored as single chunks.
+SPLIT_DEPTH = 2
+
+_INLINE = (str, int, float, bool, type(None))
+
+
+def content_digest(value: Any) -> str:
+    """Return the SHA-256 hex digest of *value*'s canonical JSON."""
+    data = json.dumps(value, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(data.encode("utf-8")).hexdigest()
+
+
+class VersionStore:
+    """Deduplicated chunk store shared by all versions of a project."""
+
+    def __init__(self) -> None:
+        self.chunks: Dict[str, Any] = {}
+        self._digests: Dict[int, str] = {}
+
+    # ------------------------------------------------------------------
+    # Chunking
+    # ------------------------------------------------------------------
+    def _intern(self, value: Any) -> Tuple[str, Any]:
+        digest = content_digest(value)
+        chunk = self.chunks.setdefault(digest, value)
+        self._digests[id(chunk)] = digest
+        return digest, chunk
+
+    def _split(self, value: Any, depth: int) -> Tuple[dict, Any]:
+        if isinstance(value, _INLINE):
+            return {"=": value}, value
+        if depth < SPLIT_DEPTH and isinstance(value, dict):
+            nodes: Dict[str, dict] = {}
+            shared: Dict[str, Any] = {}
+            for key, item in value.items():
+                nodes[key], shared[key] = self._split(item, depth + 1)
+            return {"{}": nodes}, shared
+        if depth <= SPLIT_DEPTH and isinstance(value, (list, tuple)):
+            parts = [self._split(item, SPLIT_DEPTH + 1) for item in value]
+            return {"[]": [n for n, _ in parts]}, [v for _, v in parts]
+        digest, chunk = self._intern(value)
+        return {"#": digest}, chunk
+
+    def add(self, name: str, data: dict) -> dict:
+        """Return a version entry for *data* sharing existing chunks."""
+        manifest, shared = self._split(data, 0)
+        return {"name": name, "data": shared, "manifest": manifest}
+
+    def materialize(self, manifest: dict) -> Any:
+        """Rebuild the data described by *manifest* from stored chunks."""
+        if "#" in manifest:
+            return self.chunks[manifest["#"]]
+        if "{}" in manifest:
+            return {k: self.materialize(n) for k, n in manifest["{}"].items()}
+        if "[]" in manifest:
+            return [self.materialize(n) for n in manifest["[]"]]
+        return manifest["="]
+
+    # ------------------------------------------------------------------
+    # Comparison
+    # ------------------------------------------------------------------
+    def digest_of(self, value: Any) -> Optional[str]:
+        """Return the digest of *value* if it is a stored chunk."""
+        digest = self._digests.get(id(value))
+        if digest is not None and self.chunks.get(digest) is value:
+            return digest
+        return None
+
+    def same_content(self, a: Any, b: Any) -> bool:
+        """Return ``True`` when *a* and *b* serialise identically.
+
+        Shared objects and stored chunks are decided without serialising;
+        anything else falls back to comparing sorted JSON dumps.
+        """
+        if a is b:
+            return True
+        da = self.digest_of(a)
+        db = self.digest_of(b)
+        if da is not None and db is not None:
+            return da == db
+        return json.dumps(a, sort_keys=True) == json.dumps(b, sort_keys=True)
+
+    # ------------------------------------------------------------------
+    # Persistence
+    # ------------------------------------------------------------------
+    def export(self, versions: Iterable[dict]) -> Tuple[List[dict], Dict[str, Any]]:
+        """Return ``(entries, chunks)`` to save *versions* without duplicates."""
+        entries: List[dict] = []
+        used: Dict[str, Any] = {}
+        for version in versions:
+            manifest = version.get("manifest")
+            if manifest is None:
+                manifest = self.add(version["name"], version["data"])["manifest"]
+            entries.append({"name": version["name"], "manifest": manifest})
+            self._collect(manifest, used)
+        return entries, used
+
+    def _collect(self, manifest: dict, used: Dict[str, Any]) -> None:
+        if "#" in manifest:
+            used[manifest["#"]] = self.chunks[manifest["#"]]
+        elif "{}" in manifest:
+            for node in manifest["{}"].values():
+                self._collect(node, used)
+        elif "[]" in manifest:
+            for node in manifest["[]"]:
+                self._collect(node, used)
+
+    def load(self, entries: Iterable[dict], chunks: Dict[str, Any]) -> List[dict]:
+        """Return version entries from saved *entries* and *chunks*.
+
+        Entries written before chunked storage carry their full ``data``
+        and are chunked on load.
+        """
+        for digest, chunk in chunks.items():
+            chunk = self.chunks.setdefault(digest, chunk)
+            self._digests[id(chunk)] = digest
+        versions = []
+        for entry in entries:
+            if "manifest" in entry:
+                manifest = entry["manifest"]
+                versions.append(
+                    {
+                        "name": entry["name"],
+                        "data": self.materialize(manifest),
+                        "manifest": manifest,
+                    }
+                )
+            else:
+                versions.append(self.add(entry["name"], entry.get("data", {})))
+        return versions
+
+
+def version_store_for(app: Any) -> VersionStore:
+    """Return the :class:`VersionStore` of *app*, creating it when missing."""
+    store = getattr(app, "version_store", None)
+    if store is None:
+        store = app.version_store = VersionStore()
+    return store
@@ -23,6 +23,7 @@ from __future__ import annotations
 from typing import TYPE_CHECKING
 
 from gui.toolboxes.safety_management_toolbox import SafetyManagementToolbox
+from gui.utils.tree_reconciler import TreeModel, TreeReconciler
 from mainappsrc.models.sysml.sysml_repository import SysMLRepository
 from analysis.models import REQUIREMENT_WORK_PRODUCTS
 
@@ -35,18 +36,57 @@ class ViewUpdater:
 
     def __init__(self, app: AutoMLApp) -> None:
         self.app = app
+        self._reconciler = TreeReconciler()
+        self._cycle_open = False
+        self._pending = False
 
     def update_views(self) -> None:
-        """Refresh project views based on current model state."""
-
+        """Refresh project views based on current model state.
+
+        The first call refreshes immediately.  Further calls made before Tk
+        becomes idle again are folded into one refresh run from
+        ``after_idle``, so nested handlers that each request an update do
+        not rebuild the explorer several times per event.  Idle callbacks
+        only run from the Tk event loop, so code that reads the views
+        synchronously (explorer selection handlers, save and unsaved-change
+        checks) calls :meth:`flush` first.
+        """
+
+        if self._cycle_open:
+            self._pending = True
+            return
+        after_idle = getattr(getattr(self.app, "root", None), "after_idle", None)
+        if after_idle is not None:
+            self._cycle_open = True
+            after_idle(self._close_cycle)
+        self._refresh()
+
+    def flush(self) -> None:
+        """Run a refresh deferred by :meth:`update_views` right away."""
+
+        if self._pending:
+            self._pending = False
+            self._refresh()
+
+    def _close_cycle(self) -> None:
+        self._cycle_open = False
+        self.flush()
+
+    def _refresh(self) -> None:
         app = self.app
+        # A refresh is not an edit, but it follows most edits: let the undo
+        # manager check whether the last checkpoint's scope changed.
+        settle = getattr(app, "settle_model_changes", None)
+        if settle is not None:
+            settle()
         app.refresh_model()
         # Compute occurrence counts from the current tree
         app.occurrence_counts = app.compute_occurrence_counts()
 
         if hasattr(app, "analysis_tree"):
-            tree = app.analysis_tree
-            tree.delete(*tree.get_children())
+            # Describe the explorer in a keyed model first and reconcile the
+            # real tree against it so only changed items are touched.
+            tree = TreeModel()
 
             repo = SysMLRepository.get_instance()
             global_enabled = getattr(app, "enabled_work_products", set())
@@ -424,6 +464,8 @@ class ViewUpdater:
                         continue
                     tree.insert(fmeda_root, "end", text=name, tags=("fmeda", str(idx)))
 
+            self._reconciler.apply(app.analysis_tree, tree)
+
         if hasattr(app, "page_diagram") and app.page_diagram is not None:
             if app.page_diagram.canvas.winfo_exists():
                 app.page_diagram.redraw_canvas()
@@ -78,6 +78,7 @@ class FMEDAManager:
                 # Always propagate the formula so edits take effect
                 be.prob_formula = fm_node.prob_formula
                 be.failure_prob = self.app.compute_failure_prob(be)
+                self.app.invalidate_probability(be)
 
     def show_fmeda_list(self):
         """Display the FMEDA list management window."""
@@ -20,16 +20,11 @@ from __future__ import annotations
 
 """ODD library management helpers."""
 
-import csv
 import tkinter as tk
 from tkinter import filedialog, simpledialog, ttk
 
 from gui.controls import messagebox
-
-try:  # optional dependency
-    from openpyxl import load_workbook
-except Exception:  # pragma: no cover - openpyxl may not be installed
-    load_workbook = None
+from gui.utils.streaming_import import StreamingImport, is_workbook, iter_rows
 
 
 class OddLibraryManager:
@@ -85,26 +80,33 @@ class OddLibraryManager:
                     opts["image"] = app.odd_elem_icon
                 elem_tree.insert("", tk.END, **opts)
 
-        def import_elements_from_file(path: str) -> list[dict]:
+        def add_library(name: str, elems: list[dict]) -> None:
+            app.odd_libraries.append({"name": name, "elements": elems})
+            refresh_libs()
+            app.update_odd_elements()
+
+        def import_elements_from_file(name: str, path: str) -> None:
+            """Stream *path* into a new library on a worker thread."""
+            if not path.lower().endswith((".csv", ".xlsx")):
+                add_library(name, [])
+                return
             elems: list[dict] = []
-            if path.lower().endswith(".csv"):
-                with open(path, newline="") as f:
-                    elems = list(csv.DictReader(f))
-            elif path.lower().endswith(".xlsx"):
-                try:
-                    if load_workbook is None:
-                        raise ImportError
-                    wb = load_workbook(path, read_only=True)
-                    ws = wb.active
-                    headers = [c.value for c in next(ws.iter_rows(max_row=1))]
-                    for row in ws.iter_rows(min_row=2, values_only=True):
-                        elem = {headers[i]: row[i] for i in range(len(headers))}
-                        elems.append(elem)
-                except Exception:
-                    messagebox.showerror(
-                        "Import", "Failed to read Excel file. openpyxl required."
-                    )
-            return elems
+
+            def done(result) -> None:
+                if result.failure is not None:
+                    if is_workbook(path):
+                        messagebox.showerror(
+                            "Import", "Failed to read Excel file. openpyxl required."
+                        )
+                    else:
+                        messagebox.showerror(
+                            "Import", f"Failed to read {path}: {result.failure}"
+                        )
+                add_library(name, elems)
+
+            StreamingImport(lambda: iter_rows(path)).start(
+                win, on_batch=elems.extend, on_done=done
+            )
 
         class ElementDialog(simpledialog.Dialog):
             def __init__(self, parent, app, data=None):
@@ -231,16 +233,14 @@ class OddLibraryManager:
             name = simpledialog.askstring("New Library", "Library name:")
             if not name:
                 return
-            elems: list[dict] = []
             if messagebox.askyesno("Import", "Import elements from file?"):
                 path = filedialog.askopenfilename(
                     filetypes=[("CSV/Excel", "*.csv *.xlsx")]
                 )
                 if path:
-                    elems = import_elements_from_file(path)
-            app.odd_libraries.append({"name": name, "elements": elems})
-            refresh_libs()
-            app.update_odd_elements()
+                    import_elements_from_file(name, path)
+                    return
+            add_library(name, [])
 
         def edit_lib() -> None:
             sel = lib_lb.curselection()
@@ -24,6 +24,7 @@ from tkinter import filedialog, simpledialog
 import tkinter as tk
 import datetime
 from gui.dialogs.dialog_utils import askstring_fixed
+from gui.utils import text_layout
 from analysis.utils import (
     EXPOSURE_PROBABILITIES,
     CONTROLLABILITY_PROBABILITIES,
@@ -51,6 +52,8 @@ from mainappsrc.models.gsn import GSNModule, GSNDiagram
 from mainappsrc.models.fta.fault_tree_node import FaultTreeNode
 from mainappsrc.models.sysml.sysml_repository import SysMLRepository
 from mainappsrc.core import config_utils
+from mainappsrc.core.reporting_export import EVENT_SECTIONS, FMEA_SECTIONS
+from mainappsrc.core.version_store import VersionStore
 
 
 class ProjectManager:
@@ -129,6 +132,7 @@ class ProjectManager:
         SysMLRepository.reset_instance()
         app.zoom = 1.0
         app.diagram_font.config(size=int(8 * app.zoom))
+        text_layout.invalidate(app.diagram_font)
         app.top_events = []
         app.cta_events = []
         app.paa_events = []
@@ -231,6 +235,8 @@ class ProjectManager:
                 )
                 return
         import base64, gzip, hashlib, json, os
+        # Views may hold a refresh deferred to idle time; save what they show.
+        getattr(app, "flush_views", lambda: None)()
         for fmea in app.fmeas:
             app.export_fmea_to_csv(fmea, fmea["file"])
         for fmeda in app.fmedas:
@@ -347,6 +353,76 @@ class ProjectManager:
         app.set_last_saved_state()
         app._loaded_model_paths.append(path)
 
+    # ------------------------------------------------------------------
+    def apply_model_sections(self, sections: dict) -> None:
+        """Load the *sections* of :meth:`export_model_data` into the model.
+
+        Fault tree and FMEA sections are loaded on their own, leaving the
+        rest of the model untouched.  A ``None`` section is left out; any
+        other name is merged into a full export which is then applied.
+        """
+
+        app = self.app
+        direct = set(EVENT_SECTIONS + FMEA_SECTIONS)
+        if not set(sections) <= direct or None in sections.values():
+            data = app.export_model_data(include_versions=False)
+            for name, section in sections.items():
+                if section is None:
+                    data.pop(name, None)
+                else:
+                    data[name] = section
+            self.apply_model_data(data)
+            return
+
+        root_id = getattr(app.root_node, "unique_id", None)
+        for name in EVENT_SECTIONS:
+            if name in sections:
+                setattr(app, name, [FaultTreeNode.from_dict(e) for e in sections[name]])
+        if "top_events" in sections:
+            app.root_node = next(
+                (te for te in app.top_events if te.unique_id == root_id),
+                app.top_events[0] if app.top_events else None,
+            )
+        if "fmeas" in sections:
+            app.fmea_service.load_fmeas(sections)
+        if "fmedas" in sections:
+            self._load_fmedas(sections)
+        app.update_failure_list()
+        self._link_fmea_entries()
+        app.update_views()
+
+    def _load_fmedas(self, data: dict) -> None:
+        app = self.app
+        app.fmedas = []
+        for doc in data.get("fmedas", []):
+            entries = [FaultTreeNode.from_dict(e) for e in doc.get("entries", [])]
+            app.fmedas.append(
+                {
+                    "name": doc.get("name", "FMEDA"),
+                    "file": doc.get("file", f"fmeda_{len(app.fmedas)}.csv"),
+                    "entries": entries,
+                    "bom": doc.get("bom", ""),
+                    "created": doc.get("created", datetime.datetime.now().isoformat()),
+                    "author": doc.get("author", CURRENT_USER_NAME),
+                    "modified": doc.get("modified", datetime.datetime.now().isoformat()),
+                    "modified_by": doc.get("modified_by", CURRENT_USER_NAME),
+                }
+            )
+
+    def _link_fmea_entries(self) -> None:
+        """Point FMEA entries that copy a fault tree node at that node."""
+
+        app = self.app
+        node_map = {}
+        for te in app.top_events:
+            for n in app.get_all_nodes(te):
+                node_map[n.unique_id] = n
+        for entry in app.get_all_fmea_entries():
+            orig = node_map.get(entry.unique_id)
+            if orig and entry is not orig:
+                entry.is_primary_instance = False
+                entry.original = orig
+
     # ------------------------------------------------------------------
     def apply_model_data(self, data: dict, ensure_root: bool = True) -> None:
         """Load model state from a dictionary."""
@@ -376,6 +452,13 @@ class ProjectManager:
         app.gsn_modules = [GSNModule.from_dict(m) for m in data.get("gsn_modules", [])]
         app.gsn_diagrams = [GSNDiagram.from_dict(d) for d in data.get("gsn_diagrams", [])]
 
+        # Undo snapshots are exported without versions; keep the current ones.
+        if data.get("versions"):
+            app.version_store = VersionStore()
+            app.versions = app.version_store.load(
+                data["versions"], data.get("version_chunks", {})
+            )
+
         app.safety_mgmt_toolbox = SafetyManagementToolbox.from_dict(
             data.get("safety_mgmt_toolbox", {})
         )
@@ -400,33 +483,9 @@ class ProjectManager:
 
         app.fmea_service.load_fmeas(data)
 
-        app.fmedas = []
-        for doc in data.get("fmedas", []):
-            entries = [FaultTreeNode.from_dict(e) for e in doc.get("entries", [])]
-            app.fmedas.append(
-                {
-                    "name": doc.get("name", "FMEDA"),
-                    "file": doc.get("file", f"fmeda_{len(app.fmedas)}.csv"),
-                    "entries": entries,
-                    "bom": doc.get("bom", ""),
-                    "created": doc.get("created", datetime.datetime.now().isoformat()),
-                    "author": doc.get("author", CURRENT_USER_NAME),
-                    "modified": doc.get("modified", datetime.datetime.now().isoformat()),
-                    "modified_by": doc.get("modified_by", CURRENT_USER_NAME),
-                }
-            )
-
+        self._load_fmedas(data)
         app.update_failure_list()
-
-        node_map = {}
-        for te in app.top_events:
-            for n in app.get_all_nodes(te):
-                node_map[n.unique_id] = n
-        for entry in app.get_all_fmea_entries():
-            orig = node_map.get(entry.unique_id)
-            if orig and entry is not orig:
-                entry.is_primary_instance = False
-                entry.original = orig
+        self._link_fmea_entries()
 
         app.mechanism_libraries = []
         for lib in data.get("mechanism_libraries", []):
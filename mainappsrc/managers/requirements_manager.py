@@ -23,7 +23,7 @@ from __future__ import annotations
 
 import csv
 import json
-from typing import Dict, Any, Set
+from typing import Dict, Any
 from functools import partial
 
 import tkinter as tk
@@ -36,6 +36,7 @@ from config.automl_constants import PMHF_TARGETS
 from mainappsrc.models.fta.fault_tree_node import FaultTreeNode
 from analysis.models import ASIL_ORDER, global_requirements, ensure_requirement_defaults
 from gui.windows.architecture import link_requirements, unlink_requirements
+from analysis.traceability import TraceabilityIndex
 
 try:  # pragma: no cover - optional dependency
     from mainappsrc.models.sysml.sysml_repository import SysMLRepository
@@ -48,6 +49,7 @@ class RequirementsManagerSubApp:
 
     def __init__(self, app: Any) -> None:
         self.app = app
+        self._trace_index = TraceabilityIndex(app)
 
     # ------------------------------------------------------------------
     def export_state(self) -> Dict[str, Any]:
@@ -61,68 +63,18 @@ class RequirementsManagerSubApp:
         return {}
 
     # ------------------------------------------------------------------
-    def get_requirement_allocation_names(self, req_id: str) -> list[str]:
-        """Return names of model elements linked to ``req_id``."""
-        names: list[str] = []
+    def traceability(self) -> TraceabilityIndex:
+        """Return the requirement traceability index, rebuilt if stale."""
         repo = SysMLRepository.get_instance() if SysMLRepository else None
-        if repo:
-            for diag_id, obj_id in repo.find_requirements(req_id):
-                diag = repo.diagrams.get(diag_id)
-                obj = next((o for o in getattr(diag, "objects", []) if o.get("obj_id") == obj_id), None)
-                dname = diag.name if diag else ""
-                oname = obj.get("properties", {}).get("name", "") if obj else ""
-                if dname and oname:
-                    names.append(f"{dname}:{oname}")
-                elif dname or oname:
-                    names.append(dname or oname)
-            for diag in repo.diagrams.values():
-                for obj in getattr(diag, "objects", []):
-                    reqs = obj.get("requirements", [])
-                    if any(r.get("id") == req_id for r in reqs):
-                        name = obj.get("properties", {}).get("name") or obj.get("obj_type", "")
-                        names.append(name)
-        for n in self.app.get_all_nodes(self.app.root_node):
-            reqs = getattr(n, "safety_requirements", [])
-            if any((r.get("id") if isinstance(r, dict) else getattr(r, "id", None)) == req_id for r in reqs):
-                names.append(n.user_name or f"Node {n.unique_id}")
-        for fmea in self.app.fmeas:
-            for e in fmea.get("entries", []):
-                reqs = e.get("safety_requirements", []) if isinstance(e, dict) else getattr(e, "safety_requirements", [])
-                if any((r.get("id") if isinstance(r, dict) else getattr(r, "id", None)) == req_id for r in reqs):
-                    if isinstance(e, dict):
-                        name = e.get("description") or e.get("user_name", f"BE {e.get('unique_id','')}")
-                    else:
-                        name = getattr(e, "description", "") or getattr(e, "user_name", f"BE {getattr(e, 'unique_id', '')}")
-                    names.append(f"{fmea['name']}:{name}")
-        return names
+        return self._trace_index.ensure(repo)
 
-    # ------------------------------------------------------------------
-    def _collect_goal_names(self, node: Any, acc: Set[str]) -> None:
-        if node.node_type.upper() == "TOP EVENT":
-            acc.add(node.safety_goal_description or (node.user_name or f"SG {node.unique_id}"))
-        for p in getattr(node, "parents", []):
-            self._collect_goal_names(p, acc)
+    def get_requirement_allocation_names(self, req_id: str) -> list[str]:
+        """Return names of model elements linked to ``req_id``."""
+        return self.traceability().allocation_names(req_id)
 
     def get_requirement_goal_names(self, req_id: str) -> list[str]:
         """Return a list of safety goal names linked to ``req_id``."""
-        goals: Set[str] = set()
-        for n in self.app.get_all_nodes(self.app.root_node):
-            reqs = getattr(n, "safety_requirements", [])
-            if any((r.get("id") if isinstance(r, dict) else getattr(r, "id", None)) == req_id for r in reqs):
-                self._collect_goal_names(n, goals)
-        for fmea in self.app.fmeas:
-            for e in fmea.get("entries", []):
-                reqs = e.get("safety_requirements", []) if isinstance(e, dict) else getattr(e, "safety_requirements", [])
-                if any((r.get("id") if isinstance(r, dict) else getattr(r, "id", None)) == req_id for r in reqs):
-                    parent_list = e.get("parents") if isinstance(e, dict) else getattr(e, "parents", None)
-                    parent = parent_list[0] if parent_list else None
-                    if isinstance(parent, dict) and "unique_id" in parent:
-                        node = self.app.find_node_by_id_all(parent["unique_id"])
-                    else:
-                        node = parent if hasattr(parent, "unique_id") else None
-                    if node:
-                        self._collect_goal_names(node, goals)
-        return sorted(goals)
+        return self.traceability().goal_names(req_id)
 
     # ------------------------------------------------------------------
     def compute_requirement_asil(self, req_id: str) -> str:
@@ -147,6 +99,7 @@ class RequirementsManagerSubApp:
             "approved",
         ]
         rank = {s: i for i, s in enumerate(status_order)}
+        trace = self.traceability()
 
         for rid, req in global_requirements.items():
             if req.get("status") == "obsolete":
@@ -155,10 +108,7 @@ class RequirementsManagerSubApp:
             current = req.get("status", "draft")
             current_rank = rank.get(current, 0)
 
-            for review in getattr(self.app, "reviews", []):
-                req_ids = self.app.review_manager.get_requirements_for_review(review)
-                if rid not in req_ids:
-                    continue
+            for review in trace.reviews(rid):
                 if review.mode == "joint":
                     candidate = (
                         "approved"
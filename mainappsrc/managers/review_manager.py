@@ -43,6 +43,7 @@ from gui.toolboxes.review_toolbox import (
 from gui.dialogs.dialog_utils import askstring_fixed
 from gui.styles.style_manager import StyleManager
 from analysis.fmeda_utils import GATE_NODE_TYPES
+from mainappsrc.core.version_store import version_store_for
 
 
 class ReviewManager:
@@ -641,7 +642,7 @@ class ReviewManager:
         if baseline:
             name += f" - {baseline}"
         data = self.app.export_model_data(include_versions=False)
-        self.app.versions.append({"name": name, "data": data})
+        self.app.versions.append(version_store_for(self.app).add(name, data))
 
     def compare_versions(self):
         if not self.app.versions:
@@ -702,18 +703,22 @@ class ReviewManager:
     def calculate_diff_nodes(self, old_data):
         old_map = self.node_map_from_data(old_data["top_events"])
         new_map = self.node_map_from_data([e.to_dict() for e in self.app.top_events])
+        same = version_store_for(self.app).same_content
         changed = []
         for nid, nd in new_map.items():
-            if nid not in old_map or json.dumps(old_map.get(nid, {}), sort_keys=True) != json.dumps(nd, sort_keys=True):
+            if nid not in old_map or not same(old_map[nid], nd):
                 changed.append(nid)
         return changed
 
     def calculate_diff_between(self, data1, data2):
         map1 = self.node_map_from_data(data1["top_events"])
         map2 = self.node_map_from_data(data2["top_events"])
+        # Baselines share unchanged chunks, so most nodes compare by
+        # identity or chunk digest before any JSON is produced.
+        same = version_store_for(self.app).same_content
         changed = []
         for nid, nd in map2.items():
-            if nid not in map1 or json.dumps(map1.get(nid, {}), sort_keys=True) != json.dumps(nd, sort_keys=True):
+            if nid not in map1 or not same(map1[nid], nd):
                 changed.append(nid)
         return changed
 
@@ -779,7 +784,7 @@ class ReviewManager:
             elif nid in map2 and nid not in map1:
                 status[nid] = "added"
             else:
-                if json.dumps(map1[nid], sort_keys=True) != json.dumps(map2[nid], sort_keys=True):
+                if not version_store_for(self.app).same_content(map1[nid], map2[nid]):
                     status[nid] = "added"
                 else:
                     status[nid] = "existing"
@@ -17,6 +17,7 @@
 # along with this program.  If not, see <https://www.gnu.org/licenses/>.
 
 import datetime
+import sys
 from analysis.utils import (
     derive_validation_target,
     exposure_to_probability,
@@ -24,14 +25,55 @@ from analysis.utils import (
     severity_to_probability,
 )
 from analysis.risk_assessment import boolify
+from analysis.traceability import note_trace_change, trace_list
 from analysis.user_config import CURRENT_USER_NAME
 from gui.controls import messagebox
+from mainappsrc.models.fta.node_registry import NODE_REGISTRY
+
+
+def _automl():
+    """Return the :mod:`AutoML` module, importing it on first use.
+
+    The module is looked up on each call instead of being cached because
+    project resets and tests replace its ``AutoML_Helper``.
+    """
+    mod = sys.modules.get("AutoML")
+    if mod is None:
+        import AutoML as mod
+    return mod
 
 
 class FaultTreeNode:
+    # Fault trees hold many thousands of nodes, so attributes live in slots
+    # rather than a per-instance dict.  ``__dict__`` stays available for the
+    # occasional extra attribute set by analyses and dialogs.
+    __slots__ = (
+        "_unique_id", "_original", "_original_id", "user_name", "node_type",
+        "_children", "_parents", "quant_value", "gate_type", "description",
+        "rationale", "x", "y", "severity", "controllability", "exposure",
+        "input_subtype", "display_label", "equation", "detailed_equation",
+        "is_page", "is_primary_instance", "created", "author", "modified",
+        "modified_by", "safety_goal_description", "safety_goal_asil",
+        "safe_state", "ftti", "validation_target", "validation_desc",
+        "mission_profile", "acceptance_criteria", "acceptance_rate",
+        "operational_hours_on", "exposure_given_hb",
+        "uncontrollable_given_exposure", "severity_given_uncontrollable",
+        "status", "approved", "sg_dc_target", "sg_spfm_target",
+        "sg_lpfm_target", "vehicle_safety_requirements",
+        "operational_safety_requirements", "_safety_requirements",
+        "fmea_effect", "fmea_cause", "fmea_severity", "fmea_occurrence",
+        "fmea_detection", "fmea_component", "fmeda_malfunction",
+        "fmeda_safety_goal", "fmeda_diag_cov", "fmeda_fit", "fmeda_spfm",
+        "fmeda_lpfm", "fmeda_fault_type", "fmeda_fault_fraction",
+        "fmeda_dc_target", "fmeda_spfm_target", "fmeda_lpfm_target",
+        "failure_mode_ref", "fault_ref", "malfunction", "name_readonly",
+        "product_goal", "failure_prob", "probability", "prob_formula",
+        "__dict__", "__weakref__",
+    )
+
     def __init__(self, user_name, node_type, parent=None):
-        from AutoML import AutoML_Helper
-        self.unique_id = AutoML_Helper.get_next_unique_id()
+        automl = _automl()
+        self.unique_id = automl.AutoML_Helper.get_next_unique_id()
         # Assign a sequential default name if none is provided
         self.user_name = user_name if user_name else f"Node {self.unique_id}"
         self.node_type = node_type
@@ -40,18 +82,17 @@ class FaultTreeNode:
         if parent is not None:
             self.parents.append(parent)
         self.quant_value = None
-        # Import here to avoid circular dependency during module import
-        from AutoML import GATE_NODE_TYPES
-        self.gate_type = "AND" if node_type.upper() in GATE_NODE_TYPES else None
+        kind = node_type.upper()
+        self.gate_type = "AND" if kind in automl.GATE_NODE_TYPES else None
         self.description = ""
         self.rationale = ""
         self.x = 50
         self.y = 50
         # Severity and controllability now use a 1-3 scale
         # Default to the lowest level until linked to a risk assessment entry
-        self.severity = 1 if node_type.upper() == "TOP EVENT" else None
-        self.controllability = 1 if node_type.upper() == "TOP EVENT" else None
-        self.exposure = 1 if node_type.upper() == "TOP EVENT" else None
+        self.severity = 1 if kind == "TOP EVENT" else None
+        self.controllability = 1 if kind == "TOP EVENT" else None
+        self.exposure = 1 if kind == "TOP EVENT" else None
         self.input_subtype = None
         self.display_label = ""
         self.equation = ""
@@ -135,6 +176,57 @@ class FaultTreeNode:
         )
         return self.validation_target
 
+    @property
+    def unique_id(self):
+        return self._unique_id
+
+    @unique_id.setter
+    def unique_id(self, value):
+        NODE_REGISTRY.rekey(self, getattr(self, "_unique_id", None), value)
+        self._unique_id = value
+
+    @property
+    def original(self):
+        return self._original
+
+    @original.setter
+    def original(self, value):
+        NODE_REGISTRY.relink(self, getattr(self, "_original", None), value)
+        self._original = value
+
+    # Links to other nodes and requirements are held in trace lists so any
+    # change invalidates the traceability index.
+    def _set_traced(self, slot: str, value) -> None:
+        old = getattr(self, slot, None)
+        value = trace_list(value)
+        object.__setattr__(self, slot, value)
+        if old or value:
+            note_trace_change()
+
+    @property
+    def children(self):
+        return self._children
+
+    @children.setter
+    def children(self, value):
+        self._set_traced("_children", value)
+
+    @property
+    def parents(self):
+        return self._parents
+
+    @parents.setter
+    def parents(self, value):
+        self._set_traced("_parents", value)
+
+    @property
+    def safety_requirements(self):
+        return self._safety_requirements
+
+    @safety_requirements.setter
+    def safety_requirements(self, value):
+        self._set_traced("_safety_requirements", value)
+
     @property
     def name(self):
         orig = getattr(self, "original", self)
@@ -229,9 +321,10 @@ class FaultTreeNode:
         node.rationale = data.get("rationale", "")
         node.x = data.get("x", 50)
         node.y = data.get("y", 50)
-        node.severity = data.get("severity", 1) if node.node_type.upper() == "TOP EVENT" else None
-        node.controllability = data.get("controllability", 1) if node.node_type.upper() == "TOP EVENT" else None
-        node.exposure = data.get("exposure", 1) if node.node_type.upper() == "TOP EVENT" else None
+        is_top = node.node_type.upper() == "TOP EVENT"
+        node.severity = data.get("severity", 1) if is_top else None
+        node.controllability = data.get("controllability", 1) if is_top else None
+        node.exposure = data.get("exposure", 1) if is_top else None
         node.input_subtype = data.get("input_subtype", None)
         node.is_page = boolify(data.get("is_page", False), False)
         node.is_primary_instance = boolify(data.get("is_primary_instance", True), True)
@@ -288,8 +381,7 @@ class FaultTreeNode:
         if "unique_id" in data:
             node.unique_id = data["unique_id"]
         else:
-            from AutoML import AutoML_Helper
-            node.unique_id = AutoML_Helper.get_next_unique_id()
+            node.unique_id = _automl().AutoML_Helper.get_next_unique_id()
         if not node.is_primary_instance and "original_id" in data:
             node._original_id = data["original_id"]
         else:
@@ -329,10 +421,9 @@ class FaultTreeNode:
     def clone(self, parent=None):
         """Return a copy of this node referencing the same original."""
         import copy
-        from AutoML import AutoML_Helper
 
         clone = copy.deepcopy(self)
-        clone.unique_id = AutoML_Helper.get_next_unique_id()
+        clone.unique_id = _automl().AutoML_Helper.get_next_unique_id()
         clone.children = []
         clone.parents = []
         clone.is_primary_instance = False
@@ -347,8 +438,9 @@ class FaultTreeNode:
         """Add a basic event selected from FMEA/FMEDA entries."""
         from gui.controls import messagebox
         from gui.dialogs.select_base_event_dialog import SelectBaseEventDialog
+        from mainappsrc.core.reporting_export import EVENT_SECTIONS
 
-        core.push_undo_state()
+        core.push_undo_state(touched=EVENT_SECTIONS)
         events = list(core.fmea_entries)
         for doc in core.fmeas:
             events.extend(doc.get("entries", []))
@@ -547,8 +639,9 @@ def _infer_diagram_mode(app, event_upper: str) -> str:
 
 def add_node_of_type(app, event_type):
     """Attach a new ``FaultTreeNode`` of ``event_type`` under the current selection."""
+    from mainappsrc.core.reporting_export import EVENT_SECTIONS
 
-    app.push_undo_state()
+    app.push_undo_state(touched=EVENT_SECTIONS)
     event_upper = event_type.upper()
     diag_mode = _infer_diagram_mode(app, event_upper)
 
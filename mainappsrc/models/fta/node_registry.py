@@ -0,0 +1,238 @@
+# Author: Miguel Marina <karel.capek.robotics@gmail.com>
+# SPDX-License-Identifier: GPL-3.0-or-later
+#
+# Copyright (C) 2025 Capek System Safety & Robotic Solutions
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+"""Registry of fault tree nodes keyed by ``unique_id`` and clone group.
+
+:class:`~mainappsrc.models.fta.fault_tree_node.FaultTreeNode` registers
+itself whenever its ``unique_id`` or ``original`` is assigned, which covers
+construction, :meth:`clone`, :meth:`from_dict` loading and later id or
+original reassignment.  Deleting a subtree through the structure operations
+calls :meth:`NodeRegistry.discard_subtree`.
+
+Entries are weak so nodes of a discarded model vanish once collected.  Until
+then several objects can share a ``unique_id`` (an old model after loading a
+new one, or FMEA entries copied from a tree), so :meth:`NodeRegistry.nodes`
+returns every candidate and callers decide which of them are live.
+
+The fault tree model is importable both as ``mainappsrc.models.fta`` and as
+``models.fta``; every user imports this module by its ``mainappsrc`` path so
+both copies of the node class share the single :data:`NODE_REGISTRY`.
+"""
+
+from __future__ import annotations
+
+import weakref
+from typing import Any, Iterable, List, Optional
+
+
+def _live(entry: Any) -> List[Any]:
+    """Return the live nodes referenced by an ``_by_id`` entry."""
+    refs = entry if isinstance(entry, list) else (entry,)
+    result = []
+    for ref in refs:
+        node = ref()
+        if node is not None:
+            result.append(node)
+    return result
+
+
+class NodeRegistry:
+    """Weak index of nodes by ``unique_id`` and of clones by original.
+
+    Nearly every ID names a single node, so an ID maps to one
+    :class:`weakref.ref` and only collisions are stored as a list of
+    references.  Entries of collected nodes are swept out once the index has
+    grown by as many inserts as it holds, which keeps the cleanup amortised
+    O(1) without a per-node weakref callback.
+    """
+
+    def __init__(self) -> None:
+        self._by_id: dict[Any, Any] = {}
+        self._clones: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+        self._inserts = 0
+        self._sweep_at = 4096
+        # Bumped whenever a node is registered, re-keyed or discarded so
+        # caches derived from the fault tree structure know to relink.
+        self.revision = 0
+
+    def _store(self, unique_id: Any, nodes: List[Any]) -> None:
+        if not nodes:
+            self._by_id.pop(unique_id, None)
+        elif len(nodes) == 1:
+            self._by_id[unique_id] = weakref.ref(nodes[0])
+        else:
+            self._by_id[unique_id] = [weakref.ref(n) for n in nodes]
+
+    def _sweep(self) -> None:
+        for uid, entry in list(self._by_id.items()):
+            nodes = _live(entry)
+            if len(nodes) != (len(entry) if isinstance(entry, list) else 1):
+                self._store(uid, nodes)
+        self._inserts = 0
+        self._sweep_at = max(4096, len(self._by_id))
+
+    # ------------------------------------------------------------------
+    # Maintenance hooks called by FaultTreeNode
+    # ------------------------------------------------------------------
+    def rekey(self, node: Any, old_id: Any, new_id: Any) -> None:
+        """Move *node* from ``old_id`` to ``new_id``."""
+        self.revision += 1
+        if old_id is not None and old_id != new_id:
+            entry = self._by_id.get(old_id)
+            if entry is not None:
+                self._store(old_id, [n for n in _live(entry) if n is not node])
+        if new_id is not None:
+            entry = self._by_id.get(new_id)
+            if entry is None:
+                self._by_id[new_id] = weakref.ref(node)
+            else:
+                nodes = [n for n in _live(entry) if n is not node]
+                nodes.append(node)
+                self._store(new_id, nodes)
+            self._inserts += 1
+            if self._inserts > self._sweep_at:
+                self._sweep()
+
+    def relink(self, node: Any, old_original: Any, new_original: Any) -> None:
+        """Move *node* from the clone group of ``old_original`` to ``new_original``."""
+        if old_original is not None and old_original is not node:
+            group = self._clones.get(old_original)
+            if group is not None:
+                group.discard(node)
+        if new_original is not None and new_original is not node:
+            group = self._clones.get(new_original)
+            if group is None:
+                group = self._clones[new_original] = weakref.WeakSet()
+            group.add(node)
+
+    def discard(self, node: Any) -> None:
+        """Forget *node* and its membership in any clone group."""
+        uid = getattr(node, "_unique_id", None)
+        self.rekey(node, uid, None)
+        self.relink(node, getattr(node, "_original", None), None)
+        self._clones.pop(node, None)
+
+    def discard_subtree(self, root: Any) -> None:
+        """Forget *root* and descendants that are not reachable elsewhere.
+
+        A descendant is kept when it still has a parent outside the removed
+        subtree, which happens for nodes shared by several gates.
+        """
+        removed = {id(root)}
+        stack = [root]
+        order: List[Any] = []
+        while stack:
+            node = stack.pop()
+            order.append(node)
+            for child in getattr(node, "children", []):
+                if id(child) in removed:
+                    continue
+                if all(id(p) in removed for p in getattr(child, "parents", [])):
+                    removed.add(id(child))
+                    stack.append(child)
+        for node in order:
+            self.discard(node)
+
+    def clear(self) -> None:
+        """Drop every entry."""
+        self._by_id.clear()
+        self._clones = weakref.WeakKeyDictionary()
+        self._inserts = 0
+
+    # ------------------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------------------
+    def nodes(self, unique_id: Any) -> List[Any]:
+        """Return every registered node whose ``unique_id`` is *unique_id*."""
+        entry = self._by_id.get(unique_id)
+        return _live(entry) if entry is not None else []
+
+    def contains(self, node: Any) -> bool:
+        """Return ``True`` when *node* is registered under its ``unique_id``."""
+        return any(n is node for n in self.nodes(getattr(node, "unique_id", None)))
+
+    def get(self, unique_id: Any) -> Optional[Any]:
+        """Return one node registered under *unique_id* or ``None``."""
+        for node in self.nodes(unique_id):
+            return node
+        return None
+
+    def clones_of(self, original: Any) -> List[Any]:
+        """Return the clones whose ``original`` is *original*."""
+        group = self._clones.get(original)
+        if not group:
+            return []
+        return [c for c in group if not c.is_primary_instance]
+
+    def instances_of(self, primary_id: Any) -> List[Any]:
+        """Return primaries sharing *primary_id* followed by all their clones."""
+        result: List[Any] = []
+        seen: set[int] = set()
+        primaries = [n for n in self.nodes(primary_id) if n.is_primary_instance]
+        for node in primaries:
+            if id(node) not in seen:
+                seen.add(id(node))
+                result.append(node)
+        for node in primaries:
+            for clone in self.clones_of(node):
+                if id(clone) not in seen:
+                    seen.add(id(clone))
+                    result.append(clone)
+        return result
+
+    def __len__(self) -> int:
+        return sum(len(_live(e)) for e in self._by_id.values())
+
+    # ------------------------------------------------------------------
+    # Consistency checks
+    # ------------------------------------------------------------------
+    def check_invariants(self, nodes: Iterable[Any] = ()) -> List[str]:
+        """Return descriptions of inconsistencies, empty when the index is sound.
+
+        Every registered node must be filed under its current ``unique_id``
+        and every clone group member must still point at the group's
+        original.  Each node in *nodes* must additionally be registered, and
+        so must each clone in *nodes* within its original's group.
+        """
+        problems: List[str] = []
+        for uid, entry in self._by_id.items():
+            for node in _live(entry):
+                if node.unique_id != uid:
+                    problems.append(
+                        f"node {node.unique_id} filed under id {uid}"
+                    )
+        for original, group in self._clones.items():
+            for clone in group:
+                if getattr(clone, "original", None) is not original:
+                    problems.append(
+                        f"clone {clone.unique_id} filed under original {original.unique_id}"
+                    )
+        for node in nodes:
+            if not self.contains(node):
+                problems.append(f"node {node.unique_id} is not registered")
+            original = getattr(node, "original", node)
+            if not node.is_primary_instance and original is not node:
+                group = self._clones.get(original)
+                if group is None or node not in group:
+                    problems.append(
+                        f"clone {node.unique_id} missing from group of {original.unique_id}"
+                    )
+        return problems
+
+
+NODE_REGISTRY = NodeRegistry()
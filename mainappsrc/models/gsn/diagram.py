@@ -29,6 +29,7 @@ import tkinter.font as tkFont
 
 from .nodes import GSNNode
 from gui.drawing_helper import GSNDrawingHelper
+from gui.utils import text_layout
 
 
 @dataclass
@@ -285,6 +286,14 @@ class GSNDiagram:
                 continue
         return ""
 
+    # ------------------------------------------------------------------
+    def _font(self, size: int):
+        """Return the label font, created by the drawing helper if it can."""
+        make_font = getattr(self.drawing_helper, "make_font", None)
+        if make_font is not None:
+            return make_font(size)
+        return tkFont.Font(family="Arial", size=size)
+
     # ------------------------------------------------------------------
     def _draw_node(self, canvas, node: GSNNode, zoom: float) -> None:  # pragma: no cover - requires tkinter
         x, y = node.x * zoom, node.y * zoom
@@ -292,7 +301,7 @@ class GSNDiagram:
         text = self._format_text(node)
 
         try:
-            font_obj = tkFont.Font(family="Arial", size=max(int(10 * zoom), 1))
+            font_obj = self._font(max(int(10 * zoom), 1))
             width, height = self.drawing_helper.get_text_size(text, font_obj)
         except Exception:  # pragma: no cover - headless fallback
             font_obj = None
@@ -323,7 +332,7 @@ class GSNDiagram:
             base_scale = 40 * zoom
 
             try:
-                font_obj = tkFont.Font(family="Arial", size=max(int(10 * zoom), 1))
+                font_obj = self._font(max(int(10 * zoom), 1))
                 t_width, t_height = self.drawing_helper.get_text_size(text, font_obj)
             except Exception:  # pragma: no cover - headless fallback
                 font_obj = None
@@ -450,21 +459,7 @@ class GSNDiagram:
         The wrapping honours existing newline characters and attempts to
         break lines at whitespace.  A very small and self-contained helper is
         used instead of :mod:`textwrap` so that we can operate on pixel
-        measurements provided by ``font_obj``.
+        measurements provided by ``font_obj``.  Results are cached by
+        :mod:`gui.utils.text_layout`.
         """
-        lines = []
-        for line in text.split("\n"):
-            if not line:
-                lines.append("")
-                continue
-            current = ""
-            for word in line.split():
-                candidate = f"{current} {word}".strip()
-                if current and font_obj.measure(candidate) > max_width:
-                    lines.append(current)
-                    current = word
-                else:
-                    current = candidate
-            if current:
-                lines.append(current)
-        return "\n".join(lines)
+        return "\n".join(text_layout.wrap_words(font_obj, text, max_width))
@@ -0,0 +1,238 @@
+# Author: Miguel Marina <karel.capek.robotics@gmail.com>
+# SPDX-License-Identifier: GPL-3.0-or-later
+#
+# Copyright (C) 2025 Capek System Safety & Robotic Solutions
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+"""Indexed list of repository relationships.
+
+:class:`RelationshipStore` is a ``list`` subclass so existing callers can keep
+appending, removing, slicing and serialising ``SysMLRepository.relationships``
+as before.  Every mutation also maintains dictionaries keyed by ``rel_id``,
+source, target and relationship type, turning the common lookups from full
+scans into dictionary accesses.  Relationships notify the store they belong
+to when one of the indexed attributes is reassigned (see
+``SysMLRelationship.__setattr__``); the owning store is looked up in a
+module-level table so the relationships themselves carry no back-link.
+"""
+
+from __future__ import annotations
+
+import weakref
+from typing import Any, Dict, Iterable, List, Optional
+
+# Attributes of ``SysMLRelationship`` mirrored in the indexes.
+INDEXED_FIELDS = ("rel_id", "source", "target", "rel_type")
+
+# ``id(rel) -> weakref(store)`` for relationships held by a store.
+_OWNERS: Dict[int, "weakref.ref[RelationshipStore]"] = {}
+
+
+def _forget_owners(keys: Iterable[int]) -> None:
+    """Drop table entries left behind by a collected store."""
+    for key in list(keys):
+        ref = _OWNERS.get(key)
+        if ref is not None and ref() is None:
+            del _OWNERS[key]
+
+
+def store_of(rel: Any) -> Optional["RelationshipStore"]:
+    """Return the store *rel* is a member of, or ``None``."""
+    ref = _OWNERS.get(id(rel))
+    store = ref() if ref is not None else None
+    if store is not None and id(rel) in store._counts:
+        return store
+    return None
+
+
+class RelationshipStore(list):
+    """``list`` of relationships indexed by id, source, target and type.
+
+    Relationships are indexed when they enter the list and unindexed when
+    their last occurrence leaves it, so temporarily duplicated entries (as
+    produced by swapping two items) keep their index entries.
+    """
+
+    def __init__(self, items: Iterable[Any] = ()) -> None:
+        super().__init__(items)
+        # Buckets map ``id(rel)`` to the relationship to keep insertion order
+        # and allow O(1) removal.
+        self._buckets: Dict[str, Dict[Any, Dict[int, Any]]] = {
+            name: {} for name in INDEXED_FIELDS
+        }
+        self._counts: Dict[int, int] = {}
+        weakref.finalize(self, _forget_owners, self._counts)
+        for rel in list.__iter__(self):
+            self._add(rel)
+
+    # ------------------------------------------------------------------
+    # Index maintenance
+    # ------------------------------------------------------------------
+    def _add(self, rel: Any) -> None:
+        count = self._counts.get(id(rel), 0)
+        self._counts[id(rel)] = count + 1
+        if not count:
+            _OWNERS[id(rel)] = weakref.ref(self)
+            self._index(rel)
+
+    def _drop(self, rel: Any) -> None:
+        count = self._counts.get(id(rel), 0) - 1
+        if count > 0:
+            self._counts[id(rel)] = count
+            return
+        self._counts.pop(id(rel), None)
+        ref = _OWNERS.get(id(rel))
+        if ref is not None and ref() is self:
+            del _OWNERS[id(rel)]
+        self._unindex(rel)
+
+    def _index(self, rel: Any) -> None:
+        for name, buckets in self._buckets.items():
+            buckets.setdefault(getattr(rel, name, None), {})[id(rel)] = rel
+
+    def _unindex(self, rel: Any) -> None:
+        for name, buckets in self._buckets.items():
+            key = getattr(rel, name, None)
+            bucket = buckets.get(key)
+            if bucket is not None:
+                bucket.pop(id(rel), None)
+                if not bucket:
+                    del buckets[key]
+
+    def _contains(self, rel: Any) -> bool:
+        return id(rel) in self._counts
+    def _attribute_changed(self, rel: Any, name: str, old: Any, new: Any) -> None:
+        """Move *rel* between index buckets after ``rel.name`` changed."""
+        buckets = self._buckets[name]
+        bucket = buckets.get(old)
+        if bucket is None or bucket.pop(id(rel), None) is None:
+            return
+        if not bucket:
+            del buckets[old]
+        buckets.setdefault(new, {})[id(rel)] = rel
+
+    # ------------------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------------------
+    def get(self, rel_id: str) -> Optional[Any]:
+        """Return the relationship with ``rel_id`` or ``None``."""
+        bucket = self._buckets["rel_id"].get(rel_id)
+        return next(iter(bucket.values())) if bucket else None
+
+    def _select(self, name: str, value: Any, rel_type: Optional[str]) -> List[Any]:
+        rels = self._buckets[name].get(value, {}).values()
+        if rel_type is None:
+            return list(rels)
+        return [r for r in rels if r.rel_type == rel_type]
+
+    def by_source(self, source: str, rel_type: Optional[str] = None) -> List[Any]:
+        """Return relationships originating at ``source``."""
+        return self._select("source", source, rel_type)
+
+    def by_target(self, target: str, rel_type: Optional[str] = None) -> List[Any]:
+        """Return relationships ending at ``target``."""
+        return self._select("target", target, rel_type)
+
+    def by_type(self, rel_type: str) -> List[Any]:
+        """Return relationships of ``rel_type``."""
+        return self._select("rel_type", rel_type, None)
+
+    def involving(self, elem_id: str) -> List[Any]:
+        """Return relationships with ``elem_id`` as source or target."""
+        rels = dict(self._buckets["source"].get(elem_id, {}))
+        rels.update(self._buckets["target"].get(elem_id, {}))
+        return list(rels.values())
+
+    # ------------------------------------------------------------------
+    # Mutators
+    # ------------------------------------------------------------------
+    def append(self, rel: Any) -> None:
+        super().append(rel)
+        self._add(rel)
+
+    def extend(self, rels: Iterable[Any]) -> None:
+        for rel in rels:
+            self.append(rel)
+
+    def __iadd__(self, rels: Iterable[Any]) -> "RelationshipStore":
+        self.extend(rels)
+        return self
+
+    def insert(self, index: int, rel: Any) -> None:
+        super().insert(index, rel)
+        self._add(rel)
+
+    def remove(self, rel: Any) -> None:
+        # ``list.remove`` matches by equality; prefer the identical object.
+        for idx, other in enumerate(list.__iter__(self)):
+            if other is rel:
+                del self[idx]
+                return
+        del self[self.index(rel)]
+
+    def remove_all(self, rels: Iterable[Any]) -> None:
+        """Remove every occurrence of the relationships in *rels* in one pass."""
+        doomed = {id(r) for r in rels if self._contains(r)}
+        if not doomed:
+            return
+        kept = [r for r in list.__iter__(self) if id(r) not in doomed]
+        removed = [r for r in list.__iter__(self) if id(r) in doomed]
+        super().__setitem__(slice(None), kept)
+        for rel in removed:
+            self._drop(rel)
+
+    def pop(self, index: int = -1) -> Any:
+        rel = super().pop(index)
+        self._drop(rel)
+        return rel
+
+    def clear(self) -> None:
+        rels = list(list.__iter__(self))
+        super().clear()
+        for rel in rels:
+            self._drop(rel)
+
+    def __setitem__(self, key, value) -> None:
+        old = self[key] if isinstance(key, slice) else [self[key]]
+        new = list(value) if isinstance(key, slice) else [value]
+        super().__setitem__(key, new if isinstance(key, slice) else value)
+        for rel in new:
+            self._add(rel)
+        for rel in old:
+            self._drop(rel)
+
+    def __delitem__(self, key) -> None:
+        old = self[key] if isinstance(key, slice) else [self[key]]
+        super().__delitem__(key)
+        for rel in old:
+            self._drop(rel)
+
+    def __imul__(self, count: int) -> "RelationshipStore":
+        rels = list(list.__iter__(self))
+        super().__imul__(count)
+        for _ in range(max(count, 0) - 1):
+            for rel in rels:
+                self._add(rel)
+        if count <= 0:
+            for rel in rels:
+                self._drop(rel)
+        return self
+
+
+def notify_attribute_change(rel: Any, name: str, old: Any, new: Any) -> None:
+    """Update the store owning *rel* after an indexed attribute changed."""
+    store = store_of(rel)
+    if store is not None:
+        store._attribute_changed(rel, name, old, new)
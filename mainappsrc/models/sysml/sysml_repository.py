@@ -24,6 +24,13 @@ from typing import Any, Dict, List, Optional, Tuple
 import os
 import datetime
 import analysis.user_config as user_config
+from mainappsrc.models.sysml.relationship_store import (
+    INDEXED_FIELDS,
+    RelationshipStore,
+    notify_attribute_change,
+    store_of,
+)
+from mainappsrc.core.undo_journal import ABSENT, Checkpoint, UndoJournal, thaw
 
 GLOBAL_PHASE = "GLOBAL"
 
@@ -74,6 +81,15 @@ class SysMLRelationship:
     modified_by_email: str = field(default_factory=lambda: user_config.CURRENT_USER_EMAIL)
     phase: Optional[str] = None
 
+    def __setattr__(self, name: str, value: Any) -> None:
+        if name in INDEXED_FIELDS and store_of(self) is not None:
+            old = self.__dict__.get(name)
+            object.__setattr__(self, name, value)
+            if old != value:
+                notify_attribute_change(self, name, old, value)
+            return
+        object.__setattr__(self, name, value)
+
 @dataclass
 class SysMLDiagram:
     diag_id: str
@@ -117,13 +133,12 @@ class SysMLRepository:
 
     def __init__(self):
         self.elements: Dict[str, SysMLElement] = {}
-        self.relationships: List[SysMLRelationship] = []
+        self._relationships = RelationshipStore()
         self.diagrams: Dict[str, SysMLDiagram] = {}
         # map element_id -> diagram_id for implementation links
         self.element_diagrams: Dict[str, str] = {}
-        # maintain undo and redo history of repository snapshots
-        self._undo_stack: list[dict] = []
-        self._redo_stack: list[dict] = []
+        # undo and redo history of structurally shared repository snapshots
+        self._journal = UndoJournal(limit=50)
         self.active_phase: Optional[str] = None
         # Phases reused by the currently active lifecycle phase. Elements or
         # diagrams belonging to any of these phases should remain visible even
@@ -134,8 +149,22 @@ class SysMLRepository:
         self.reuse_products: set[str] = set()
         # Diagrams made immutable after phase freeze
         self.frozen_diagrams: set[str] = set()
+        # Bumped whenever diagrams are added, removed, replaced or touched so
+        # caches keyed on diagram contents can tell when to rebuild.
+        self.diagram_revision = 0
         self.root_package = self.create_element("Package", name="Root")
 
+    @property
+    def relationships(self) -> RelationshipStore:
+        """Relationships indexed by id, source, target and type."""
+        return self._relationships
+
+    @relationships.setter
+    def relationships(self, value) -> None:
+        if not isinstance(value, RelationshipStore):
+            value = RelationshipStore(value)
+        self._relationships = value
+
     def touch_element(self, elem_id: str) -> None:
         elem = self.elements.get(elem_id)
         if elem:
@@ -144,6 +173,7 @@ class SysMLRepository:
             elem.modified_by_email = user_config.CURRENT_USER_EMAIL
 
     def touch_diagram(self, diag_id: str) -> None:
+        self.diagram_revision += 1
         diag = self.diagrams.get(diag_id)
         if diag:
             diag.modified = datetime.datetime.now().isoformat()
@@ -151,7 +181,7 @@ class SysMLRepository:
             diag.modified_by_email = user_config.CURRENT_USER_EMAIL
 
     def touch_relationship(self, rel_id: str) -> None:
-        rel = next((r for r in self.relationships if r.rel_id == rel_id), None)
+        rel = self.relationships.get(rel_id)
         if rel:
             rel.modified = datetime.datetime.now().isoformat()
             rel.modified_by = user_config.CURRENT_USER_NAME
@@ -189,30 +219,65 @@ class SysMLRepository:
     # ------------------------------------------------------------
     # Undo support
     # ------------------------------------------------------------
-    def _strip_object_positions(self, data: dict) -> dict:
-        """Return a copy of *data* without concrete object positions.
+    @property
+    def _undo_stack(self) -> list:
+        return self._journal.undo_stack
+
+    @_undo_stack.setter
+    def _undo_stack(self, value: list) -> None:
+        self._journal.undo_stack = list(value)
 
-        The helper is used to determine whether two repository states differ
-        only by object coordinates within diagrams.  When this is the case we
-        can merge the states to keep the undo history compact.
+    @property
+    def _redo_stack(self) -> list:
+        return self._journal.redo_stack
+
+    @_redo_stack.setter
+    def _redo_stack(self, value: list) -> None:
+        self._journal.redo_stack = list(value)
+
+    def _undo_state(self) -> dict:
+        """Return a live view of the repository for :class:`UndoJournal`.
+
+        The view references the dataclass field dictionaries directly; the
+        journal copies whatever changed so no serialisation is required.
         """
 
-        cleaned = json.loads(json.dumps(data))
+        return {
+            "elements": [vars(e) for e in self.elements.values()],
+            "relationships": [vars(r) for r in self.relationships],
+            "diagrams": [vars(d) for d in self.diagrams.values()],
+            "element_diagrams": self.element_diagrams,
+        }
 
-        def scrub(obj: Any) -> None:
-            if isinstance(obj, dict):
-                for field in ("x", "y", "modified", "modified_by", "modified_by_email"):
-                    obj.pop(field, None)
-                for value in obj.values():
-                    scrub(value)
-            elif isinstance(obj, list):
-                for item in obj:
-                    scrub(item)
+    def _undo_read(self, keys=None):
+        """Return the live values :class:`UndoJournal` freezes for *keys*.
 
-        scrub(cleaned)
-        return cleaned
+        ``None`` selects the whole repository (see :meth:`_undo_state`).
+        """
 
-    def push_undo_state(self, strategy: str = "v4", sync_app: bool = True) -> None:
+        if keys is None:
+            return self._undo_state()
+        return {key: self._undo_value(key) for key in keys}
+
+    def _undo_value(self, key: tuple) -> Any:
+        kind, ident = key
+        if kind == "element_diagrams":
+            return self.element_diagrams
+        if kind == "relationships":
+            rel = self.relationships.get(ident)
+            if rel is None:
+                return ABSENT
+            return vars(rel)
+        obj = getattr(self, kind).get(ident)
+        return ABSENT if obj is None else vars(obj)
+
+    def push_undo_state(
+        self,
+        strategy: str = "v4",
+        sync_app: bool = True,
+        touched: Optional[List[tuple]] = None,
+        moved: bool = False,
+    ) -> bool:
         """Save the current repository state for undo.
 
         Repeated calls that do not change the repository would otherwise
@@ -223,92 +288,82 @@ class SysMLRepository:
         Skipping storage of consecutive identical states keeps the history
         concise and ensures that each user action corresponds to a single
         undo step.
+
+        *touched* lists the ``(kind, id)`` keys of the entities the caller is
+        about to change, ``kind`` being ``"elements"``, ``"relationships"``
+        or ``"diagrams"`` (``("element_diagrams", None)`` stands for the
+        implementation links).  Only those entities are then recorded instead
+        of the whole repository.  An empty *touched* pairs a step of the
+        application's history that leaves the repository alone; ``moved``
+        then tells whether that step was a move.
+
+        Returns whether the repository changed since it was last observed,
+        i.e. whether the previous step actually edited anything.
         """
 
-        state = self.to_dict()
-        stripped = self._strip_object_positions(state)
+        journal = self._journal
+        if touched is None:
+            checkpoint, status = journal.checkpoint(self._undo_state())
+            drifted = journal.drifted(self._undo_read, status)
+        else:
+            checkpoint, status = journal.patch(self._undo_read, touched, moved)
+            drifted = bool(touched) and journal.drifted(self._undo_read)
 
         handler = getattr(
             self, f"_push_undo_state_{strategy}", self._push_undo_state_v1
         )
-        changed = handler(state, stripped)
+        changed = handler(checkpoint, status)
+        journal.observe()
+
+        app = None
+        if sync_app:
+            try:
+                from AutoML import AutoMLApp
 
+                app = getattr(AutoMLApp, "_instance", None)
+            except Exception:
+                pass
         if changed:
-            if len(self._undo_stack) > 50:
-                self._undo_stack.pop(0)
+            journal._trim(self._undo_stack)
             self._redo_stack.clear()
-            if sync_app:
-                try:
-                    from AutoML import AutoMLApp
-
-                    app = getattr(AutoMLApp, "_instance", None)
-                    if app:
-                        app.push_undo_state(strategy=strategy, sync_repo=False)
-                except Exception:
-                    pass
+            try:
+                if app and touched is None:
+                    app.push_undo_state(strategy=strategy, sync_repo=False)
+                elif app:
+                    # Nothing outside the repository changes; record an
+                    # empty step so both histories stay paired.
+                    app.push_undo_state(
+                        strategy=strategy,
+                        sync_repo=False,
+                        touched=(),
+                        moved=checkpoint.moved,
+                    )
+            except Exception:
+                pass
+        if drifted and app and touched is not None:
+            # The paired empty step cannot see repository edits.
+            try:
+                app.mark_model_changed()
+            except Exception:
+                pass
+        return drifted
 
     # ------------------------------------------------------------
     # Variants for push_undo_state
     # ------------------------------------------------------------
-    def _push_undo_state_v1(self, state: dict, stripped: dict) -> bool:
-        if self._undo_stack:
-            last = self._undo_stack[-1]
-            if last == state:
-                return False
-            if self._strip_object_positions(last) == stripped:
-                if (
-                    len(self._undo_stack) >= 2
-                    and self._strip_object_positions(self._undo_stack[-2]) == stripped
-                ):
-                    self._undo_stack[-1] = state
-                    return True
-                self._undo_stack.append(state)
-                return True
-        else:
-            self._undo_stack.append(state)
-            return True
+    def _push_undo_state_v1(self, checkpoint: Checkpoint, status: int) -> bool:
+        return self._journal.push_v1(checkpoint, status)
 
-        self._undo_stack.append(state)
-        return True
+    def _push_undo_state_v2(self, checkpoint: Checkpoint, status: int) -> bool:
+        return self._journal.push_v2(checkpoint, status)
 
-    def _push_undo_state_v2(self, state: dict, stripped: dict) -> bool:
-        if self._undo_stack and self._undo_stack[-1] == state:
-            return False
-        if self._undo_stack and self._strip_object_positions(self._undo_stack[-1]) == stripped:
-            if self._last_move_base == stripped:
-                self._undo_stack[-1] = state
-            else:
-                self._undo_stack.append(state)
-                self._last_move_base = stripped
-            return True
-        self._last_move_base = None
-        self._undo_stack.append(state)
-        return True
+    def _push_undo_state_v3(self, checkpoint: Checkpoint, status: int) -> bool:
+        # Unlike the application's move runs, the repository's ``v3`` has
+        # always merged a move into the previous move like ``v4``.
+        return self._journal.push_v4(checkpoint, status)
 
-    def _push_undo_state_v3(self, state: dict, stripped: dict) -> bool:
-        if self._undo_stack and self._undo_stack[-1] == state:
-            return False
-        self._undo_stack.append(state)
-        if len(self._undo_stack) >= 3:
-            s1 = self._strip_object_positions(self._undo_stack[-3])
-            s2 = self._strip_object_positions(self._undo_stack[-2])
-            if s1 == s2 == stripped:
-                self._undo_stack.pop(-2)
-        if len(self._undo_stack) > 50:
-            self._undo_stack.pop(0)
-        self._redo_stack.clear()
-        return True
-
-    def _push_undo_state_v4(self, state: dict, stripped: dict) -> bool:
-        if self._undo_stack and self._undo_stack[-1] == state:
-            return False
-        self._undo_stack.append(state)
-        if len(self._undo_stack) >= 3:
-            s1 = self._strip_object_positions(self._undo_stack[-3])
-            s2 = self._strip_object_positions(self._undo_stack[-2])
-            if s1 == s2 == stripped:
-                self._undo_stack.pop(-2)
-        return True
+    def _push_undo_state_v4(self, checkpoint: Checkpoint, status: int) -> bool:
+        return self._journal.push_v4(checkpoint, status)
 
     def undo(self, strategy: str = "v4") -> bool:
         """Revert to the most recent saved state."""
@@ -321,109 +376,132 @@ class SysMLRepository:
         return handler()
 
     # Undo/redo variants
+    def _undo_step(self) -> bool:
+        changed, target = self._journal.undo(self._undo_read)
+        if target is not None:
+            self._restore(target, self._redo_stack[-1])
+        return changed
+
+    def _redo_step(self) -> bool:
+        changed, target = self._journal.redo(self._undo_read)
+        if target is not None:
+            self._restore(target, self._undo_stack[-1])
+        return changed
+
+    def _restore(self, target: Any, current: Any) -> None:
+        state_of = self._journal.state_of
+        if self._journal.is_partial(target):
+            self._apply_patch(state_of(target))
+        else:
+            self._replay_state(state_of(current), state_of(target))
+
     def _undo_v1(self) -> bool:
-        if not self._undo_stack:
-            return False
-        current = self.to_dict()
-        if self._undo_stack and self._undo_stack[-1] == current:
-            self._undo_stack.pop()
-            if not self._undo_stack:
-                return False
-        state = self._undo_stack.pop()
-        self._redo_stack.append(current)
-        if len(self._redo_stack) > 50:
-            self._redo_stack.pop(0)
-        self.from_dict(state)
-        return True
+        return self._undo_step()
 
     def _undo_v2(self) -> bool:
-        if not self._undo_stack:
-            return False
-        current = self.to_dict()
-        if self._undo_stack and self._undo_stack[-1] == current:
-            self._undo_stack.pop()
-            if not self._undo_stack:
-                return False
-        state = self._undo_stack.pop()
-        self._redo_stack.append(current)
-        if len(self._redo_stack) > 50:
-            self._redo_stack.pop(0)
-        self.from_dict(state)
-        return True
+        return self._undo_step()
 
     def _undo_v3(self) -> bool:
-        if not self._undo_stack:
-            return False
-        current = self.to_dict()
-        if self._undo_stack and self._undo_stack[-1] == current:
-            self._undo_stack.pop()
-            if not self._undo_stack:
-                return False
-        state = self._undo_stack.pop()
-        self._redo_stack.append(current)
-        if len(self._redo_stack) > 50:
-            self._redo_stack.pop(0)
-        self.from_dict(state)
-        return True
+        return self._undo_step()
 
     def _undo_v4(self) -> bool:
-        if not self._undo_stack:
-            return False
-        current = self.to_dict()
-        if self._undo_stack and self._undo_stack[-1] == current:
-            self._undo_stack.pop()
-            if not self._undo_stack:
-                return False
-        state = self._undo_stack.pop()
-        self._redo_stack.append(current)
-        if len(self._redo_stack) > 50:
-            self._redo_stack.pop(0)
-        self.from_dict(state)
-        return True
+        return self._undo_step()
 
     def _redo_v1(self) -> bool:
-        if not self._redo_stack:
-            return False
-        current = self.to_dict()
-        state = self._redo_stack.pop()
-        self._undo_stack.append(current)
-        if len(self._undo_stack) > 50:
-            self._undo_stack.pop(0)
-        self.from_dict(state)
-        return True
+        return self._redo_step()
 
     def _redo_v2(self) -> bool:
-        if not self._redo_stack:
-            return False
-        current = self.to_dict()
-        state = self._redo_stack.pop()
-        self._undo_stack.append(current)
-        if len(self._undo_stack) > 50:
-            self._undo_stack.pop(0)
-        self.from_dict(state)
-        return True
+        return self._redo_step()
 
     def _redo_v3(self) -> bool:
-        if not self._redo_stack:
-            return False
-        current = self.to_dict()
-        state = self._redo_stack.pop()
-        self._undo_stack.append(current)
-        if len(self._undo_stack) > 50:
-            self._undo_stack.pop(0)
-        self.from_dict(state)
-        return True
+        return self._redo_step()
 
     def _redo_v4(self) -> bool:
-        if not self._redo_stack:
-            return False
-        current = self.to_dict()
-        state = self._redo_stack.pop()
-        self._undo_stack.append(current)
-        if len(self._undo_stack) > 50:
-            self._undo_stack.pop(0)
-        self.from_dict(state)
-        return True
+        return self._redo_step()
+
+    def _replay_state(self, current: dict, target: dict) -> None:
+        """Restore the frozen *target* state starting from frozen *current*.
+
+        *current* must describe the live repository.  Entities whose frozen
+        form is shared between both states are unchanged and keep their live
+        objects; only the remaining ones are rebuilt from *target*.
+        """
+
+        def replay(items, cls, live, key):
+            before = {entry[key]: entry for entry in current.get(items, [])}
+            result = []
+            for entry in target.get(items, []):
+                obj = live.get(entry[key])
+                if obj is None or before.get(entry[key]) is not entry:
+                    obj = cls(**thaw(entry))
+                result.append(obj)
+            return result
+
+        elements = replay("elements", SysMLElement, self.elements, "elem_id")
+        rels = replay(
+            "relationships",
+            SysMLRelationship,
+            {r.rel_id: r for r in self.relationships},
+            "rel_id",
+        )
+        diagrams = replay("diagrams", SysMLDiagram, self.diagrams, "diag_id")
+        self.elements.clear()
+        self.elements.update((e.elem_id, e) for e in elements)
+        self.relationships[:] = rels
+        self.diagrams.clear()
+        self.diagrams.update((d.diag_id, d) for d in diagrams)
+        self.diagram_revision += 1
+        self.element_diagrams = dict(target.get("element_diagrams", {}))
+        self.root_package = None
+        for elem in self.elements.values():
+            if elem.elem_type == "Package" and elem.owner is None:
+                self.root_package = elem
+                break
+        if self.root_package is None:
+            self.root_package = self.create_element("Package", name="Root")
+
+        self._resolve_part_definition_ids()
+
+    def _apply_patch(self, forms: dict) -> None:
+        """Restore the entities of a partial undo checkpoint."""
+
+        classes = {"elements": SysMLElement, "diagrams": SysMLDiagram}
+        for (kind, ident), form in forms.items():
+            if kind == "element_diagrams":
+                self.element_diagrams = dict(form)
+            elif kind == "relationships":
+                old = self.relationships.get(ident)
+                new = None if form is ABSENT else SysMLRelationship(**thaw(form))
+                if old is None and new is not None:
+                    self.relationships.append(new)
+                elif old is not None:
+                    index = next(
+                        i for i, r in enumerate(list.__iter__(self.relationships))
+                        if r is old
+                    )
+                    if new is None:
+                        del self.relationships[index]
+                    else:
+                        self.relationships[index] = new
+            elif form is ABSENT:
+                getattr(self, kind).pop(ident, None)
+            else:
+                getattr(self, kind)[ident] = classes[kind](**thaw(form))
+        self.diagram_revision += 1
+        if any(kind == "elements" for kind, _ in forms):
+            root = self.root_package
+            if root is None or self.elements.get(root.elem_id) is not root:
+                self.root_package = next(
+                    (
+                        e
+                        for e in self.elements.values()
+                        if e.elem_type == "Package" and e.owner is None
+                    ),
+                    None,
+                )
+                if self.root_package is None:
+                    self.root_package = self.create_element("Package", name="Root")
+            self._resolve_part_definition_ids()
 
     def ensure_unique_element_name(self, name: str, self_elem_id: str | None = None) -> str:
         """Return a unique element name based on *name* across all elements."""
@@ -457,8 +535,8 @@ class SysMLRepository:
         return name
 
     def create_element(self, elem_type: str, name: str = "", properties: Optional[Dict[str, str]] = None, owner: Optional[str] = None) -> SysMLElement:
-        self.push_undo_state()
         elem_id = str(uuid.uuid4())
+        self.push_undo_state(touched=[("elements", elem_id)])
         if not name:
             name = self._default_name(elem_type)
         unique_name = self.ensure_unique_element_name(name)
@@ -503,19 +581,25 @@ class SysMLRepository:
         color: str = "#FFFFFF",
         father: Optional[str] = None,
     ) -> SysMLDiagram:
-        self.push_undo_state()
         if diag_id is None:
             diag_id = str(uuid.uuid4())
+        same_name_diagrams = [
+            d
+            for d in self.diagrams.values()
+            if name
+            and (
+                d.name == name
+                or d.name.startswith(f"{name} ")
+                or d.name.startswith(f"{name}_")
+            )
+        ]
+        self.push_undo_state(
+            touched=[("diagrams", diag_id)]
+            + [("diagrams", d.diag_id) for d in same_name_diagrams]
+        )
         if package is None:
             package = self.root_package.elem_id
         if name:
-            same_name_diagrams = [
-                d
-                for d in self.diagrams.values()
-                if d.name == name
-                or d.name.startswith(f"{name} ")
-                or d.name.startswith(f"{name}_")
-            ]
             if same_name_diagrams:
                 if any(d.diag_type != diag_type for d in same_name_diagrams):
                     for d in same_name_diagrams:
@@ -566,6 +650,7 @@ class SysMLRepository:
             phase=self.active_phase,
         )
         self.diagrams[diag_id] = diagram
+        self.diagram_revision += 1
         try:
             from analysis import safety_management as sm
             toolbox = getattr(sm, "ACTIVE_TOOLBOX", None)
@@ -595,7 +680,7 @@ class SysMLRepository:
                     )
                     if src.diag_type not in allowed:
                         return
-            self.push_undo_state()
+            self.push_undo_state(touched=[("diagrams", diag_id)])
             diag.elements.append(elem_id)
 
     def add_relationship_to_diagram(self, diag_id: str, rel_id: str) -> None:
@@ -603,24 +688,39 @@ class SysMLRepository:
         if diag and rel_id not in diag.relationships:
             if self.diagram_read_only(diag_id):
                 return
-            self.push_undo_state()
+            self.push_undo_state(touched=[("diagrams", diag_id)])
             diag.relationships.append(rel_id)
 
     def delete_element(self, elem_id: str) -> None:
         """Remove an element and any relationships referencing it."""
         if self.element_read_only(elem_id):
             return
-        self.push_undo_state()
+        involved = self.relationships.involving(elem_id)
+        self.push_undo_state(
+            touched=[("elements", elem_id)]
+            + [("relationships", r.rel_id) for r in involved]
+        )
         if elem_id in self.elements:
             del self.elements[elem_id]
-        self.relationships = [r for r in self.relationships if r.source != elem_id and r.target != elem_id]
+        self.relationships.remove_all(involved)
 
     def delete_package(self, pkg_id: str) -> None:
         """Delete a package and reassign its contents to the parent package."""
         pkg = self.elements.get(pkg_id)
         if not pkg or pkg.elem_type != "Package" or pkg_id == self.root_package.elem_id:
             return
-        self.push_undo_state()
+        self.push_undo_state(
+            touched=[
+                ("elements", e.elem_id)
+                for e in self.elements.values()
+                if e.owner == pkg_id
+            ]
+            + [
+                ("diagrams", d.diag_id)
+                for d in self.diagrams.values()
+                if d.package == pkg_id
+            ]
+        )
         parent = pkg.owner or self.root_package.elem_id
         for elem in self.elements.values():
             if elem.owner == pkg_id:
@@ -633,9 +733,12 @@ class SysMLRepository:
     def delete_diagram(self, diag_id: str) -> None:
         if self.diagram_read_only(diag_id):
             return
-        self.push_undo_state()
+        self.push_undo_state(
+            touched=[("diagrams", diag_id), ("element_diagrams", None)]
+        )
         if diag_id in self.diagrams:
             del self.diagrams[diag_id]
+            self.diagram_revision += 1
         # remove any element links to this diagram
         for k, v in list(self.element_diagrams.items()):
             if v == diag_id:
@@ -660,6 +763,7 @@ class SysMLRepository:
             if rel.phase == old:
                 rel.phase = new
 
+        self.diagram_revision += 1
         for diag in self.diagrams.values():
             if diag.phase == old:
                 diag.phase = new
@@ -707,6 +811,7 @@ class SysMLRepository:
         for d in data.get("diagrams", []):
             diag = SysMLDiagram(**d)
             self.diagrams[diag.diag_id] = diag
+        self.diagram_revision += 1
         self.element_diagrams = data.get("element_diagrams", {})
         self.root_package = None
         for elem in self.elements.values():
@@ -725,9 +830,9 @@ class SysMLRepository:
         properties: Optional[Dict[str, str]] = None,
         record_undo: bool = True,
     ) -> SysMLRelationship:
-        if record_undo:
-            self.push_undo_state()
         rel_id = str(uuid.uuid4())
+        if record_undo:
+            self.push_undo_state(touched=[("relationships", rel_id)])
         rel = SysMLRelationship(
             rel_id,
             rel_type,
@@ -833,6 +938,7 @@ class SysMLRepository:
             return
         old = diag.phase
         diag.phase = phase
+        self.diagram_revision += 1
         match: set[Optional[str]] = {old}
         if old in (None, GLOBAL_PHASE):
             match.update({None, GLOBAL_PHASE})
@@ -841,7 +947,7 @@ class SysMLRepository:
             if elem and elem.phase in match:
                 elem.phase = phase
         for rel_id in getattr(diag, "relationships", []):
-            rel = next((r for r in self.relationships if r.rel_id == rel_id), None)
+            rel = self.relationships.get(rel_id)
             if rel and rel.phase in match:
                 rel.phase = phase
         for obj in getattr(diag, "objects", []):
@@ -948,7 +1054,7 @@ class SysMLRepository:
     def link_diagram(self, elem_id: str, diag_id: Optional[str], record_undo: bool = True) -> None:
         """Associate an element with a diagram implementing it."""
         if record_undo:
-            self.push_undo_state()
+            self.push_undo_state(touched=[("element_diagrams", None)])
         if diag_id:
             self.element_diagrams[elem_id] = diag_id
         else:
@@ -984,6 +1090,7 @@ class SysMLRepository:
         for d in data.get("diagrams", []):
             diag = SysMLDiagram(**d)
             self.diagrams[diag.diag_id] = diag
+        self.diagram_revision += 1
         self.element_diagrams = data.get("element_diagrams", {})
         self.root_package = None
         for elem in self.elements.values():
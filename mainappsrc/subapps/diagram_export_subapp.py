@@ -20,9 +20,12 @@ from __future__ import annotations
 
 """Diagram export utilities for :class:`AutoMLApp`."""
 
+import os
 from tkinter import filedialog
 from PIL import Image, ImageDraw, ImageFont
 
+from gui.utils import headless_renderer
+
 
 class DiagramExportSubApp:
     """Provide diagram export helpers."""
@@ -98,6 +101,11 @@ class DiagramExportSubApp:
     # ------------------------------------------------------------------
     def capture_page_diagram(self, page_node):
         """Return a PIL image of *page_node* rendered off-screen."""
+        img = headless_renderer.capture_image(
+            headless_renderer.fta_scene, self.app, page_node
+        )
+        if img is not None:
+            return img
         from io import BytesIO
         import tkinter as tk
         from PIL import Image
@@ -139,6 +147,9 @@ class DiagramExportSubApp:
     # ------------------------------------------------------------------
     def capture_gsn_diagram(self, diagram):
         """Return a PIL image of a GSN diagram."""
+        img = headless_renderer.capture_image(headless_renderer.gsn_scene, diagram)
+        if img is not None:
+            return img
         from io import BytesIO
         import tkinter as tk
         from PIL import Image
@@ -180,6 +191,9 @@ class DiagramExportSubApp:
     # ------------------------------------------------------------------
     def capture_sysml_diagram(self, diagram):
         """Return a PIL image of the given SysML diagram."""
+        img = headless_renderer.capture_image(headless_renderer.sysml_scene, diagram)
+        if img is not None:
+            return img
         from io import BytesIO
         import tkinter as tk
         from PIL import Image
@@ -227,6 +241,9 @@ class DiagramExportSubApp:
     # ------------------------------------------------------------------
     def capture_cbn_diagram(self, doc):
         """Return a PIL image of a Causal Bayesian Network diagram."""
+        img = headless_renderer.capture_image(headless_renderer.cbn_scene, doc)
+        if img is not None:
+            return img
         from io import BytesIO
         import tkinter as tk
         from PIL import Image
@@ -256,6 +273,45 @@ class DiagramExportSubApp:
             temp.destroy()
         return img.convert("RGB") if img else None
 
+    # ------------------------------------------------------------------
+    def export_all_diagrams(self, directory: str, fmt: str = "svg", processes=None):
+        """Write every project diagram to *directory* without opening windows.
+
+        Scenes are built here and written by a process pool.  Returns one
+        ``(path, error)`` pair per diagram in project order; diagrams that
+        cannot be drawn are reported with their error instead of a file.
+        """
+        from mainappsrc.models.sysml.sysml_repository import SysMLRepository
+
+        app = self.app
+        sources = []
+        for top_event in getattr(app, "top_events", []):
+            for page in [top_event] + self.get_page_nodes(top_event):
+                sources.append(
+                    (f"FTA_{page.name}_{page.unique_id}", headless_renderer.fta_scene, (app, page))
+                )
+        for diagram in getattr(app, "all_gsn_diagrams", []):
+            sources.append((f"GSN_{diagram.root.user_name}", headless_renderer.gsn_scene, (diagram,)))
+        for diagram in SysMLRepository.get_instance().diagrams.values():
+            name = diagram.name or diagram.diag_id
+            sources.append((f"SysML_{name}", headless_renderer.sysml_scene, (diagram,)))
+        for doc in getattr(app, "cbn_docs", []):
+            sources.append((f"CBN_{doc.name}", headless_renderer.cbn_scene, (doc,)))
+
+        os.makedirs(directory, exist_ok=True)
+        jobs, results = [], []
+        for name, build, args in sources:
+            safe = "".join(c if c.isalnum() or c in "-_." else "_" for c in name)
+            path = os.path.join(directory, f"{safe}.{fmt}")
+            try:
+                jobs.append(headless_renderer.ExportJob(build(*args), path))
+            except Exception as exc:
+                results.append((path, str(exc) or exc.__class__.__name__))
+            else:
+                results.append(None)
+        written = iter(headless_renderer.export_scenes(jobs, processes))
+        return [result or next(written) for result in results]
+
     # ------------------------------------------------------------------
     def capture_diff_diagram(self, top_event):
         """Return an image of the FTA diff versus the last version."""
@@ -23,9 +23,11 @@ from __future__ import annotations
 
 import re
 
+from analysis.fault_tree_bdd import FaultTreeBDD
 from analysis.fmeda_utils import GATE_NODE_TYPES
 from config.automl_constants import dynamic_recommendations, VALID_SUBTYPES
 from gui.controls import messagebox
+from mainappsrc.core.report_builder import walk_tree
 from mainappsrc.models.fta.fault_tree_node import FaultTreeNode
 
 
@@ -251,72 +253,52 @@ class FTASubApp:
         mapping = {1: "PAL1", 2: "PAL2", 3: "PAL3", 4: "PAL4", 5: "PAL5"}
         return mapping.get(level, str(level))
 
-    def calculate_cut_sets(self, app, node):
-        if not node.children:
-            return [{node.unique_id}]
-        gate = (node.gate_type or "AND").upper() if node.node_type.upper() in GATE_NODE_TYPES else "AND"
-        child_cut_sets = [self.calculate_cut_sets(app, child) for child in node.children]
-        if gate == "OR":
-            result = []
-            for cuts in child_cut_sets:
-                result.extend(cuts)
-            return result
-        elif gate == "AND":
-            result = [set()]
-            for cuts in child_cut_sets:
-                temp = []
-                for partial in result:
-                    for cs in cuts:
-                        temp.append(partial.union(cs))
-                result = temp
-            return result
-        else:
-            result = []
-            for cuts in child_cut_sets:
-                result.extend(cuts)
-            return result
+    def calculate_cut_sets(self, app, node, max_order=None, cutoff=None):
+        """Return the minimal cut sets of ``node`` as sets of node ids.
+
+        The tree is compiled into a binary decision diagram so repeated
+        events and clones are reduced to a single variable and supersets of
+        other cut sets are removed.  ``max_order`` and ``cutoff`` truncate the
+        result by cut set size and probability respectively.
+        """
+        return FaultTreeBDD(node).minimal_cut_sets(max_order=max_order, cutoff=cutoff)
 
     def build_hierarchical_argumentation(self, app, node, indent=0):
-        indent_str = "    " * indent
-        node_name = node.user_name if node.user_name else f"Node {node.unique_id}"
-        details = f"{node.node_type}"
-        if node.input_subtype:
-            details += f" ({node.input_subtype})"
-        if node.description:
-            details += f": {node.description}"
-        metric_type = "maturity" if node.node_type.upper() in ["CONFIDENCE LEVEL", "ROBUSTNESS SCORE"] else "rigor"
-        metric_descr = self.metric_to_text(app, metric_type, node.quant_value)
-        line = f"{indent_str}- {node_name} ({details}) -> {metric_descr}"
-        if node.rationale and node.node_type.upper() not in ["CONFIDENCE LEVEL", "ROBUSTNESS SCORE"]:
-            line += f" [Rationale: {node.rationale.strip()}]"
-        child_lines = [self.build_hierarchical_argumentation(app, child, indent + 1) for child in node.children]
-        if child_lines:
-            line += "\n" + "\n".join(child_lines)
-        return line
+        return self._argumentation_lines(app, node, indent, None)
 
     def build_hierarchical_argumentation_common(self, app, node, indent=0, described=None):
         if described is None:
             described = set()
-        indent_str = "    " * indent
-        node_name = node.user_name if node.user_name else f"Node {node.unique_id}"
-        if node.unique_id not in described:
-            details = f"{node.node_type}"
-            if node.input_subtype:
-                details += f" ({node.input_subtype})"
-            if node.description:
-                details += f": {node.description}"
-            described.add(node.unique_id)
-        else:
-            details = f"{node.node_type} (see common cause: {node_name})"
-        metric_type = "maturity" if node.node_type.upper() in ["CONFIDENCE LEVEL", "ROBUSTNESS SCORE"] else "rigor"
-        metric_descr = self.metric_to_text(app, metric_type, node.quant_value)
-        line = f"{indent_str}- {node_name} ({details}) -> {metric_descr}"
-        if node.rationale and node.node_type.upper() not in ["CONFIDENCE LEVEL", "ROBUSTNESS SCORE"]:
-            line += f" [Rationale: {node.rationale.strip()}]"
-        child_lines = [self.build_hierarchical_argumentation_common(app, child, indent + 1, described) for child in node.children]
-        if child_lines:
-            line += "\n" + "\n".join(child_lines)
-        return line
+        return self._argumentation_lines(app, node, indent, described)
+
+    def _argumentation_lines(self, app, root, indent, described):
+        """Return one line per node of *root*, children indented below parents.
+
+        With a *described* set, nodes seen before are referenced as common
+        causes instead of being described again.
+        """
+        lines = []
+        for node, depth, entering in walk_tree(root, indent):
+            if not entering:
+                continue
+            node_name = node.user_name if node.user_name else f"Node {node.unique_id}"
+            if described is None or node.unique_id not in described:
+                details = f"{node.node_type}"
+                if node.input_subtype:
+                    details += f" ({node.input_subtype})"
+                if node.description:
+                    details += f": {node.description}"
+                if described is not None:
+                    described.add(node.unique_id)
+            else:
+                details = f"{node.node_type} (see common cause: {node_name})"
+            metric_type = "maturity" if node.node_type.upper() in ["CONFIDENCE LEVEL", "ROBUSTNESS SCORE"] else "rigor"
+            metric_descr = self.metric_to_text(app, metric_type, node.quant_value)
+            line = f"{'    ' * depth}- {node_name} ({details}) -> {metric_descr}"
+            if node.rationale and node.node_type.upper() not in ["CONFIDENCE LEVEL", "ROBUSTNESS SCORE"]:
+                line += f" [Rationale: {node.rationale.strip()}]"
+            lines.append(line)
+        return "\n".join(lines)
 
     def build_page_argumentation(self, app, page_node):
         return self.build_hierarchical_argumentation(app, page_node)
@@ -455,6 +437,8 @@ class FTASubApp:
 
         def map_nodes(n):
             nodes_by_id[n.unique_id] = n
+            original = getattr(n, "original", None) or n
+            nodes_by_id.setdefault(original.unique_id, original)
             for child in n.children:
                 map_nodes(child)
 
@@ -556,19 +540,21 @@ class FTASubApp:
         return "\n".join(report_lines)
 
     def build_text_report(self, app, node, indent=0):
-        report = "    " * indent + f"{node.name} ({node.node_type}"
-        if node.node_type.upper() in GATE_NODE_TYPES:
-            report += f", {node.gate_type}"
-        report += ")"
-        if node.display_label:
-            report += f" => {node.display_label}"
-        arg_text = self.build_argumentation(app, node)
-        if arg_text:
-            report += f"\n{'    ' * (indent + 1)}Argumentation: {arg_text}"
-        report += "\n\n"
-        for child in node.children:
-            report += self.build_text_report(app, child, indent + 1)
-        return report
+        parts = []
+        for n, depth, entering in walk_tree(node, indent):
+            if not entering:
+                continue
+            parts.append("    " * depth + f"{n.name} ({n.node_type}")
+            if n.node_type.upper() in GATE_NODE_TYPES:
+                parts.append(f", {n.gate_type}")
+            parts.append(")")
+            if n.display_label:
+                parts.append(f" => {n.display_label}")
+            arg_text = self.build_argumentation(app, n)
+            if arg_text:
+                parts.append(f"\n{'    ' * (depth + 1)}Argumentation: {arg_text}")
+            parts.append("\n\n")
+        return "".join(parts)
 
     def all_children_are_base_events(self, app, node):
         if not node.children:
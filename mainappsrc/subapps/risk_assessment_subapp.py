@@ -38,6 +38,7 @@ from gui.windows.threat_window import ThreatWindow
 
 from analysis.models import ASIL_ORDER, ASIL_TARGETS, CAL_LEVEL_OPTIONS, component_fit_map
 from analysis.utils import append_unique_insensitive
+from mainappsrc.core.reporting_export import EVENT_SECTIONS, FMEA_SECTIONS
 from mainappsrc.models.fta.fault_tree_node import FaultTreeNode
 
 
@@ -455,7 +456,7 @@ class RiskAssessmentSubApp:
         app.update_views()
 
     def rename_fault(self, app, old: str, new: str) -> None:
-        app.push_undo_state()
+        app.push_undo_state(touched=EVENT_SECTIONS + FMEA_SECTIONS)
         if not old or old == new:
             return
         for i, f in enumerate(app.faults):
@@ -476,7 +477,7 @@ class RiskAssessmentSubApp:
         app.update_views()
 
     def rename_failure(self, app, old: str, new: str) -> None:
-        app.push_undo_state()
+        app.push_undo_state(touched=EVENT_SECTIONS + FMEA_SECTIONS)
         if not old or old == new:
             return
         for i, fl in enumerate(app.failures):
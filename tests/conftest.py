@@ -0,0 +1,35 @@
+# Author: Miguel Marina <karel.capek.robotics@gmail.com>
+# SPDX-License-Identifier: GPL-3.0-or-later
+#
+# Copyright (C) 2025 Capek System Safety & Robotic Solutions
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+"""Shared test setup.
+
+The shared configuration registry is created when :mod:`config` is first
+imported, so its on-disk cache is pointed at a temporary directory before
+any test module is collected instead of the user's ``~/.cache``.
+"""
+
+import os
+import shutil
+import tempfile
+
+_CONFIG_CACHE = tempfile.mkdtemp(prefix="automl-config-cache-")
+os.environ["AUTOML_CONFIG_CACHE"] = _CONFIG_CACHE
+
+
+def pytest_sessionfinish(session, exitstatus):
+    shutil.rmtree(_CONFIG_CACHE, ignore_errors=True)
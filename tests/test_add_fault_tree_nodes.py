@@ -39,7 +39,7 @@ def _make_app(root):
     app.analysis_tree = types.SimpleNamespace(selection=lambda: ())
     app.update_views = lambda: None
     app.find_node_by_id_all = lambda uid: root if uid == root.unique_id else None
-    app.push_undo_state = lambda: None
+    app.push_undo_state = lambda **kwargs: None
     app.diagram_mode = "FTA"
     return app
 
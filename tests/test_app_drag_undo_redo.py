@@ -46,11 +46,11 @@ def test_drag_records_only_endpoints_and_undo_redo():
     app.redraw_canvas = lambda: None
     app.undo_manager = UndoRedoManager(app)
     app.export_model_data = lambda include_versions=False: {
-        "diagrams": [{"objects": [{"x": node.x, "y": node.y}]}]
+        "top_events": [{"x": node.x, "y": node.y}]
     }
     app.apply_model_data = lambda data: (
-        setattr(node, "x", data["diagrams"][0]["objects"][0]["x"]),
-        setattr(node, "y", data["diagrams"][0]["objects"][0]["y"]),
+        setattr(node, "x", data["top_events"][0]["x"]),
+        setattr(node, "y", data["top_events"][0]["y"]),
     )
     app.push_undo_state = AutoMLApp.push_undo_state.__get__(app)
     app.undo = AutoMLApp.undo.__get__(app)
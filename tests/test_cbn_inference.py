@@ -0,0 +1,187 @@
+# Author: Miguel Marina <karel.capek.robotics@gmail.com>
+# SPDX-License-Identifier: GPL-3.0-or-later
+#
+# Copyright (C) 2025 Capek System Safety & Robotic Solutions
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+"""Junction-tree inference compared with brute-force enumeration."""
+
+import random
+from itertools import product
+
+import pytest
+
+from analysis import cbn_inference
+from analysis.causal_bayesian_network import CausalBayesianNetwork
+from analysis.cbn_inference import Factor, JunctionTree, min_fill_order
+
+
+def _random_network(seed, size=8, max_parents=3):
+    rng = random.Random(seed)
+    cbn = CausalBayesianNetwork()
+    for i in range(size):
+        name = f"N{i}"
+        parents = rng.sample(cbn.nodes, min(len(cbn.nodes), rng.randint(0, max_parents)))
+        if parents:
+            cpd = {
+                combo: rng.random()
+                for combo in product([False, True], repeat=len(parents))
+                if rng.random() > 0.2
+            }
+            cbn.add_node(name, parents=parents, cpd=cpd)
+        else:
+            cbn.add_node(name, cpd=rng.random())
+    return cbn
+
+
+def _brute_force(cbn, var, evidence=None, interventions=None):
+    evidence = evidence or {}
+    interventions = interventions or {}
+    num = den = 0.0
+    for values in product([False, True], repeat=len(cbn.nodes)):
+        world = dict(zip(cbn.nodes, values))
+        if any(world[k] != v for k, v in evidence.items()):
+            continue
+        p = 1.0
+        for node in cbn.nodes:
+            if node in interventions:
+                p *= 1.0 if world[node] == interventions[node] else 0.0
+                continue
+            parents = cbn.parents[node]
+            if parents:
+                key = tuple(world[q] for q in parents)
+                pt = cbn.cpds[node].get(key, 1.0 / 2 ** len(parents))
+            else:
+                pt = cbn.cpds[node]
+            p *= pt if world[node] else 1.0 - pt
+        den += p
+        if world[var]:
+            num += p
+    return num / den if den else 0.0
+
+
+@pytest.fixture(params=["numpy", "python"])
+def factor_tables(request, monkeypatch):
+    """Run with NumPy factor tables and with the pure-Python fallback."""
+    if request.param == "numpy":
+        pytest.importorskip("numpy")
+    else:
+        monkeypatch.setattr(cbn_inference, "np", None)
+    return request.param
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_queries_match_enumeration(seed, factor_tables):
+    cbn = _random_network(seed)
+    marginals = cbn.marginal_probabilities()
+    for node in cbn.nodes:
+        assert marginals[node] == pytest.approx(_brute_force(cbn, node), abs=1e-9)
+    evidence = {"N7": True, "N2": False}
+    do = {"N3": True}
+    for node in cbn.nodes:
+        assert cbn.query(node, evidence) == pytest.approx(
+            _brute_force(cbn, node, evidence), abs=1e-9
+        )
+        assert cbn.intervention(node, do, evidence) == pytest.approx(
+            _brute_force(cbn, node, evidence, do), abs=1e-9
+        )
+
+
+def test_joint_probability_and_cpd_rows(factor_tables):
+    cbn = _random_network(11)
+    expected = 0.0
+    for values in product([False, True], repeat=len(cbn.nodes)):
+        world = dict(zip(cbn.nodes, values))
+        if world["N1"] and not world["N5"]:
+            p = 1.0
+            for node in cbn.nodes:
+                parents = cbn.parents[node]
+                if parents:
+                    key = tuple(world[q] for q in parents)
+                    pt = cbn.cpds[node].get(key, 1.0 / 2 ** len(parents))
+                else:
+                    pt = cbn.cpds[node]
+                p *= pt if world[node] else 1.0 - pt
+            expected += p
+    assert cbn.joint_probability({"N1": True, "N5": False}) == pytest.approx(expected)
+    node = next(n for n in cbn.nodes if cbn.parents[n])
+    for combo, _p_true, combo_prob, _joint in cbn.cpd_rows(node):
+        assignment = dict(zip(cbn.parents[node], combo))
+        assert combo_prob == pytest.approx(cbn.joint_probability(assignment))
+
+
+def test_edits_invalidate_cached_results():
+    cbn = CausalBayesianNetwork()
+    cbn.add_node("A", cpd=0.2)
+    cbn.add_node("B", parents=["A"], cpd={(True,): 1.0, (False,): 0.0})
+    assert cbn.query("B") == pytest.approx(0.2)
+    cbn.cpds["A"] = 0.7
+    assert cbn.query("B") == pytest.approx(0.7)
+    cbn.cpds["B"][(False,)] = 1.0
+    assert cbn.query("B") == pytest.approx(1.0)
+    cbn.add_node("C", parents=["B"], cpd={(True,): 0.5, (False,): 0.0})
+    assert cbn.query("C") == pytest.approx(0.5)
+    cbn.parents["A"].append("C")
+    with pytest.raises(ValueError):
+        cbn.query("C")
+
+
+def test_impossible_evidence_gives_zero():
+    cbn = CausalBayesianNetwork()
+    cbn.add_node("A", cpd=0.0)
+    cbn.add_node("B", parents=["A"], cpd={(True,): 0.5, (False,): 0.5})
+    assert cbn.query("B", {"A": True}) == 0.0
+    assert cbn.joint_probability({"A": True}) == 0.0
+
+
+def test_large_chain_network_is_tractable():
+    cbn = CausalBayesianNetwork()
+    cbn.add_node("X0", cpd=0.5)
+    for i in range(1, 60):
+        parents = [f"X{i - 1}"] + ([f"X{i - 2}"] if i > 1 else [])
+        cpd = {c: 0.9 if any(c) else 0.1 for c in product([False, True], repeat=len(parents))}
+        cbn.add_node(f"X{i}", parents=parents, cpd=cpd)
+    probs = cbn.marginal_probabilities()
+    assert len(probs) == 60
+    assert 0.0 < probs["X59"] < 1.0
+    assert len(cbn.cpd_rows("X59")) == 4
+
+
+def test_min_fill_and_tree_structure():
+    adjacency = {"A": {"B", "C"}, "B": {"A", "D"}, "C": {"A", "D"}, "D": {"B", "C"}}
+    order = min_fill_order(adjacency)
+    assert sorted(order) == ["A", "B", "C", "D"]
+    tree = JunctionTree({"A": (), "B": ("A",), "C": ("A",), "D": ("B", "C")})
+    # The four-cycle is triangulated into two cliques of three variables.
+    assert sorted(len(c) for c in tree.cliques) == [3, 3]
+    assert len(tree.schedule) == len(tree.cliques) - 1
+
+
+def test_factor_operations(factor_tables):
+    a = Factor(("X", "Y"), [0.1, 0.2, 0.3, 0.4])
+    b = Factor(("Z", "Y"), [1.0, 2.0, 3.0, 4.0])
+    ab = a.multiply(b)
+    assert ab.variables == ("X", "Y", "Z")
+    for x, y, z in product([False, True], repeat=3):
+        world = {"X": x, "Y": y, "Z": z}
+        assert ab.value(world) == pytest.approx(a.value(world) * b.value(world))
+    yx = ab.marginal(("Y", "X"))
+    assert list(yx.values) == pytest.approx([0.1 * 3.0, 0.3 * 7.0, 0.2 * 3.0, 0.4 * 7.0])
+    assert ab.marginal(()).total() == pytest.approx(ab.total())
+    ab.observe("Y", True)
+    assert ab.marginal(("Y",)).value({"Y": False}) == 0.0
+    # The divisor is reordered to ("Y", "X"); 0/0 stays 0.
+    ratio = yx.divide(Factor(("X", "Y"), [0.0, 2.0, 4.0, 8.0]))
+    assert list(ratio.values) == pytest.approx([0.0, 2.1 / 4.0, 0.6 / 2.0, 2.8 / 8.0])
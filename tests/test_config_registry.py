@@ -0,0 +1,109 @@
+# Author: Miguel Marina <karel.capek.robotics@gmail.com>
+# SPDX-License-Identifier: GPL-3.0-or-later
+#
+# Copyright (C) 2025 Capek System Safety & Robotic Solutions
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+"""Tests for :mod:`config.registry`."""
+
+import json
+from pathlib import Path
+
+from config import config_registry as shared_registry
+import config.registry as registry_mod
+from config.registry import ConfigRegistry
+
+
+def _write_rules(path, gates):
+    path.write_text(json.dumps({"gate_node_types": gates}))
+
+
+def test_each_file_is_parsed_once_until_it_changes(tmp_path, monkeypatch):
+    rules = tmp_path / "diagram_rules.json"
+    _write_rules(rules, ["AND"])
+    calls = []
+    original = registry_mod.load_diagram_rules
+
+    def counting(path):
+        calls.append(path)
+        return original(path)
+
+    monkeypatch.setattr(registry_mod, "load_diagram_rules", counting)
+    registry = ConfigRegistry(cache_dir=None)
+
+    first = registry.diagram_rules(rules)
+    assert registry.diagram_rules(str(rules)) is first
+    assert len(calls) == 1
+
+    _write_rules(rules, ["AND", "OR"])
+    assert registry.diagram_rules(rules)["gate_node_types"] == ["AND", "OR"]
+    assert len(calls) == 2
+
+
+def test_compiled_results_persist_across_registries(tmp_path, monkeypatch):
+    monkeypatch.setattr(registry_mod, "_PROJECT_DIR", tmp_path)
+    src = tmp_path / "rules.json"
+    _write_rules(src, ["AND"])
+    builds = []
+
+    def build():
+        builds.append(1)
+        return {"a": [1, 2]}
+
+    cache = tmp_path / "cache"
+    assert ConfigRegistry(cache).compile("map", (src,), build, persist=True) == {"a": [1, 2]}
+    assert ConfigRegistry(cache).compile("map", (src,), build, persist=True) == {"a": [1, 2]}
+    assert len(builds) == 1
+    assert all(f.suffix == ".json" for f in cache.iterdir())
+
+    # Results not marked as plain JSON data stay in memory.
+    assert ConfigRegistry(cache).compile("tuples", (src,), lambda: (1, 2)) == (1, 2)
+    assert not any(f.name.startswith("tuples-") for f in cache.iterdir())
+
+    _write_rules(src, ["OR"])
+    ConfigRegistry(cache).compile("map", (src,), build, persist=True)
+    assert len(builds) == 2
+
+
+def test_reload_notifies_subscribers_only_after_changes(tmp_path):
+    rules = tmp_path / "diagram_rules.json"
+    _write_rules(rules, ["AND"])
+    registry = ConfigRegistry(cache_dir=None)
+    registry.diagram_rules(rules)
+    notified = []
+    registry.subscribe(lambda: notified.append(True))
+
+    assert not registry.reload()
+    _write_rules(rules, ["AND", "VOTING"])
+    # A consumer refreshing its copy first must not hide the change.
+    registry.diagram_rules(rules)
+    assert registry.reload()
+    assert notified == [True]
+    assert not registry.reload()
+    assert registry.reload(force=True)
+    assert notified == [True, True]
+
+
+def test_shipped_rules_are_shared_between_consumers():
+    from analysis import fmeda_utils
+    from mainappsrc.core import page_diagram
+
+    assert fmeda_utils._CONFIG is page_diagram._CONFIG
+    assert shared_registry.diagram_rules(fmeda_utils._CONFIG_PATH) is fmeda_utils._CONFIG
+
+
+def test_tests_do_not_write_to_the_user_cache():
+    assert shared_registry.cache_dir is not None
+    assert Path(shared_registry.cache_dir) != Path.home() / ".cache" / "automl" / "config"
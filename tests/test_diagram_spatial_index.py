@@ -0,0 +1,154 @@
+# Author: Miguel Marina <karel.capek.robotics@gmail.com>
+# SPDX-License-Identifier: GPL-3.0-or-later
+#
+# Copyright (C) 2025 Capek System Safety & Robotic Solutions
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+
+"""Tests for the spatial indexes behind diagram hit-testing."""
+
+import copy
+import json
+
+from gui.architecture import (
+    DiagramConnection,
+    SysMLDiagramWindow,
+    SysMLObject,
+    load_diagram_content,
+)
+from gui.utils.spatial_index import DiagramObjectStore, PointList
+from mainappsrc.models.sysml.sysml_repository import SysMLDiagram, SysMLRepository
+
+
+def _window(objects, connections=()):
+    repo = SysMLRepository.reset_instance()
+    diag = SysMLDiagram(diag_id="d", diag_type="Block Definition Diagram")
+    repo.diagrams[diag.diag_id] = diag
+    win = SysMLDiagramWindow.__new__(SysMLDiagramWindow)
+    win.repo = repo
+    win.diagram_id = diag.diag_id
+    win.zoom = 1.0
+    win.objects = list(objects)
+    win.connections = list(connections)
+    return win
+
+
+def _block(obj_id, x, y, **kw):
+    return SysMLObject(obj_id, "Block", x, y, phase=None, **kw)
+
+
+def test_hit_testing_follows_moves_resizes_and_zoom():
+    boundary = SysMLObject(1, "System Boundary", 500, 500, width=1000, height=1000, phase=None)
+    a = _block(2, 100, 100)
+    b = _block(3, 2000, 2000)
+    win = _window([boundary, a, b])
+    assert isinstance(win.objects, DiagramObjectStore)
+
+    assert win.find_object(100, 100) is a
+    assert win.find_object(300, 300) is boundary
+    assert win.find_object(2000, 2000) is b
+
+    a.x, a.y = 300, 300
+    assert win.find_object(100, 100) is boundary
+    assert win.find_object(300, 300) is a
+
+    b.width = 400
+    assert win.find_object(2190, 2000) is b
+
+    win.zoom = 2.0
+    assert win.find_object(600, 600) is a
+    assert win.find_object(300, 300) is boundary
+
+
+def test_get_object_and_list_mutations():
+    a, b = _block(1, 0, 0), _block(2, 50, 10)
+    win = _window([a, b])
+    assert win.get_object(2) is b
+
+    win.objects.remove(b)
+    assert win.get_object(2) is None
+    assert win.find_object(25, 15) is a
+
+    win.objects.insert(0, b)
+    assert win.get_object(2) is b
+    # ``b`` is now drawn first so ``a`` is on top where they overlap.
+    assert win.find_object(25, 15) is a
+
+    win.objects[0], win.objects[1] = win.objects[1], win.objects[0]
+    assert win.find_object(25, 15) is b
+
+    a.obj_id = 7
+    assert win.get_object(1) is None
+    assert win.get_object(7) is a
+
+
+def test_connection_lookup_tracks_objects_and_bend_points():
+    a, b = _block(1, 0, 0), _block(2, 400, 0)
+    conn = DiagramConnection(1, 2, "Association", phase=None)
+    win = _window([a, b], [conn])
+    assert isinstance(conn.points, PointList)
+
+    assert win.find_connection(200, 0) is conn
+    assert win.find_connection(200, 300) is None
+
+    b.y = 600
+    a.y = 600
+    assert win.find_connection(200, 0) is None
+    assert win.find_connection(200, 600) is conn
+
+    conn.style = "Custom"
+    conn.points.append((200, 1200))
+    assert win.find_connection(200, 900) is conn
+
+    # Copies are detached from the store until they are added to one.
+    clone = copy.deepcopy(conn)
+    clone.src = 2
+    assert win.connections.attached_to(2) == [conn]
+    clone.src = 1
+    win.connections.remove(conn)
+    assert win.find_connection(200, 600) is None
+    win.connections.append(clone)
+    assert isinstance(clone.points, PointList)
+    clone.points[0] = (200, 2000)
+    assert win.find_connection(200, 1800) is clone
+
+
+def test_rubber_band_selection_uses_index():
+    objs = [_block(i, 100 * i, 100 * i) for i in range(1, 30)]
+    win = _window(objs)
+    win.redraw = lambda: None
+    win.update_property_view = lambda: None
+    win.select_rect_start = (150, 150)
+    win._update_drag_selection(450, 450)
+    assert win.selected_objs == objs[1:4]
+
+
+def test_synced_diagram_reloads_and_serialises():
+    a, b = _block(1, 0, 0), _block(2, 400, 0)
+    conn = DiagramConnection(1, 2, "Association", style="Custom", points=[(200, 50)], phase=None)
+    win = _window([a, b], [conn])
+    win.app = None
+    win._sync_to_repository()
+
+    objects, connections = load_diagram_content(win.repo, win.diagram_id)
+    assert [o.obj_id for o in objects] == [1, 2]
+    assert connections[0].points == [(200, 50)]
+    json.dumps(win.repo.to_dict())
+
+    # Reloaded items are indexed by their own store, not the synced one.
+    reloaded = _window(objects, connections)
+    objects[0].x = 800
+    assert reloaded.find_object(800, 0) is objects[0]
+    assert win.find_object(0, 0) is a
@@ -0,0 +1,123 @@
+# Author: Miguel Marina <karel.capek.robotics@gmail.com>
+# SPDX-License-Identifier: GPL-3.0-or-later
+#
+# Copyright (C) 2025 Capek System Safety & Robotic Solutions
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+import itertools
+import types
+
+import pytest
+
+from analysis.fault_tree_bdd import FaultTreeBDD, order_variables
+
+
+_ids = itertools.count(1)
+
+
+def _node(node_type, gate_type=None, failure_prob=0.0, children=()):
+    node = types.SimpleNamespace(
+        unique_id=next(_ids),
+        node_type=node_type,
+        gate_type=gate_type,
+        failure_prob=failure_prob,
+        children=list(children),
+        parents=[],
+        is_primary_instance=True,
+        original=None,
+    )
+    node.original = node
+    return node
+
+
+def _clone(node):
+    clone = _node(node.node_type, node.gate_type, node.failure_prob)
+    clone.is_primary_instance = False
+    clone.original = node
+    return clone
+
+
+def test_repeated_event_probability_is_exact():
+    a = _node("Basic Event", failure_prob=0.1)
+    b = _node("Basic Event", failure_prob=0.2)
+    c = _node("Basic Event", failure_prob=0.3)
+    left = _node("GATE", "AND", children=[a, b])
+    right = _node("GATE", "AND", children=[_clone(a), c])
+    top = _node("TOP EVENT", "OR", children=[left, right])
+
+    bdd = FaultTreeBDD(top)
+
+    # P(a AND (b OR c)) evaluated exactly.
+    assert bdd.probability() == pytest.approx(0.1 * (1 - 0.8 * 0.7))
+
+
+def test_minimal_cut_sets_drop_supersets_and_respect_cutoffs():
+    a = _node("Basic Event", failure_prob=0.1)
+    b = _node("Basic Event", failure_prob=0.01)
+    c = _node("Basic Event", failure_prob=0.5)
+    sub = _node("GATE", "AND", children=[a, b])
+    other = _node("GATE", "AND", children=[b, c, _clone(a)])
+    top = _node("TOP EVENT", "OR", children=[sub, other, c])
+
+    bdd = FaultTreeBDD(top)
+
+    ids = (a.unique_id, b.unique_id, c.unique_id)
+    assert bdd.minimal_cut_sets() == [{ids[2]}, {ids[0], ids[1]}]
+    assert bdd.minimal_cut_sets(max_order=1) == [{ids[2]}]
+    assert bdd.minimal_cut_sets(cutoff=0.01) == [{ids[2]}]
+
+
+def test_importance_measures():
+    a = _node("Basic Event", failure_prob=0.1)
+    b = _node("Basic Event", failure_prob=0.2)
+    top = _node("TOP EVENT", "AND", children=[a, b])
+
+    bdd = FaultTreeBDD(top)
+    birnbaum = bdd.birnbaum_importance()
+    fv = bdd.fussell_vesely_importance()
+
+    assert birnbaum[a.unique_id] == pytest.approx(0.2)
+    assert birnbaum[b.unique_id] == pytest.approx(0.1)
+    assert fv[a.unique_id] == pytest.approx(1.0)
+
+
+@pytest.mark.parametrize("heuristic", ["dfs", "bfs", "frequency"])
+def test_ordering_heuristics_give_same_probability(heuristic):
+    events = [_node("Basic Event", failure_prob=0.01 * (i + 1)) for i in range(6)]
+    gates = [
+        _node("GATE", "AND", children=[events[i], events[(i + 1) % 6]])
+        for i in range(6)
+    ]
+    top = _node("TOP EVENT", "OR", children=gates)
+
+    order = order_variables(top, heuristic)
+    bdd = FaultTreeBDD(top, ordering=heuristic)
+
+    assert sorted(order) == sorted(e.unique_id for e in events)
+    assert bdd.probability() == pytest.approx(FaultTreeBDD(top).probability())
+
+
+def test_large_tree_compiles_without_recursion_errors():
+    events = [_node("Basic Event", failure_prob=1e-4) for _ in range(3000)]
+    gates = [
+        _node("GATE", "AND", children=[events[i], events[i + 1]])
+        for i in range(0, len(events) - 1)
+    ]
+    top = _node("TOP EVENT", "OR", children=gates)
+
+    bdd = FaultTreeBDD(top)
+
+    assert 0 < bdd.probability() < 3000 * 1e-8
+    assert len(bdd.minimal_cut_sets(max_order=2)) == len(gates)
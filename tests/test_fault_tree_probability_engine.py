@@ -0,0 +1,163 @@
+# Author: Miguel Marina <karel.capek.robotics@gmail.com>
+# SPDX-License-Identifier: GPL-3.0-or-later
+#
+# Copyright (C) 2025 Capek System Safety & Robotic Solutions
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+import types
+
+import pytest
+
+from analysis.fault_tree_probability import FaultTreeProbabilityEngine
+from analysis.risk_assessment import AutoMLHelper
+
+
+_ids = iter(range(1, 1_000_000))
+
+
+def _node(node_type, gate_type=None, failure_prob=0.0, children=()):
+    node = types.SimpleNamespace(
+        unique_id=next(_ids),
+        node_type=node_type,
+        gate_type=gate_type,
+        failure_prob=failure_prob,
+        probability=0.0,
+        display_label="",
+        children=list(children),
+        parents=[],
+    )
+    for child in node.children:
+        child.parents.append(node)
+    return node
+
+
+def _count_combines(engine, monkeypatch):
+    calls = []
+    original = engine._combine
+
+    def counting(node, probs):
+        calls.append(node.unique_id)
+        return original(node, probs)
+
+    monkeypatch.setattr(engine, "_combine", counting)
+    return calls
+
+
+def test_and_or_gates_match_classic_formula():
+    a = _node("Basic Event", failure_prob=0.1)
+    b = _node("Basic Event", failure_prob=0.2)
+    c = _node("Basic Event", failure_prob=0.3)
+    and_gate = _node("GATE", "AND", children=[a, b])
+    top = _node("TOP EVENT", "OR", children=[and_gate, c])
+
+    prob = AutoMLHelper().calculate_probability_recursive(top)
+
+    assert prob == pytest.approx(1 - (1 - 0.02) * (1 - 0.3))
+    assert top.probability == prob
+    assert and_gate.display_label == "P=2.00e-02"
+
+
+def test_shared_subtrees_are_evaluated_once(monkeypatch):
+    leaf = _node("Basic Event", failure_prob=0.5)
+    layer = _node("GATE", "OR", children=[leaf, leaf])
+    for _ in range(40):
+        layer = _node("GATE", "OR", children=[layer, layer])
+    engine = FaultTreeProbabilityEngine()
+    calls = _count_combines(engine, monkeypatch)
+
+    engine.evaluate(layer)
+
+    assert len(calls) == 42
+    assert len(set(calls)) == 42
+
+
+def test_changed_basic_event_recomputes_only_its_ancestors(monkeypatch):
+    a = _node("Basic Event", failure_prob=0.1)
+    b = _node("Basic Event", failure_prob=0.2)
+    left = _node("GATE", "OR", children=[a])
+    right = _node("GATE", "OR", children=[b])
+    top = _node("TOP EVENT", "AND", children=[left, right])
+    engine = FaultTreeProbabilityEngine()
+    engine.evaluate(top)
+    calls = _count_combines(engine, monkeypatch)
+
+    a.failure_prob = 0.4
+    prob = engine.evaluate(top)
+
+    assert prob == pytest.approx(0.4 * 0.2)
+    assert calls == [a.unique_id, left.unique_id, top.unique_id]
+
+
+def test_invalidate_supports_incremental_recalculation(monkeypatch):
+    a = _node("Basic Event", failure_prob=0.1)
+    b = _node("Basic Event", failure_prob=0.2)
+    top = _node("TOP EVENT", "OR", children=[a, b])
+    engine = FaultTreeProbabilityEngine()
+    engine.evaluate(top)
+    calls = _count_combines(engine, monkeypatch)
+
+    b.failure_prob = 0.5
+    assert engine.evaluate(top, verify=False) == pytest.approx(1 - 0.9 * 0.8)
+    assert calls == []
+
+    engine.invalidate(b)
+    assert engine.evaluate(top, verify=False) == pytest.approx(1 - 0.9 * 0.5)
+    assert calls == [b.unique_id, top.unique_id]
+
+
+def test_probability_updates_invalidate_the_engine(monkeypatch):
+    from mainappsrc.core.probability_reliability import Probability_Reliability
+
+    a = _node("Basic Event", failure_prob=0.1)
+    b = _node("Basic Event", failure_prob=0.2)
+    top = _node("TOP EVENT", "OR", children=[a, b])
+    helper = AutoMLHelper()
+    helper.calculate_probability_recursive(top)
+    app = types.SimpleNamespace(helper=helper, get_all_basic_events=lambda: [a, b])
+    service = Probability_Reliability(app)
+    rates = {a.unique_id: 0.1, b.unique_id: 0.5}
+    monkeypatch.setattr(service, "compute_failure_prob", lambda be: rates[be.unique_id])
+    calls = _count_combines(helper.probability_engine, monkeypatch)
+
+    service.update_basic_event_probabilities()
+    prob = helper.calculate_probability_recursive(top, verify=False)
+    assert prob == pytest.approx(1 - 0.9 * 0.5)
+    assert calls == [b.unique_id, top.unique_id]
+
+
+def test_structural_change_is_detected():
+    a = _node("Basic Event", failure_prob=0.1)
+    b = _node("Basic Event", failure_prob=0.2)
+    top = _node("TOP EVENT", "AND", children=[a])
+    engine = FaultTreeProbabilityEngine()
+    assert engine.evaluate(top) == pytest.approx(0.1)
+
+    top.children.append(b)
+    b.parents.append(top)
+    assert engine.evaluate(top) == pytest.approx(0.02)
+
+    top.gate_type = "OR"
+    assert engine.evaluate(top) == pytest.approx(1 - 0.9 * 0.8)
+
+
+def test_cycles_do_not_recurse_forever():
+    a = _node("Basic Event", failure_prob=0.1)
+    gate = _node("GATE", "OR", children=[a])
+    top = _node("TOP EVENT", "OR", children=[gate])
+    gate.children.append(top)
+
+    prob = FaultTreeProbabilityEngine().evaluate(top)
+
+    assert prob == pytest.approx(0.1)
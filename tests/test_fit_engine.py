@@ -0,0 +1,143 @@
+# Author: Miguel Marina <karel.capek.robotics@gmail.com>
+# SPDX-License-Identifier: GPL-3.0-or-later
+#
+# Copyright (C) 2025 Capek System Safety & Robotic Solutions
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+"""BOM FIT matrix over several mission profiles."""
+
+import types
+
+import pytest
+
+from analysis import fit_engine, models
+from analysis.fit_engine import fit_matrix, temperature_corners
+from analysis.fmeda_utils import compute_fmeda_metrics
+from analysis.models import (
+    PASSIVE_QUAL_FACTORS,
+    RELIABILITY_MODELS,
+    MissionProfile,
+    ReliabilityComponent,
+)
+
+
+def _bom():
+    return [
+        ReliabilityComponent("R1", "resistor", 2, {"power_W": "0.25"}, "AEC-Q200", is_passive=True),
+        ReliabilityComponent("R2", "resistor", 1, {"power_W": "0.25"}),
+        ReliabilityComponent("C1", "capacitor", 3, {"dielectric": "tantalum", "voltage_V": 16}),
+        ReliabilityComponent("U1", "ic", 1, {"type": "mcu", "pins": 64, "transistors": 1e6}),
+        ReliabilityComponent("X1", "unknown", 1),
+    ]
+
+
+def _profiles():
+    cold = MissionProfile("cold", tau_on=1000, tau_off=500, board_temp_max=40, duty_cycle=0.5)
+    hot = MissionProfile("hot", tau_on=2000, ambient_temp_max=105, duty_cycle=0.8)
+    return [cold, hot]
+
+
+def _per_component_fit(comp, mp, std):
+    info = RELIABILITY_MODELS[std].get(comp.comp_type)
+    if not info:
+        return 0.0
+    qf = PASSIVE_QUAL_FACTORS.get(comp.qualification, 1.0) if comp.is_passive else 1.0
+    return info["formula"](comp.attributes, mp) * mp.tau * qf
+
+
+@pytest.mark.parametrize("std", ["IEC 62380", "SN 29500"])
+def test_matrix_matches_per_component_formulas(std):
+    bom = _bom()
+    profiles = _profiles()
+    matrix = fit_matrix(bom, profiles, std)
+    for comp, row in zip(bom, matrix.rows):
+        for mp, fit in zip(profiles, row):
+            assert fit == pytest.approx(_per_component_fit(comp, mp, std))
+    for j, total in enumerate(matrix.totals()):
+        expected = sum(_per_component_fit(c, profiles[j], std) * c.quantity for c in bom)
+        assert total == pytest.approx(expected)
+    assert list(matrix.rows[-1]) == [0.0, 0.0]
+
+
+def test_models_without_split_use_formula(monkeypatch):
+    calls = []
+
+    def formula(attrs, mp):
+        calls.append(1)
+        return 1.0
+
+    monkeypatch.setitem(RELIABILITY_MODELS["IEC 62380"], "fuse", {"text": "", "formula": formula})
+    bom = [ReliabilityComponent(f"F{i}", "fuse", attributes={"rating": 1}) for i in range(50)]
+    matrix = fit_matrix(bom, _profiles(), "IEC 62380")
+    assert matrix.column(1) == [2000.0] * 50
+    # One evaluation per distinct attribute set and profile.
+    assert len(calls) == 2
+
+
+def test_sub_boms_and_missing_profile():
+    child = ReliabilityComponent("Child", "resistor", 2, fit=1.5)
+    parent = ReliabilityComponent("Board", "assembly", 3, sub_boms=[[child]])
+    leaf = ReliabilityComponent("R", "resistor")
+    matrix = fit_matrix([parent, leaf], [None], "IEC 62380")
+    assert [list(row) for row in matrix.rows] == [[3.0], [0.0]]
+    assert matrix.fit_map(0) == {"Board": 9.0, "Child": 9.0, "R": 0.0}
+    matrix.apply(0)
+    assert matrix.fit_map(0) == models.component_fit_map([parent, leaf])
+
+
+def test_fit_map_feeds_fmeda_metrics():
+    bom = _bom()
+    matrix = fit_matrix(bom, _profiles(), "IEC 62380")
+    node = types.SimpleNamespace(
+        parents=[],
+        fmea_component="C1",
+        fmeda_fault_type="permanent",
+        fmeda_fault_fraction=0.5,
+        fmeda_fit=0.0,
+        fmeda_diag_cov=0.9,
+        fmeda_safety_goal="SG1",
+    )
+    per_profile = matrix.metrics([node], lambda sg: "B")
+    for j, metrics in enumerate(per_profile):
+        matrix.apply(j)
+        expected = compute_fmeda_metrics([node], bom, lambda sg: "B")
+        assert metrics["total"] == pytest.approx(expected["total"])
+        assert metrics["spfm_raw"] == pytest.approx(expected["spfm_raw"])
+    assert per_profile[1]["total"] > per_profile[0]["total"]
+
+
+def test_temperature_corners():
+    base = _profiles()[0]
+    corners = temperature_corners(base, [-40, 25, 125])
+    assert [c.name for c in corners] == ["cold @ -40C", "cold @ 25C", "cold @ 125C"]
+    matrix = fit_matrix(_bom()[:1], corners, "IEC 62380")
+    row = matrix.rows[0]
+    assert row[0] < row[1] < row[2]
+    assert base.board_temp_max == 40
+
+
+def test_pure_python_fallback_without_numpy(monkeypatch):
+    pytest.importorskip("numpy")
+    bom = _bom()
+    profiles = _profiles()
+    expected = fit_matrix(bom, profiles, "IEC 62380")
+    rows, totals, fits = expected.rows.tolist(), expected.totals(), expected.fit_map(1)
+    monkeypatch.setattr(fit_engine, "np", None)
+    matrix = fit_matrix(bom, profiles, "IEC 62380")
+    assert isinstance(matrix.rows, list)
+    for row, expected_row in zip(matrix.rows, rows):
+        assert row == pytest.approx(expected_row)
+    assert matrix.totals() == pytest.approx(totals)
+    assert matrix.fit_map(1) == pytest.approx(fits)
@@ -0,0 +1,116 @@
+# Author: Miguel Marina <karel.capek.robotics@gmail.com>
+# SPDX-License-Identifier: GPL-3.0-or-later
+#
+# Copyright (C) 2025 Capek System Safety & Robotic Solutions
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+"""Compiled governance policy caching for the safety management toolbox."""
+
+import os
+import sys
+
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+
+from analysis import safety_management
+from analysis.safety_management import SafetyManagementToolbox
+from mainappsrc.models.sysml.sysml_repository import SysMLRepository
+
+
+def _toolbox():
+    SysMLRepository.reset_instance()
+    repo = SysMLRepository.get_instance()
+    toolbox = SafetyManagementToolbox()
+    gov = repo.create_diagram("Governance Diagram", name="Gov")
+    toolbox.diagrams["Gov"] = gov.diag_id
+    gov.objects = [
+        {"obj_id": 1, "obj_type": "Work Product", "properties": {"name": "HAZOP"}},
+        {"obj_id": 2, "obj_type": "Work Product", "properties": {"name": "Risk Assessment"}},
+        {"obj_id": 3, "obj_type": "Work Product", "properties": {"name": "FMEA"}},
+        {"obj_id": 4, "obj_type": "Lifecycle Phase", "properties": {"name": "P2"}},
+        {"obj_id": 5, "obj_type": "Lifecycle Phase", "properties": {"name": "P1"}},
+    ]
+    gov.connections = [
+        {"src": 1, "dst": 2, "conn_type": "Propagate by Review"},
+        {"src": 2, "dst": 3, "conn_type": "Trace"},
+        {"src": 4, "dst": 5, "conn_type": "Re-use"},
+    ]
+    return repo, toolbox, gov
+
+
+def _count_builds(monkeypatch):
+    builds = []
+    original = safety_management.GovernancePolicy.__init__
+
+    def counting(self, *args, **kwargs):
+        builds.append(1)
+        original(self, *args, **kwargs)
+
+    monkeypatch.setattr(safety_management.GovernancePolicy, "__init__", counting)
+    return builds
+
+
+def test_policy_is_compiled_once_per_governance_revision(monkeypatch):
+    repo, toolbox, gov = _toolbox()
+    builds = _count_builds(monkeypatch)
+    for _ in range(5):
+        assert toolbox.propagation_type("HAZOP", "Risk Assessment") == "Propagate by Review"
+        assert toolbox.can_trace("Risk Assessment", "FMEA")
+        assert toolbox._reuse_map()["P2"]["phases"] == {"P1"}
+    assert len(builds) == 1
+
+    gov.connections.append({"src": 1, "dst": 3, "conn_type": "Trace"})
+    assert toolbox.can_trace("HAZOP", "FMEA")
+    assert len(builds) == 2
+
+    toolbox.set_active_module("P2")
+    toolbox.document_visible("FMEA", "X")
+    switched = len(builds)
+    for name in ("Y", "Z"):
+        toolbox.document_visible("FMEA", name)
+        toolbox.enabled_products()
+    assert len(builds) == switched
+
+    gov.objects = [dict(o) for o in gov.objects]
+    gov.objects[1]["properties"] = {"name": "Mission Profile"}
+    assert not toolbox.can_trace("Risk Assessment", "FMEA")
+
+
+def test_document_lookup_uses_diagram_index():
+    repo, toolbox, _gov = _toolbox()
+    toolbox.set_active_module("P2")
+    p1 = repo.create_diagram("FMEA", name="Doc")
+    p1.phase = "P1"
+    p3 = repo.create_diagram("FMEA", name="Other")
+    p3.phase = "P3"
+    assert toolbox.document_visible("FMEA", "Doc")
+    assert toolbox.document_read_only("FMEA", "Doc")
+    assert not toolbox.document_visible("FMEA", "Other")
+    assert not toolbox.document_visible("FMEA", "Missing")
+    assert toolbox.phase_for_document("FMEA", "Other") == "P3"
+
+    # Renames that bypass the repository are caught when the stale entry
+    # is looked up.
+    p3.name = "Renamed"
+    assert toolbox.phase_for_document("FMEA", "Other") is None
+    assert toolbox.phase_for_document("FMEA", "Renamed") == "P3"
+
+
+def test_phase_tagged_governance_diagrams_join_their_module():
+    repo, toolbox, _gov = _toolbox()
+    extra = repo.create_diagram("Governance Diagram", name="Extra")
+    extra.tags.append("safety-management")
+    repo.set_diagram_phase(extra.diag_id, "P2")
+    assert "Extra" in toolbox.diagrams_in_module("P2")
+    assert toolbox.module_for_diagram("Extra") == "P2"
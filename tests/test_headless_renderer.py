@@ -0,0 +1,190 @@
+# Author: Miguel Marina <karel.capek.robotics@gmail.com>
+# SPDX-License-Identifier: GPL-3.0-or-later
+#
+# Copyright (C) 2025 Capek System Safety & Robotic Solutions
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+"""Headless rendering of diagrams from model objects."""
+
+import sys
+import types
+import xml.etree.ElementTree as ET
+
+from analysis.causal_bayesian_network import CausalBayesianNetworkDoc
+from gui.architecture import DiagramConnection, SysMLObject
+from gui.utils import headless_renderer as hr
+from gui.windows.causal_bayesian_network_window import CausalBayesianNetworkWindow
+from mainappsrc.core.config_utils import GATE_NODE_TYPES, AutoML_Helper
+from mainappsrc.models.fta.fault_tree_node import FaultTreeNode
+from mainappsrc.models.gsn.diagram import GSNDiagram
+from mainappsrc.models.gsn.nodes import GSNNode
+from mainappsrc.models.sysml.sysml_repository import SysMLDiagram, SysMLRepository
+
+SVG = "{http://www.w3.org/2000/svg}"
+
+
+def _texts(scene):
+    return [i.options["text"] for i in scene.items if i.kind == "text"]
+
+
+def _svg(scene):
+    return ET.fromstring(hr.scene_to_svg(scene))
+
+
+def test_scene_canvas_follows_canvas_api():
+    canvas = hr.SceneCanvas()
+    a = canvas.create_rectangle(0, 0, 10, 10, tags="a")
+    b = canvas.create_line([(0, 0), (20, 5)], tags=("b", "x"))
+    canvas.create_text(5, 5, text="hi", font=hr.HeadlessFont("Arial", 10, "bold"))
+    assert canvas.find_withtag("x") == (b,)
+    assert canvas.bbox("a") == (-1, -1, 11, 11)
+    canvas.move("a", 5, 5)
+    assert canvas.coords(a) == [5, 5, 15, 15]
+    canvas.tag_lower("b")
+    assert canvas.find_all()[0] == b
+    canvas.delete("a")
+    scene = canvas.scene()
+    assert [i.kind for i in scene.items] == ["line", "text"]
+    assert scene.items[1].options["font"] == ("Arial", 10, "bold")
+
+
+def test_text_wraps_and_anchors_like_tk():
+    font = hr.HeadlessFont("Arial", 10)
+    assert font.measure("W") > font.measure("i") > 0
+    assert font.copy().measure("ab") == font.measure("ab")
+    item = hr.SceneItem(
+        "text", [100, 0], {"text": "one two three", "width": font.measure("one two"), "anchor": "n"}
+    )
+    block = hr.text_block(item)
+    assert [line for _x, _y, line in block.lines] == ["one two", "three"]
+    left, top, right, _bottom = block.box
+    assert top == 0 and (left + right) / 2 == 100
+
+
+def test_gsn_scene_draws_nodes_and_links():
+    goal = GSNNode("G1", "Goal")
+    goal.x, goal.y = 100, 100
+    solution = GSNNode("S1", "Solution")
+    solution.x, solution.y = 100, 250
+    goal.add_child(solution)
+    diagram = GSNDiagram(goal)
+    diagram.add_node(solution)
+    scene = hr.gsn_scene(diagram)
+    assert {"G1", "S1"} <= set(" ".join(_texts(scene)).split())
+    root = _svg(scene)
+    assert root.find(f"{SVG}defs/{SVG}linearGradient") is not None
+    assert root.findall(f"{SVG}polyline")
+
+
+def test_fta_scene_uses_page_diagram_layout(monkeypatch):
+    # Other tests replace the ``AutoML`` module that hands out node ids.
+    monkeypatch.setitem(
+        sys.modules,
+        "AutoML",
+        types.SimpleNamespace(AutoML_Helper=AutoML_Helper, GATE_NODE_TYPES=GATE_NODE_TYPES),
+    )
+    top = FaultTreeNode("Top", "Top Event")
+    top.x, top.y = 200, 100
+    top.gate_type = "AND"
+    event = FaultTreeNode("Leaf", "Basic Event")
+    event.x, event.y = 200, 300
+    top.children = [event]
+    event.parents = [top]
+    app = types.SimpleNamespace(
+        get_node_fill_color=lambda node, mode: "#FAD7A0",
+        occurrence_counts={},
+        project_properties={},
+    )
+    scene = hr.fta_scene(app, top)
+    assert any("Top" in text for text in _texts(scene))
+    assert any("Leaf" in text for text in _texts(scene))
+    assert any(i.kind == "gradient" and i.options["fill"].lower() == "#fad7a0" for i in scene.items)
+
+
+def test_sysml_scene_loads_repository_diagram():
+    repo = SysMLRepository.reset_instance()
+    diagram = SysMLDiagram(diag_id="d", diag_type="Block Definition Diagram")
+    diagram.objects = [
+        SysMLObject(1, "Block", 100, 100, properties={"name": "Engine"}).__dict__,
+        SysMLObject(2, "Block", 300, 100, properties={"name": "Wheel"}).__dict__,
+    ]
+    diagram.connections = [DiagramConnection(1, 2, "Association").__dict__]
+    repo.diagrams[diagram.diag_id] = diagram
+    scene = hr.sysml_scene(diagram, repo)
+    assert {"line", "gradient", "text"} <= {i.kind for i in scene.items}
+    assert _svg(scene).findall(f"{SVG}text")
+
+
+def test_cbn_scene_draws_arrows_between_circles():
+    doc = CausalBayesianNetworkDoc("net")
+    doc.network.add_node("Rain", cpd=0.3)
+    doc.network.add_node("Wet", parents=["Rain"], cpd={(True,): 0.9, (False,): 0.1})
+    doc.positions = {"Rain": [(50, 50)], "Wet": [(200, 50)]}
+    scene = hr.cbn_scene(doc)
+    (edge,) = [i for i in scene.items if i.kind == "line"]
+    radius = CausalBayesianNetworkWindow.NODE_RADIUS
+    assert edge.coords == [50 + radius, 50, 200 - radius, 50]
+    assert edge.options["arrow"] == "last"
+    # The arrow head is drawn as a polygon after the shortened shaft.
+    assert len(_svg(scene).findall(f"{SVG}polygon")) == 1
+
+
+def test_export_scenes_reports_each_job(tmp_path, monkeypatch):
+    canvas = hr.SceneCanvas()
+    canvas.create_oval(0, 0, 10, 10, fill="gray50")
+    scene = canvas.scene()
+    svg_path = str(tmp_path / "a.svg")
+    monkeypatch.setattr(hr, "Image", None)
+    results = hr.export_scenes(
+        [hr.ExportJob(scene, svg_path), hr.ExportJob(scene, str(tmp_path / "b.png"))],
+        processes=1,
+    )
+    assert results[0] == (svg_path, None)
+    assert results[1][1] == "Pillow required"
+    assert 'fill="#808080"' in open(svg_path, encoding="utf-8").read()
+    assert hr.capture_image(lambda: scene) is None
+
+
+def test_capture_image_logs_why_it_falls_back(caplog, monkeypatch):
+    def broken():
+        raise RuntimeError("no canvas")
+
+    # Other tests may stub out Pillow; the build fails before it is used.
+    monkeypatch.setattr(hr, "Image", object())
+    with caplog.at_level("DEBUG", logger=hr.__name__):
+        assert hr.capture_image(broken) is None
+    assert "broken" in caplog.text and "no canvas" in caplog.text
+
+
+def test_export_all_diagrams_keeps_project_order(tmp_path, monkeypatch):
+    from mainappsrc.subapps.diagram_export_subapp import DiagramExportSubApp
+
+    repo = SysMLRepository.reset_instance()
+    repo.diagrams["d"] = SysMLDiagram(diag_id="d", diag_type="Block Definition Diagram", name="Broken")
+
+    def broken(diagram):
+        raise ValueError("cannot draw")
+
+    monkeypatch.setattr(hr, "sysml_scene", broken)
+    doc = CausalBayesianNetworkDoc("net")
+    doc.network.add_node("Rain", cpd=0.3)
+    doc.positions = {"Rain": [(50, 50)]}
+    app = types.SimpleNamespace(cbn_docs=[doc])
+    results = DiagramExportSubApp(app).export_all_diagrams(str(tmp_path), processes=1)
+    assert results == [
+        (str(tmp_path / "SysML_Broken.svg"), "cannot draw"),
+        (str(tmp_path / "CBN_net.svg"), None),
+    ]
+    assert (tmp_path / "CBN_net.svg").exists()
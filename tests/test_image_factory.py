@@ -0,0 +1,212 @@
+# Author: Miguel Marina <karel.capek.robotics@gmail.com>
+# SPDX-License-Identifier: GPL-3.0-or-later
+#
+# Copyright (C) 2025 Capek System Safety & Robotic Solutions
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+"""Batched rendering and caching of icon and gradient images."""
+
+import base64
+import io
+import struct
+import types
+import zlib
+
+import pytest
+
+from gui.utils import icon_factory, image_factory
+from gui.utils.image_factory import PixelBuffer
+
+
+class FakeImage:
+    """Stand-in for ``tk.PhotoImage`` recording every Tcl level call."""
+
+    count = 0
+
+    def __init__(self, width=0, height=0, data=None, format=None, master=None):
+        FakeImage.count += 1
+        self.name = f"fake{FakeImage.count}"
+        self.width, self.height = width, height
+        self.data, self.format = data, format
+        self.puts = []
+
+    def put(self, data, to=None):
+        self.puts.append((data, to))
+
+    def __str__(self):
+        return self.name
+
+
+class FakePillowPhoto(FakeImage):
+    """Stand-in for ``ImageTk.PhotoImage`` keeping the Pillow image."""
+
+    def __init__(self, image, master=None):
+        super().__init__(*image.size, format="pillow", master=master)
+        self.image = image
+
+
+@pytest.fixture(params=["pillow", "builtin"])
+def fake_tk(request, monkeypatch):
+    monkeypatch.setattr(image_factory.tk, "PhotoImage", FakeImage)
+    if request.param == "pillow":
+        pil = pytest.importorskip("PIL.Image")
+        if not hasattr(pil, "frombytes"):
+            pytest.skip("Pillow is replaced by a stub")
+        monkeypatch.setattr(image_factory, "Image", pil)
+        monkeypatch.setattr(image_factory, "ImageTk", types.SimpleNamespace(PhotoImage=FakePillowPhoto))
+    else:
+        monkeypatch.setattr(image_factory, "Image", None)
+        monkeypatch.setattr(image_factory, "ImageTk", None)
+    image_factory.clear_cache()
+    yield request.param
+    image_factory.clear_cache()
+    image_factory.use_atlas(None)
+
+
+def _decode_png(data):
+    if image_factory.Image is not None:
+        img = image_factory.Image.open(io.BytesIO(data)).convert("RGBA")
+        return _rows(img)
+    assert data[:8] == b"\x89PNG\r\n\x1a\n"
+    pos, chunks = 8, {}
+    while pos < len(data):
+        (length,) = struct.unpack(">I", data[pos : pos + 4])
+        kind = data[pos + 4 : pos + 8]
+        chunks[kind] = data[pos + 8 : pos + 8 + length]
+        pos += 12 + length
+    width, height = struct.unpack(">II", chunks[b"IHDR"][:8])
+    raw = zlib.decompress(chunks[b"IDAT"])
+    stride = 1 + width * 4
+    return [
+        [tuple(raw[y * stride + 1 + x * 4 : y * stride + 5 + x * 4]) for x in range(width)]
+        for y in range(height)
+    ]
+
+
+def _rows(pil_image):
+    width, height = pil_image.size
+    return [[pil_image.getpixel((x, y)) for x in range(width)] for y in range(height)]
+
+
+def _pixels(img):
+    """Return the RGBA rows of an image rendered with transparency."""
+    if img.format == "pillow":
+        return _rows(img.image)
+    assert img.format == "png"
+    return _decode_png(base64.b64decode(img.data))
+
+
+def test_pixel_buffer_follows_photoimage_put():
+    buf = PixelBuffer(4, 3)
+    buf.put("#ff0000", to=(0, 0, 3, 2))
+    buf.put("#00ff00", (3, 2))
+    buf.put("#0000ff", (9, 9))
+    buf.put([["#111111", "#222222"]], to=(1, 2, 4, 3))
+    assert buf.pixels == [
+        ["#ff0000", "#ff0000", "#ff0000", None],
+        ["#ff0000", "#ff0000", "#ff0000", None],
+        [None, "#111111", "#222222", "#111111"],
+    ]
+    assert list(buf.spans()) == [
+        (0, 0, ["#ff0000"] * 3),
+        (0, 1, ["#ff0000"] * 3),
+        (1, 2, ["#111111", "#222222", "#111111"]),
+    ]
+
+
+def test_png_encoding_keeps_transparency(fake_tk):
+    buf = PixelBuffer(2, 2)
+    buf.put("#102030", (0, 0))
+    buf.put("#fff", (1, 1))
+    assert _decode_png(image_factory.png_bytes(buf)) == [
+        [(16, 32, 48, 255), (0, 0, 0, 0)],
+        [(0, 0, 0, 0), (255, 255, 255, 255)],
+    ]
+
+
+def test_render_uses_one_call(fake_tk):
+    opaque = PixelBuffer(2, 1)
+    opaque.put("#000000", to=(0, 0, 2, 1))
+    img = image_factory.render(opaque)
+    assert img.puts == [("{#000000 #000000}", (0, 0))]
+
+    sparse = PixelBuffer(2, 1)
+    sparse.put("#ffffff", (1, 0))
+    img = image_factory.render(sparse)
+    assert img.puts == []
+    assert _pixels(img)[0] == [(0, 0, 0, 0), (255, 255, 255, 255)]
+
+    # Colour names cannot be resolved without Tk: fall back to opaque runs.
+    named = PixelBuffer(2, 1)
+    named.put("black", (0, 0))
+    img = image_factory.render(named)
+    assert img.puts == [("{black}", (0, 0))]
+
+
+def test_icons_are_painted_once_and_shared(fake_tk, monkeypatch):
+    paints = []
+    original = icon_factory._paint_icon
+    monkeypatch.setattr(
+        icon_factory, "_paint_icon", lambda *args: paints.append(args[1]) or original(*args)
+    )
+    first = icon_factory.create_icon("circle", "#336699")
+    assert icon_factory.create_icon("circle", "#336699") is first
+    assert icon_factory.create_icon("circle", "#336699", size=24) is not first
+    assert paints == ["circle", "circle"]
+    assert len(first.puts) <= 16
+
+
+def test_lru_cache_evicts_least_recently_used():
+    cache = image_factory.LRUCache(2)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    assert cache.get("a") == 1
+    cache.put("c", 3)
+    assert "b" not in cache and cache.get("a") == 1 and cache.get("c") == 3
+
+
+def test_gradient_is_one_tiled_put_and_cached(fake_tk):
+    img = image_factory.gradient(3, 40, "#000000")
+    assert img.puts == [("{#ffffff #7f7f7f #000000}", (0, 0, 3, 40))]
+    assert image_factory.gradient(3, 40, "#000000") is img
+    assert image_factory.gradient(4, 40, "#000000") is not img
+
+
+def test_recolor_uses_source_pixels(fake_tk):
+    icon = image_factory.icon(("dot",), 3, lambda img: img.put("#204060", (1, 1)))
+    glow = image_factory.recolor(icon, lambda c: "#ffffff" if c == "#204060" else c)
+    pixels = _pixels(glow)
+    assert pixels[1][1] == (255, 255, 255, 255) and pixels[0][0] == (0, 0, 0, 0)
+    assert image_factory.recolor(FakeImage(1, 1), str.upper) is None
+
+
+def test_icon_atlas_round_trip(fake_tk, tmp_path):
+    path = tmp_path / "atlas" / "icons.json"
+    image_factory.use_atlas(str(path))
+    paint_calls = []
+
+    def paint(img):
+        paint_calls.append(1)
+        img.put("#336699", to=(0, 0, 2, 2))
+
+    image_factory.icon(("square", "#336699"), 4, paint)
+    image_factory.save_atlas()
+    assert path.exists()
+
+    image_factory.clear_cache()
+    image_factory.use_atlas(str(path))
+    img = image_factory.icon(("square", "#336699"), 4, paint)
+    assert paint_calls == [1]
+    assert _decode_png(base64.b64decode(img.data))[1][1] == (0x33, 0x66, 0x99, 255)
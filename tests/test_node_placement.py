@@ -38,7 +38,7 @@ def _make_app(mode: str):
         selected_node=parent,
         canvas=Canvas(),
         diagram_mode=mode,
-        push_undo_state=lambda: None,
+        push_undo_state=lambda **kwargs: None,
         update_views=lambda: None,
     )
     return app, parent
@@ -0,0 +1,159 @@
+# Author: Miguel Marina <karel.capek.robotics@gmail.com>
+# SPDX-License-Identifier: GPL-3.0-or-later
+#
+# Copyright (C) 2025 Capek System Safety & Robotic Solutions
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+
+"""Fault tree node registry keyed by unique ID and clone group."""
+
+import gc
+import sys
+import types
+
+import pytest
+
+# Provide dummy PIL modules so the core can be imported without Pillow
+for _mod in ("PIL", "PIL.Image", "PIL.ImageDraw", "PIL.ImageFont", "PIL.ImageTk"):
+    sys.modules.setdefault(_mod, types.ModuleType(_mod))
+
+from mainappsrc.core.config_utils import GATE_NODE_TYPES, AutoML_Helper
+from mainappsrc.core.structure_tree_operations import Structure_Tree_Operations
+from mainappsrc.core.syncing_and_ids import Syncing_And_IDs
+from mainappsrc.models.fta.fault_tree_node import FaultTreeNode
+from mainappsrc.models.fta.node_registry import NODE_REGISTRY
+
+
+@pytest.fixture(autouse=True)
+def _automl_ids(monkeypatch):
+    # Other tests replace the ``AutoML`` module that hands out node ids.
+    monkeypatch.setitem(
+        sys.modules,
+        "AutoML",
+        types.SimpleNamespace(AutoML_Helper=AutoML_Helper, GATE_NODE_TYPES=GATE_NODE_TYPES),
+    )
+
+
+def _walk(node):
+    yield node
+    for child in node.children:
+        yield from _walk(child)
+
+
+def _tree():
+    top = FaultTreeNode("Top", "TOP EVENT")
+    gate = FaultTreeNode("Gate", "GATE", top)
+    top.children.append(gate)
+    be = FaultTreeNode("BE", "Basic Event", gate)
+    gate.children.append(be)
+    clone = be.clone(top)
+    return top, gate, be, clone
+
+
+def _app(top_events, entries=()):
+    app = types.SimpleNamespace(
+        top_events=list(top_events), fmea_entries=list(entries), fmeas=[], fmedas=[]
+    )
+    app.structure = Structure_Tree_Operations(app)
+    return app
+
+
+def test_construction_and_clone_register_nodes():
+    top, gate, be, clone = _tree()
+    assert NODE_REGISTRY.get(be.unique_id) is be
+    assert NODE_REGISTRY.clones_of(be) == [clone]
+    assert NODE_REGISTRY.instances_of(be.unique_id) == [be, clone]
+    assert NODE_REGISTRY.check_invariants(_walk(top)) == []
+
+
+def test_reassigned_id_and_original_are_reindexed():
+    top, gate, be, clone = _tree()
+    old = clone.unique_id
+    clone.unique_id = 10_000_001
+    assert clone not in NODE_REGISTRY.nodes(old)
+    assert NODE_REGISTRY.get(10_000_001) is clone
+    clone.original = gate
+    assert NODE_REGISTRY.clones_of(be) == []
+    assert NODE_REGISTRY.clones_of(gate) == [clone]
+    assert NODE_REGISTRY.check_invariants(_walk(top)) == []
+
+
+def test_from_dict_registers_loaded_tree():
+    top, gate, be, clone = _tree()
+    loaded = FaultTreeNode.from_dict(top.to_dict())
+    nodes = list(_walk(loaded))
+    assert {n.unique_id for n in nodes} == {n.unique_id for n in _walk(top)}
+    assert NODE_REGISTRY.check_invariants(nodes) == []
+    for node in nodes:
+        assert node in NODE_REGISTRY.nodes(node.unique_id)
+
+
+def test_find_node_by_id_all_ignores_replaced_model():
+    top, gate, be, clone = _tree()
+    loaded = FaultTreeNode.from_dict(top.to_dict())
+    loaded_be = loaded.children[0].children[0]
+    app = _app([loaded])
+    assert app.structure.find_node_by_id_all(be.unique_id) is loaded_be
+    app.top_events = [top]
+    assert app.structure.find_node_by_id_all(be.unique_id) is be
+
+
+def test_find_node_by_id_all_returns_fmea_entry():
+    entry = FaultTreeNode("FM", "Basic Event")
+    app = _app([], [entry])
+    assert app.structure.find_node_by_id_all(entry.unique_id) is entry
+    assert app.structure.find_node_by_id_all(-1) is None
+
+
+def test_delete_subtree_discards_unshared_nodes():
+    top, gate, be, clone = _tree()
+    shared = FaultTreeNode("Shared", "Basic Event", gate)
+    gate.children.append(shared)
+    top.children.append(shared)
+    shared.parents.append(top)
+    top.children.remove(gate)
+    gate.parents = []
+    NODE_REGISTRY.discard_subtree(gate)
+    assert gate not in NODE_REGISTRY.nodes(gate.unique_id)
+    assert be not in NODE_REGISTRY.nodes(be.unique_id)
+    assert NODE_REGISTRY.clones_of(be) == []
+    assert shared in NODE_REGISTRY.nodes(shared.unique_id)
+
+
+def test_dropped_nodes_leave_registry():
+    node = FaultTreeNode("Tmp", "Basic Event")
+    uid = node.unique_id
+    del node
+    gc.collect()
+    assert NODE_REGISTRY.nodes(uid) == []
+
+
+def test_sync_touches_only_registered_instances():
+    top, gate, be, clone = _tree()
+    app = types.SimpleNamespace()
+    app._copy_attrs_no_xy = lambda dst, src, attrs: [
+        setattr(dst, a, getattr(src, a)) for a in attrs
+    ]
+
+    def fail():
+        raise AssertionError("fault tree sync must not walk the model")
+
+    app.get_all_nodes_in_model = fail
+    app.get_all_fmea_entries = fail
+    clone.user_name = "Renamed"
+    clone.display_label = "Renamed (clone)"
+    Syncing_And_IDs(app)._sync_nodes_by_id_strategy1(clone, ["user_name"])
+    assert be.user_name == "Renamed"
+    assert be.display_label == "Renamed"
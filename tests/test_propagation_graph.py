@@ -0,0 +1,167 @@
+# Author: Miguel Marina <karel.capek.robotics@gmail.com>
+# SPDX-License-Identifier: GPL-3.0-or-later
+#
+# Copyright (C) 2025 Capek System Safety & Robotic Solutions
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+"""Incremental propagation of failure mode and safety goal data."""
+
+from types import SimpleNamespace
+
+from mainappsrc.core.propagation_graph import PropagationGraph, propagation_graph_for
+
+
+def _node(uid, node_type="Basic Event", *children, **attrs):
+    node = SimpleNamespace(
+        unique_id=uid,
+        node_type=node_type,
+        children=list(children),
+        parents=[],
+        user_name=f"N{uid}",
+        safety_goal_description="",
+        malfunction="",
+        failure_mode_ref=None,
+        fault_ref="",
+        fmeda_fit=0.0,
+        fmeda_diag_cov=0.0,
+        prob_formula="linear",
+        failure_prob=0.0,
+        fmeda_malfunction="",
+        fmeda_safety_goal="",
+        sg_dc_target=0.0,
+        sg_spfm_target=0.0,
+        sg_lpfm_target=0.0,
+    )
+    for child in children:
+        child.parents.append(node)
+    node.__dict__.update(attrs)
+    return node
+
+
+def _walk(node):
+    yield node
+    for child in node.children:
+        yield from _walk(child)
+
+
+def _app():
+    be1 = _node(11, failure_mode_ref=100)
+    be2 = _node(12, failure_mode_ref=100)
+    be3 = _node(13, fmeda_fit=5.0)
+    te1 = _node(1, "Top Event", _node(2, "Gate", be1, be3), safety_goal_description="SG1", sg_dc_target=0.9)
+    te2 = _node(3, "Top Event", be2, safety_goal_description="SG2", malfunction="M2")
+    fm = _node(100, "Failure Mode", fmeda_fit=10.0, fmeda_diag_cov=0.5)
+    loose = _node(200, "Failure Mode", fmeda_malfunction="M2")
+    app = SimpleNamespace(
+        top_events=[te1, te2],
+        fmea_entries=[fm, loose],
+        fmeas=[],
+        fmedas=[],
+        mission_profiles=[SimpleNamespace(tau=2.0)],
+        reliability_components=[],
+        computed=[],
+        invalidated=[],
+    )
+    app.get_all_basic_events = lambda: [
+        n for te in app.top_events for n in _walk(te) if n.node_type == "Basic Event"
+    ]
+    app.get_all_failure_modes = lambda: app.get_all_basic_events() + list(app.fmea_entries)
+    app.get_all_nodes = lambda te: list(_walk(te))
+
+    def compute(node, fm=None):
+        app.computed.append(node.unique_id)
+        return fm.fmeda_fit * app.mission_profiles[0].tau / 1e9
+
+    app.compute_failure_prob = compute
+    app.invalidate_probability = app.invalidated.append
+    return app, (be1, be2, be3, fm, loose)
+
+
+def test_refresh_propagates_failure_modes_and_safety_goals():
+    app, (be1, be2, be3, fm, loose) = _app()
+    propagation_graph_for(app).refresh()
+    assert (be1.fmeda_fit, be1.fmeda_diag_cov, be2.fmeda_fit) == (10.0, 0.5, 10.0)
+    assert be1.failure_prob == be2.failure_prob == 20.0 / 1e9
+    assert be3.failure_prob == 10.0 / 1e9
+    # Changed probabilities drop the cached fault tree results.
+    assert {n.unique_id for n in app.invalidated} == {11, 12, 13}
+    assert be3.fmeda_safety_goal == "SG1" and be3.fmeda_dc_target == 0.9
+    # Events with a failure mode follow the trees containing that failure mode.
+    assert be1.fmeda_safety_goal == fm.fmeda_safety_goal == ""
+    # Malfunctions take precedence over tree membership.
+    assert loose.fmeda_safety_goal == "SG2"
+    assert propagation_graph_for(app) is app.propagation_graph
+
+
+def test_edits_only_recompute_downstream_events():
+    app, (be1, be2, be3, fm, _loose) = _app()
+    graph = PropagationGraph(app)
+    graph.refresh()
+    assert sorted(app.computed) == [11, 12, 13]
+
+    app.computed.clear()
+    graph.refresh()
+    assert app.computed == [] and graph.recomputed == 0
+
+    fm.fmeda_fit = 30.0
+    graph.refresh()
+    assert sorted(app.computed) == [11, 12]
+    assert be2.failure_prob == 60.0 / 1e9
+
+    app.computed.clear()
+    app.mission_profiles[0].tau = 4.0
+    graph.refresh()
+    assert sorted(app.computed) == [11, 12, 13]
+
+    app.computed.clear()
+    graph.invalidate(be3)
+    graph.refresh()
+    assert app.computed == [13]
+
+
+def test_links_survive_refreshes_until_the_structure_changes():
+    from analysis.traceability import note_trace_change
+
+    app, (be1, be2, be3, fm, loose) = _app()
+    graph = PropagationGraph(app)
+    graph.refresh()
+    graph.refresh()
+    assert graph.builds == 1
+
+    # Failure mode references are re-read without relinking.
+    be3.failure_mode_ref = 100
+    app.computed.clear()
+    graph.refresh()
+    assert graph.builds == 1
+    assert app.computed == [13] and be3.fmeda_fit == 10.0
+
+    # Renaming a safety goal or re-parenting nodes relinks the model.
+    app.top_events[1].safety_goal_description = "SG3"
+    graph.refresh()
+    assert graph.builds == 2 and loose.fmeda_safety_goal == "SG3"
+
+    be3.failure_mode_ref = None
+    te1 = app.top_events[0]
+    gate = te1.children[0]
+    gate.children.remove(be3)
+    app.top_events[1].children.append(be3)
+    be3.parents = [app.top_events[1]]
+    note_trace_change()
+    graph.refresh()
+    assert graph.builds == 3 and be3.fmeda_safety_goal == "SG3"
+
+    graph.invalidate_links()
+    graph.refresh()
+    assert graph.builds == 4
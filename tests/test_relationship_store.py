@@ -0,0 +1,109 @@
+# Author: Miguel Marina <karel.capek.robotics@gmail.com>
+# SPDX-License-Identifier: GPL-3.0-or-later
+#
+# Copyright (C) 2025 Capek System Safety & Robotic Solutions
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+"""Tests for the indexed relationship store of :class:`SysMLRepository`."""
+
+import json
+
+from mainappsrc.models.sysml.relationship_store import RelationshipStore
+from mainappsrc.models.sysml.sysml_repository import SysMLRepository
+
+
+def _repo_with_blocks():
+    repo = SysMLRepository.reset_instance()
+    a = repo.create_element("Block", name="A")
+    b = repo.create_element("Block", name="B")
+    c = repo.create_element("Block", name="C")
+    return repo, a, b, c
+
+
+def test_lookups_use_indexes():
+    repo, a, b, c = _repo_with_blocks()
+    t1 = repo.create_relationship("Trace", a.elem_id, b.elem_id)
+    t2 = repo.create_relationship("Trace", a.elem_id, c.elem_id)
+    assoc = repo.create_relationship("Association", b.elem_id, a.elem_id)
+
+    assert repo.relationships.get(t1.rel_id) is t1
+    assert repo.relationships.by_source(a.elem_id, "Trace") == [t1, t2]
+    assert repo.relationships.by_target(a.elem_id) == [assoc]
+    assert repo.relationships.by_type("Association") == [assoc]
+    assert {r.rel_id for r in repo.relationships.involving(b.elem_id)} == {
+        t1.rel_id,
+        assoc.rel_id,
+    }
+
+
+def test_indexes_follow_attribute_changes_and_removal():
+    repo, a, b, c = _repo_with_blocks()
+    rel = repo.create_relationship("Trace", a.elem_id, b.elem_id)
+
+    rel.target = c.elem_id
+    assert repo.relationships.by_target(b.elem_id) == []
+    assert repo.relationships.by_target(c.elem_id) == [rel]
+
+    repo.delete_element(a.elem_id)
+    assert list(repo.relationships) == []
+    assert repo.relationships.get(rel.rel_id) is None
+
+
+def test_store_keeps_list_api_and_serialisation():
+    repo, a, b, _c = _repo_with_blocks()
+    rel = repo.create_relationship("Trace", a.elem_id, b.elem_id)
+    data = json.loads(repo.serialize())
+    assert data["relationships"][0]["rel_id"] == rel.rel_id
+    assert "_store" not in data["relationships"][0]
+
+    repo.relationships = [r for r in repo.relationships if r is not rel]
+    assert isinstance(repo.relationships, RelationshipStore)
+    assert repo.relationships.get(rel.rel_id) is None
+    repo.relationships.append(rel)
+    assert repo.relationships[-1] is rel
+    assert repo.relationships.get(rel.rel_id) is rel
+    del repo.relationships[0]
+    assert repo.relationships.by_source(a.elem_id) == []
+
+
+def test_undo_restores_indexed_relationships():
+    repo, a, b, _c = _repo_with_blocks()
+    rel = repo.create_relationship("Trace", a.elem_id, b.elem_id)
+    repo.push_undo_state()
+    repo.delete_element(b.elem_id)
+    assert repo.relationships.by_source(a.elem_id) == []
+
+    repo.undo()
+    assert [r.rel_id for r in repo.relationships.by_source(a.elem_id)] == [rel.rel_id]
+
+
+def test_swaps_and_slice_assignment_keep_indexes():
+    repo, a, b, c = _repo_with_blocks()
+    r1 = repo.create_relationship("Trace", a.elem_id, b.elem_id)
+    r2 = repo.create_relationship("Association", b.elem_id, c.elem_id)
+    rels = repo.relationships
+    rels[0], rels[1] = rels[1], rels[0]
+    assert list(rels) == [r2, r1]
+    assert rels.get(r1.rel_id) is r1 and rels.get(r2.rel_id) is r2
+    assert rels.by_type("Association") == [r2]
+    r2.source = a.elem_id
+    assert {r.rel_id for r in rels.by_source(a.elem_id)} == {r1.rel_id, r2.rel_id}
+
+    rels[:] = [r1, r2, r1]
+    del rels[0]
+    assert rels.get(r1.rel_id) is r1
+    rels[:] = [r2]
+    assert rels.get(r1.rel_id) is None and rels.by_type("Trace") == []
+    assert "_store" not in vars(r2)
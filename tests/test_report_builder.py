@@ -0,0 +1,140 @@
+# Author: Miguel Marina <karel.capek.robotics@gmail.com>
+# SPDX-License-Identifier: GPL-3.0-or-later
+#
+# Copyright (C) 2025 Capek System Safety & Robotic Solutions
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+"""Streaming, template driven report generation."""
+
+import json
+import types
+from pathlib import Path
+
+from analysis.models import HaraDoc, HaraEntry
+from mainappsrc.core import report_builder, reporting_export
+from mainappsrc.core.report_builder import ReportBuilder, iter_node_html, walk_tree
+from mainappsrc.models.gsn.diagram import GSNDiagram
+from mainappsrc.models.gsn.nodes import GSNNode
+
+
+def _node(name, *children):
+    return types.SimpleNamespace(
+        name=name,
+        node_type="Basic Event",
+        gate_type=None,
+        display_label="",
+        description="",
+        rationale="",
+        children=list(children),
+    )
+
+
+def _hara(name, hazard):
+    entry = HaraEntry("m", hazard, "s", 3, "", 2, "", 4, "", "C", "SG1")
+    return HaraDoc(name, [], [entry])
+
+
+def test_walk_tree_handles_deep_trees_without_recursion():
+    root = node = _node("n0")
+    for i in range(1, 5000):
+        child = _node(f"n{i}")
+        node.children.append(child)
+        node = child
+    html = "".join(iter_node_html(root))
+    assert html.count("<details open>") == html.count("</details>") == 5000
+    order = [(n.name, d, e) for n, d, e in walk_tree(_node("a", _node("b"), _node("c")), 1)]
+    assert order == [
+        ("a", 1, True), ("b", 2, True), ("b", 2, False), ("c", 2, True), ("c", 2, False), ("a", 1, False)
+    ]
+
+
+def test_template_sections_only_rerender_changed_documents(tmp_path):
+    app = types.SimpleNamespace(
+        hara_docs=[_hara("H1", "Collision"), _hara("H2", "Fire")],
+        fmeas=[],
+        top_events=[],
+    )
+    template = {
+        "elements": {"haz": "analysis:hazard", "x": "spfm"},
+        "sections": [{"title": "Hazards", "content": "Intro <haz> <x> end"}],
+    }
+    path = tmp_path / "report.html"
+    builder = ReportBuilder(app, processes=1)
+    builder.write_html(str(path), template)
+    text = path.read_text(encoding="utf-8")
+    assert text.index("<h2>Hazards</h2>") < text.index("<p>Intro</p>") < text.index("Collision")
+    assert "Fire" in text and "<p>end</p>" in text and "spfm is not rendered" in text
+    cache = app.report_fragment_cache
+    assert (cache.hits, cache.misses) == (0, 2)
+
+    app.hara_docs[1].entries[0].hazard = "Smoke"
+    ReportBuilder(app, processes=1).write_html(str(path), template)
+    assert (cache.hits, cache.misses) == (1, 3)
+    assert "Smoke" in path.read_text(encoding="utf-8")
+
+
+def test_diagrams_are_written_once_per_model_change(tmp_path, monkeypatch):
+    goal = GSNNode("G1", "Goal")
+    diagram = GSNDiagram(goal)
+    app = types.SimpleNamespace(all_gsn_diagrams=[diagram])
+    builds = []
+    original = report_builder.headless_renderer.gsn_scene
+    monkeypatch.setattr(
+        report_builder.headless_renderer,
+        "gsn_scene",
+        lambda d: builds.append(d) or original(d),
+    )
+    template = {"elements": {"g": "diagram:gsn"}, "sections": [{"title": "GSN", "content": "<g>"}]}
+    path = tmp_path / "out.html"
+    for _ in range(2):
+        ReportBuilder(app, processes=1).write_html(str(path), template)
+    svg = tmp_path / "out_files" / f"gsn_{diagram.diag_id}.svg"
+    assert svg.exists() and len(builds) == 1
+    assert f'src="out_files/gsn_{diagram.diag_id}.svg"' in path.read_text(encoding="utf-8")
+
+    goal.user_name = "G2"
+    ReportBuilder(app, processes=1).write_html(str(path), template)
+    assert len(builds) == 2 and "G2" in svg.read_text(encoding="utf-8")
+
+
+def test_pdf_export_names_html_output_and_diagram_errors(tmp_path, monkeypatch):
+    pdf_path = tmp_path / "out.pdf"
+    template_path = tmp_path / "template.json"
+    template_path.write_text(json.dumps({"elements": {}, "sections": []}))
+
+    class FailingBuilder:
+        def __init__(self, app):
+            self.errors = []
+
+        def write_html(self, path, template=None):
+            Path(path).write_text("<html></html>")
+            self.errors.append((str(tmp_path / "out_files" / "bd.svg"), "boom"))
+
+    shown = []
+    dialogs = reporting_export.filedialog
+    boxes = reporting_export.messagebox
+    monkeypatch.setattr(reporting_export, "ReportBuilder", FailingBuilder)
+    monkeypatch.setattr(dialogs, "asksaveasfilename", lambda **k: str(pdf_path))
+    monkeypatch.setattr(dialogs, "askopenfilename", lambda **k: str(template_path))
+    for kind in ("showinfo", "showwarning", "showerror"):
+        monkeypatch.setattr(boxes, kind, lambda title, msg, kind=kind: shown.append((kind, msg)))
+
+    reporting_export.Reporting_Export(object()).generate_pdf_report()
+
+    assert pdf_path.with_suffix(".html").exists()
+    [(kind, msg)] = shown
+    assert kind == "showwarning"
+    assert str(pdf_path.with_suffix(".html")) in msg
+    assert "bd.svg: boom" in msg
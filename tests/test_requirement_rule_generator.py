@@ -25,7 +25,10 @@ if str(ROOT) not in sys.path:
     sys.path.insert(0, str(ROOT))
 
 import analysis.governance as governance
+import analysis.requirement_rule_generator as generator
+import config.registry
 from analysis.requirement_rule_generator import generate_patterns_from_config
+from config import config_registry
 
 
 def test_generate_patterns_from_config(tmp_path: Path) -> None:
@@ -53,6 +56,50 @@ def test_generate_patterns_from_config(tmp_path: Path) -> None:
     assert ids == expected
 
 
+_RULES = {
+    "ai_nodes": ["ANN", "AI Database"],
+    "requirement_rules": {"annotation": {"action": "annotate", "subject": "Team"}},
+    "connection_rules": {"Governance Diagram": {"Annotation": {"ANN": ["AI Database"]}}},
+}
+
+
+def test_regenerate_skips_unchanged_rules(tmp_path: Path, monkeypatch) -> None:
+    rules = tmp_path / "diagram_rules.json"
+    out = tmp_path / "requirement_patterns.json"
+    rules.write_text(json.dumps(_RULES))
+    calls = []
+    monkeypatch.setattr(
+        generator,
+        "generate_patterns_from_config",
+        lambda cfg: calls.append(cfg) or generate_patterns_from_config(cfg),
+    )
+    assert generator.regenerate_requirement_patterns(rules, out) is True
+    assert generator.regenerate_requirement_patterns(rules, out) is False
+    assert len(calls) == 1
+
+    # Reformatted rules are rebuilt but produce the same file: no rewrite.
+    stamp = out.stat().st_mtime_ns
+    rules.write_text(json.dumps(_RULES, indent=4))
+    assert generator.regenerate_requirement_patterns(rules, out) is False
+    assert len(calls) == 2 and out.stat().st_mtime_ns == stamp
+    assert not list(tmp_path.glob("*.tmp"))
+
+
+def test_background_regeneration_shares_patterns_in_memory(tmp_path: Path, monkeypatch) -> None:
+    rules = tmp_path / "diagram_rules.json"
+    out = tmp_path / "requirement_patterns.json"
+    rules.write_text(json.dumps(_RULES))
+    future = generator.regenerate_requirement_patterns(rules, out, background=True)
+    assert future.result(timeout=30) is True
+
+    def no_parse(path):
+        raise AssertionError("patterns re-parsed")
+
+    monkeypatch.setattr(config.registry, "load_json_with_comments", no_parse)
+    patterns = config_registry.requirement_patterns(out)
+    assert patterns == json.loads(out.read_text(encoding="utf-8"))
+
+
 def test_reload_config_updates_patterns(tmp_path: Path, monkeypatch) -> None:
     cfg = {
         "ai_nodes": ["ANN", "AI Database"],
@@ -0,0 +1,245 @@
+# Author: Miguel Marina <karel.capek.robotics@gmail.com>
+# SPDX-License-Identifier: GPL-3.0-or-later
+#
+# Copyright (C) 2025 Capek System Safety & Robotic Solutions
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+
+"""Tests for retained-mode patching of architecture diagram canvases."""
+
+import tkinter as tk
+
+from gui.architecture import DiagramConnection, SysMLDiagramWindow, SysMLObject
+from gui.utils.retained_canvas import CanvasScene, TaggingCanvas
+from mainappsrc.models.sysml.sysml_repository import SysMLDiagram, SysMLRepository
+
+
+class RecordingCanvas(tk.Canvas):
+    """``tk.Canvas`` stand-in recording calls without a Tk interpreter."""
+
+    def __init__(self):
+        self.items = {}
+        self.calls = []
+        self._next = 0
+
+    def _create(self, kind, *args, **kw):
+        self._next += 1
+        tags = kw.get("tags", ())
+        tags = (tags,) if isinstance(tags, str) else tuple(tags)
+        self.items[self._next] = (kind, tags)
+        self.calls.append(("create", kind, tags))
+        return self._next
+
+    def create_rectangle(self, *args, **kw):
+        return self._create("rectangle", *args, **kw)
+
+    def create_line(self, *args, **kw):
+        return self._create("line", *args, **kw)
+
+    def delete(self, tag):
+        self.calls.append(("delete", tag))
+        if tag == "all":
+            self.items.clear()
+        else:
+            self.items = {i: v for i, v in self.items.items() if tag not in v[1]}
+
+    def move(self, tag, dx, dy):
+        self.calls.append(("move", tag, dx, dy))
+
+    def tag_raise(self, *args):
+        self.calls.append(("raise",) + args)
+
+    def tag_lower(self, *args):
+        self.calls.append(("lower",) + args)
+
+    def find_withtag(self, tag):
+        return [i for i, v in self.items.items() if tag in v[1]]
+
+    def configure(self, **kw):
+        pass
+
+    config = configure
+
+    def bbox(self, *args):
+        return (0, 0, 1, 1)
+
+
+def _window(objects, connections=()):
+    repo = SysMLRepository.reset_instance()
+    diag = SysMLDiagram(diag_id="d", diag_type="Block Definition Diagram")
+    repo.diagrams[diag.diag_id] = diag
+    win = SysMLDiagramWindow.__new__(SysMLDiagramWindow)
+    win.repo = repo
+    win.diagram_id = diag.diag_id
+    win.zoom = 1.0
+    win.objects = list(objects)
+    win.connections = list(connections)
+    win.canvas = RecordingCanvas()
+    win.gradient_cache = {}
+    win.compartment_buttons = []
+    win.selected_obj = None
+    win.selected_objs = []
+    win.selected_conn = None
+    win.dragging_endpoint = None
+    win.endpoint_drag_pos = None
+    win.start = None
+    win.temp_line_end = None
+    win.current_tool = "Select"
+    win.ensure_text_fits = lambda obj: None
+    drawn = []
+
+    def draw_object(obj):
+        drawn.append(obj.obj_id)
+        win.canvas.create_rectangle(0, 0, 1, 1, tags="block")
+        win.compartment_buttons.append((obj.obj_id, "parts", (0, 0, 10, 10)))
+
+    def draw_connection(src, dst, conn, selected=False):
+        drawn.append((conn.src, conn.dst))
+        win.canvas.create_line(0, 0, 1, 1, tags=("connection",))
+
+    win.draw_object = draw_object
+    win.draw_connection = draw_connection
+    return win, drawn
+
+
+def _block(obj_id, x, y):
+    return SysMLObject(obj_id, "Block", x, y, phase=None)
+
+
+def test_tagging_canvas_merges_group_tag():
+    canvas = RecordingCanvas()
+    proxy = TaggingCanvas(canvas, "g")
+    proxy.create_line(0, 0, 1, 1)
+    proxy.create_line(0, 0, 1, 1, tags="a")
+    proxy.create_line(0, 0, 1, 1, tags=("a", "b"))
+    assert [v[1] for v in canvas.items.values()] == [("g",), ("a", "g"), ("a", "b", "g")]
+    assert proxy.find_withtag == canvas.find_withtag
+
+
+def test_scene_matches_requires_frame_and_order():
+    scene = CanvasScene()
+    assert not scene.matches(None, [], [])
+    scene.frame = (1.0,)
+    scene.object_order = [1, 2]
+    assert scene.matches((1.0,), [1, 2], [])
+    assert not scene.matches((2.0,), [1, 2], [])
+    assert not scene.matches((1.0,), [2, 1], [])
+    assert scene.new_tag("obj") != scene.new_tag("obj")
+
+
+def test_move_translates_group_and_redraws_attached_connections():
+    a, b, c = _block(1, 0, 0), _block(2, 100, 0), _block(3, 200, 0)
+    conn = DiagramConnection(2, 3, "Association")
+    win, drawn = _window([a, b, c], [conn])
+    win.redraw()
+    assert drawn == [1, 2, 3, (2, 3)]
+    drawn.clear()
+    win.canvas.calls.clear()
+
+    a.x += 5
+    a.y += 7
+    win.redraw_changed()
+    moves = [c for c in win.canvas.calls if c[0] == "move"]
+    assert len(moves) == 1 and moves[0][2:] == (5, 7)
+    assert drawn == []
+    assert ("delete", "all") not in win.canvas.calls
+    assert win.compartment_buttons[0] == (1, "parts", (5, 7, 15, 17))
+
+    drawn.clear()
+    b.x += 10
+    win.redraw_changed()
+    assert drawn == [(2, 3)]
+
+    # Nothing changed: no canvas work at all.
+    win.canvas.calls.clear()
+    win.redraw_changed()
+    assert win.canvas.calls == []
+
+
+def test_resize_and_selection_redraw_only_the_changed_object():
+    a, b = _block(1, 0, 0), _block(2, 100, 0)
+    win, drawn = _window([a, b])
+    win.redraw()
+    drawn.clear()
+
+    b.width += 20
+    win.redraw_changed()
+    assert drawn == [2]
+    assert len(win.canvas.find_withtag("block")) == 2
+    assert ("raise", win._scene.objects[id(b)].tag, win._scene.objects[id(a)].tag) in win.canvas.calls
+
+    drawn.clear()
+    win.selected_objs = [a]
+    win.redraw_changed()
+    assert drawn == [1]
+
+
+def test_structural_changes_fall_back_to_full_redraw():
+    a, b = _block(1, 0, 0), _block(2, 100, 0)
+    win, drawn = _window([a, b])
+    win.redraw()
+    drawn.clear()
+
+    win.objects.append(_block(3, 50, 50))
+    win.redraw_changed()
+    assert drawn == [1, 2, 3]
+
+    drawn.clear()
+    win.zoom = 2.0
+    win.redraw_changed()
+    assert drawn == [1, 2, 3]
+
+
+def test_fake_canvases_always_redraw():
+    a = _block(1, 0, 0)
+    win, drawn = _window([a])
+    calls = []
+    win.canvas = object()
+    win.redraw = lambda: calls.append("redraw")
+    win.redraw_changed()
+    assert calls == ["redraw"]
+
+
+def test_drag_syncs_repository_and_views_on_release():
+    a = _block(1, 0, 0)
+    win, drawn = _window([a])
+    calls = []
+
+    class App:
+        def update_views(self):
+            calls.append("views")
+
+    win.app = App()
+    win._sync_to_repository = lambda: calls.append("sync")
+    win.canvas.canvasx = lambda v: v
+    win.canvas.canvasy = lambda v: v
+    win.select_rect_start = None
+    win.dragging_point_index = None
+    win.resizing_obj = None
+    win.selected_obj = a
+    win.drag_offset = (0, 0)
+    win.redraw()
+
+    class Event:
+        def __init__(self, x, y):
+            self.x, self.y = x, y
+
+    for step in range(1, 6):
+        win.on_left_drag(Event(step * 10, 0))
+    assert a.x == 50
+    assert calls == []
+
+    win.on_left_release(Event(50, 0))
+    assert calls == ["sync", "views"]
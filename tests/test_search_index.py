@@ -0,0 +1,138 @@
+# Author: Miguel Marina <karel.capek.robotics@gmail.com>
+# SPDX-License-Identifier: GPL-3.0-or-later
+#
+# Copyright (C) 2025 Capek System Safety & Robotic Solutions
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+
+"""Tests for the incremental index behind the search toolbox."""
+
+import re
+
+from gui.utils.search_index import SearchIndex, required_literal
+
+
+def _items(index, regex, sources=None, **kwargs):
+    return [item for _src, item in index.search(regex, sources, **kwargs)]
+
+
+def test_substring_and_prefix_queries():
+    index = SearchIndex()
+    index.update_source("hazards", [(h, h, h) for h in ("Motor fire", "Collision", "Brake fade")])
+    index.update_source("faults", [("f", "Motor stall", "Motor stall")])
+
+    regex = re.compile("motor", re.IGNORECASE)
+    assert _items(index, regex, literal="motor") == ["Motor fire", "Motor stall"]
+    assert _items(index, regex, ["faults"], literal="motor") == ["Motor stall"]
+
+    regex = re.compile(r"\bco", re.IGNORECASE)
+    assert _items(index, regex, literal="co", prefix=True) == ["Collision"]
+    assert index.prefix_candidates("xyz") == set()
+
+
+def test_regex_runs_on_literal_candidates_only():
+    assert required_literal(r"brake\s+(fade|lock)") == "brake"
+    assert required_literal(r"(?:over)heat(ing)?") == "overheat"
+    assert required_literal(r"a|b") == ""
+
+    index = SearchIndex()
+    texts = ["Brake  fade", "Brake lock", "Brakes"]
+    index.update_source("s", [(t, t, t) for t in texts])
+    regex = re.compile(r"brake\s+(fade|lock)", re.IGNORECASE)
+    assert index.substring_candidates("brake") == {0, 1, 2}
+    assert _items(index, regex) == ["Brake  fade", "Brake lock"]
+
+
+def test_prefixes_spanning_several_words_fall_back_to_substrings():
+    index = SearchIndex()
+    texts = ["Brake-by-wire unit", "Steer-by-wire", "Brake pad"]
+    index.update_source("s", [(t, t, t) for t in texts])
+    regex = re.compile(r"\b" + re.escape("brake-by"), re.IGNORECASE)
+    assert _items(index, regex, literal="brake-by", prefix=True) == ["Brake-by-wire unit"]
+    regex = re.compile(r"\b" + re.escape("by-w"), re.IGNORECASE)
+    assert _items(index, regex, literal="by-w", prefix=True) == texts[:2]
+
+
+def test_search_in_progress_ignores_later_updates():
+    index = SearchIndex()
+    index.update_source("s", [(i, f"motor {i}", i) for i in range(4)])
+    matches = index.search(re.compile("motor"), literal="motor")
+    assert next(matches) == ("s", 0)
+    index.update_source("s", [(i, f"pump {i}", -i) for i in range(6)])
+    assert list(matches) == [("s", 1), ("s", 2), ("s", 3)]
+
+
+def test_update_source_only_reindexes_changed_documents():
+    index = SearchIndex()
+    index.update_source("s", [("a", "alpha", 1), ("b", "beta", 2)])
+    kept = index._by_key["s"]["a"]
+
+    index.update_source("s", [("a", "alpha", 1), ("b", "gamma", 2), ("c", "delta", 3)])
+    assert index._by_key["s"]["a"] is kept
+    assert _items(index, re.compile("beta")) == []
+    assert _items(index, re.compile("gamma")) == [2]
+
+    index.update_source("s", [("c", "delta", 3)])
+    assert len(index) == 1
+    assert "alp" not in index._grams
+
+
+def test_toolbox_sees_model_edits_without_notification():
+    from types import SimpleNamespace
+
+    from gui.toolboxes.search_toolbox import SearchToolbox
+    from mainappsrc.core.undo_manager import UndoRedoManager
+
+    class Var:
+        def __init__(self, value):
+            self.value = value
+
+        def get(self):
+            return self.value
+
+    app = SimpleNamespace(hazards=["Fire"])
+    app.undo_manager = UndoRedoManager(app)
+    tb = SearchToolbox.__new__(SearchToolbox)
+    tb.app = app
+    tb.search_var = Var("hazards: fire")
+    tb.case_var = Var(False)
+    tb.regex_var = Var(False)
+    tb.results_box = SimpleNamespace(
+        delete=lambda *a: None,
+        insert=lambda *a: None,
+        select_clear=lambda *a: None,
+        selection_set=lambda *a: None,
+        activate=lambda *a: None,
+        see=lambda *a: None,
+    )
+    tb.results = []
+    tb.current_index = -1
+    tb._init_handlers()
+
+    tb._run_search()
+    assert [r["label"] for r in tb.results] == ["Hazard - Fire"]
+    (fire,) = tb._index._docs
+
+    # Edits that record no checkpoint are found by the next query and
+    # unchanged documents keep their postings.
+    app.hazards.append("Wildfire")
+    tb._run_search()
+    assert app.undo_manager.model_version == 0
+    assert [r["label"] for r in tb.results] == ["Hazard - Fire", "Hazard - Wildfire"]
+    assert fire in tb._index._docs
+
+    app.hazards[1] = "Flood"
+    tb._run_search()
+    assert [r["label"] for r in tb.results] == ["Hazard - Fire"]
@@ -0,0 +1,181 @@
+# Author: Miguel Marina <karel.capek.robotics@gmail.com>
+# SPDX-License-Identifier: GPL-3.0-or-later
+#
+# Copyright (C) 2025 Capek System Safety & Robotic Solutions
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+"""Chunked background CSV/XLSX import."""
+
+import csv
+import threading
+import time
+from types import SimpleNamespace
+
+from analysis.models import COMPONENT_ATTR_TEMPLATES, ReliabilityComponent
+from gui.utils.streaming_import import (
+    BomRowConverter,
+    StreamingImport,
+    iter_rows,
+    read_headers,
+)
+
+MAPPING = {"name": "Part", "type": "Kind", "qty": "Qty", "qualification": ""}
+
+
+def _write_bom(path, rows):
+    with open(path, "w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(["Part", "Kind", "Qty", "Voltage"])
+        writer.writerows(rows)
+
+
+def _legacy_import(path, mapping):
+    """The row loop previously run on the Tk thread."""
+    components = []
+    with open(path, newline="") as f:
+        for row in csv.DictReader(f):
+            try:
+                name = row.get(mapping["name"], "")
+                ctype = row.get(mapping["type"], "")
+                qty = int(row.get(mapping["qty"], 1) or 1)
+                qual = (
+                    row.get(mapping.get("qualification"), "")
+                    if mapping.get("qualification")
+                    else ""
+                )
+                comp = ReliabilityComponent(name, ctype, qty, {}, qual)
+                template = COMPONENT_ATTR_TEMPLATES.get(ctype, {})
+                for k, v in template.items():
+                    comp.attributes[k] = v[0] if isinstance(v, list) else v
+                for key, val in row.items():
+                    if key not in mapping.values():
+                        comp.attributes[key] = val
+                components.append(comp)
+            except Exception:
+                continue
+    return components
+
+
+def test_bom_import_matches_previous_importer(tmp_path):
+    path = tmp_path / "bom.csv"
+    _write_bom(
+        path,
+        [
+            ["C1", "capacitor", "2", "16"],
+            ["R1", "resistor", "", "5"],
+            ["bad", "diode", "many", "1"],
+            ["X1", "unknown", "1", "3", "extra"],
+        ],
+    )
+    assert read_headers(str(path)) == ["Part", "Kind", "Qty", "Voltage"]
+    result = StreamingImport(
+        lambda: iter_rows(str(path)), BomRowConverter(MAPPING), chunk_size=2
+    ).run()
+    expected = _legacy_import(path, MAPPING)
+    assert result.items == expected
+    assert [list(c.attributes) for c in result.items] == [list(c.attributes) for c in expected]
+    assert result.rows == 4
+    assert [e.row for e in result.errors] == [3]
+    assert "many" in result.errors[0].message
+
+
+class FakeWidget:
+    """Collect ``after`` callbacks and run them on demand."""
+
+    def __init__(self):
+        self.callbacks = []
+        self.bindings = []
+
+    def after(self, _ms, callback):
+        self.callbacks.append(callback)
+
+    def bind(self, sequence, callback, add=None):
+        self.bindings.append((sequence, callback))
+
+    def destroy(self):
+        self.callbacks = []
+        for sequence, callback in self.bindings:
+            if sequence == "<Destroy>":
+                callback(SimpleNamespace(widget=self))
+
+    def pump(self, timeout=5.0):
+        deadline = time.monotonic() + timeout
+        while self.callbacks and time.monotonic() < deadline:
+            self.callbacks.pop(0)()
+            time.sleep(0.001)
+
+
+def test_background_import_delivers_batches_on_poll(tmp_path):
+    path = tmp_path / "odd.csv"
+    with open(path, "w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(["name", "class"])
+        for i in range(1234):
+            writer.writerow([f"E{i}", "Road"])
+    widget = FakeWidget()
+    batches, progress, done = [], [], []
+    StreamingImport(lambda: iter_rows(str(path)), chunk_size=100).start(
+        widget,
+        on_batch=batches.append,
+        on_done=done.append,
+        on_progress=progress.append,
+        poll_ms=0,
+    )
+    widget.pump()
+    assert len(done) == 1 and done[0].failure is None and done[0].rows == 1234
+    elems = [e for batch in batches for e in batch]
+    with open(path, newline="") as f:
+        assert elems == list(csv.DictReader(f))
+    assert max(len(b) for b in batches) == 100
+    assert progress[-1] == 1234
+
+
+def test_failures_and_cancellation():
+    def broken():
+        yield {"a": 1}
+        raise OSError("disk gone")
+
+    result = StreamingImport(broken).run()
+    assert result.items == [{"a": 1}]
+    assert isinstance(result.failure, OSError)
+
+    widget = FakeWidget()
+    done = []
+    importer = StreamingImport(lambda: iter([{"a": 1}] * 10), chunk_size=1)
+    importer.start(widget, on_batch=lambda b: None, on_done=done.append, poll_ms=0)
+    importer.cancel()
+    widget.pump(timeout=0.5)
+    assert done == []
+
+
+def test_destroying_the_widget_stops_the_worker():
+    widget = FakeWidget()
+    produced = []
+
+    def rows():
+        for i in range(1000):
+            produced.append(i)
+            yield {"a": i}
+
+    # Nobody drains the queue once the widget is gone.
+    before = set(threading.enumerate())
+    StreamingImport(rows, chunk_size=1).start(
+        widget, on_batch=lambda b: None, on_done=lambda r: None, poll_ms=0
+    )
+    [worker] = set(threading.enumerate()) - before
+    widget.destroy()
+    worker.join(timeout=5.0)
+    assert not worker.is_alive()
+    assert len(produced) < 1000
@@ -0,0 +1,87 @@
+# Author: Miguel Marina <karel.capek.robotics@gmail.com>
+# SPDX-License-Identifier: GPL-3.0-or-later
+#
+# Copyright (C) 2025 Capek System Safety & Robotic Solutions
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+"""Cached text measurement shared by the diagram renderers."""
+
+from gui.styles.style_manager import StyleManager
+from gui.utils import text_layout
+from gui.utils.text_layout import TextLayout
+
+
+class CountingFont:
+    """Font measuring 5 pixels per character per size step."""
+
+    def __init__(self, size=1):
+        self.size = size
+        self.calls = 0
+
+    def actual(self):
+        return {"family": "Stub", "size": self.size}
+
+    def measure(self, text):
+        self.calls += 1
+        return len(text) * 5 * self.size
+
+    def metrics(self, key):
+        return 10 * self.size
+
+    def configure(self, size):
+        self.size = size
+
+
+def test_wraps_are_cached_and_split_long_words():
+    layout = TextLayout()
+    font = CountingFont()
+    lines = layout.wrap_to_width(font, "ab abcdefghijkl cd", 30)
+    assert lines == ["ab", "abcdef", "ghijkl", "cd"]
+    calls = font.calls
+    assert layout.wrap_to_width(font, "ab abcdefghijkl cd", 30) == lines
+    assert layout.wrap_words(font, "one two\n\nthree", 35) == ["one two", "", "three"]
+    assert layout.text_size(font, "abc\nab") == (15, 20)
+    # Another font object with the same description shares the entries.
+    twin = CountingFont()
+    assert layout.wrap_to_width(twin, "ab abcdefghijkl cd", 30) == lines
+    assert layout.measure(twin, "abc") == 15
+    assert font.calls > calls and twin.calls == 0
+
+
+def test_invalidate_after_zoom_and_style_change(tmp_path):
+    layout = text_layout.get_layout()
+    font = CountingFont()
+    assert text_layout.measure(font, "abcd") == 20
+    font.configure(size=2)
+    assert text_layout.measure(font, "abcd") == 20
+    text_layout.invalidate(font)
+    assert text_layout.measure(font, "abcd") == 40
+    style = tmp_path / "style.xml"
+    style.write_text('<style><canvas color="#FFFFFF"/></style>')
+    font.configure(size=3)
+    StyleManager.get_instance().load_style(style)
+    assert text_layout.measure(font, "abcd") == 60
+    assert layout.font_key(object()) is None
+
+
+def test_fonts_without_description_are_measured_directly():
+    layout = TextLayout()
+
+    class Plain:
+        def measure(self, text):
+            return len(text)
+
+    assert layout.wrap_like_tk(Plain(), "aa bb", 3) == ["aa", "bb"]
+    assert layout.measure(Plain(), "abc") == 3 and layout.hits == 0
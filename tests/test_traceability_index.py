@@ -0,0 +1,248 @@
+# Author: Miguel Marina <karel.capek.robotics@gmail.com>
+# SPDX-License-Identifier: GPL-3.0-or-later
+#
+# Copyright (C) 2025 Capek System Safety & Robotic Solutions
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""Bidirectional requirement traceability index."""
+
+import time
+from types import SimpleNamespace
+
+from analysis import traceability
+from analysis.models import global_requirements
+from analysis.traceability import TraceabilityIndex, TraceList
+
+
+def _node(uid, node_type="Basic Event", *children, reqs=(), **attrs):
+    node = SimpleNamespace(
+        unique_id=uid,
+        node_type=node_type,
+        children=TraceList(children),
+        parents=TraceList(),
+        user_name=f"N{uid}",
+        safety_goal_description="",
+        safety_requirements=TraceList({"id": r} for r in reqs),
+    )
+    for child in children:
+        child.parents.append(node)
+    node.__dict__.update(attrs)
+    return node
+
+
+def _walk(node):
+    yield node
+    for child in node.children:
+        yield from _walk(child)
+
+
+def _model():
+    be = _node(11, reqs=["R1", "R2"])
+    shared = _node(12, reqs=["R1"])
+    te1 = _node(1, "Top Event", _node(2, "Gate", be, shared), safety_goal_description="SG1")
+    te2 = _node(3, "Top Event", shared, user_name="Brake")
+    root = SimpleNamespace(children=[te1, te2])
+    entry = SimpleNamespace(description="Short", parents=[be], safety_requirements=TraceList([{"id": "R3"}]))
+    diag = SimpleNamespace(
+        name="IBD",
+        objects=[{"obj_id": 7, "obj_type": "Block", "properties": {"name": "ECU"}, "requirements": [{"id": "R2"}]}],
+    )
+    reviews = [SimpleNamespace(name="Rev", fta_ids=[1], fmea_names=[], req_ids={"R1", "R2"})]
+    app = SimpleNamespace(
+        root_node=root,
+        top_events=[te1, te2],
+        fmeas=TraceList([{"name": "FMEA1", "entries": TraceList([entry])}]),
+        reviews=reviews,
+        review_manager=SimpleNamespace(get_requirements_for_review=lambda r: r.req_ids),
+        revision=0,
+    )
+    app._model_revision = lambda: app.revision
+    app.get_all_nodes = lambda node: [n for c in node.children for n in _walk(c)]
+    repo = SimpleNamespace(diagrams={"d1": diag}, diagram_revision=0)
+    return app, repo, (be, shared, entry)
+
+
+def test_index_answers_both_directions():
+    app, repo, (be, shared, entry) = _model()
+    trace = TraceabilityIndex(app).ensure(repo)
+    assert trace.allocation_names("R2") == ["IBD:ECU", "ECU", "N11"]
+    assert trace.allocation_names("R1") == ["N11", "N12", "N12"]
+    assert trace.allocation_names("R3") == ["FMEA1:Short"]
+    assert trace.goal_names("R1") == ["Brake", "SG1"]
+    assert trace.goal_names("R3") == ["SG1"]
+    assert trace.diagram_objects("R2") == [("d1", 7)]
+    assert trace.requirements_for_node(be) == {"R1", "R2"}
+    assert trace.requirements_for_node(entry) == {"R3"}
+    assert trace.requirements_for_object("d1", 7) == {"R2"}
+    assert trace.requirements_for_goal("Brake") == {"R1"}
+    assert trace.requirements_for_review(app.reviews[0]) == {"R1", "R2"}
+    assert trace.reviews("R1") == app.reviews and trace.reviews("R3") == []
+    assert set(trace.requirement_ids()) == {"R1", "R2", "R3"}
+
+
+def test_index_rebuilds_only_after_changes(monkeypatch):
+    monkeypatch.setattr(traceability, "_trace_revision", 0)
+    app, repo, (be, _shared, _entry) = _model()
+    trace = TraceabilityIndex(app)
+    for _ in range(3):
+        trace.ensure(repo).allocation_names("R1")
+    assert trace.builds == 1
+
+    # The model's lists report their own changes.
+    be.safety_requirements.append({"id": "R4"})
+    assert trace.ensure(repo).allocation_names("R4") == ["N11"]
+    repo.diagram_revision += 1
+    trace.ensure(repo)
+    assert trace.builds == 3
+
+    # Other edits leave the index alone; names are read when queried.
+    app.revision += 1
+    be.user_name = "Pump"
+    app.top_events[0].safety_goal_description = "SG9"
+    assert trace.ensure(repo).allocation_names("R4") == ["Pump"]
+    assert trace.goal_names("R1") == ["Brake", "SG9"]
+    assert trace.requirements_for_goal("SG9") == {"R1", "R2", "R3", "R4"}
+    assert trace.builds == 3
+
+
+def test_status_update_reads_reviews_from_index():
+    from mainappsrc.managers.requirements_manager import RequirementsManagerSubApp
+
+    app, _repo, _nodes = _model()
+    calls = []
+    app.review_manager = SimpleNamespace(
+        get_requirements_for_review=lambda r: calls.append(r) or r.req_ids
+    )
+    app.reviews[0].mode = "peer"
+    app.reviews[0].reviewed = True
+    saved = dict(global_requirements)
+    global_requirements.clear()
+    try:
+        for i in range(50):
+            global_requirements[f"R{i}"] = {"id": f"R{i}", "status": "draft"}
+        manager = RequirementsManagerSubApp(app)
+        manager.update_requirement_statuses()
+        assert global_requirements["R1"]["status"] == "peer reviewed"
+        assert global_requirements["R7"]["status"] == "draft"
+        assert len(calls) == len(app.reviews)
+    finally:
+        global_requirements.clear()
+        global_requirements.update(saved)
+
+
+def test_store_mutations_invalidate_the_index(monkeypatch):
+    monkeypatch.setattr(traceability, "_trace_revision", 0)
+    app, repo, (be, shared, entry) = _model()
+    trace = TraceabilityIndex(app)
+    assert trace.ensure(repo).goal_names("R3") == ["SG1"]
+
+    entry.safety_requirements.pop()
+    assert trace.ensure(repo).allocation_names("R3") == []
+    gate = app.top_events[0].children[0]
+    gate.children.remove(shared)
+    shared.parents.remove(gate)
+    assert trace.ensure(repo).goal_names("R1") == ["Brake", "SG1"]
+    del be.safety_requirements[0]
+    assert trace.ensure(repo).goal_names("R1") == ["Brake"]
+    builds = trace.builds
+    saved = dict(global_requirements)
+    try:
+        global_requirements.pop("missing", None)
+        trace.ensure(repo)
+        assert trace.builds == builds + 1
+    finally:
+        global_requirements.clear()
+        global_requirements.update(saved)
+
+
+def test_explorer_open_time_is_linear_in_requirements():
+    from gui.toolboxes import RequirementsExplorerWindow
+    from mainappsrc.models.sysml.sysml_repository import SysMLRepository
+
+    class _Var:
+        def get(self):
+            return ""
+
+    class _Tree:
+        def __init__(self):
+            self.rows = []
+
+        def get_children(self):
+            return ()
+
+        def delete(self, *items):
+            self.rows = []
+
+        def insert(self, _parent, _index, values=()):
+            self.rows.append(values)
+
+    repo = SysMLRepository.reset_instance()
+    diag = repo.create_diagram("Internal Block Diagram", name="IBD")
+
+    def open_explorer(count):
+        global_requirements.clear()
+        diag.objects = []
+        for i in range(count):
+            req = {"id": f"R{i}", "text": f"Requirement {i}"}
+            global_requirements[req["id"]] = req
+            diag.objects.append(
+                {"obj_id": i, "obj_type": "Block", "properties": {"name": f"B{i}"}, "requirements": [req]}
+            )
+        win = RequirementsExplorerWindow.__new__(RequirementsExplorerWindow)
+        win.app = None
+        win.tree = _Tree()
+        win.query_var = win.type_var = win.asil_var = win.status_var = _Var()
+        start = time.perf_counter()
+        win.refresh()
+        return time.perf_counter() - start, win.tree.rows
+
+    saved = dict(global_requirements)
+    try:
+        small, _rows = open_explorer(2_000)
+        large, rows = open_explorer(20_000)
+    finally:
+        global_requirements.clear()
+        global_requirements.update(saved)
+        SysMLRepository.reset_instance()
+    assert len(rows) == 20_000 and rows[-1][5] == "IBD:B19999"
+    # Ten times the requirements may not cost a hundred times as long.
+    assert large < max(small, 0.05) * 40
+
+
+def test_fault_tree_nodes_hold_trace_lists(monkeypatch):
+    import sys
+
+    from mainappsrc.core.config_utils import GATE_NODE_TYPES, AutoML_Helper
+    from mainappsrc.models.fta.fault_tree_node import FaultTreeNode
+
+    monkeypatch.setitem(
+        sys.modules,
+        "AutoML",
+        SimpleNamespace(AutoML_Helper=AutoML_Helper, GATE_NODE_TYPES=GATE_NODE_TYPES),
+    )
+    top = FaultTreeNode("Top", "TOP EVENT")
+    be = FaultTreeNode("BE", "BASIC EVENT", parent=top)
+    assert be.parents == [top]
+
+    def bumps(edit):
+        before = traceability.trace_revision()
+        edit()
+        return traceability.trace_revision() > before
+
+    assert bumps(lambda: top.children.append(be))
+    assert bumps(lambda: setattr(be, "safety_requirements", [{"id": "R1"}]))
+    assert isinstance(be.safety_requirements, TraceList)
+    assert bumps(lambda: be.safety_requirements.append({"id": "R2"}))
+    assert bumps(lambda: top.children.remove(be))
+    assert not bumps(lambda: setattr(be, "children", []))
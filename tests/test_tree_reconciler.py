@@ -0,0 +1,229 @@
+# Author: Miguel Marina <karel.capek.robotics@gmail.com>
+# SPDX-License-Identifier: GPL-3.0-or-later
+#
+# Copyright (C) 2025 Capek System Safety & Robotic Solutions
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+"""Tests for incremental explorer tree refreshes."""
+
+import types
+
+from gui.utils.tree_reconciler import TreeModel, TreeReconciler
+from mainappsrc.core.view_updater import ViewUpdater
+
+
+class FakeTreeview:
+    """Minimal ``ttk.Treeview`` keeping items, order and open state."""
+
+    def __init__(self):
+        self.items = {"": {"children": []}}
+        self.calls = []
+
+    def get_children(self, item=""):
+        return tuple(self.items[item]["children"])
+
+    def exists(self, iid):
+        return iid in self.items
+
+    def insert(self, parent, index, iid=None, **options):
+        self.calls.append(("insert", iid))
+        self.items[iid] = {"children": [], "parent": parent, **options}
+        siblings = self.items[parent]["children"]
+        siblings.insert(len(siblings) if index == "end" else index, iid)
+        return iid
+
+    def delete(self, *iids):
+        for iid in iids:
+            self.calls.append(("delete", iid))
+            self.items[self.items[iid]["parent"]]["children"].remove(iid)
+            stack = [iid]
+            while stack:
+                stack.extend(self.items.pop(stack.pop())["children"])
+
+    def move(self, iid, parent, index):
+        self.calls.append(("move", iid, index))
+        self.items[self.items[iid]["parent"]]["children"].remove(iid)
+        self.items[parent]["children"].insert(index, iid)
+        self.items[iid]["parent"] = parent
+
+    def item(self, iid, **options):
+        self.calls.append(("item", iid, tuple(sorted(options))))
+        self.items[iid].update(options)
+
+    def texts(self, item=""):
+        return [
+            (self.items[c]["text"], self.texts(c)) for c in self.items[item]["children"]
+        ]
+
+
+def _model(docs, extra_root=False):
+    model = TreeModel()
+    root = model.insert("", "end", text="Hazard & Threat Analysis", open=True)
+    hazops = model.insert(root, "end", text="HAZOPs", open=True)
+    for idx, name in enumerate(docs):
+        model.insert(hazops, "end", text=name, tags=("hazop", str(idx)))
+    if extra_root:
+        model.insert("", "end", text="Risk Assessment", open=True)
+    return model
+
+
+def test_reconcile_only_touches_changed_items_and_keeps_open_state():
+    tree = FakeTreeview()
+    reconciler = TreeReconciler()
+    reconciler.apply(tree, _model(["A", "B"]))
+    assert tree.texts() == [("Hazard & Threat Analysis", [("HAZOPs", [("A", []), ("B", [])])])]
+
+    root = tree.get_children()[0]
+    tree.items[root]["open"] = False  # collapsed by the user
+    tree.calls.clear()
+    reconciler.apply(tree, _model(["A", "B"]))
+    assert tree.calls == []
+
+    reconciler.apply(tree, _model(["A", "B", "C"], extra_root=True))
+    assert [c[0] for c in tree.calls] == ["insert", "insert"]
+    assert tree.items[root]["open"] is False
+    assert tree.texts()[1] == ("Risk Assessment", [])
+
+
+def test_reconcile_deletes_and_reorders():
+    tree = FakeTreeview()
+    reconciler = TreeReconciler()
+    model = TreeModel()
+    for name in ("a", "b", "c"):
+        model.insert("", "end", text=name)
+    reconciler.apply(tree, model)
+    ids = dict(zip("abc", tree.get_children()))
+
+    model = TreeModel()
+    for name in ("c", "a"):
+        model.insert("", "end", text=name)
+    tree.calls.clear()
+    reconciler.apply(tree, model)
+    assert [tree.items[i]["text"] for i in tree.get_children()] == ["c", "a"]
+    assert tree.get_children() == (ids["c"], ids["a"])
+    assert ("delete", ids["b"]) in tree.calls
+    assert not any(c[0] == "insert" for c in tree.calls)
+
+
+def test_external_items_are_replaced_and_options_updated():
+    tree = FakeTreeview()
+    tree.insert("", "end", iid="I001", text="stale")
+    reconciler = TreeReconciler()
+    model = TreeModel()
+    model.insert("", "end", text="x", tags=("fta", "1"), image=None)
+    reconciler.apply(tree, model)
+    assert [tree.items[i]["text"] for i in tree.get_children()] == ["x"]
+
+    model = TreeModel()
+    model.insert("", "end", text="x", tags=("fta", "1"), image="icon")
+    tree.calls.clear()
+    reconciler.apply(tree, model)
+    assert tree.calls == [("item", tree.get_children()[0], ("image",))]
+
+
+def test_duplicate_labels_get_distinct_keys():
+    model = TreeModel()
+    a = model.insert("", "end", text="Doc")
+    b = model.insert("", "end", text="Doc")
+    assert a != b and len(model) == 2
+
+
+def test_minimal_trees_are_rebuilt():
+    class ListTree:
+        def __init__(self):
+            self.rows = []
+
+        def get_children(self, item=""):
+            return [i for i, (p, _t) in enumerate(self.rows) if p == item]
+
+        def delete(self, *items):
+            self.rows = []
+
+        def insert(self, parent, index, text="", **kw):
+            self.rows.append((parent, text))
+            return len(self.rows) - 1
+
+    tree = ListTree()
+    TreeReconciler().apply(tree, _model(["A"]))
+    assert [t for _p, t in tree.rows] == ["Hazard & Threat Analysis", "HAZOPs", "A"]
+
+
+def test_update_views_coalesces_within_idle_cycle():
+    idle = []
+    refreshes = []
+    app = types.SimpleNamespace(
+        root=types.SimpleNamespace(after_idle=idle.append),
+        refresh_model=lambda: refreshes.append(1),
+        compute_occurrence_counts=lambda: {},
+    )
+    updater = ViewUpdater(app)
+    updater.update_views()
+    updater.update_views()
+    updater.update_views()
+    assert len(refreshes) == 1 and len(idle) == 1
+    idle.pop()()
+    assert len(refreshes) == 2
+    updater.update_views()
+    assert len(refreshes) == 3
+
+
+def test_update_views_without_tk_root_is_synchronous():
+    refreshes = []
+    app = types.SimpleNamespace(
+        refresh_model=lambda: refreshes.append(1),
+        compute_occurrence_counts=lambda: {},
+    )
+    updater = ViewUpdater(app)
+    updater.update_views()
+    updater.update_views()
+    assert len(refreshes) == 2
+
+
+def test_renamed_items_keep_their_item_and_open_state():
+    tree = FakeTreeview()
+    reconciler = TreeReconciler()
+
+    def model(name):
+        m = TreeModel()
+        pkg = m.insert("", "end", text=name, open=True, tags=("pkg", "p1"))
+        m.insert(pkg, "end", text="Diagram", tags=("arch", "d1"))
+        return m
+
+    reconciler.apply(tree, model("Package"))
+    pkg = tree.get_children()[0]
+    tree.items[pkg]["open"] = False
+    tree.calls.clear()
+    reconciler.apply(tree, model("Renamed"))
+    assert tree.get_children() == (pkg,)
+    assert [c[0] for c in tree.calls] == ["item"]
+    assert tree.items[pkg]["text"] == "Renamed"
+    assert tree.items[pkg]["open"] is False
+
+
+def test_flush_runs_the_deferred_refresh_without_an_event_loop():
+    refreshes = []
+    app = types.SimpleNamespace(
+        root=types.SimpleNamespace(after_idle=lambda cb: None),
+        refresh_model=lambda: refreshes.append(1),
+        compute_occurrence_counts=lambda: {},
+    )
+    updater = ViewUpdater(app)
+    updater.update_views()
+    updater.update_views()
+    assert len(refreshes) == 1
+    updater.flush()
+    assert len(refreshes) == 2
+    updater.flush()
+    assert len(refreshes) == 2
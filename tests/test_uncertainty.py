@@ -0,0 +1,230 @@
+# Author: Miguel Marina <karel.capek.robotics@gmail.com>
+# SPDX-License-Identifier: GPL-3.0-or-later
+#
+# Copyright (C) 2025 Capek System Safety & Robotic Solutions
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+
+"""Monte Carlo uncertainty propagation for fault trees and FIT rates."""
+
+import math
+import sys
+import types
+from types import SimpleNamespace
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+# Provide dummy PIL modules so the core can be imported without Pillow
+for _mod in ("PIL", "PIL.Image", "PIL.ImageDraw", "PIL.ImageFont", "PIL.ImageTk"):
+    sys.modules.setdefault(_mod, types.ModuleType(_mod))
+
+from mainappsrc.core.probability_reliability import Probability_Reliability
+from analysis import uncertainty
+from analysis.models import MissionProfile, ReliabilityComponent
+from analysis.uncertainty import (
+    Fixed,
+    LogNormal,
+    RateProbability,
+    Uniform,
+    bom_fit_distributions,
+    distribution_from_spec,
+    propagate_bom_fit,
+    propagate_fault_tree,
+    propagate_pmhf,
+)
+
+_ids = iter(range(1, 10_000))
+
+
+def _node(node_type, *children, gate=None, prob=0.0):
+    node = SimpleNamespace(
+        unique_id=next(_ids),
+        node_type=node_type,
+        gate_type=gate,
+        children=list(children),
+        parents=[],
+        failure_prob=prob,
+        is_primary_instance=True,
+    )
+    node.original = node
+    for child in children:
+        child.parents.append(node)
+    return node
+
+
+def _clone(node):
+    clone = _node(node.node_type, prob=node.failure_prob)
+    clone.is_primary_instance = False
+    clone.original = node
+    return clone
+
+
+def test_fixed_inputs_reproduce_point_estimate():
+    a = _node("Basic Event", prob=1e-3)
+    b = _node("Basic Event", prob=2e-3)
+    c = _node("Basic Event", prob=5e-2)
+    top = _node("Top Event", _node("Gate", a, b, gate="OR"), c, gate="AND")
+    result = propagate_fault_tree(top, {}, samples=1000, seed=1)
+    expected = (1 - (1 - 1e-3) * (1 - 2e-3)) * 5e-2
+    assert result.point == pytest.approx(expected)
+    assert np.allclose(result.samples, expected)
+
+
+def test_seeded_runs_are_reproducible():
+    a = _node("Basic Event")
+    b = _node("Basic Event")
+    top = _node("Top Event", a, b, gate="OR")
+    dists = {a.unique_id: LogNormal(1e-4, 10), b.unique_id: Uniform(1e-5, 1e-4)}
+    first = propagate_fault_tree(top, dists, samples=5000, seed=7, batch_size=1024)
+    second = propagate_fault_tree(top, dists, samples=5000, seed=7, batch_size=1024)
+    other = propagate_fault_tree(top, dists, samples=5000, seed=8, batch_size=1024)
+    assert np.array_equal(first.samples, second.samples)
+    assert not np.array_equal(first.samples, other.samples)
+
+
+def test_lognormal_percentiles_follow_error_factor():
+    event = _node("Basic Event")
+    top = _node("Top Event", event, gate="OR")
+    result = propagate_fault_tree(
+        top, {event.unique_id: LogNormal(1e-6, 3)}, samples=200_000, seed=3
+    )
+    bands = result.bands()
+    assert bands["point"] == pytest.approx(1e-6)
+    assert bands["p50"] == pytest.approx(1e-6, rel=0.02)
+    assert bands["p95"] == pytest.approx(3e-6, rel=0.03)
+    assert bands["p5"] == pytest.approx(1e-6 / 3, rel=0.03)
+    assert bands["mean"] == pytest.approx(LogNormal(1e-6, 3).mean, rel=0.02)
+
+
+def test_clones_share_samples_of_original():
+    event = _node("Basic Event")
+    top = _node("Top Event", event, _clone(event), gate="AND")
+    result = propagate_fault_tree(
+        top, {event.unique_id: LogNormal(1e-3, 3)}, samples=100_000, seed=5
+    )
+    # Perfectly correlated inputs square the percentiles of one event.
+    assert result.percentiles([95])[95.0] == pytest.approx((3e-3) ** 2, rel=0.05)
+
+
+def test_pmhf_sums_top_events_on_shared_draws():
+    shared = _node("Basic Event")
+    own = _node("Basic Event")
+    te1 = _node("Top Event", shared, gate="OR")
+    te2 = _node("Top Event", shared, own, gate="OR")
+    dists = {shared.unique_id: LogNormal(1e-6, 5), own.unique_id: Uniform(0, 2e-6)}
+    per_top, total = propagate_pmhf([te1, te2], dists, samples=10_000, seed=2)
+    assert set(per_top) == {te1.unique_id, te2.unique_id}
+    assert np.allclose(total.samples, per_top[te1.unique_id].samples + per_top[te2.unique_id].samples)
+    assert total.point == pytest.approx(per_top[te1.unique_id].point + per_top[te2.unique_id].point)
+    assert np.all(per_top[te2.unique_id].samples >= per_top[te1.unique_id].samples)
+
+
+def test_histogram_and_exceedance():
+    event = _node("Basic Event")
+    top = _node("Top Event", event, gate="OR")
+    result = propagate_fault_tree(top, {event.unique_id: Uniform(0.0, 1.0)}, samples=4000, seed=1)
+    counts, edges = result.histogram(bins=10)
+    assert sum(counts) == 4000 and len(edges) == 11
+    log_counts, log_edges = result.histogram(bins=5, log=True)
+    assert sum(log_counts) == np.count_nonzero(result.samples > 0)
+    assert all(b > a for a, b in zip(log_edges, log_edges[1:]))
+    assert result.exceedance(0.5) == pytest.approx(0.5, abs=0.05)
+
+
+def test_rate_probability_and_specs():
+    linear = RateProbability(Fixed(100.0), mission_time=1000.0)
+    assert linear.point == pytest.approx(1e-4)
+    exp = RateProbability(Fixed(1e9), mission_time=1.0, formula="exponential")
+    assert exp.point == pytest.approx(1 - math.exp(-1))
+    assert distribution_from_spec({"dist": "lognormal", "median": 2.0, "error_factor": 10}) == LogNormal(2.0, 10)
+    assert distribution_from_spec({"dist": "uniform", "low": 1, "high": 5}) == Uniform(1, 5)
+    with pytest.raises(ValueError):
+        distribution_from_spec({"dist": "weibull"})
+    with pytest.raises(ValueError):
+        LogNormal(1.0, 0.5)
+
+
+def test_bom_fit_propagation():
+    comps = [
+        ReliabilityComponent("R1", "resistor", quantity=2, fit=5.0),
+        ReliabilityComponent("U1", "ic", fit=40.0),
+    ]
+    dists = bom_fit_distributions(comps, error_factor=2, overrides={"U1": Fixed(40.0)})
+    assert dists["R1"] == LogNormal(10.0, 2)
+    result = propagate_bom_fit(dists, samples=50_000, seed=4)
+    assert result.point == pytest.approx(50.0)
+    assert result.percentiles([50])[50.0] == pytest.approx(50.0, rel=0.02)
+    assert result.samples.min() >= 40.0
+
+
+def test_app_pmhf_uncertainty_matches_point_calculation():
+    be = SimpleNamespace(
+        unique_id=9001, node_type="Basic Event", gate_type=None, children=[], parents=[],
+        fmeda_fit=100.0, prob_formula="linear", failure_prob=0.0, is_primary_instance=True,
+        fault_ref="", failure_mode_ref=None,
+    )
+    be.original = be
+    top = SimpleNamespace(
+        unique_id=9000, node_type="Top Event", gate_type="OR", children=[be], parents=[],
+        safety_goal_asil="B", is_primary_instance=True,
+    )
+    top.original = top
+    app = SimpleNamespace(
+        mission_profiles=[MissionProfile("MP", tau_on=1000.0)],
+        reliability_components=[],
+        get_failure_mode_node=lambda node: node,
+        get_component_name_for_node=lambda node: "",
+        get_all_basic_events=lambda: [be],
+        top_events=[top],
+    )
+    service = Probability_Reliability(app)
+    be.failure_prob = service.compute_failure_prob(be)
+    per_top, total = service.calculate_pmhf_uncertainty(samples=20_000, seed=1, fit_error_factor=3)
+    assert total.point == pytest.approx(be.failure_prob)
+    assert per_top[9000].percentiles([50])[50.0] == pytest.approx(1e-4, rel=0.03)
+
+
+def test_lognormal_tails_are_not_truncated_by_the_table():
+    sigma = LogNormal(1.0, 3).sigma
+    table_max = max(uncertainty._lognormal_table(sigma))
+    draws = LogNormal(1.0, 3).sample(np.random.default_rng(0), 1 << 20)
+    assert draws.max() > table_max
+    assert draws.min() < 1 / table_max
+
+
+def test_pure_python_fallback_without_numpy(monkeypatch):
+    monkeypatch.setattr(uncertainty, "np", None)
+    a = _node("Basic Event")
+    b = _node("Basic Event", prob=0.5)
+    top = _node("Top Event", _node("Gate", a, b, gate="AND"), gate="OR")
+    rate = RateProbability(Uniform(1e8, 3e8), mission_time=1.0, formula="exponential")
+    per_top, total = propagate_pmhf([top], {a.unique_id: rate}, samples=5000, seed=3, batch_size=1000)
+    result = per_top[top.unique_id]
+    assert isinstance(result.samples, list) and len(result.samples) == 5000
+    assert result.point == pytest.approx(0.5 * (1 - math.exp(-0.2)))
+    assert min(result.samples) >= 0.5 * (1 - math.exp(-0.1))
+    assert total.samples == result.samples
+    counts, edges = result.histogram(bins=10)
+    assert sum(counts) == 5000 and len(edges) == 11
+    assert result.exceedance(result.percentiles([50])[50.0]) == pytest.approx(0.5, abs=0.01)
+
+    fit = propagate_bom_fit({"R1": LogNormal(10.0, 3)}, samples=20_000, seed=4)
+    bands = fit.bands()
+    assert bands["p50"] == pytest.approx(10.0, rel=0.03)
+    assert bands["p95"] == pytest.approx(30.0, rel=0.05)
+    assert bands["mean"] == pytest.approx(LogNormal(10.0, 3).mean, rel=0.03)
+    assert propagate_bom_fit({"R1": LogNormal(10.0, 3)}, samples=20_000, seed=4).samples == fit.samples
@@ -0,0 +1,137 @@
+# Author: Miguel Marina <karel.capek.robotics@gmail.com>
+# SPDX-License-Identifier: GPL-3.0-or-later
+#
+# Copyright (C) 2025 Capek System Safety & Robotic Solutions
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+"""Tests for the structural-diff undo journal."""
+
+from mainappsrc.core.undo_journal import (
+    ABSENT,
+    POSITION,
+    SAME,
+    STRUCTURE,
+    UndoJournal,
+    freeze,
+)
+from mainappsrc.models.sysml.sysml_repository import SysMLRepository
+
+
+def _model(count=50):
+    return {
+        "diagrams": [
+            {"diag_id": f"d{i}", "objects": [{"obj_id": i, "x": 0, "y": 0, "name": f"o{i}"}]}
+            for i in range(count)
+        ]
+    }
+
+
+def test_unchanged_entities_are_shared_between_checkpoints():
+    model = _model()
+    journal = UndoJournal(limit=20)
+    journal.push(model)
+    model["diagrams"][3]["objects"][0]["name"] = "renamed"
+    journal.push(model)
+
+    first, second = (cp.state["diagrams"] for cp in journal.undo_stack)
+    assert first[3] is not second[3]
+    assert all(a is b for i, (a, b) in enumerate(zip(first, second)) if i != 3)
+    assert first[3]["objects"][0]["name"] == "o3"
+
+
+def test_freeze_classifies_changes():
+    old, _ = freeze(_model(2))
+    moved = _model(2)
+    moved["diagrams"][0]["objects"][0]["x"] = 10
+    renamed = _model(2)
+    renamed["diagrams"][1]["objects"][0]["name"] = "other"
+
+    assert freeze(_model(2), old)[1] == SAME
+    assert freeze(moved, old)[1] == POSITION
+    assert freeze(renamed, old)[1] == STRUCTURE
+    assert freeze(_model(3), old)[1] == STRUCTURE
+
+
+def test_drag_moves_coalesce_for_every_strategy():
+    for strategy in ("v1", "v2", "v3", "v4"):
+        model = _model(2)
+        journal = UndoJournal(limit=20)
+        journal.push(model, strategy)
+        for x in range(1, 5):
+            model["diagrams"][0]["objects"][0]["x"] = x
+            journal.push(model, strategy)
+        assert len(journal.undo_stack) == 2, strategy
+
+
+def test_repository_undo_rebuilds_only_changed_entities():
+    repo = SysMLRepository.reset_instance()
+    kept = repo.create_element("Block", name="Kept")
+    edited = repo.create_element("Block", name="Before")
+    repo.push_undo_state()
+    edited.name = "After"
+    repo.push_undo_state()
+
+    assert repo.undo()
+    assert repo.elements[kept.elem_id] is kept
+    assert repo.elements[edited.elem_id].name == "Before"
+
+    assert repo.redo()
+    assert repo.elements[kept.elem_id] is kept
+    assert repo.elements[edited.elem_id].name == "After"
+
+
+def test_mutation_paths_record_only_the_touched_entities():
+    repo = SysMLRepository.reset_instance()
+    kept = repo.create_element("Block", name="Kept")
+    made = repo.create_element("Block", name="Made")
+
+    top = repo._undo_stack[-1]
+    assert top.partial
+    assert top.state == {("elements", made.elem_id): ABSENT}
+
+    assert repo.undo()
+    assert made.elem_id not in repo.elements
+    assert repo.elements[kept.elem_id] is kept
+
+    assert repo.redo()
+    assert repo.elements[made.elem_id].name == "Made"
+    assert repo.elements[kept.elem_id] is kept
+
+
+def test_partial_moves_fold_into_the_step_below():
+    model = {("obj", 1): {"obj_id": 1, "x": 0, "name": "a"}}
+    journal = UndoJournal(limit=20)
+
+    def read(keys):
+        return {k: model.get(k, ABSENT) for k in keys}
+
+    def push(keys):
+        journal.push_v4(*journal.patch(read, keys))
+
+    push([("obj", 1)])
+    model[("obj", 1)]["name"] = "b"
+    for x in range(1, 4):
+        push([("obj", 1)])
+        model[("obj", 1)]["x"] = x
+    push([("obj", 2)])
+
+    # The moves merged into the step that started them.
+    assert len(journal.undo_stack) == 3
+    assert journal.undo_stack[1].state[("obj", 1)] == {"obj_id": 1, "x": 0, "name": "b"}
+
+    changed, target = journal.undo(read)
+    assert changed and target is not None
+    assert target.state[("obj", 1)]["x"] == 0
+    assert journal.redo_stack[-1].state[("obj", 1)]["x"] == 3
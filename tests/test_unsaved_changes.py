@@ -0,0 +1,182 @@
+# Author: Miguel Marina <karel.capek.robotics@gmail.com>
+# SPDX-License-Identifier: GPL-3.0-or-later
+#
+# Copyright (C) 2025 Capek System Safety & Robotic Solutions
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+"""Revision-based unsaved-changes tracking."""
+
+import os
+import sys
+import types
+
+sys.modules.setdefault("PIL", types.ModuleType("PIL"))
+sys.modules.setdefault("PIL.Image", types.ModuleType("PIL.Image"))
+sys.modules.setdefault("PIL.ImageDraw", types.ModuleType("PIL.ImageDraw"))
+sys.modules.setdefault("PIL.ImageFont", types.ModuleType("PIL.ImageFont"))
+sys.modules.setdefault("PIL.ImageTk", types.ModuleType("PIL.ImageTk"))
+
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+import AutoML
+from AutoML import AutoMLApp
+from analysis.risk_assessment import AutoMLHelper
+from mainappsrc.core.reporting_export import EVENT_SECTIONS, Reporting_Export
+from mainappsrc.core.undo_manager import UndoRedoManager
+from mainappsrc.core.view_updater import ViewUpdater
+from mainappsrc.managers.project_manager import ProjectManager
+from mainappsrc.models.fta.fault_tree_node import FaultTreeNode
+from mainappsrc.models.sysml.sysml_repository import SysMLRepository
+
+
+def _app():
+    SysMLRepository.reset_instance()
+    app = AutoMLApp.__new__(AutoMLApp)
+    app.model = {"name": "a"}
+    app.exports = 0
+
+    def export_model_data(include_versions=True):
+        app.exports += 1
+        return dict(app.model)
+
+    app.export_model_data = export_model_data
+    app.apply_model_data = lambda data: app.model.update(data)
+    app.undo_manager = UndoRedoManager(app)
+    return app
+
+
+def test_clean_check_does_not_export_model():
+    app = _app()
+    app.set_last_saved_state()
+    assert app.exports == 0
+    assert not app.has_unsaved_changes()
+
+    app.push_undo_state(sync_repo=False)
+    app.model["name"] = "b"
+    exports = app.exports
+    assert app.has_unsaved_changes()
+    assert app.exports == exports
+
+    app.set_last_saved_state()
+    assert not app.has_unsaved_changes()
+    assert app.exports == exports
+    app.mark_model_changed()
+    assert app.has_unsaved_changes()
+
+
+def test_open_refresh_close_reads_nothing():
+    app = _app()
+    app.refresh_model = lambda: None
+    app.compute_occurrence_counts = lambda: {}
+    app.view_updater = ViewUpdater(app)
+    app.set_last_saved_state()
+    for _ in range(3):
+        app.view_updater.update_views()
+    assert not app.has_unsaved_changes()
+    assert app.exports == 0
+
+
+def test_noop_checkpoints_and_refreshes_are_not_edits():
+    app = _app()
+    app.refresh_model = lambda: None
+    app.compute_occurrence_counts = lambda: {}
+    app.view_updater = ViewUpdater(app)
+    app.set_last_saved_state()
+    version = app.undo_manager.model_version
+
+    app.push_undo_state(sync_repo=False, touched=["name"])
+    app.push_undo_state(sync_repo=False, touched=["name"])
+    app.view_updater.update_views()
+    assert app.undo_manager.model_version == version
+    assert not app.has_unsaved_changes()
+
+    # A full checkpoint announces an edit the refresh cannot compare.
+    app.push_undo_state(sync_repo=False)
+    app.view_updater.update_views()
+    assert app.has_unsaved_changes()
+
+    app.model["name"] = "b"
+    app.push_undo_state(sync_repo=False)
+    assert app.undo_manager.model_version == version + 1
+    assert app.has_unsaved_changes()
+
+
+def test_refresh_counts_edits_in_a_partial_checkpoint():
+    app = _app()
+    app.refresh_model = lambda: None
+    app.compute_occurrence_counts = lambda: {}
+    app.view_updater = ViewUpdater(app)
+    app.set_last_saved_state()
+    version = app.undo_manager.model_version
+
+    app.push_undo_state(sync_repo=False, touched=["name"])
+    app.model["name"] = "b"
+    app.view_updater.update_views()
+    assert app.undo_manager.model_version == version + 1
+
+
+def test_verification_digest_detects_reverted_edits():
+    app = _app()
+    app.verify_saved_state = True
+    app.set_last_saved_state()
+    app.push_undo_state(sync_repo=False)
+    app.model["name"] = "b"
+    assert app.has_unsaved_changes()
+    app.model["name"] = "a"
+    assert not app.has_unsaved_changes()
+    # Edits that bypassed revision tracking are still caught.
+    app.model["extra"] = 1
+    assert app.has_unsaved_changes()
+    app.verify_saved_state = False
+    app.set_last_saved_state()
+    assert app.last_saved_digest is None
+
+
+def test_partial_undo_loads_only_the_touched_sections(monkeypatch):
+    monkeypatch.setattr(AutoML, "AutoML_Helper", AutoMLHelper())
+    app = _app()
+    app.applies = 0
+    app.apply_model_data = lambda data: setattr(app, "applies", app.applies + 1)
+    app.reporting_export = Reporting_Export(app)
+    app.project_manager = ProjectManager(app)
+    first = FaultTreeNode("First", "TOP EVENT")
+    second = FaultTreeNode("Second", "TOP EVENT")
+    app.top_events = [first, second]
+    app.cta_events = []
+    app.paa_events = []
+    app.root_node = second
+    app.get_all_nodes = lambda node: [node]
+    app.get_all_fmea_entries = lambda: []
+    app.update_failure_list = lambda: None
+    app.update_views = lambda: None
+    app.refresh_all = lambda: None
+
+    app.push_undo_state(sync_repo=False, touched=EVENT_SECTIONS)
+    second.user_name = "Renamed"
+    app.top_events.append(FaultTreeNode("Third", "TOP EVENT"))
+    app.undo_manager.undo()
+
+    assert [te.user_name for te in app.top_events] == ["First", "Second"]
+    # The selected fault tree stays selected after the reload.
+    assert app.root_node is app.top_events[1]
+    assert app.exports == 0 and app.applies == 0
+
+    app.undo_manager.redo()
+    assert [te.user_name for te in app.top_events] == ["First", "Renamed", "Third"]
+    assert app.exports == 0 and app.applies == 0
+
+
+def test_untracked_app_is_always_dirty():
+    app = AutoMLApp.__new__(AutoMLApp)
+    assert app.has_unsaved_changes()
@@ -0,0 +1,100 @@
+# Author: Miguel Marina <karel.capek.robotics@gmail.com>
+# SPDX-License-Identifier: GPL-3.0-or-later
+#
+# Copyright (C) 2025 Capek System Safety & Robotic Solutions
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+"""Content-addressed storage of project versions."""
+
+import copy
+import json
+import types
+
+from mainappsrc.core.version_store import VersionStore, content_digest
+
+
+def _model(label="A"):
+    return {
+        "top_events": [
+            {"unique_id": 1, "user_name": "TE", "children": [{"unique_id": 2, "description": label}]},
+            {"unique_id": 3, "user_name": "TE2", "children": []},
+        ],
+        "fmeas": [{"name": "F1", "entries": [1, 2, 3]}],
+        "sysml_repository": {
+            "elements": {"e1": {"name": "Block"}, "e2": {"name": "Part"}},
+            "diagrams": {"d1": {"objects": []}},
+        },
+        "project_properties": {"pdf_report_name": "Report"},
+    }
+
+
+def test_unchanged_chunks_are_shared_between_baselines():
+    store = VersionStore()
+    v1 = store.add("v1", _model())
+    count = len(store.chunks)
+    edited = _model("B")
+    v2 = store.add("v2", edited)
+    # Only the edited top event adds a chunk.
+    assert len(store.chunks) == count + 1
+    assert v1["data"] == _model() and v2["data"] == edited
+    assert v1["data"]["fmeas"][0] is v2["data"]["fmeas"][0]
+    elements1 = v1["data"]["sysml_repository"]["elements"]
+    elements2 = v2["data"]["sysml_repository"]["elements"]
+    assert elements1["e1"] is elements2["e1"]
+    assert store.same_content(v1["data"]["top_events"][1], v2["data"]["top_events"][1])
+    assert not store.same_content(v1["data"]["top_events"][0], v2["data"]["top_events"][0])
+
+
+def test_same_content_falls_back_to_json():
+    store = VersionStore()
+    assert store.same_content({"a": 1, "b": [1]}, {"b": [1], "a": 1})
+    assert not store.same_content({"a": 1}, {"a": 2})
+
+
+def test_export_and_load_round_trip():
+    store = VersionStore()
+    versions = [store.add("v1", _model()), store.add("v2", _model("B"))]
+    entries, chunks = store.export(versions)
+    assert all("data" not in e for e in entries)
+    assert all(content_digest(v) == k for k, v in chunks.items())
+    saved = json.loads(json.dumps({"versions": entries, "version_chunks": chunks}))
+
+    loaded = VersionStore().load(saved["versions"], saved["version_chunks"])
+    assert [v["name"] for v in loaded] == ["v1", "v2"]
+    assert loaded[0]["data"] == _model()
+    assert loaded[1]["data"] == _model("B")
+    assert loaded[0]["data"]["fmeas"][0] is loaded[1]["data"]["fmeas"][0]
+
+
+def test_legacy_entries_with_full_data_are_chunked():
+    store = VersionStore()
+    legacy = [{"name": "v1", "data": _model()}, {"name": "v2", "data": _model()}]
+    loaded = store.load(copy.deepcopy(legacy), {})
+    assert [v["data"] for v in loaded] == [e["data"] for e in legacy]
+    assert loaded[0]["data"]["top_events"][0] is loaded[1]["data"]["top_events"][0]
+    entries, _chunks = store.export(legacy)
+    assert [e["name"] for e in entries] == ["v1", "v2"]
+
+
+def test_diff_between_versions_uses_shared_chunks():
+    from mainappsrc.managers.review_manager import ReviewManager
+
+    app = types.SimpleNamespace(version_store=VersionStore())
+    manager = ReviewManager.__new__(ReviewManager)
+    manager.app = app
+    v1 = app.version_store.add("v1", _model())
+    v2 = app.version_store.add("v2", _model("B"))
+    assert manager.calculate_diff_between(v1["data"], v2["data"]) == [1, 2]
+    assert manager.calculate_diff_between(v1["data"], v1["data"]) == []